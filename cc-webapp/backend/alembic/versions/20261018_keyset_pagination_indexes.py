@@ -0,0 +1,53 @@
+"""add (scope, created_at, id) composite indexes for keyset pagination
+
+Revision ID: 20261018_keyset_pagination_indexes
+Revises: 20250926_merge_heads_auth_invite
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '20261018_keyset_pagination_indexes'
+down_revision: Union[str, None] = '20250926_merge_heads_auth_invite'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index name, table, columns)
+INDEXES = (
+    ('ix_game_history_user_created_id', 'game_history', ['user_id', 'created_at', 'id']),
+    ('ix_notifications_user_created_id', 'notifications', ['user_id', 'created_at', 'id']),
+    ('ix_shop_tx_user_created_id', 'shop_transactions', ['user_id', 'created_at', 'id']),
+    ('ix_chat_messages_room_created_id', 'chat_messages', ['room_id', 'created_at', 'id']),
+)
+
+
+def _inspector():
+    return sa.inspect(op.get_bind())
+
+
+def upgrade() -> None:
+    """Create keyset pagination indexes where the table and columns exist."""
+    insp = _inspector()
+    tables = set(insp.get_table_names())
+    for name, table, columns in INDEXES:
+        if table not in tables:
+            continue
+        existing_cols = {c['name'] for c in insp.get_columns(table)}
+        if not set(columns) <= existing_cols:
+            continue
+        if any(ix.get('name') == name for ix in insp.get_indexes(table)):
+            continue
+        op.create_index(name, table, columns, unique=False)
+
+
+def downgrade() -> None:
+    """Drop keyset pagination indexes if present."""
+    insp = _inspector()
+    tables = set(insp.get_table_names())
+    for name, table, _ in INDEXES:
+        if table in tables and any(ix.get('name') == name for ix in insp.get_indexes(table)):
+            op.drop_index(name, table_name=table)
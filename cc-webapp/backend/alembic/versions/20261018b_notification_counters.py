@@ -0,0 +1,45 @@
+"""add notification_counters (per-user unread/total counters)
+
+Revision ID: 20261018b_notification_counters
+Revises: 20261018_keyset_pagination_indexes
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '20261018b_notification_counters'
+down_revision: Union[str, None] = '20261018_keyset_pagination_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create notification_counters and backfill from notifications."""
+    insp = sa.inspect(op.get_bind())
+    tables = set(insp.get_table_names())
+    if 'notification_counters' in tables:
+        return
+    op.create_table(
+        'notification_counters',
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id'), primary_key=True),
+        sa.Column('unread_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('total_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    if 'notifications' in tables:
+        op.execute(
+            "INSERT INTO notification_counters (user_id, unread_count, total_count) "
+            "SELECT user_id, SUM(CASE WHEN is_read IS NULL OR is_read THEN 0 ELSE 1 END), COUNT(*) "
+            "FROM notifications GROUP BY user_id"
+        )
+
+
+def downgrade() -> None:
+    """Drop notification_counters if present."""
+    insp = sa.inspect(op.get_bind())
+    if 'notification_counters' in insp.get_table_names():
+        op.drop_table('notification_counters')
@@ -0,0 +1,45 @@
+"""add leaderboard_snapshots (period winners persisted at rollover)
+
+Revision ID: 20261019_leaderboard_snapshots
+Revises: 20261018b_notification_counters
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '20261019_leaderboard_snapshots'
+down_revision: Union[str, None] = '20261018b_notification_counters'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create leaderboard_snapshots."""
+    insp = sa.inspect(op.get_bind())
+    if 'leaderboard_snapshots' in insp.get_table_names():
+        return
+    op.create_table(
+        'leaderboard_snapshots',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('game_type', sa.String(50), nullable=False),
+        sa.Column('period', sa.String(10), nullable=False),
+        sa.Column('bucket', sa.String(16), nullable=False),
+        sa.Column('rank', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id'), nullable=False),
+        sa.Column('score', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.UniqueConstraint('game_type', 'period', 'bucket', 'rank', name='uq_leaderboard_snapshot_rank'),
+    )
+    op.create_index('ix_leaderboard_snapshot_user', 'leaderboard_snapshots', ['user_id', 'period'])
+
+
+def downgrade() -> None:
+    """Drop leaderboard_snapshots if present."""
+    insp = sa.inspect(op.get_bind())
+    if 'leaderboard_snapshots' in insp.get_table_names():
+        op.drop_index('ix_leaderboard_snapshot_user', table_name='leaderboard_snapshots')
+        op.drop_table('leaderboard_snapshots')
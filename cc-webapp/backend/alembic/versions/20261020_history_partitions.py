@@ -0,0 +1,128 @@
+"""composite user/time indexes + monthly RANGE partitions for game_history / user_actions
+
+Revision ID: 20261020_history_partitions
+Revises: 20261019_leaderboard_snapshots
+Create Date: 2026-10-20
+
+모든 DB: (user_id, game_type, created_at) / (user_id, created_at) / (user_id, action_type, created_at) 인덱스.
+PostgreSQL: 기존 테이블을 ``<table>_legacy`` 로 이름 변경 후 ``created_at`` RANGE 파티션 부모에
+(MINVALUE, 다음 달 1일) 범위 파티션으로 attach — 행 복사 없음. 이후 월 파티션은 다음 달부터
+app/services/partition_service.ensure_future_partitions 가 생성한다 (여기서는 3개월분 + DEFAULT).
+
+주의:
+- 부모 PK 는 (id, created_at) (파티션 키 포함 필수), user_actions.created_at NULL 은 1970-01-01 로 보정 후 NOT NULL.
+  legacy 의 PK(id) 와 created_at 없는 UNIQUE 는 제거하고 PK (id, created_at) 로 재구성 (ATTACH 전제 조건)
+- 보조 인덱스/FK 는 부모에 재생성(파티션 전체에 전파)하고 legacy 쪽 원본은 제거 → 인덱스 재빌드 시간 필요
+- downgrade 는 추가 인덱스만 제거한다 (파티션 → 단일 테이블 역전환은 수행하지 않음)
+"""
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '20261020_history_partitions'
+down_revision: Union[str, None] = '20261019_leaderboard_snapshots'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ('game_history', 'ix_game_history_user_game_created', ['user_id', 'game_type', 'created_at']),
+    ('user_actions', 'ix_user_actions_user_created', ['user_id', 'created_at']),
+    ('user_actions', 'ix_user_actions_user_type_created', ['user_id', 'action_type', 'created_at']),
+]
+PARTITION_TABLES = ('game_history', 'user_actions')
+MONTHS_AHEAD = 3
+
+
+def _add_months(at: datetime, n: int) -> datetime:
+    idx = at.year * 12 + (at.month - 1) + n
+    return datetime(idx // 12, idx % 12 + 1, 1)
+
+
+def _is_partitioned(bind, table: str) -> bool:
+    return bool(bind.execute(
+        sa.text("SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:t)"), {"t": table}
+    ).first())
+
+
+def _partition(bind, table: str) -> None:
+    legacy = f"{table}_legacy"
+    q = lambda sql, **kw: bind.execute(sa.text(sql), kw)  # noqa: E731
+    seq = q("SELECT pg_get_serial_sequence(:t, 'id')", t=table).scalar()
+    fks = q("SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+            "WHERE conrelid = to_regclass(:t) AND contype = 'f'", t=table).all()
+    # PK / UNIQUE 중 파티션 키(created_at)를 포함하지 않는 것 — 부모에 둘 수 없고 ATTACH 도 막는다
+    keys = q("SELECT c.conname FROM pg_constraint c JOIN pg_attribute a "
+             "ON a.attrelid = c.conrelid AND a.attname = 'created_at' "
+             "WHERE c.conrelid = to_regclass(:t) AND c.contype IN ('p', 'u') AND NOT a.attnum = ANY (c.conkey)",
+             t=table).scalars().all()
+    indexes = q("SELECT i.indexname, i.indexdef FROM pg_indexes i WHERE i.tablename = :t AND i.indexname NOT IN "
+                "(SELECT conname FROM pg_constraint WHERE conrelid = to_regclass(:t) AND contype IN ('p', 'u'))",
+                t=table).all()
+    max_created = q(f'SELECT max(created_at) FROM "{table}"').scalar()
+    now = datetime.utcnow()
+    # legacy 범위 상한: 현재/최대 created_at 이 속한 달의 다음 달 1일 (미래 시각 행도 포함)
+    latest = max(now, max_created or now)
+    bound = _add_months(datetime(latest.year, latest.month, 1), 1)
+
+    q(f"UPDATE \"{table}\" SET created_at = '1970-01-01' WHERE created_at IS NULL")
+    q(f'ALTER TABLE "{table}" ALTER COLUMN created_at SET NOT NULL')
+    for name, _ in indexes:
+        q(f'DROP INDEX IF EXISTS "{name}"')
+    q(f'ALTER TABLE "{table}" RENAME TO "{legacy}"')
+    # legacy PK(id) 를 (id, created_at) 로 재구성: 그대로 두면 ATTACH 가 부모 PK 인덱스를
+    # 만들려다 "multiple primary keys" 로 실패한다. 새 PK 인덱스는 ATTACH 시 부모 PK 에 연결됨
+    for name in keys:
+        q(f'ALTER TABLE "{legacy}" DROP CONSTRAINT "{name}"')
+    q(f'ALTER TABLE "{legacy}" ADD CONSTRAINT "{legacy}_pk" PRIMARY KEY (id, created_at)')
+    q(f'CREATE TABLE "{table}" (LIKE "{legacy}" INCLUDING DEFAULTS) PARTITION BY RANGE (created_at)')
+    q(f'ALTER TABLE "{table}" ADD CONSTRAINT "{table}_pk" PRIMARY KEY (id, created_at)')
+    if seq:
+        q(f"ALTER SEQUENCE {seq} OWNED BY \"{table}\".id")  # legacy 파티션 DROP 시 시퀀스 보존
+    # CHECK 선검증 → ATTACH 시 전체 스캔 생략
+    q(f'ALTER TABLE "{legacy}" ADD CONSTRAINT "{legacy}_bound" CHECK (created_at < \'{bound:%Y-%m-%d}\')')
+    q(f'ALTER TABLE "{table}" ATTACH PARTITION "{legacy}" FOR VALUES FROM (MINVALUE) TO (\'{bound:%Y-%m-%d}\')')
+    q(f'ALTER TABLE "{legacy}" DROP CONSTRAINT "{legacy}_bound"')
+    start = bound
+    for _ in range(MONTHS_AHEAD):
+        end = _add_months(start, 1)
+        q(f'CREATE TABLE IF NOT EXISTS "{table}_p{start:%Y%m}" PARTITION OF "{table}" '
+          f"FOR VALUES FROM ('{start:%Y-%m-%d}') TO ('{end:%Y-%m-%d}')")
+        start = end
+    q(f'CREATE TABLE IF NOT EXISTS "{table}_default" PARTITION OF "{table}" DEFAULT')
+    for _, indexdef in indexes:
+        q(indexdef)  # "ON public.<table>" → 이제 부모(파티션 전체)에 생성
+    for name, definition in fks:
+        q(f'ALTER TABLE "{legacy}" DROP CONSTRAINT "{name}"')
+        q(f'ALTER TABLE "{table}" ADD CONSTRAINT "{name}" {definition}')
+
+
+def upgrade() -> None:
+    """Create composite indexes; convert to monthly partitions on PostgreSQL."""
+    bind = op.get_bind()
+    insp = sa.inspect(bind)
+    tables = set(insp.get_table_names())
+    if bind.dialect.name == 'postgresql':
+        for table in PARTITION_TABLES:
+            if table in tables and not _is_partitioned(bind, table):
+                _partition(bind, table)
+        insp = sa.inspect(bind)
+    for table, name, cols in INDEXES:
+        if table not in tables:
+            continue
+        if any(ix.get('name') == name for ix in insp.get_indexes(table)):
+            continue
+        op.create_index(name, table, cols)
+
+
+def downgrade() -> None:
+    """Drop the composite indexes added here (partitioning is left in place)."""
+    insp = sa.inspect(op.get_bind())
+    tables = set(insp.get_table_names())
+    for table, name, _ in INDEXES:
+        if table == 'user_actions' and name == 'ix_user_actions_user_created':
+            continue  # 20250811_core_ix 소유
+        if table in tables and any(ix.get('name') == name for ix in insp.get_indexes(table)):
+            op.drop_index(name, table_name=table)
@@ -0,0 +1,71 @@
+"""typed user_actions attributes (game_type / bet / win / result / is_jackpot) + indexes
+
+Revision ID: 20261021_user_action_attributes
+Revises: 20261020_history_partitions
+Create Date: 2026-10-21
+
+action_data(Text JSON) 의 자주 조회되는 속성을 nullable 컬럼으로 승격한다.
+- ix_user_actions_user_game_created: (user_id, game_type, created_at) [PG: INCLUDE bet, win, result]
+- ix_user_actions_jackpot: (user_id) WHERE is_jackpot — 잭팟 행만 담는 부분 인덱스
+
+컬럼 추가는 nullable/기본값 없음 → 테이블 재작성 없음. 기존 행 값 채우기는 대용량 UPDATE 를
+마이그레이션 트랜잭션에 넣지 않고 관리자 작업 ``actions.backfill_attributes`` 로 청크 실행한다.
+(파티션 테이블이면 부모에 추가한 컬럼/인덱스가 모든 파티션에 전파된다.)
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '20261021_user_action_attributes'
+down_revision: Union[str, None] = '20261020_history_partitions'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLE = 'user_actions'
+COLUMNS = [
+    ('game_type', sa.String(length=20)),
+    ('bet', sa.Integer()),
+    ('win', sa.Integer()),
+    ('result', sa.String(length=20)),
+    ('is_jackpot', sa.Boolean()),
+]
+GAME_INDEX = 'ix_user_actions_user_game_created'
+JACKPOT_INDEX = 'ix_user_actions_jackpot'
+
+
+def upgrade() -> None:
+    """Add typed attribute columns and their indexes (guarded)."""
+    bind = op.get_bind()
+    insp = sa.inspect(bind)
+    if TABLE not in insp.get_table_names():
+        return
+    existing = {c['name'] for c in insp.get_columns(TABLE)}
+    for name, type_ in COLUMNS:
+        if name not in existing:
+            op.add_column(TABLE, sa.Column(name, type_, nullable=True))
+    indexes = {ix.get('name') for ix in insp.get_indexes(TABLE)}
+    if GAME_INDEX not in indexes:
+        op.create_index(GAME_INDEX, TABLE, ['user_id', 'game_type', 'created_at'],
+                        postgresql_include=['bet', 'win', 'result'])
+    if JACKPOT_INDEX not in indexes:
+        op.create_index(JACKPOT_INDEX, TABLE, ['user_id'],
+                        postgresql_where=sa.text('is_jackpot'), sqlite_where=sa.text('is_jackpot = 1'))
+
+
+def downgrade() -> None:
+    """Drop the attribute indexes and columns."""
+    bind = op.get_bind()
+    insp = sa.inspect(bind)
+    if TABLE not in insp.get_table_names():
+        return
+    indexes = {ix.get('name') for ix in insp.get_indexes(TABLE)}
+    for name in (JACKPOT_INDEX, GAME_INDEX):
+        if name in indexes:
+            op.drop_index(name, table_name=TABLE)
+    existing = {c['name'] for c in insp.get_columns(TABLE)}
+    with op.batch_alter_table(TABLE) as batch:
+        for name, _ in reversed(COLUMNS):
+            if name in existing:
+                batch.drop_column(name)
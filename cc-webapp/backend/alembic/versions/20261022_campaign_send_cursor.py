@@ -0,0 +1,41 @@
+"""notification_campaigns.sent_cursor (chunked send resume point)
+
+Revision ID: 20261022_campaign_send_cursor
+Revises: 20261021_user_action_attributes
+Create Date: 2026-10-22
+
+캠페인 청크 발송 시 마지막으로 commit 된 대상 user_id 를 같은 트랜잭션에 기록한다.
+프로세스 중단 후 재시도는 이 커서 이후 사용자부터 발송 (이미 전달된 청크 중복 방지).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '20261022_campaign_send_cursor'
+down_revision: Union[str, None] = '20261021_user_action_attributes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLE = 'notification_campaigns'
+COLUMN = 'sent_cursor'
+
+
+def upgrade() -> None:
+    """Add the nullable resume cursor column (guarded)."""
+    insp = sa.inspect(op.get_bind())
+    if TABLE not in insp.get_table_names():
+        return
+    if COLUMN not in {c['name'] for c in insp.get_columns(TABLE)}:
+        op.add_column(TABLE, sa.Column(COLUMN, sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    """Drop the resume cursor column."""
+    insp = sa.inspect(op.get_bind())
+    if TABLE not in insp.get_table_names():
+        return
+    if COLUMN in {c['name'] for c in insp.get_columns(TABLE)}:
+        with op.batch_alter_table(TABLE) as batch:
+            batch.drop_column(COLUMN)
@@ -0,0 +1,41 @@
+"""notification_campaigns.claimed_at (single-sender claim lease)
+
+Revision ID: 20261023_campaign_claim
+Revises: 20261022_campaign_send_cursor
+Create Date: 2026-10-23
+
+발송자는 ``scheduled`` → ``sending`` 조건부 UPDATE 로 캠페인을 점유하고 이 시각을 기록한다.
+청크 commit 마다 갱신되며, 만료된 리스(발송 중 프로세스 중단)만 다른 발송자가 다시 점유할 수 있다.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '20261023_campaign_claim'
+down_revision: Union[str, None] = '20261022_campaign_send_cursor'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLE = 'notification_campaigns'
+COLUMN = 'claimed_at'
+
+
+def upgrade() -> None:
+    """Add the nullable claim lease column (guarded)."""
+    insp = sa.inspect(op.get_bind())
+    if TABLE not in insp.get_table_names():
+        return
+    if COLUMN not in {c['name'] for c in insp.get_columns(TABLE)}:
+        op.add_column(TABLE, sa.Column(COLUMN, sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    """Drop the claim lease column."""
+    insp = sa.inspect(op.get_bind())
+    if TABLE not in insp.get_table_names():
+        return
+    if COLUMN in {c['name'] for c in insp.get_columns(TABLE)}:
+        with op.batch_alter_table(TABLE) as batch:
+            batch.drop_column(COLUMN)
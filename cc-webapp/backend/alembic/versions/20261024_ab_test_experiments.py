@@ -0,0 +1,41 @@
+"""add ab_test_experiments (configured variant order per experiment)
+
+Revision ID: 20261024_ab_test_experiments
+Revises: 20261023_campaign_claim
+Create Date: 2026-10-24
+
+무상태 배정 엔진은 ``hash % len(variants)`` 인덱스로 변형을 고르므로 변형 순서가 곧 배정이다.
+재시작 후 ``ab_test_participants`` 관측 변형(정렬)으로 재구성하면 순서/누락 변형이 달라질 수 있어
+``ABTestService.assign`` 요청 목록을 그대로 저장한다.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '20261024_ab_test_experiments'
+down_revision: Union[str, None] = '20261023_campaign_claim'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create ab_test_experiments."""
+    insp = sa.inspect(op.get_bind())
+    if 'ab_test_experiments' in insp.get_table_names():
+        return
+    op.create_table(
+        'ab_test_experiments',
+        sa.Column('test_name', sa.String(100), primary_key=True),
+        sa.Column('variants', sa.JSON(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    """Drop ab_test_experiments if present."""
+    insp = sa.inspect(op.get_bind())
+    if 'ab_test_experiments' in insp.get_table_names():
+        op.drop_table('ab_test_experiments')
@@ -3,6 +3,10 @@ from apscheduler.schedulers.asyncio import AsyncIOScheduler
 # from apscheduler.schedulers.background import BackgroundScheduler # if not using asyncio for FastAPI
 from .utils.segment_utils import compute_rfm_and_update_segments
 from .services.campaign_dispatcher import dispatch_due_campaigns
+from .services.notification_counters import reconcile_counters
+from .services.abtest_service import flush_exposures, load_experiments
+from .services.leaderboard_service import snapshot_rollover
+from .services.partition_service import run_maintenance as run_partition_maintenance
 from . import models
 # Ensure database.py defines SessionLocal. If it's not created yet, this import will fail at runtime.
 # For now, assuming database.py and SessionLocal will be available.
@@ -126,6 +130,79 @@ def job_function():
         if db:
             db.close()
 
+def reconcile_notification_counters():
+    """알림 카운터 드리프트 보정 (notifications 집계 기준)."""
+    db = None
+    try:
+        db = SessionLocal()
+        repaired = reconcile_counters(db)
+        if repaired:
+            print(f"[{datetime.utcnow()}] APScheduler: Repaired {repaired} notification counters.")
+        return repaired
+    except Exception as e:
+        print(f"[{datetime.utcnow()}] APScheduler: reconcile_notification_counters error (guarded): {e}")
+        logging.exception("reconcile_notification_counters guarded error")
+        return 0
+    finally:
+        if db:
+            db.close()
+
+def flush_ab_exposures():
+    """A/B 노출 버퍼 잔여분 ClickHouse 적재 (트래픽이 적을 때의 꼬리 flush)."""
+    try:
+        return flush_exposures()
+    except Exception as e:
+        print(f"[{datetime.utcnow()}] APScheduler: flush_ab_exposures error (guarded): {e}")
+        return 0
+
+def reload_ab_experiments():
+    """A/B 실험 레지스트리 재적재 (다른 워커가 기록한 새 실험/변형 반영)."""
+    db = None
+    try:
+        db = SessionLocal()
+        return load_experiments(db)
+    except Exception as e:
+        print(f"[{datetime.utcnow()}] APScheduler: reload_ab_experiments error (guarded): {e}")
+        return 0
+    finally:
+        if db:
+            db.close()
+
+def snapshot_leaderboards():
+    """직전 daily/weekly 리더보드 상위 N 스냅샷 (버킷당 1회, 이미 기록된 버킷은 생략)."""
+    db = None
+    try:
+        db = SessionLocal()
+        written = snapshot_rollover(db)
+        if written:
+            print(f"[{datetime.utcnow()}] APScheduler: Snapshotted {written} leaderboard rows.")
+        return written
+    except Exception as e:
+        print(f"[{datetime.utcnow()}] APScheduler: snapshot_leaderboards error (guarded): {e}")
+        logging.exception("snapshot_leaderboards guarded error")
+        return 0
+    finally:
+        if db:
+            db.close()
+
+def maintain_history_partitions():
+    """game_history / user_actions 미래 월 파티션 사전 생성 + (활성화 시) 보존 기간 경과 구간 아카이브."""
+    db = None
+    try:
+        db = SessionLocal()
+        result = run_partition_maintenance(db)
+        if result["created"] or result["archived"]:
+            print(f"[{datetime.utcnow()}] APScheduler: Partitions created={result['created']} "
+                  f"archived={len(result['archived'])}.")
+        return result
+    except Exception as e:
+        print(f"[{datetime.utcnow()}] APScheduler: maintain_history_partitions error (guarded): {e}")
+        logging.exception("maintain_history_partitions guarded error")
+        return None
+    finally:
+        if db:
+            db.close()
+
 def start_scheduler():
     if scheduler.running:
         print(f"[{datetime.utcnow()}] APScheduler: Scheduler already running.")
@@ -136,6 +213,16 @@ def start_scheduler():
     scheduler.add_job(job_function, 'interval', minutes=5, misfire_grace_time=300)
     # Stale pending transaction cleanup: every minute
     scheduler.add_job(cleanup_stale_pending_transactions, 'interval', minutes=1, misfire_grace_time=60)
+    # Notification counter drift repair: hourly
+    scheduler.add_job(reconcile_notification_counters, 'interval', hours=1, misfire_grace_time=600)
+    # A/B exposure buffer tail flush
+    scheduler.add_job(flush_ab_exposures, 'interval', seconds=30, misfire_grace_time=30)
+    # A/B experiment registry reload (startup load happens in app lifespan)
+    scheduler.add_job(reload_ab_experiments, 'interval', minutes=5, misfire_grace_time=300)
+    # Leaderboard period rollover snapshot: hourly at :05 (idempotent per bucket)
+    scheduler.add_job(snapshot_leaderboards, 'cron', minute=5, misfire_grace_time=1800)
+    # History partitions: daily 03:30 UTC (pre-create next months, archive expired when enabled)
+    scheduler.add_job(maintain_history_partitions, 'cron', hour=3, minute=30, misfire_grace_time=3600)
 
     # Run once on startup for local testing/verification (5 seconds after app start)
     # This helps confirm the job setup without waiting for 2 AM.
@@ -110,6 +110,50 @@ class Settings(BaseSettings):
     # Observability / APM
     SENTRY_DSN: str | None = os.getenv("SENTRY_DSN")
     SENTRY_TRACES_SAMPLE_RATE: float = float(os.getenv("SENTRY_TRACES_SAMPLE_RATE", "0.0"))  # 0.0 (off) ~ 1.0
+    # 요청별 SQL 쿼리 수/DB 시간 계측 (app/core/query_metrics.py)
+    QUERY_METRICS_ENABLED: bool = os.getenv("QUERY_METRICS_ENABLED", "1") == "1"
+    QUERY_METRICS_SERVER_TIMING: bool = os.getenv("QUERY_METRICS_SERVER_TIMING", "0") == "1"  # Server-Timing/X-DB-Query-Count 헤더
+    QUERY_N_PLUS_ONE_THRESHOLD: int = int(os.getenv("QUERY_N_PLUS_ONE_THRESHOLD", "5"))  # 동일 지문 반복 N회 이상 → N+1 경고
+
+    # 결제 Fraud 속도 룰 (app/services/fraud/velocity.py) — 룰셋 전체를 Lua 1회로 기록+평가
+    # kind: count | sum(amount 합계) | distinct(field 고유값 수), scope/field: user | ip | card | device
+    # threshold: 윈도 내 허용 최대값 (현재 시도 포함 값이 초과하면 hit)
+    FRAUD_VELOCITY_RULES: list = [
+        {"name": "purchase_user_5m", "kind": "count", "scope": "user", "window": 300, "threshold": 20},
+        {"name": "purchase_ip_5m", "kind": "count", "scope": "ip", "window": 300, "threshold": 60},
+        {"name": "purchase_card_1h", "kind": "count", "scope": "card", "window": 3600, "threshold": 30},
+        {"name": "amount_user_1h", "kind": "sum", "scope": "user", "window": 3600, "threshold": 500_000},
+        {"name": "cards_user_5m", "kind": "distinct", "scope": "user", "field": "card", "window": 300, "threshold": 3},
+        {"name": "cards_device_1d", "kind": "distinct", "scope": "device", "field": "card", "window": 86400,
+         "threshold": 5, "decision": "HARD_BLOCK"},
+    ]
+    # Redis 미연결 시 프로세스 메모리 슬라이딩 윈도로 평가 (워커 간 공유 안 됨, 기본 off → 검사 생략)
+    FRAUD_VELOCITY_MEMORY_FALLBACK: bool = os.getenv("FRAUD_VELOCITY_MEMORY_FALLBACK", "0") == "1"
+
+    # 게임 리더보드 (app/services/leaderboard_service.py)
+    LEADERBOARD_SNAPSHOT_TOP_N: int = int(os.getenv("LEADERBOARD_SNAPSHOT_TOP_N", "100"))  # 기간 종료 시 DB 기록 순위 수
+    LEADERBOARD_MEMORY_TTL_SECONDS: int = int(os.getenv("LEADERBOARD_MEMORY_TTL_SECONDS", "30"))  # Redis 미연결 시 DB 집계 캐시
+
+    # 실시간 동기화 스냅샷 (app/realtime/snapshot.py) — 이벤트로 패치, TTL 은 미반영 경로(bulk UPDATE 등) 수렴 상한
+    REALTIME_SNAPSHOT_TTL_SECONDS: int = int(os.getenv("REALTIME_SNAPSHOT_TTL_SECONDS", "600"))
+
+    # 알림 재전송 스트림 (app/services/notification_stream.py) — 사용자별 보관 건수 / 마지막 발행 후 보관 시간
+    NOTIFICATION_STREAM_MAXLEN: int = int(os.getenv("NOTIFICATION_STREAM_MAXLEN", "200"))
+    NOTIFICATION_STREAM_TTL_SECONDS: int = int(os.getenv("NOTIFICATION_STREAM_TTL_SECONDS", str(7 * 24 * 3600)))
+
+    # 세그먼트 라벨 캐시 (app/services/segment_resolver.py) — 프로세스 LRU, 다른 워커 변경 반영 상한 = TTL
+    SEGMENT_LABEL_CACHE_SIZE: int = int(os.getenv("SEGMENT_LABEL_CACHE_SIZE", "50000"))
+    SEGMENT_LABEL_CACHE_TTL_SECONDS: int = int(os.getenv("SEGMENT_LABEL_CACHE_TTL_SECONDS", "300"))
+    # Redis HASH segments:labels 항목 유효 시간 (오래된 항목은 miss 처리 → DB 재조회로 수렴)
+    SEGMENT_LABEL_REDIS_TTL_SECONDS: int = int(os.getenv("SEGMENT_LABEL_REDIS_TTL_SECONDS", "86400"))
+
+    # game_history / user_actions 월 파티션 + 보존/아카이브 (app/services/partition_service.py)
+    STORAGE_PARTITION_MONTHS_AHEAD: int = int(os.getenv("STORAGE_PARTITION_MONTHS_AHEAD", "3"))
+    # 테이블별 보존 개월 수 (0 = 무기한). 아카이브된 구간은 리더보드 alltime 재구성/출석 backfill 원본에서 빠짐
+    STORAGE_RETENTION_MONTHS: dict = {"game_history": 24, "user_actions": 12}
+    STORAGE_ARCHIVE_ENABLED: bool = os.getenv("STORAGE_ARCHIVE_ENABLED", "0") == "1"  # 기본 off: 파티션 사전 생성만
+    STORAGE_ARCHIVE_SINK: str = os.getenv("STORAGE_ARCHIVE_SINK", "file")  # file(gzip JSONL) | clickhouse
+    STORAGE_ARCHIVE_DIR: str = os.getenv("STORAGE_ARCHIVE_DIR", "./archive")
 
     # Slot configuration (symbol weights as JSON-like string env or default mapping)
     SLOT_SYMBOL_WEIGHTS: dict = {
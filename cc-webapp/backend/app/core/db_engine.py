@@ -0,0 +1,238 @@
+"""SQLAlchemy engine factory (pool sizing / PgBouncer mode / pool metrics).
+
+``app.database`` (그리고 ``app.db.base`` 재노출)가 쓰는 유일한 엔진 생성 경로.
+
+- 풀 설정: ``DB_POOL_SIZE`` / ``DB_MAX_OVERFLOW`` / ``DB_POOL_TIMEOUT`` / ``DB_POOL_RECYCLE`` /
+  ``DB_POOL_PRE_PING`` (SQLite 메모리 DB 는 단일 연결 풀이라 크기 옵션 미적용)
+- ``DB_POOL_MODE=pgbouncer``: 트랜잭션 풀링용 NullPool (연결 재사용은 PgBouncer 담당) +
+  드라이버별 prepared statement 캐시 비활성 (asyncpg ``statement_cache_size=0``,
+  psycopg3 ``prepare_threshold=None``; psycopg2 는 서버측 prepare 를 쓰지 않음)
+- 계측: 체크아웃 대기 시간 히스토그램 / 타임아웃 카운터 / checked-out·overflow 게이지
+  (prometheus_client 미설치 시 ``pool_status`` 의 프로세스 통계만)
+- 초기 연결: 엔진은 1회 생성, 연결만 지수 백오프로 재시도 (``DB_CONNECT_RETRIES``)
+"""
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field, replace
+from typing import Any, Dict, Optional
+
+from sqlalchemy import create_engine, event, exc
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.pool import NullPool, QueuePool
+
+logger = logging.getLogger(__name__)
+
+POOL_MODES = ("queue", "pgbouncer")
+
+try:  # optional prometheus metrics
+    from prometheus_client import Counter, Gauge, Histogram  # type: ignore
+    _POOL_WAIT = Histogram(
+        "db_pool_checkout_wait_seconds", "Time spent waiting for a pooled DB connection", ["engine"],
+        buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+    )
+    _POOL_TIMEOUTS = Counter(
+        "db_pool_checkout_timeouts_total", "Pool checkouts that gave up after pool_timeout", ["engine"],
+    )
+    _POOL_CHECKED_OUT = Gauge("db_pool_checked_out", "Connections currently checked out", ["engine"])
+    _POOL_OVERFLOW = Gauge("db_pool_overflow", "Connections open beyond pool_size", ["engine"])
+    _POOL_SIZE = Gauge("db_pool_size", "Configured pool_size", ["engine"])
+except Exception:  # pragma: no cover
+    _POOL_WAIT = None
+    _POOL_TIMEOUTS = None
+    _POOL_CHECKED_OUT = None
+    _POOL_OVERFLOW = None
+    _POOL_SIZE = None
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    raw = os.getenv(name)
+    return default if raw is None else raw.strip().lower() in ("1", "true", "yes", "on")
+
+
+@dataclass(frozen=True)
+class PoolSettings:
+    mode: str = "queue"
+    pool_size: int = 5
+    max_overflow: int = 10
+    pool_timeout: float = 30.0
+    pool_recycle: int = 1800
+    pool_pre_ping: bool = True
+
+    @classmethod
+    def from_env(cls) -> "PoolSettings":
+        mode = os.getenv("DB_POOL_MODE", "queue").strip().lower()
+        if mode not in POOL_MODES:
+            logger.warning("unknown DB_POOL_MODE=%s, using queue", mode)
+            mode = "queue"
+        return cls(
+            mode=mode,
+            pool_size=int(os.getenv("DB_POOL_SIZE", "5")),
+            max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "10")),
+            pool_timeout=float(os.getenv("DB_POOL_TIMEOUT", "30")),
+            pool_recycle=int(os.getenv("DB_POOL_RECYCLE", "1800")),
+            pool_pre_ping=_env_bool("DB_POOL_PRE_PING", True),
+        )
+
+
+# ------------------------------------------------------------------ 계측 풀
+@dataclass
+class PoolStats:
+    checkouts: int = 0
+    timeouts: int = 0
+    wait_total: float = 0.0
+    wait_max: float = 0.0
+    peak_checked_out: int = 0
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+
+class _TimedPoolMixin:
+    """``_do_get`` (풀에서 연결 대기/생성) 소요 시간과 타임아웃을 기록."""
+
+    metrics_name = "default"
+    stats: PoolStats
+
+    def _do_get(self):  # type: ignore[override]
+        start = time.perf_counter()
+        timed_out = False
+        try:
+            return super()._do_get()  # type: ignore[misc]
+        except exc.TimeoutError:
+            timed_out = True
+            raise
+        finally:
+            waited = time.perf_counter() - start
+            st = self.stats
+            with st.lock:
+                st.wait_total += waited
+                st.wait_max = max(st.wait_max, waited)
+                if timed_out:
+                    st.timeouts += 1
+                else:
+                    st.checkouts += 1
+            if _POOL_WAIT is not None:
+                _POOL_WAIT.labels(self.metrics_name).observe(waited)
+                if timed_out:
+                    _POOL_TIMEOUTS.labels(self.metrics_name).inc()
+
+
+class InstrumentedQueuePool(_TimedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedNullPool(_TimedPoolMixin, NullPool):
+    pass
+
+
+def _bind_stats(pool_cls: type, name: str) -> type:
+    # 엔진마다 독립 통계 (풀 재생성(dispose/recreate) 시에도 같은 클래스 → 통계 유지)
+    return type(pool_cls.__name__, (pool_cls,), {"metrics_name": name, "stats": PoolStats()})
+
+
+def _update_gauges(pool: Any, name: str, stats: PoolStats) -> None:
+    checked_out = pool.checkedout() if hasattr(pool, "checkedout") else 0
+    with stats.lock:
+        stats.peak_checked_out = max(stats.peak_checked_out, checked_out)
+    if _POOL_CHECKED_OUT is not None:
+        _POOL_CHECKED_OUT.labels(name).set(checked_out)
+        _POOL_OVERFLOW.labels(name).set(max(0, pool.overflow()) if hasattr(pool, "overflow") else 0)
+
+
+# ------------------------------------------------------------------ 팩토리
+def engine_kwargs(url: str, pool: PoolSettings, *, name: str = "default",
+                  connect_args: Optional[Dict[str, Any]] = None, echo: bool = False) -> Dict[str, Any]:
+    """create_engine 인자 구성 (URL 방언/드라이버 + 풀 모드)."""
+    u = make_url(url)
+    args: Dict[str, Any] = dict(connect_args or {})
+    kw: Dict[str, Any] = {"echo": echo}
+    backend, driver = u.get_backend_name(), u.get_driver_name()
+    if backend == "sqlite":
+        args.setdefault("check_same_thread", False)
+        if not u.database or u.database == ":memory:":
+            kw["connect_args"] = args  # 메모리 DB: SQLAlchemy 기본 단일 연결 풀 유지
+            return kw
+        pool = replace(pool, mode="queue", pool_pre_ping=False)  # 로컬 파일: 끊김 없음, 바운서 없음
+    if pool.mode == "pgbouncer":
+        kw["poolclass"] = _bind_stats(InstrumentedNullPool, name)
+        if driver == "asyncpg":
+            args.setdefault("statement_cache_size", 0)
+            args.setdefault("prepared_statement_cache_size", 0)
+        elif driver == "psycopg":
+            args.setdefault("prepare_threshold", None)
+    else:
+        kw.update(
+            poolclass=_bind_stats(InstrumentedQueuePool, name),
+            pool_size=pool.pool_size,
+            max_overflow=pool.max_overflow,
+            pool_timeout=pool.pool_timeout,
+            pool_recycle=pool.pool_recycle,
+            pool_pre_ping=pool.pool_pre_ping,
+        )
+    kw["connect_args"] = args
+    return kw
+
+
+def create_db_engine(url: str, *, pool: Optional[PoolSettings] = None, name: str = "default",
+                     connect_args: Optional[Dict[str, Any]] = None, echo: bool = False) -> Engine:
+    """풀 설정/계측이 적용된 엔진 생성 (연결 시도는 하지 않음)."""
+    pool = pool or PoolSettings.from_env()
+    eng = create_engine(url, **engine_kwargs(url, pool, name=name, connect_args=connect_args, echo=echo))
+    stats = getattr(eng.pool, "stats", None)
+    if stats is not None:
+        if _POOL_SIZE is not None:
+            _POOL_SIZE.labels(name).set(pool.pool_size if pool.mode == "queue" else 0)
+
+        def _on_change(*_args: Any) -> None:
+            _update_gauges(eng.pool, name, stats)
+
+        event.listen(eng, "checkout", _on_change)
+        event.listen(eng, "checkin", _on_change)
+    return eng
+
+
+def connect_with_retry(eng: Engine, *, attempts: Optional[int] = None, delay: Optional[float] = None,
+                       max_delay: float = 5.0) -> None:
+    """초기 연결 확인 (지수 백오프). 모두 실패하면 마지막 예외를 그대로 올린다."""
+    attempts = attempts or int(os.getenv("DB_CONNECT_RETRIES", "30"))
+    delay = delay if delay is not None else float(os.getenv("DB_CONNECT_RETRY_DELAY", "1.0"))
+    for i in range(1, attempts + 1):
+        try:
+            with eng.connect():
+                return
+        except Exception as e:
+            if i == attempts:
+                raise
+            wait = min(max_delay, delay * (2 ** (i - 1)))
+            logger.warning("database connect retry %s/%s in %.1fs: %s", i, attempts, wait, e)
+            eng.dispose()
+            time.sleep(wait)
+
+
+def pool_status(eng: Engine) -> Dict[str, Any]:
+    """현재 풀 상태 + 누적 체크아웃 통계 (관리/진단용)."""
+    p = eng.pool
+    out: Dict[str, Any] = {"pool": type(p).__name__}
+    for attr in ("size", "checkedout", "checkedin", "overflow"):
+        fn = getattr(p, attr, None)
+        if callable(fn):
+            out[attr] = fn()
+    stats: Optional[PoolStats] = getattr(p, "stats", None)
+    if stats is not None:
+        with stats.lock:
+            out.update(
+                checkouts=stats.checkouts,
+                timeouts=stats.timeouts,
+                peak_checked_out=stats.peak_checked_out,
+                wait_avg_ms=round(stats.wait_total / max(1, stats.checkouts + stats.timeouts) * 1000, 3),
+                wait_max_ms=round(stats.wait_max * 1000, 3),
+            )
+    return out
+
+
+__all__ = [
+    "POOL_MODES", "PoolSettings", "PoolStats", "InstrumentedQueuePool", "InstrumentedNullPool",
+    "engine_kwargs", "create_db_engine", "connect_with_retry", "pool_status",
+]
@@ -0,0 +1,186 @@
+"""Pure game outcome math shared by production endpoints and the economy simulator.
+
+라우터/서비스는 난수 생성·잔액·로그·브로드캐스트를 담당하고, 결과 판정 규칙은
+이 모듈의 순수 함수만 사용한다. ``scripts/economy_sim.py`` 의 벡터화 모드는 같은 함수로
+룩업 테이블(슬롯 릴 조합 216개, 크래시 균등 격자 10000개, 가챠 상태별 누적분포)을 만들어
+NumPy 배치로 평가하므로 시뮬레이션과 운영 코드의 규칙이 어긋나지 않는다.
+
+이 모듈은 앱 설정/DB 를 import 하지 않는다 (프로세스 풀 워커에서 가볍게 로드).
+"""
+from __future__ import annotations
+
+import hashlib
+from typing import Dict, FrozenSet, List, Mapping, Optional, Sequence, Tuple
+
+# ---------------------------------------------------------------------------
+# Slot (POST /api/games/slot/spin)
+# ---------------------------------------------------------------------------
+# 릴 심볼 순서는 random.choices 재현성을 위해 고정
+SLOT_SYMBOLS: Tuple[str, ...] = ('🍒', '🍋', '🍊', '🍇', '💎', '7️⃣')
+SLOT_DEFAULT_WEIGHTS: Dict[str, int] = {'🍒': 30, '🍋': 25, '🍊': 20, '🍇': 15, '💎': 8, '7️⃣': 2}
+SLOT_TRIPLE_MULTIPLIERS: Dict[str, int] = {'🍒': 2, '🍋': 3, '🍊': 4, '🍇': 5, '💎': 10, '7️⃣': 50}
+SLOT_PAIR_MULTIPLIER = 1.5
+SLOT_JACKPOT_SYMBOL = '7️⃣'
+SLOT_STREAK_BONUS_STEP = 0.02  # 연속 시도 1회당 +2%
+SLOT_STREAK_BONUS_CAP = 0.20   # 최대 +20%
+SLOT_VARIATION_RANGE = (0.95, 1.05)  # 승리 시 ±5% 변동
+
+
+def slot_symbol_weights(cfg_weights: Optional[Mapping[str, int]] = None) -> List[int]:
+    """설정 가중치 → SLOT_SYMBOLS 순서 가중치 목록 (누락 심볼은 1)."""
+    cfg = cfg_weights or SLOT_DEFAULT_WEIGHTS
+    return [cfg.get(sym, 1) for sym in SLOT_SYMBOLS]
+
+
+def slot_base_win(reels: Sequence[str], bet_amount: int) -> int:
+    """스트릭 보너스 적용 전 당첨액 (3개 일치 → 심볼 배수, 인접 2개 일치 → 1.5배)."""
+    if reels[0] == reels[1] == reels[2]:
+        return bet_amount * SLOT_TRIPLE_MULTIPLIERS.get(reels[0], 1)
+    if reels[0] == reels[1] or reels[1] == reels[2]:
+        return int(bet_amount * SLOT_PAIR_MULTIPLIER)
+    return 0
+
+
+def slot_streak_bonus(streak_count: int) -> float:
+    """연속 시도 스트릭 기반 승리 보너스 배수 (1.0 ~ 1.2)."""
+    return 1.0 + min(max(streak_count, 0) * SLOT_STREAK_BONUS_STEP, SLOT_STREAK_BONUS_CAP)
+
+
+def slot_final_win(base_win: int, streak_count: int, variation: float) -> int:
+    """승리 시에만 스트릭 보너스 × 변동(variation ∈ SLOT_VARIATION_RANGE) 적용."""
+    if base_win <= 0:
+        return 0
+    return int(base_win * slot_streak_bonus(streak_count) * variation)
+
+
+def slot_is_jackpot(reels: Sequence[str]) -> bool:
+    return reels[0] == SLOT_JACKPOT_SYMBOL and reels[0] == reels[1] == reels[2]
+
+
+# ---------------------------------------------------------------------------
+# Crash (POST /api/games/crash/bet, shared-round engine)
+# ---------------------------------------------------------------------------
+CRASH_UNIFORM_GRID = 10000  # 단일 요청 모드는 md5 해시 % 10000 격자 균등값 사용
+CRASH_HOUSE_FACTOR = 0.95
+
+
+def crash_point_from_uniform(random_val: float) -> float:
+    """[0,1) 균등값 → 크래시 배수 (5단계 분포 + 하우스 엣지 5%, 단일 요청 모드와 공유)."""
+    if random_val < 0.35:    # 35% - 1.0x ~ 1.5x (낮은 배수, 높은 확률)
+        multiplier = 1.0 + (random_val / 0.35) * 0.5
+    elif random_val < 0.60:  # 25% - 1.5x ~ 2.5x (중간 배수)
+        multiplier = 1.5 + ((random_val - 0.35) / 0.25) * 1.0
+    elif random_val < 0.80:  # 20% - 2.5x ~ 5.0x (높은 배수)
+        multiplier = 2.5 + ((random_val - 0.60) / 0.20) * 2.5
+    elif random_val < 0.95:  # 15% - 5.0x ~ 10.0x (매우 높은 배수)
+        multiplier = 5.0 + ((random_val - 0.80) / 0.15) * 5.0
+    else:                    # 5% - 10.0x ~ 50.0x (잭팟 배수)
+        multiplier = 10.0 + ((random_val - 0.95) / 0.05) * 40.0
+    # 하우스 엣지 적용 (약 5% 하우스 수수료) + 소수점 둘째 자리
+    return round(max(1.01, multiplier * CRASH_HOUSE_FACTOR), 2)
+
+
+def crash_uniform_from_seed(seed: str) -> float:
+    """시드 문자열 → 격자 균등값 (md5 상위 32bit % 10000 / 10000)."""
+    hash_val = int(hashlib.md5(seed.encode()).hexdigest()[:8], 16)
+    return (hash_val % CRASH_UNIFORM_GRID) / float(CRASH_UNIFORM_GRID)
+
+
+def crash_auto_cashout_win(bet_amount: int, auto_cashout: Optional[float], crash_point: float) -> Tuple[int, str]:
+    """단일 요청 모드 정산: (잔액 가산액, status).
+
+    베팅액은 선차감되고, 자동 캐시아웃 성공 시 순이익 int(bet × (auto - 1)) 만 가산한다.
+    """
+    if auto_cashout and crash_point >= auto_cashout:
+        return int(bet_amount * (auto_cashout - 1.0)), "auto_cashed"
+    return 0, "crashed"
+
+
+# ---------------------------------------------------------------------------
+# Gacha (GachaService._resolve_draws)
+# ---------------------------------------------------------------------------
+GACHA_PITY_THRESHOLD = 90
+GACHA_HISTORY_SIZE = 10
+GACHA_HISTORY_DECAY = 0.8  # 최근 히스토리에 있는 등급 확률 감쇠
+GACHA_PITY_RARITY = "Epic"
+# 수익성 개선을 위한 하우스 엣지가 적용된 확률 테이블 (심리적 효과 강화, GACHA_RARITY_TABLE 로 재정의)
+GACHA_DEFAULT_RARITY_TABLE: Tuple[Tuple[str, float], ...] = (
+    ("Legendary", 0.002),   # 0.2% (극도로 희귀 - 심리적 갈망 증폭)
+    ("Epic", 0.025),        # 2.5% (감소하여 희소성 강화)
+    ("Rare", 0.15),         # 15% (감소)
+    ("Common", 0.65),       # 65% (감소)
+    ("Near_Miss_Epic", 0.08),    # 8% (Epic 근접 실패)
+    ("Near_Miss_Legendary", 0.093), # 9.3% (Legendary 근접 실패)
+)
+# 근접 실패 항목 → (표시 결과, 실제 획득 등급)
+GACHA_NEAR_MISS_OUTCOMES: Dict[str, Tuple[str, str]] = {
+    "Near_Miss_Epic": ("Rare_near_miss_epic", "Rare"),
+    "Near_Miss_Legendary": ("Epic_near_miss_legendary", "Epic"),
+}
+
+
+def gacha_near_miss_probability(current_count: int) -> float:
+    """근접 실패 확률 (연속 실패 횟수가 많을수록 증가, 최대 30%)."""
+    base_near_miss_rate = 0.173  # 기본 17.3% (Epic + Legendary 근접 실패)
+    if current_count > 50:
+        base_near_miss_rate += 0.1  # +10%
+    elif current_count > 30:
+        base_near_miss_rate += 0.05  # +5%
+    return min(base_near_miss_rate, 0.3)
+
+
+def gacha_rarity_cdf(rarity_table: Sequence[Tuple[str, float]], present: FrozenSet[str], boost: float) -> Tuple[List[float], List[str]]:
+    """(히스토리 보유 등급, 근접 실패 부스트) 상태의 누적분포.
+
+    히스토리에 있는 등급 ×0.8, Near_Miss 항목은 boost/2 로 대체. 합이 1 미만이면
+    초과 구간은 호출 측에서 "Common" 으로 처리한다.
+    """
+    cumulative = 0.0
+    cum: List[float] = []
+    names: List[str] = []
+    for name, prob in rarity_table:
+        adj_prob = prob
+        if name in present:
+            adj_prob *= GACHA_HISTORY_DECAY
+        if "Near_Miss" in name:
+            adj_prob = boost / 2
+        cumulative += adj_prob
+        cum.append(cumulative)
+        names.append(name)
+    return cum, names
+
+
+def gacha_rarity_masses(rarity_table: Sequence[Tuple[str, float]], present: FrozenSet[str], boost: float) -> List[Tuple[str, float]]:
+    """``gacha_rarity_cdf`` 역CDF 추첨과 동일한 분포의 (등급, 확률) 목록 (alias sampler 입력).
+
+    누적값 1 초과 구간은 잘리고, 1 미만 잔여 구간은 "Common" 으로 귀속된다.
+    """
+    cum, names = gacha_rarity_cdf(rarity_table, present, boost)
+    masses: List[Tuple[str, float]] = []
+    prev = 0.0
+    for name, c in zip(names, cum):
+        upper = min(c, 1.0)
+        masses.append((name, max(0.0, upper - prev)))
+        prev = max(prev, upper)
+    if prev < 1.0:
+        masses.append(("Common", 1.0 - prev))
+    return masses
+
+
+def gacha_resolve_rarity(rarity: str, pity: bool) -> Tuple[str, str, bool, bool]:
+    """추첨 등급 → (표시 결과, 실제 등급, 근접 실패 여부, 피티 발동 여부). 보상 풀 재고는 호출 측 처리."""
+    if pity and rarity not in {"Epic", "Legendary"}:
+        return GACHA_PITY_RARITY, GACHA_PITY_RARITY, False, True
+    if "Near_Miss" in rarity:
+        shown, actual = GACHA_NEAR_MISS_OUTCOMES.get(rarity, ("Common_near_miss", "Common"))
+        return shown, actual, True, False
+    return rarity, rarity, False, False
+
+
+__all__ = [
+    "SLOT_SYMBOLS", "SLOT_DEFAULT_WEIGHTS", "SLOT_TRIPLE_MULTIPLIERS", "SLOT_VARIATION_RANGE",
+    "slot_symbol_weights", "slot_base_win", "slot_streak_bonus", "slot_final_win", "slot_is_jackpot",
+    "CRASH_UNIFORM_GRID", "crash_point_from_uniform", "crash_uniform_from_seed", "crash_auto_cashout_win",
+    "GACHA_PITY_THRESHOLD", "GACHA_HISTORY_SIZE", "GACHA_DEFAULT_RARITY_TABLE", "gacha_near_miss_probability", "gacha_rarity_cdf",
+    "gacha_rarity_masses", "gacha_resolve_rarity",
+]
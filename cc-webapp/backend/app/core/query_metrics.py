@@ -0,0 +1,184 @@
+"""Per-request SQL query instrumentation.
+
+SQLAlchemy ``before/after_cursor_execute`` 이벤트로 쿼리 수 / DB 시간 / 정규화된 문장 지문을
+현재 요청(``request_id_ctx``)에 귀속시킨다.
+
+- 요청 범위: ``QueryMetricsMiddleware`` 가 ``begin_request`` / ``end_request`` 호출
+  (sync 엔드포인트는 threadpool 로 contextvars 가 복사되므로 동일 request_id 로 집계)
+- 요청 종료 시 route 템플릿 라벨로 Prometheus 히스토그램 기록 (prometheus_client 미설치 시 생략)
+- 동일 지문이 ``QUERY_N_PLUS_ONE_THRESHOLD`` 회 이상 반복되면 N+1 의심 경고 로그 + 카운터
+- 테스트 헬퍼: ``with assert_max_queries(5): client.get(...)`` — TestClient 포털 스레드의
+  쿼리까지 포함해 집계 (캡처는 스레드 무관 전역 목록)
+"""
+from __future__ import annotations
+
+import logging
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from .logging import request_id_ctx
+
+logger = logging.getLogger(__name__)
+
+try:  # optional prometheus metrics
+    from prometheus_client import Counter as _PromCounter, Histogram  # type: ignore
+    _DB_QUERIES = Histogram(
+        "http_request_db_queries", "SQL statements issued per HTTP request", ["method", "route"],
+        buckets=(1, 2, 3, 5, 10, 20, 50, 100, 200),
+    )
+    _DB_SECONDS = Histogram(
+        "http_request_db_seconds", "Total SQL execution time per HTTP request", ["method", "route"],
+        buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+    )
+    _DB_N_PLUS_ONE = _PromCounter(
+        "http_request_db_n_plus_one_total", "Requests with a repeated SQL fingerprint above threshold", ["method", "route"],
+    )
+except Exception:  # pragma: no cover
+    _DB_QUERIES = None
+    _DB_SECONDS = None
+    _DB_N_PLUS_ONE = None
+
+_START_KEY = "query_metrics_started_at"
+
+_WS_RE = re.compile(r"\s+")
+_STR_RE = re.compile(r"'(?:[^']|'')*'")
+_NUM_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PARAM_RE = re.compile(r"%\([^)]+\)s|%s|:\w+|\$\d+")
+_LIST_RE = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+
+
+@lru_cache(maxsize=4096)
+def fingerprint(statement: str) -> str:
+    """리터럴/바인드 파라미터/IN 목록 길이를 지운 문장 지문."""
+    s = _WS_RE.sub(" ", statement).strip()
+    s = _STR_RE.sub("?", s)
+    s = _PARAM_RE.sub("?", s)
+    s = _NUM_RE.sub("?", s)
+    return _LIST_RE.sub("(?+)", s)
+
+
+@dataclass
+class QueryStats:
+    """요청/캡처 단위 집계."""
+    count: int = 0
+    seconds: float = 0.0
+    fingerprints: Counter = field(default_factory=Counter)
+    statements: List[str] = field(default_factory=list)
+    keep_statements: bool = False
+
+    def record(self, statement: str, elapsed: float) -> None:
+        self.count += 1
+        self.seconds += elapsed
+        self.fingerprints[fingerprint(statement)] += 1
+        if self.keep_statements:
+            self.statements.append(statement)
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """threshold 회 이상 반복된 지문 (많은 순)."""
+        return [(fp, n) for fp, n in self.fingerprints.most_common() if n >= threshold]
+
+
+_lock = threading.Lock()
+_requests: Dict[str, QueryStats] = {}
+_captures: Tuple[QueryStats, ...] = ()  # copy-on-write (리스너는 락 없이 순회)
+_installed = False
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):  # noqa: ANN001
+    conn.info[_START_KEY] = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):  # noqa: ANN001
+    started = conn.info.pop(_START_KEY, None)
+    elapsed = time.perf_counter() - started if started is not None else 0.0
+    stats = _requests.get(request_id_ctx.get())
+    if stats is not None:
+        stats.record(statement, elapsed)
+    for capture in _captures:
+        capture.record(statement, elapsed)
+
+
+def install_query_metrics_listeners() -> None:
+    """모든 Engine 에 커서 실행 리스너 등록 (멱등)."""
+    global _installed
+    if _installed:
+        return
+    event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+    _installed = True
+
+
+def begin_request(request_id: str) -> QueryStats:
+    stats = QueryStats()
+    if request_id and request_id != "-":
+        _requests[request_id] = stats
+    return stats
+
+
+def end_request(request_id: str, method: str, route: str, n_plus_one_threshold: int = 0) -> Optional[QueryStats]:
+    """요청 집계 종료 → 메트릭 기록 + N+1 의심 경고. 반환값은 헤더 작성용."""
+    stats = _requests.pop(request_id, None)
+    if stats is None:
+        return None
+    try:
+        if _DB_QUERIES is not None:
+            _DB_QUERIES.labels(method, route).observe(stats.count)
+            _DB_SECONDS.labels(method, route).observe(stats.seconds)
+        if n_plus_one_threshold > 0:
+            repeated = stats.repeated(n_plus_one_threshold)
+            if repeated:
+                fp, n = repeated[0]
+                if _DB_N_PLUS_ONE is not None:
+                    _DB_N_PLUS_ONE.labels(method, route).inc()
+                logger.warning(
+                    "possible N+1: %s %s repeated %d× (%d queries total): %s",
+                    method, route, n, stats.count, fp[:200],
+                    extra={"event": "db_n_plus_one", "route": route, "repeat": n, "queries": stats.count},
+                )
+    except Exception as e:  # 계측 실패는 요청 처리에 영향 없음
+        logger.debug("query metrics record failed: %s", e)
+    return stats
+
+
+def server_timing_value(stats: QueryStats) -> str:
+    return f'db;dur={stats.seconds * 1000:.1f};desc="{stats.count} queries"'
+
+
+@contextmanager
+def capture_queries() -> Iterator[QueryStats]:
+    """블록 내 모든 스레드의 SQL 실행 집계 (테스트/벤치 전용)."""
+    install_query_metrics_listeners()
+    stats = QueryStats(keep_statements=True)
+    global _captures
+    with _lock:
+        _captures = _captures + (stats,)
+    try:
+        yield stats
+    finally:
+        with _lock:
+            _captures = tuple(c for c in _captures if c is not stats)
+
+
+@contextmanager
+def assert_max_queries(limit: int) -> Iterator[QueryStats]:
+    """블록 내 쿼리 수가 limit 을 넘으면 AssertionError (실행 문장 목록 포함)."""
+    with capture_queries() as stats:
+        yield stats
+    if stats.count > limit:
+        listing = "\n".join(f"  {i + 1}. {s[:160]}" for i, s in enumerate(stats.statements))
+        raise AssertionError(f"expected at most {limit} queries, got {stats.count}:\n{listing}")
+
+
+__all__ = [
+    "QueryStats", "fingerprint", "install_query_metrics_listeners", "begin_request", "end_request",
+    "server_timing_value", "capture_queries", "assert_max_queries",
+]
@@ -13,18 +13,40 @@
 2) idempotency (reward): idemp:reward:<user_id>:<idem_key>
 3) 한정패키지 재고 홀드: limited:hold:<package_id>:<hold_id>
 4) 한정패키지 재고 카운터: limited:stock:<package_id>
-5) Fraud 속도 (전체 요청 타임스탬프 ZSET): fraud:req:ts:<user_id>
-6) Fraud distinct 카드토큰 SET: fraud:cardtokens:<user_id>
+5) Fraud 속도 (사용자 구매 시도 이벤트 ZSET): fraud:req:ts:<user_id>
+6) Fraud distinct 카드토큰 ZSET(member=토큰, score=최근 사용 ms): fraud:cardtokens:<user_id>
+   그 외 스코프(ip/card/device 등): fraud:ev:<scope>:<id>, fraud:distinct:<scope>:<field>:<id>
 7) Webhook timestamp+nonce 재생 방지: webhook:replay:<ts>:<nonce>
 8) Webhook event idempotency: webhook:event:<event_id>
 9) Pending 결제 폴링 락: purchase:pending:lock:<tx_id>
+10) 라이브 메트릭 분 버킷 카운터: metrics:live:cnt:<name>:<minute_epoch>
+11) 라이브 온라인 사용자 HLL(분 버킷): metrics:live:online:<minute_epoch>
+12) 라이브 메트릭 게이지: metrics:live:gauge:<name>
+13) 라이브 메트릭 DB 동기화 마커: metrics:live:synced
+14) 일일 게임 쿼터 카운터: quota:daily:<game>:<yyyymmdd>:<user_id>
+15) 채팅방 참가자 SET 캐시: chat:room:<room_id>:members
+16) 채팅방 Pub/Sub 채널: chat:room:<room_id> (워커별 패턴 구독 chat:room:* → 로컬 허브 릴레이)
+17) 알림 카운터 HASH(unread/total): notif:counters:<user_id>
+18) 알림 최신 N건 인박스 캐시: notif:inbox:<user_id>
+19) 게임 리더보드 ZSET(member=user_id, score=점수): lb:<game>:<period>:<bucket>
+20) 리더보드 재구성 완료 마커 / 재구성 락: lb:<game>:<period>:<bucket>:built, lb:<game>:<period>:<bucket>:lock
+21) 출석/활동 비트맵(1일=1비트, offset=2020-01-01 이후 일수): attendance:<action>:<user_id>
+22) 실시간 동기화 스냅샷 HASH(_v/_base/f:*/v:*/a:*): rt:snap:<user_id>
 
 TTL 권장값 요약:
 - 멱등키(idemp:*) : settings.IDEMPOTENCY_TTL_SECONDS (기본 600s)
 - 한정패키지 hold: settings.LIMITED_HOLD_TTL_SECONDS (만료 시 재고 반환)
 - webhook:replay/* : 5분 (요청 skew 범위) → 300s
 - webhook:event:* : 24h (이벤트 중복 방어 충분 기간)
-- fraud:* : 5분 롤링 윈도우 (동일 300s)
+- fraud:* : 룰셋 최대 윈도우 (FRAUD_VELOCITY_RULES, 매 기록 시 PEXPIRE 갱신)
+- metrics:live:cnt:* : 2h (최대 조회 윈도우 60분 + 여유), metrics:live:online:* : 15분
+- quota:daily:* : 다음 UTC 자정 EXPIREAT
+- chat:room:*:members : 1h (참가/퇴장 시 즉시 삭제로 무효화)
+- notif:counters:* : 7d (변경 시 HINCRBY, 실패 시 삭제 → DB 카운터에서 재적재)
+- notif:inbox:* : 5분 (알림 변경 시 삭제)
+- lb:*:daily:* : 3d, lb:*:weekly:* : 15d (기간 종료 후 스냅샷 여유), lb:*:alltime:* : 만료 없음
+- attendance:* : 만료 없음 (사용자×액션 1년 ≈ 46B, 스트릭/리텐션 조회가 전체 이력을 사용)
+- rt:snap:* : settings.REALTIME_SNAPSHOT_TTL_SECONDS (기본 600s, 패치 시 미갱신 → 주기적 DB 재생성)
 
 함수는 호출부에서 문자열 포맷 실수를 줄이고, IDE 검색/리팩토링 용이성을 높인다.
 """
@@ -48,6 +70,16 @@ def fraud_req_ts(user_id: int) -> str:
 def fraud_cardtokens(user_id: int) -> str:
     return f"fraud:cardtokens:{user_id}".lower()
 
+def fraud_events(scope: str, ident: str) -> str:
+    if scope == "user":
+        return fraud_req_ts(ident)  # type: ignore[arg-type]
+    return f"fraud:ev:{scope}:{ident}".lower()
+
+def fraud_distinct(scope: str, field: str, ident: str) -> str:
+    if scope == "user" and field == "card":
+        return fraud_cardtokens(ident)  # type: ignore[arg-type]
+    return f"fraud:distinct:{scope}:{field}:{ident}".lower()
+
 def webhook_replay(ts: int, nonce: str) -> str:
     return f"webhook:replay:{ts}:{nonce}".lower()
 
@@ -57,7 +89,74 @@ def webhook_event(event_id: str) -> str:
 def purchase_pending_lock(tx_id: str) -> str:
     return f"purchase:pending:lock:{tx_id}".lower()
 
+def live_bucket(name: str, minute: int) -> str:
+    return f"metrics:live:cnt:{name}:{minute}".lower()
+
+def live_online(minute: int) -> str:
+    return f"metrics:live:online:{minute}"
+
+def live_gauge(name: str) -> str:
+    return f"metrics:live:gauge:{name}".lower()
+
+def live_sync_marker() -> str:
+    return "metrics:live:synced"
+
+def daily_quota(game: str, day: str, user_id: int) -> str:
+    return f"quota:daily:{game}:{day}:{user_id}".lower()
+
 __all__ = [
     "idemp_purchase","idemp_reward","limited_hold","limited_stock","fraud_req_ts",
-    "fraud_cardtokens","webhook_replay","webhook_event","purchase_pending_lock"
+    "fraud_cardtokens","fraud_events","fraud_distinct","webhook_replay","webhook_event","purchase_pending_lock",
+    "live_bucket","live_online","live_gauge","live_sync_marker","daily_quota"
 ]
+
+def chat_room_members(room_id: int) -> str:
+    return f"chat:room:{room_id}:members"
+
+def chat_room_members_epoch(room_id: int) -> str:
+    return f"chat:room:{room_id}:members:epoch"
+
+def chat_room_channel(room_id: int) -> str:
+    return f"chat:room:{room_id}"
+
+def chat_room_channel_pattern() -> str:
+    return "chat:room:*"
+
+def notif_counters(user_id: int) -> str:
+    return f"notif:counters:{user_id}"
+
+def notif_inbox(user_id: int) -> str:
+    return f"notif:inbox:{user_id}"
+
+def notif_seq(user_id: int) -> str:
+    return f"notif:seq:{user_id}"
+
+def notif_stream(user_id: int) -> str:
+    return f"notif:stream:{user_id}"
+
+def leaderboard(game: str, period: str, bucket: str) -> str:
+    return f"lb:{game}:{period}:{bucket}"
+
+def leaderboard_built(game: str, period: str, bucket: str) -> str:
+    return f"lb:{game}:{period}:{bucket}:built"
+
+def leaderboard_lock(game: str, period: str, bucket: str) -> str:
+    return f"lb:{game}:{period}:{bucket}:lock"
+
+def leaderboard_staging(game: str, period: str, bucket: str) -> str:
+    return f"lb:{game}:{period}:{bucket}:staging"
+
+def leaderboard_base(game: str, period: str, bucket: str) -> str:
+    return f"lb:{game}:{period}:{bucket}:base"
+
+def attendance(action: str, user_id: int) -> str:
+    return f"attendance:{action}:{user_id}".lower()
+
+def realtime_snapshot(user_id: int) -> str:
+    return f"rt:snap:{user_id}"
+
+def segment_labels() -> str:
+    return "segments:labels"
+
+def action_attr_backfill_hwm() -> str:
+    return "actions:attr_backfill:hwm"
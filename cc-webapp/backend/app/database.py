@@ -1,8 +1,9 @@
 "SQLAlchemy engine and session configuration."
-from sqlalchemy import create_engine, event
+from sqlalchemy import event
 from sqlalchemy.orm import declarative_base, sessionmaker
 import os
-import time
+
+from app.core.db_engine import connect_with_retry, create_db_engine
 
 # Base class for all models
 Base = declarative_base()
@@ -46,40 +47,32 @@ def _create_engine_with_retry(url: str):
 
     In containerized env (POSTGRES_* set), we should not silently fallback to SQLite.
     Instead, retry until Postgres is ready, then raise to let the container restart if still failing.
+    풀 크기/PgBouncer 모드/계측은 app/core/db_engine.create_db_engine (DB_POOL_* 환경 변수).
     """
     is_postgres = url.startswith("postgresql")
     has_postgres_env = all(
         os.getenv(k) for k in ("POSTGRES_SERVER", "POSTGRES_USER", "POSTGRES_PASSWORD", "POSTGRES_DB")
     )
 
+    eng = create_db_engine(url, connect_args=connect_args, echo=echo)
     if is_postgres:
-        attempts = int(os.getenv("DB_CONNECT_RETRIES", "30"))
-        delay = float(os.getenv("DB_CONNECT_RETRY_DELAY", "1.0"))
-        last_err: Exception | None = None
-        for i in range(1, attempts + 1):
-            try:
-                eng = create_engine(url, connect_args=connect_args, echo=echo)
-                with eng.connect():
-                    pass
-                print(f"✅ 데이터베이스 연결 성공: {url.split('@')[-1] if '@' in url else url}")
-                return eng
-            except Exception as e:
-                last_err = e
-                print(f"⏳ 데이터베이스 연결 재시도 {i}/{attempts}: {e}")
-                time.sleep(delay)
-        # If we reach here, all retries failed.
-        # If Postgres env is present, do NOT fallback to SQLite (to avoid split-brain between DBs).
-        if has_postgres_env:
-            raise RuntimeError(f"Postgres 연결 실패 (재시도 {attempts}회): {last_err}")
+        try:
+            connect_with_retry(eng)
+            print(f"✅ 데이터베이스 연결 성공: {url.split('@')[-1] if '@' in url else url}")
+            return eng
+        except Exception as last_err:
+            eng.dispose()
+            # If Postgres env is present, do NOT fallback to SQLite (to avoid split-brain between DBs).
+            if has_postgres_env:
+                raise RuntimeError(f"Postgres 연결 실패: {last_err}")
         # Otherwise, allow fallback for local dev (rare path when url constructed as postgres but no envs)
         print("⚠️ Postgres 연결 실패, 개발 모드로 SQLite로 폴백합니다.")
         fb_url = "sqlite:///./fallback.db"
-        eng = create_engine(fb_url, connect_args={"check_same_thread": False})
+        eng = create_db_engine(fb_url)
         print(f"🔄 Fallback 데이터베이스 사용: {fb_url}")
         return eng
     else:
         # SQLite or other DBs: create directly
-        eng = create_engine(url, connect_args=connect_args, echo=echo)
         try:
             with eng.connect():
                 pass
@@ -87,7 +80,7 @@ def _create_engine_with_retry(url: str):
             # As a last resort for dev, use fallback SQLite
             print(f"⚠️ 주 데이터베이스 연결 실패: {e}")
             fb_url = "sqlite:///./fallback.db"
-            eng = create_engine(fb_url, connect_args={"check_same_thread": False})
+            eng = create_db_engine(fb_url)
             print(f"🔄 Fallback 데이터베이스 사용: {fb_url}")
         else:
             print(f"✅ 데이터베이스 연결 성공: {url}")
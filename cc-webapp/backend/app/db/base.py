@@ -1,18 +1,7 @@
-from sqlalchemy import create_engine
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+"""Legacy import path — 엔진/세션/Base 는 app.database 의 단일 인스턴스를 재노출한다.
 
-from app.core.config import settings
-
-# SQLAlchemy 엔진 생성
-engine = create_engine(
-    settings.SQLALCHEMY_DATABASE_URI, 
-    pool_pre_ping=True
-)
-
-# 세션 팩토리 생성
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-
-# 모든 모델의 기본 클래스가 될 Base 클래스
-Base = declarative_base()
+(이전에는 여기서 두 번째 독립 엔진과 별도 declarative Base 를 만들어 풀이 이중으로 열렸다.)
+"""
+from app.database import Base, SessionLocal, engine
 
+__all__ = ["Base", "SessionLocal", "engine"]
@@ -29,6 +29,7 @@ from app.core.logging import setup_logging, LoggingContextMiddleware
 from app.core.config import settings
 from app.core.error_handlers import add_exception_handlers
 from app.middleware.simple_logging import SimpleLoggingMiddleware
+from app.middleware.query_metrics import QueryMetricsMiddleware
 # from app.core.exceptions import add_exception_handlers  # Disabled - empty file
 # from app.middleware.error_handling import error_handling_middleware  # Disabled
 # from app.middleware.logging import LoggingContextMiddleware  # Disabled
@@ -192,6 +193,17 @@ async def lifespan(app: FastAPI):
         print(f"⚠️ AUTO_SEED_BASIC 래퍼 오류: {e}")
 
     start_scheduler()
+    # A/B 실험 레지스트리 초기 적재 (ab_test_participants 기준, 이후 스케줄러가 주기 재적재)
+    try:
+        from app.database import SessionLocal as _AbSession
+        from app.services.abtest_service import load_experiments
+        _ab_db = _AbSession()
+        try:
+            print(f"🧪 A/B experiments loaded: {load_experiments(_ab_db)}")
+        finally:
+            _ab_db.close()
+    except Exception as e:
+        print(f"⚠️ A/B experiment registry load failed: {e}")
     # Redis 초기화 (실패 허용)
     try:
         if not getattr(app.state, "redis_initialized", False):
@@ -211,6 +223,13 @@ async def lifespan(app: FastAPI):
                 print(f"⚠️ Redis connection failed, using in-memory fallback: {re}")
     except Exception as e:
         print(f"⚠️ Redis init wrapper error: {e}")
+    # 채팅방 채널 릴레이: 다른 워커가 publish 한 방 메시지를 이 워커의 허브 구독자에게 전달
+    try:
+        from app.realtime.relay import chat_room_relay
+        if chat_room_relay.start(get_redis_manager().redis_client):
+            print("📨 Chat room relay subscribed")
+    except Exception as e:
+        print(f"⚠️ Chat room relay start failed: {e}")
     # Start Kafka consumer (optional)
     try:
         await start_consumer()
@@ -218,6 +237,14 @@ async def lifespan(app: FastAPI):
             print("📡 Kafka consumer started")
     except Exception as e:
         print(f"⚠️ Kafka consumer start failed: {e}")
+    # 공유 라운드 크래시 엔진 (옵션): 샤드별 라운드 루프 시작
+    if os.getenv("CRASH_ROUNDS_ENABLED", "0") == "1":
+        try:
+            from app.services.crash_round_engine import get_crash_engines
+            get_crash_engines().start()
+            print("💥 Crash round engine started")
+        except Exception as e:
+            print(f"⚠️ Crash round engine start failed: {e}")
     print("✅ Backend startup complete")
     try:
         yield
@@ -231,6 +258,17 @@ async def lifespan(app: FastAPI):
                 print("📡 Kafka consumer stopped")
         except Exception as e:
             print(f"⚠️ Kafka consumer stop failed: {e}")
+        try:
+            from app.realtime.relay import chat_room_relay
+            chat_room_relay.stop()
+        except Exception as e:
+            print(f"⚠️ Chat room relay stop failed: {e}")
+        if os.getenv("CRASH_ROUNDS_ENABLED", "0") == "1":
+            try:
+                from app.services.crash_round_engine import get_crash_engines
+                await get_crash_engines().stop()
+            except Exception as e:
+                print(f"⚠️ Crash round engine stop failed: {e}")
         if scheduler and getattr(scheduler, "running", False):
             try:
                 # shutdown may raise RuntimeError if event loop is closed (test lifecycle)
@@ -294,9 +332,43 @@ origins = (
 
 add_exception_handlers(app)
 
+# 라이브 메트릭 공급기 (Session commit 이벤트 → 슬라이딩 윈도우 카운터)
+from app.services.live_metrics_service import install_live_metrics_listeners
+install_live_metrics_listeners()
+
+# 퀴즈 정의 캐시 무효화 (Quiz/QuizQuestion/QuizAnswer commit 이벤트)
+from app.services.quiz_service import install_quiz_cache_listeners
+install_quiz_cache_listeners()
+
+# 활동 비트맵 (UserAction commit 이벤트 → attendance:ACTIVE SETBIT)
+from app.services.attendance_service import install_attendance_listeners
+install_attendance_listeners()
+
+# user_actions 타입 속성 (UserAction INSERT 직전 action_data → game_type/bet/win/result/is_jackpot)
+from app.services.action_attributes import install_action_attribute_listeners
+install_action_attribute_listeners()
+
+# 세그먼트 라벨 캐시 (UserSegment commit 이벤트 → segments:labels HASH + 로컬 LRU)
+from app.services.segment_resolver import install_segment_listeners
+install_segment_listeners()
+
+# 채팅방 참가자 SET 캐시 무효화 (ChatParticipant commit 이벤트 → chat:room:<id>:members 삭제)
+from app.services.chat_service import install_chat_member_listeners
+install_chat_member_listeners()
+
+# 실시간 동기화 스냅샷 (User 잔액/VIP commit 이벤트 → rt:snap 패치)
+from app.realtime.snapshot import install_snapshot_listeners
+install_snapshot_listeners()
+
+# 요청별 SQL 쿼리 수/DB 시간 계측 (Engine 커서 이벤트 → request_id_ctx 귀속)
+from app.core.query_metrics import install_query_metrics_listeners
+install_query_metrics_listeners()
+
 # 간단한 API 로깅 미들웨어 추가
 app.add_middleware(SimpleLoggingMiddleware)
 
+# 쿼리 계측은 LoggingContextMiddleware 안쪽 (request_id 설정 이후)
+app.add_middleware(QueryMetricsMiddleware)
 app.add_middleware(LoggingContextMiddleware)
 app.add_middleware(
     CORSMiddleware,
@@ -0,0 +1,44 @@
+"""ASGI middleware attributing SQL query counts / DB time to each HTTP request.
+
+``LoggingContextMiddleware`` 안쪽에 등록해야 request_id_ctx 가 설정된 상태로 시작한다.
+route 라벨은 FastAPI 가 scope 에 기록한 APIRoute 의 경로 템플릿 (/api/users/{user_id}) 을
+사용하고, 매칭 실패(404 등)는 "unmatched" 로 묶어 라벨 카디널리티를 제한한다.
+"""
+from __future__ import annotations
+
+from app.core.config import settings
+from app.core.logging import request_id_ctx
+from app.core import query_metrics
+
+
+def _route_label(scope) -> str:  # noqa: ANN001
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+class QueryMetricsMiddleware:
+    def __init__(self, app):  # noqa: ANN001
+        self.app = app
+
+    async def __call__(self, scope, receive, send):  # noqa: ANN001
+        if scope.get("type") != "http" or not settings.QUERY_METRICS_ENABLED:
+            return await self.app(scope, receive, send)
+        request_id = request_id_ctx.get()
+        stats = query_metrics.begin_request(request_id)
+        add_headers = settings.QUERY_METRICS_SERVER_TIMING
+
+        async def send_wrapper(message):
+            # 응답 시작 시점까지의 쿼리만 헤더에 반영 (스트리밍 본문 중 쿼리는 메트릭에만 집계)
+            if add_headers and message.get("type") == "http.response.start":
+                headers = list(message.get("headers") or [])
+                headers.append((b"server-timing", query_metrics.server_timing_value(stats).encode("latin-1")))
+                headers.append((b"x-db-query-count", str(stats.count).encode("latin-1")))
+                message["headers"] = headers
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            query_metrics.end_request(
+                request_id, scope.get("method") or "-", _route_label(scope), settings.QUERY_N_PLUS_ONE_THRESHOLD,
+            )
@@ -42,7 +42,7 @@ from .game_models import (
 from .user_models import UserSegment, VIPAccessLog
 
 # 알림 모델 추가
-from .notification_models import Notification, NotificationCampaign
+from .notification_models import Notification, NotificationCampaign, NotificationCounter
 
 # Quiz 모델들 추가
 from .quiz_models import (
@@ -93,7 +93,7 @@ from .event_models import (
 from .admin_content_models import *  # noqa: F401,F403
 
 # History / Social 모델 추가
-from .history_models import GameHistory
+from .history_models import GameHistory, LeaderboardSnapshot
 from .social_models import FollowRelation
 from .achievement_models import Achievement, UserAchievement
 
@@ -130,6 +130,7 @@ __all__ = [
     # Notifications
     "Notification",
     "NotificationCampaign",
+    "NotificationCounter",
     
     # Quiz
     "QuizCategory",
@@ -182,6 +183,7 @@ __all__ = [
     "PageView",
     "ConversionEvent",
     "ABTestParticipant",
+    "ABTestExperiment",
     "CustomEvent",
 
     # Event Models
@@ -191,6 +193,7 @@ __all__ = [
 
     # History
     "GameHistory",
+    "LeaderboardSnapshot",
 
     # Social
     "FollowRelation",
@@ -230,6 +233,7 @@ from .analytics_models import (
     PageView,
     ConversionEvent,
     ABTestParticipant,
+    ABTestExperiment,
     CustomEvent,
 )
 
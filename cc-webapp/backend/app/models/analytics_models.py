@@ -98,6 +98,16 @@ class ABTestParticipant(Base):
     user = relationship("User")
 
 
+class ABTestExperiment(Base):
+    """A/B 테스트 변형 목록 (요청 순서 그대로) — 재시작 후에도 해시 배정 인덱스 유지"""
+    __tablename__ = "ab_test_experiments"
+
+    test_name = Column(String(100), primary_key=True)
+    variants = Column(JSON, nullable=False)  # ["ctl", "t1", ...] 배정 순서
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
 class CustomEvent(Base):
     """커스텀 이벤트 모델"""
     __tablename__ = "custom_events"
@@ -4,7 +4,7 @@
 AI 채팅, 실시간 채팅, 감정 기반 메시징 시스템
 """
 
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, JSON, Text, Float
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, JSON, Text, Float, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from datetime import datetime
@@ -64,6 +64,10 @@ class ChatParticipant(Base):
 class ChatMessage(Base):
     """채팅 메시지"""
     __tablename__ = "chat_messages"
+    __table_args__ = (
+        # 방별 최신순 keyset 페이지네이션 (created_at DESC, id DESC)
+        Index("ix_chat_messages_room_created_id", "room_id", "created_at", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     room_id = Column(Integer, ForeignKey("chat_rooms.id"), nullable=False)
@@ -1,7 +1,7 @@
 """게임 관련 데이터베이스 모델"""
 from datetime import datetime
 from typing import Optional
-from sqlalchemy import Column, Integer, String, DateTime, Float, JSON, ForeignKey, Boolean, Text
+from sqlalchemy import Column, Integer, String, DateTime, Float, JSON, ForeignKey, Boolean, Text, Index, text
 from sqlalchemy.orm import relationship
 
 from ..database import Base
@@ -34,12 +34,29 @@ class Game(Base):
 class UserAction(Base):
     """사용자 액션 모델"""
     __tablename__ = "user_actions"
+    __table_args__ = (
+        # 사용자 × 기간 (최근 활동/스트릭) / 사용자 × 액션 × 기간 (일일 한도, 업적 집계)
+        Index("ix_user_actions_user_created", "user_id", "created_at"),
+        Index("ix_user_actions_user_type_created", "user_id", "action_type", "created_at"),
+        # 게임별 승률/베팅 합계 (PG: bet/win/result INCLUDE → index-only scan)
+        Index("ix_user_actions_user_game_created", "user_id", "game_type", "created_at",
+              postgresql_include=["bet", "win", "result"]),
+        # 잭팟 수: 잭팟 행만 담는 부분 인덱스
+        Index("ix_user_actions_jackpot", "user_id",
+              postgresql_where=text("is_jackpot"), sqlite_where=text("is_jackpot = 1")),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     action_type = Column(String(50), nullable=False)
     action_data = Column(Text)
     created_at = Column(DateTime, default=datetime.utcnow)
+    # action_data 에서 INSERT 시점에 추출되는 타입 속성 (app/services/action_attributes.py)
+    game_type = Column(String(20), nullable=True)
+    bet = Column(Integer, nullable=True)
+    win = Column(Integer, nullable=True)
+    result = Column(String(20), nullable=True)
+    is_jackpot = Column(Boolean, nullable=True)
     
     # 관계
     user = relationship("User", back_populates="actions")
@@ -1,12 +1,18 @@
 from __future__ import annotations
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, JSON
+from sqlalchemy import BigInteger, Column, Integer, String, DateTime, ForeignKey, JSON, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 
 from ..database import Base
 
 class GameHistory(Base):
     __tablename__ = "game_history"
+    __table_args__ = (
+        # 사용자별 최신순 keyset 페이지네이션 (created_at DESC, id DESC)
+        Index("ix_game_history_user_created_id", "user_id", "created_at", "id"),
+        # 사용자 × 게임 × 기간 (게임별 이력/업적 합계/리더보드 재구성)
+        Index("ix_game_history_user_game_created", "user_id", "game_type", "created_at"),
+    )
     id = Column(Integer, primary_key=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     game_type = Column(String(50), nullable=False, index=True)
@@ -19,3 +25,23 @@ class GameHistory(Base):
 
     user = relationship("User", backref="game_history")
     session = relationship("GameSession", backref="actions")
+
+
+class LeaderboardSnapshot(Base):
+    """기간 리더보드 확정 순위 (Redis lb:<game>:<period>:<bucket> ZSET 의 기간 종료 시점 상위 N)
+
+    daily/weekly 기간이 바뀐 뒤 스케줄러가 직전 기간을 1회 기록한다 (버킷당 1회, 재실행 시 생략).
+    """
+    __tablename__ = "leaderboard_snapshots"
+    __table_args__ = (
+        UniqueConstraint("game_type", "period", "bucket", "rank", name="uq_leaderboard_snapshot_rank"),
+        Index("ix_leaderboard_snapshot_user", "user_id", "period"),
+    )
+    id = Column(Integer, primary_key=True)
+    game_type = Column(String(50), nullable=False)
+    period = Column(String(10), nullable=False)  # daily | weekly
+    bucket = Column(String(16), nullable=False)  # 20261019 | 2026-W42
+    rank = Column(Integer, nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    score = Column(BigInteger, nullable=False, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
@@ -4,7 +4,7 @@
 알림 시스템 데이터베이스 모델
 """
 
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, func
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, Index, func
 from sqlalchemy.orm import relationship
 from ..database import Base
 
@@ -12,6 +12,10 @@ from ..database import Base
 class Notification(Base):
     """알림 모델"""
     __tablename__ = "notifications"
+    __table_args__ = (
+        # 사용자별 최신순 keyset 페이지네이션 (created_at DESC, id DESC)
+        Index("ix_notifications_user_created_id", "user_id", "created_at", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -27,6 +31,19 @@ class Notification(Base):
     user = relationship("User", back_populates="notifications")
 
 
+class NotificationCounter(Base):
+    """사용자별 알림 카운터 (Redis 해시 notif:counters:<user_id> 의 DB 원본)
+
+    notifications 변경과 같은 트랜잭션에서 증감되며, 드리프트는 재조정 작업이 보정한다.
+    """
+    __tablename__ = "notification_counters"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    unread_count = Column(Integer, nullable=False, default=0)
+    total_count = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
 class NotificationCampaign(Base):
     """알림/캠페인 스케줄 모델
 
@@ -34,7 +51,9 @@ class NotificationCampaign(Base):
     - target_segment: 세그먼트 라벨 (segment 선택 시)
     - user_ids: 콤마로 구분된 대상 유저 ID 목록 (user_ids 선택 시)
     - scheduled_at: 예약 발송 시간 (UTC)
-    - status: 'scheduled' | 'sent' | 'cancelled'
+    - status: 'scheduled' | 'sending' | 'sent' | 'cancelled'
+    - sent_cursor: 발송 완료된 마지막 대상 user_id (청크 commit 과 함께 기록, 재시도 시 이후부터 재개)
+    - claimed_at: 발송자 점유(리스) 시각 — scheduled → sending 조건부 UPDATE 로 1명만 발송, 청크마다 갱신
     """
     __tablename__ = "notification_campaigns"
 
@@ -48,3 +67,5 @@ class NotificationCampaign(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     sent_at = Column(DateTime(timezone=True))
     status = Column(String(20), nullable=False, default="scheduled")
+    sent_cursor = Column(Integer)
+    claimed_at = Column(DateTime(timezone=True))
@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, JSON, UniqueConstraint
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, JSON, UniqueConstraint, Index
 from sqlalchemy.orm import relationship
 
 from ..database import Base
@@ -40,6 +40,8 @@ class ShopTransaction(Base):
     __table_args__ = (
         # 하나의 사용자-상품-멱등키 조합은 단일 트랜잭션으로 고정
         UniqueConstraint('user_id', 'product_id', 'idempotency_key', name='uq_shop_tx_user_product_idem'),
+        # 사용자별 거래내역 keyset 페이지네이션 (created_at DESC, id DESC)
+        Index('ix_shop_tx_user_created_id', 'user_id', 'created_at', 'id'),
     )
 
     id = Column(Integer, primary_key=True)
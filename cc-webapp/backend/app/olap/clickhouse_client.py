@@ -182,4 +182,16 @@ class ClickHouseClient:
             lines.append("\t".join([user_id, code, quantity, total_price, gems, charge_id]))
         data = "\n".join(lines)
         sql = "INSERT INTO purchases (user_id, code, quantity, total_price_cents, gems_granted, charge_id) FORMAT TSV\n" + data
-        self.execute(sql)
\ No newline at end of file
+        self.execute(sql)
+
+    def insert_ab_flags(self, rows: List[Dict[str, Any]]):
+        if not rows:
+            return
+        # assigned_at/day 는 DEFAULT now()/today() 사용
+        data = "\n".join("\t".join([
+            str(int(r.get("user_id") or 0)),
+            str(r.get("flag_key") or ""),
+            str(r.get("variant") or ""),
+        ]) for r in rows)
+        sql = "INSERT INTO ab_flags (user_id, flag_key, variant) FORMAT TSV\n" + data
+        self.execute(sql)
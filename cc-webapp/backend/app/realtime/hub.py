@@ -24,6 +24,8 @@ class RealtimeHub:
         self._user_channels: Dict[int, Set[Any]] = {}
         # monitor(관리) 채널(전체 세션 관찰)
         self._monitor: Set[Any] = set()
+        # 토픽 구독 (예: crash:<shard> 라운드 틱 스트림) topic -> set(ws)
+        self._topics: Dict[str, Set[Any]] = {}
         self._lock = asyncio.Lock()
         # 최근 이벤트 메모리 (간단 sliding window)
         self._recent_events: list[dict[str, Any]] = []
@@ -36,6 +38,12 @@ class RealtimeHub:
         except ValueError:
             ms = 300.0
         self._min_interval = ms / 1000.0
+        # 토픽 전송 타임아웃 (REALTIME_SEND_TIMEOUT_MS, 기본 500ms) — 느린 소켓 1개가 틱 루프를 막지 않도록
+        try:
+            send_ms = float(os.getenv("REALTIME_SEND_TIMEOUT_MS", "500"))
+        except ValueError:
+            send_ms = 500.0
+        self._send_timeout = send_ms / 1000.0
 
     async def register_user(self, user_id: int, ws: Any) -> None:
         async with self._lock:
@@ -79,6 +87,13 @@ class RealtimeHub:
         event 예시: {"type":"game_event","user_id":123,"game_type":"slot", ...}
         """
         self._remember(event)
+        if isinstance(event.get("user_id"), int):
+            try:
+                # 접속 시 초기 상태로 쓰는 사용자 스냅샷을 같은 이벤트로 패치 (Redis EVALSHA → 워커 스레드)
+                from .snapshot import sync_snapshots
+                await asyncio.to_thread(sync_snapshots.apply_event, event)
+            except Exception:
+                pass
         if _REALTIME_EVENTS_TOTAL is not None:
             try:
                 _REALTIME_EVENTS_TOTAL.inc()
@@ -121,6 +136,52 @@ class RealtimeHub:
         if coros:
             await asyncio.gather(*coros, return_exceptions=True)
 
+    async def subscribe(self, topic: str, ws: Any) -> None:
+        async with self._lock:
+            self._topics.setdefault(topic, set()).add(ws)
+
+    async def unsubscribe(self, topic: str, ws: Any) -> None:
+        async with self._lock:
+            bucket = self._topics.get(topic)
+            if bucket is not None:
+                bucket.discard(ws)
+                if not bucket:
+                    self._topics.pop(topic, None)
+
+    def topic_size(self, topic: str) -> int:
+        return len(self._topics.get(topic, ()))
+
+    async def publish(self, topic: str, event: dict[str, Any], *, remember: bool = False) -> int:
+        """토픽 구독자 전체에 1회 직렬화 후 전송 (사용자별 스로틀 미적용).
+
+        고빈도 스트림(틱)은 remember=False 로 최근 이벤트 버퍼를 오염시키지 않는다.
+        소켓별 전송은 ``_send_timeout`` 으로 제한하고, 시간 초과/실패 소켓은 구독에서 제거한다.
+        반환값: 전송 대상 수
+        """
+        if remember:
+            self._remember(event)
+        try:
+            import json
+            text = json.dumps(event, default=str)
+        except Exception:
+            return 0
+        async with self._lock:
+            targets = list(self._topics.get(topic, ()))
+        if not targets:
+            return 0
+        results = await asyncio.gather(
+            *(asyncio.wait_for(ws.send_text(text), self._send_timeout) for ws in targets),
+            return_exceptions=True,
+        )
+        # 전송 실패(끊긴 소켓) / 시간 초과(느린 소켓) 구독 정리
+        dead = [ws for ws, r in zip(targets, results) if isinstance(r, Exception)]
+        if dead:
+            async with self._lock:
+                bucket = self._topics.get(topic)
+                if bucket is not None:
+                    bucket.difference_update(dead)
+        return len(targets)
+
     async def snapshot_for_monitor(self) -> dict[str, Any]:
         async with self._lock:
             return {
@@ -0,0 +1,90 @@
+"""Redis Pub/Sub → RealtimeHub 토픽 릴레이 (워커 간 팬아웃)
+
+채팅방 메시지는 발신 워커에서 Redis 채널 ``chat:room:<id>`` 에 1회 publish 되고, 같은 워커의
+허브 구독 소켓에는 직접 전달된다. 다른 워커에 붙은 방 소켓은 이 릴레이가 전달한다.
+
+- 워커마다 패턴 구독 1개 (``chat:room:*``, redis-py PubSub 전용 데몬 스레드)
+- 수신 메시지는 워커 이벤트 루프에서 ``hub.publish(channel, event)`` (로컬 구독자가 있을 때만)
+- 발신 워커 식별자 ``origin`` 이 ``INSTANCE_ID`` 와 같으면 건너뜀 → 로컬 중복 전달 없음
+- Redis 미연결 시 기동하지 않음 (단일 워커 동작은 기존과 동일)
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import uuid
+from typing import Any, Optional
+
+from ..core import redis_keys
+
+logger = logging.getLogger(__name__)
+
+# 이 프로세스(워커) 식별자 — Redis 로 내보내는 이벤트의 ``origin`` 필드
+INSTANCE_ID = uuid.uuid4().hex
+ORIGIN_FIELD = "origin"
+
+
+def _text(v: Any) -> str:
+    return v.decode() if isinstance(v, (bytes, bytearray)) else str(v)
+
+
+class TopicRelay:
+    def __init__(self, pattern: str, hub: Any = None) -> None:
+        self.pattern = pattern
+        self._hub = hub
+        self._pubsub: Any = None
+        self._thread: Any = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def start(self, redis_client: Any, loop: Optional[asyncio.AbstractEventLoop] = None) -> bool:
+        """패턴 구독 시작 (멱등). 반환: 이번 호출로 기동했는지."""
+        if self._thread is not None or redis_client is None:
+            return False
+        self._loop = loop or asyncio.get_running_loop()
+        pubsub = redis_client.pubsub(ignore_subscribe_messages=True)
+        pubsub.psubscribe(**{self.pattern: self._on_message})
+        self._pubsub = pubsub
+        self._thread = pubsub.run_in_thread(sleep_time=1.0, daemon=True)
+        return True
+
+    def stop(self) -> None:
+        thread, pubsub = self._thread, self._pubsub
+        self._thread = self._pubsub = None
+        try:
+            if thread is not None:
+                thread.stop()
+            if pubsub is not None:
+                pubsub.close()
+        except Exception:
+            logger.warning("topic relay stop failed pattern=%s", self.pattern, exc_info=True)
+
+    def _on_message(self, message: dict) -> None:
+        self.dispatch(_text(message.get("channel")), message.get("data"))
+
+    def dispatch(self, channel: str, raw: Any) -> bool:
+        """Redis 메시지 1건을 로컬 허브 토픽으로 전달 (PubSub 스레드에서 호출). 반환: 전달 예약 여부."""
+        try:
+            event = json.loads(_text(raw))
+        except (TypeError, ValueError):
+            return False
+        if not isinstance(event, dict) or event.pop(ORIGIN_FIELD, None) == INSTANCE_ID:
+            return False
+        if self._hub is None:
+            from . import hub as _hub
+            self._hub = _hub
+        loop = self._loop
+        if loop is None or loop.is_closed() or not self._hub.topic_size(channel):
+            return False
+        asyncio.run_coroutine_threadsafe(self._hub.publish(channel, event), loop)
+        return True
+
+
+chat_room_relay = TopicRelay(redis_keys.chat_room_channel_pattern())
+
+
+__all__ = ["INSTANCE_ID", "ORIGIN_FIELD", "TopicRelay", "chat_room_relay"]
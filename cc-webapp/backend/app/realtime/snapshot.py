@@ -0,0 +1,360 @@
+"""Per-user realtime sync snapshot (versioned, patched in place).
+
+``/api/realtime/sync`` 접속마다 User 조회 + Redis 스트릭 GET + ``AchievementService.user_progress``
+전체 계산을 수행하던 초기 상태 수집을 대체한다. 배포 직후 재접속 폭주 시에도 접속당 Redis HGETALL 1회.
+
+- 키: ``rt:snap:<user_id>`` HASH (TTL ``REALTIME_SNAPSHOT_TTL_SECONDS``)
+    ``_v`` 현재 버전, ``_base`` 스냅샷 생성 버전(ms epoch → 재생성 시에도 단조 증가)
+    ``f:<section>.<name>`` 필드 값(JSON), ``v:<section>.<name>`` 필드 마지막 변경 버전
+    ``a:<code>`` 해제된 업적 코드 (unlock 이벤트 중복 집계 방지)
+- 갱신: RealtimeHub 가 이미 브로드캐스트하는 이벤트(profile_update / balance_update / reward_granted /
+  streak_update / achievement_progress)를 ``apply_event`` 가 Lua 1회로 패치 (키 없으면 무시 → 다음 접속 시 생성)
+  + User 잔액/VIP 컬럼 변경 commit 리스너 (브로드캐스트 없이 잔액이 바뀌는 경로 보정)
+  + Core bulk UPDATE 경로(크래시 라운드 차감/정산)는 commit 후 ``patch_balances`` 직접 호출
+- 재동기화: 클라이언트가 마지막 수신 버전(since)을 보내면 그 이후 바뀐 필드만 ``sync_delta`` 로 응답.
+  since < _base (스냅샷 재생성) 또는 알 수 없는 버전이면 전체 상태
+- Redis 미연결: 프로세스 메모리 dict (같은 해시 구조/패치 의미)
+"""
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import inspect, select
+from sqlalchemy.orm import Session
+
+from ..core import redis_keys
+from ..core.config import settings
+from ..utils.redis import get_redis_manager
+from ..utils.session_hooks import register_commit_hook
+
+logger = logging.getLogger(__name__)
+
+SECTIONS = ("profile", "streak", "achievements")
+STREAK_ACTION = "SLOT_SPIN"
+_UNLOCKED = "achievements.unlocked_count"
+
+# User 컬럼 → 스냅샷 필드 (commit 리스너)
+_USER_FIELDS = {"gold_balance": "profile.gold_balance", "vip_points": "profile.vip_points",
+                "user_rank": "profile.rank"}
+
+# KEYS[1]=snapshot  ARGV[1]=unlock code('' 없음)  ARGV[2..]=field, json 값 쌍
+# 반환: 변경 필드 수 (-1=스냅샷 없음). 값이 같으면 버전 미증가
+_PATCH_LUA = """
+if redis.call('EXISTS', KEYS[1]) == 0 then return -1 end
+local v = tonumber(redis.call('HGET', KEYS[1], '_v')) + 1
+local changed = 0
+for i = 2, #ARGV - 1, 2 do
+  if redis.call('HGET', KEYS[1], 'f:' .. ARGV[i]) ~= ARGV[i + 1] then
+    redis.call('HSET', KEYS[1], 'f:' .. ARGV[i], ARGV[i + 1], 'v:' .. ARGV[i], v)
+    changed = changed + 1
+  end
+end
+if ARGV[1] ~= '' and redis.call('HSETNX', KEYS[1], 'a:' .. ARGV[1], 1) == 1 then
+  local n = tonumber(redis.call('HGET', KEYS[1], 'f:achievements.unlocked_count') or '0') + 1
+  redis.call('HSET', KEYS[1], 'f:achievements.unlocked_count', n, 'v:achievements.unlocked_count', v)
+  changed = changed + 1
+end
+if changed > 0 then redis.call('HSET', KEYS[1], '_v', v) end
+return changed
+"""
+
+
+def patch_hash(h: Dict[str, str], fields: Dict[str, str], unlock: str = "") -> int:
+    """``_PATCH_LUA`` 와 같은 의미의 파이썬 구현 (메모리 fallback)."""
+    v = int(h["_v"]) + 1
+    changed = 0
+    for name, value in fields.items():
+        if h.get(f"f:{name}") != value:
+            h[f"f:{name}"] = value
+            h[f"v:{name}"] = str(v)
+            changed += 1
+    if unlock and f"a:{unlock}" not in h:
+        h[f"a:{unlock}"] = "1"
+        h[f"f:{_UNLOCKED}"] = str(int(h.get(f"f:{_UNLOCKED}", "0")) + 1)
+        h[f"v:{_UNLOCKED}"] = str(v)
+        changed += 1
+    if changed:
+        h["_v"] = str(v)
+    return changed
+
+
+def fields_for_event(event: Dict[str, Any]) -> Tuple[Dict[str, Any], str]:
+    """브로드캐스트 이벤트 → (스냅샷 필드 변경분, 해제 업적 코드)."""
+    etype = event.get("type")
+    out: Dict[str, Any] = {}
+    unlock = ""
+    if etype == "profile_update":
+        changes = event.get("changes") or {}
+        for k in ("gold_balance", "level", "experience", "vip_points", "rank"):
+            if k in changes:
+                out[f"profile.{k}"] = changes[k]
+    elif etype in ("balance_update", "reward_granted"):
+        for k in ("balance_after", "gold_balance", "balance"):
+            if isinstance(event.get(k), int):
+                out["profile.gold_balance"] = event[k]
+                break
+    elif etype == "streak_update":
+        if event.get("action_type") == STREAK_ACTION and event.get("streak_count") is not None:
+            out["streak.streak_count"] = event["streak_count"]
+    elif etype == "achievement_progress":
+        if event.get("unlocked") and event.get("achievement_code"):
+            unlock = str(event["achievement_code"])
+    return out, unlock
+
+
+@dataclass
+class SyncState:
+    version: int
+    base: int
+    sections: Dict[str, Dict[str, Any]]
+    changed_at: Dict[str, int] = field(default_factory=dict)
+
+    @classmethod
+    def from_hash(cls, h: Dict[Any, Any]) -> Optional["SyncState"]:
+        h = {(k.decode() if isinstance(k, bytes) else k): (v.decode() if isinstance(v, bytes) else v)
+             for k, v in (h or {}).items()}
+        if "_v" not in h:
+            return None
+        sections: Dict[str, Dict[str, Any]] = {s: {} for s in SECTIONS}
+        changed_at: Dict[str, int] = {}
+        for k, v in h.items():
+            if k.startswith("f:"):
+                section, _, name = k[2:].partition(".")
+                sections.setdefault(section, {})[name] = json.loads(v)
+            elif k.startswith("v:"):
+                changed_at[k[2:]] = int(v)
+        return cls(int(h["_v"]), int(h.get("_base", 0)), sections, changed_at)
+
+    def full(self) -> Dict[str, Any]:
+        return {**self.sections, "version": self.version}
+
+    def delta(self, since: Optional[int]) -> Optional[Dict[str, Any]]:
+        """since 이후 변경 필드 (section → {name: value}). 전체 재전송이 필요하면 None."""
+        if since is None or since < self.base or since > self.version:
+            return None
+        changes: Dict[str, Dict[str, Any]] = {}
+        for name, v in self.changed_at.items():
+            if v > since:
+                section, _, key = name.partition(".")
+                changes.setdefault(section, {})[key] = self.sections.get(section, {}).get(key)
+        return changes
+
+
+def build_hash(user_id: int, db: Session, base: Optional[int] = None) -> Optional[Dict[str, str]]:
+    """DB(+스트릭 카운터)에서 스냅샷 해시 생성 (콜드 경로). 사용자 없으면 None."""
+    from ..models.achievement_models import Achievement, UserAchievement
+    from ..models.auth_models import User
+
+    user = db.query(User).filter(User.id == user_id).first()
+    if not user:
+        return None
+    values: Dict[str, Any] = {
+        "profile.user_id": user.id,
+        "profile.gold_balance": getattr(user, "gold_balance", 0),
+        "profile.level": getattr(user, "battlepass_level", 1) or 1,
+        "profile.experience": getattr(user, "total_experience", 0) or 0,
+        "profile.vip_points": getattr(user, "vip_points", 0) or 0,
+        "profile.rank": getattr(user, "user_rank", "STANDARD"),
+    }
+    try:
+        from ..utils.redis import get_streak_counter
+        values["streak.streak_count"] = get_streak_counter(str(user.id), STREAK_ACTION)
+        values["streak.action_type"] = STREAK_ACTION
+    except Exception as e:
+        logger.warning(f"Failed to get streak data for user {user_id}: {e}")
+    unlocked = []
+    try:
+        # 활성 업적 × 사용자 해제 여부 (user_progress 전체 직렬화 대신 코드/플래그만 1쿼리)
+        rows = db.execute(
+            select(Achievement.code, UserAchievement.is_unlocked)
+            .outerjoin(UserAchievement, (UserAchievement.achievement_id == Achievement.id)
+                       & (UserAchievement.user_id == user_id))
+            .where(Achievement.is_active == True)  # noqa: E712
+        ).all()
+        unlocked = [code for code, is_unlocked in rows if is_unlocked]
+        values["achievements.total_achievements"] = len(rows)
+        values[_UNLOCKED] = len(unlocked)
+    except Exception as e:
+        logger.warning(f"Failed to get achievement data for user {user_id}: {e}")
+    base = base if base is not None else int(time.time() * 1000)
+    h = {"_v": str(base), "_base": str(base)}
+    for name, value in values.items():
+        h[f"f:{name}"] = json.dumps(value, default=str)
+        h[f"v:{name}"] = str(base)
+    for code in unlocked:
+        h[f"a:{code}"] = "1"
+    return h
+
+
+class SyncSnapshotCache:
+    def __init__(self) -> None:
+        self._sha: Optional[str] = None
+        self._lock = threading.Lock()
+        self._memory: Dict[int, Tuple[float, Dict[str, str]]] = {}
+
+    @property
+    def _redis(self):
+        try:
+            return get_redis_manager().redis_client
+        except Exception:
+            return None
+
+    @property
+    def ttl(self) -> int:
+        return int(settings.REALTIME_SNAPSHOT_TTL_SECONDS)
+
+    # ------------------------------------------------------------ read / build
+    def get(self, user_id: int, db: Session) -> Optional[SyncState]:
+        """스냅샷 조회 (HGETALL 1회), 없으면 DB 에서 생성 후 저장."""
+        r = self._redis
+        if r is not None:
+            try:
+                state = SyncState.from_hash(r.hgetall(redis_keys.realtime_snapshot(user_id)))
+                if state is not None:
+                    return state
+            except Exception:
+                logger.warning("realtime snapshot read failed user=%s", user_id, exc_info=True)
+        else:
+            with self._lock:
+                hit = self._memory.get(user_id)
+                if hit and hit[0] > time.monotonic():
+                    return SyncState.from_hash(dict(hit[1]))
+        h = build_hash(user_id, db)
+        if h is None:
+            return None
+        self._store(r, user_id, h)
+        return SyncState.from_hash(h)
+
+    def _store(self, r, user_id: int, h: Dict[str, str]) -> None:  # noqa: ANN001
+        if r is None:
+            with self._lock:
+                self._memory[user_id] = (time.monotonic() + self.ttl, h)
+            return
+        key = redis_keys.realtime_snapshot(user_id)
+        try:
+            pipe = r.pipeline(transaction=True)
+            pipe.delete(key)
+            pipe.hset(key, mapping=h)
+            pipe.expire(key, self.ttl)
+            pipe.execute()
+        except Exception:
+            logger.warning("realtime snapshot store failed user=%s", user_id, exc_info=True)
+
+    def invalidate(self, user_id: int) -> None:
+        r = self._redis
+        if r is None:
+            with self._lock:
+                self._memory.pop(user_id, None)
+            return
+        try:
+            r.delete(redis_keys.realtime_snapshot(user_id))
+        except Exception:
+            pass
+
+    def clear_memory(self) -> None:
+        with self._lock:
+            self._memory.clear()
+
+    # ------------------------------------------------------------ patch
+    def patch(self, user_id: int, fields: Dict[str, Any], unlock: str = "") -> int:
+        """존재하는 스냅샷에만 필드 패치 (원자, best-effort). 변경 필드 수 (-1=스냅샷 없음)."""
+        if not fields and not unlock:
+            return 0
+        encoded = {k: json.dumps(v, default=str) for k, v in fields.items()}
+        r = self._redis
+        if r is None:
+            with self._lock:
+                hit = self._memory.get(user_id)
+                if not hit or hit[0] <= time.monotonic():
+                    return -1
+                return patch_hash(hit[1], encoded, unlock)
+        args = [unlock]
+        for k, v in encoded.items():
+            args += [k, v]
+        key = redis_keys.realtime_snapshot(user_id)
+        try:
+            if self._sha is None:
+                self._sha = r.script_load(_PATCH_LUA)
+            try:
+                return int(r.evalsha(self._sha, 1, key, *args))
+            except Exception as e:
+                if "NOSCRIPT" not in str(e):
+                    raise
+                self._sha = r.script_load(_PATCH_LUA)
+                return int(r.evalsha(self._sha, 1, key, *args))
+        except Exception:
+            logger.warning("realtime snapshot patch failed user=%s", user_id, exc_info=True)
+            return 0
+
+    def apply_event(self, event: Dict[str, Any]) -> int:
+        uid = event.get("user_id")
+        if not isinstance(uid, int):
+            return 0
+        fields, unlock = fields_for_event(event)
+        return self.patch(uid, fields, unlock)
+
+
+sync_snapshots = SyncSnapshotCache()
+
+
+def patch_balances(db: Session, user_ids: Any) -> int:
+    """ORM 리스너를 거치지 않는 잔액 변경(Core bulk UPDATE) commit 이후 스냅샷 잔액 보정.
+
+    현재 값을 1쿼리로 읽어 패치한다. 조회 실패 시 해당 스냅샷을 무효화 (다음 접속 시 재생성).
+    """
+    from ..models.auth_models import User
+
+    ids = list(dict.fromkeys(uid for uid in user_ids if uid is not None))
+    if not ids:
+        return 0
+    try:
+        rows = db.execute(select(User.id, User.gold_balance).where(User.id.in_(ids))).all()
+    except Exception:
+        logger.warning("realtime snapshot balance refresh failed users=%s", len(ids), exc_info=True)
+        for uid in ids:
+            sync_snapshots.invalidate(uid)
+        return 0
+    for uid, balance in rows:
+        sync_snapshots.patch(uid, {"profile.gold_balance": balance})
+    return len(rows)
+
+
+# ---------------------------------------------------------------------------
+# Session 이벤트: User 잔액/VIP 컬럼 변경 flush 수집 → commit 확정 시 스냅샷 패치
+# ---------------------------------------------------------------------------
+_PENDING_KEY = "realtime_snapshot_patches"
+
+
+def _collect(session: Session, pending: Dict[int, Dict[str, Any]]) -> None:
+    from ..models.auth_models import User
+
+    for obj in session.dirty:
+        if not isinstance(obj, User):
+            continue
+        attrs = inspect(obj).attrs
+        for attr, name in _USER_FIELDS.items():
+            added = attrs[attr].history.added
+            # SQL 표현식 대입(gold_balance = User.gold_balance + x)은 값 미확정 → 건너뜀 (TTL 로 수렴)
+            if added and isinstance(added[-1], (int, str)):
+                pending.setdefault(obj.id, {})[name] = added[-1]
+
+
+def _apply(pending: Dict[int, Dict[str, Any]]) -> None:
+    for uid, fields in pending.items():
+        sync_snapshots.patch(uid, fields)
+
+
+def install_snapshot_listeners() -> None:
+    """모든 Session 에 User 잔액/VIP 변경 → 실시간 스냅샷 패치 리스너 등록 (멱등)."""
+    register_commit_hook(_PENDING_KEY, _collect, _apply, factory=dict)
+
+
+__all__ = [
+    "SyncState", "SyncSnapshotCache", "sync_snapshots", "fields_for_event", "patch_hash", "build_hash",
+    "patch_balances", "install_snapshot_listeners",
+]
@@ -7,6 +7,7 @@ from datetime import datetime, timedelta
 
 from .. import models
 from ..core.config import settings
+from ..services.segment_resolver import segment_resolver
 
 logger = logging.getLogger(__name__)
 
@@ -64,9 +65,8 @@ class GameRepository:
         self.redis_client.ltrim(key, 0, 9) # Keep only the last 10
 
     def get_user_segment(self, db: Session, user_id: int) -> str:
-        # This logic should be in RFMService, but keeping here for now to avoid breaking dependencies
-        user_segment = db.query(models.UserSegment).filter(models.UserSegment.user_id == user_id).first()
-        return user_segment.rfm_group if user_segment else "Low-Value"
+        # 프로세스 LRU → Redis HASH → DB (정상 상태에서 DB 왕복 없음)
+        return segment_resolver.label(db, user_id) or "Low-Value"
 
     def record_action(self, db: Session, user_id: int, action_type: str, action_data: str) -> models.UserAction | None:
         if not db:
@@ -77,10 +77,26 @@ class GameRepository:
         db.refresh(action)
         return action
 
-    def count_daily_actions(self, db: Session, user_id: int, action_type: str) -> int:
+    def count_daily_actions(self, db: Session, user_id: int, action_type: str, *,
+                            units_key: Optional[str] = None) -> int:
+        """오늘 액션 수.
+
+        units_key 지정 시 행 수 대신 action_data JSON 의 해당 값 합계 (값이 없는 행은 1) —
+        한 행에 여러 쿼터 단위를 기록하는 일괄 처리(가챠 N 연차)용.
+        """
         today_start = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
-        return db.query(models.UserAction).filter(
+        query = db.query(models.UserAction).filter(
             models.UserAction.user_id == user_id,
             models.UserAction.action_type == action_type,
             models.UserAction.created_at >= today_start
-        ).count()
+        )
+        if units_key is None:
+            return query.count()
+        total = 0
+        for (raw,) in query.with_entities(models.UserAction.action_data):
+            try:
+                units = json.loads(raw).get(units_key)
+            except (TypeError, ValueError, AttributeError):
+                units = None
+            total += units if isinstance(units, int) and units > 0 else 1
+        return total
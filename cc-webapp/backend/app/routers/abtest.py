@@ -2,11 +2,11 @@ from __future__ import annotations
 
 from fastapi import APIRouter, Depends, Query
 from pydantic import BaseModel
-from typing import List
+from typing import Dict, List
 
 from ..dependencies import get_db
 from .. import models
-from ..services.abtest_service import ABTestService
+from ..services.abtest_service import ABTestService, get_assignment_engine
 
 router = APIRouter(prefix="/api/abtest", tags=["abtest"])
 
@@ -33,10 +33,21 @@ def assign_variant(req: AssignmentRequest, user_id: int = Query(..., description
     return AssignmentResponse.from_model(row)
 
 
+class AssignmentsResponse(BaseModel):
+    user_id: int
+    assignments: Dict[str, str]
+
+
 @router.get("/variant", response_model=AssignmentResponse)
-def get_variant(test_name: str, user_id: int = Query(..., description="User ID"), db=Depends(get_db)):
-    svc = ABTestService(db)
-    row = svc.get(user_id=user_id, test_name=test_name)
-    if not row:
-        row = svc.assign(user_id=user_id, test_name=test_name, variants=["A", "B"])
-    return AssignmentResponse.from_model(row)
+def get_variant(test_name: str, user_id: int = Query(..., description="User ID")):
+    # 무상태 배정: 해시 + 인메모리 설정, 노출은 배치 적재 (DB 조회/쓰기 없음)
+    # 응답 형태는 기존과 동일 — 홀드아웃/비활성이면 기본 경험(첫 변형)을 주고 노출은 기록하지 않음
+    engine = get_assignment_engine()
+    variant = engine.assign(user_id, test_name) or engine.control_variant(test_name)
+    return AssignmentResponse(user_id=user_id, test_name=test_name, variant=variant)
+
+
+@router.get("/assignments", response_model=AssignmentsResponse)
+def get_assignments(user_id: int = Query(..., description="User ID")):
+    """페이지 로드용: 활성 실험 전체 일괄 배정."""
+    return AssignmentsResponse(user_id=user_id, assignments=get_assignment_engine().assign_all(user_id))
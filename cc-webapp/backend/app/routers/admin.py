@@ -3,19 +3,18 @@
 import logging
 import uuid
 from typing import List, Optional, Any
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from pydantic import BaseModel, Field
 from typing import Any
-from fastapi.responses import StreamingResponse
-import csv
-import io
 
 from ..database import get_db
 from ..dependencies import get_current_user
 from ..core.config import settings
 from ..services.admin_service import AdminService
 from ..services.limited_package_service import LimitedPackageService
+from ..services.job_service import get_job_service
 from ..security.audit import audit_log
+from ..utils.csv_stream import iter_keyset, csv_streaming_response
 from datetime import datetime
 from sqlalchemy.orm import Session
 from app import models
@@ -441,44 +440,105 @@ async def list_audit_logs(
     return {"items": [_row(r) for r in rows], "count": len(rows), "skip": params.skip, "limit": params.limit}
 
 
+class AuditExportParams(BaseModel):
+    action: Optional[str] = Field(None, description="Filter by action, e.g., LIMITED_SET_STOCK")
+    target_type: Optional[str] = Field(None, description="Filter by target type, e.g., limited_package|promo")
+    target_id: Optional[str] = Field(None, description="Filter by specific target id/code")
+    since: Optional[datetime] = Field(None, description="Return logs created at or after this timestamp")
+    until: Optional[datetime] = Field(None, description="Return logs created before this timestamp")
+    max_rows: Optional[int] = Field(None, ge=1, description="Optional cap; default unbounded")
+    gzip: bool = Field(False, description="gzip-compress the CSV stream on the fly")
+
+
 @router.get("/audit/logs.csv")
 async def export_audit_logs_csv(
-    params: AuditLogParams = Depends(),
+    params: AuditExportParams = Depends(),
     admin_user = Depends(require_admin_access),
     db: Session = Depends(get_db),
 ):
+    """감사 로그 CSV 스트리밍 export (keyset 커서, 무제한, 선택적 gzip)."""
     from app import models
-    q = db.query(models.AdminAuditLog)
+    M = models.AdminAuditLog
+    q = db.query(M.id, M.action, M.target_type, M.target_id, M.actor_user_id, M.created_at, M.details)
     if params.action:
-        q = q.filter(models.AdminAuditLog.action == params.action)
+        q = q.filter(M.action == params.action)
     if params.target_type:
-        q = q.filter(models.AdminAuditLog.target_type == params.target_type)
+        q = q.filter(M.target_type == params.target_type)
     if params.target_id:
-        q = q.filter(models.AdminAuditLog.target_id == params.target_id)
+        q = q.filter(M.target_id == params.target_id)
     if params.since:
-        q = q.filter(models.AdminAuditLog.created_at >= params.since)
+        q = q.filter(M.created_at >= params.since)
     if params.until:
-        q = q.filter(models.AdminAuditLog.created_at < params.until)
-    q = q.order_by(models.AdminAuditLog.created_at.desc()).offset(params.skip).limit(min(params.limit, 1000))
-    rows = q.all()
+        q = q.filter(M.created_at < params.until)
+    rows = iter_keyset(q, M.id, max_rows=params.max_rows)
+    return csv_streaming_response(
+        "admin_audit_logs.csv",
+        ["id", "action", "target_type", "target_id", "actor_user_id", "created_at", "details"],
+        rows,
+        gzip_output=params.gzip,
+    )
+
+
+@router.get("/users.csv")
+async def export_users_csv(
+    search: Optional[str] = None,
+    max_rows: Optional[int] = None,
+    gzip: bool = False,
+    admin_user = Depends(require_admin_access),
+    db: Session = Depends(get_db),
+):
+    """사용자 CSV 스트리밍 export (keyset 커서)."""
+    U = models.User
+    q = db.query(U.id, U.site_id, U.nickname, U.phone_number, U.is_active, U.is_admin, U.gold_balance, U.created_at)
+    if search:
+        q = q.filter(
+            (U.nickname.ilike(f"%{search}%")) |
+            (U.site_id.ilike(f"%{search}%")) |
+            (U.phone_number.ilike(f"%{search}%"))
+        )
+    rows = iter_keyset(q, U.id, max_rows=max_rows)
+    return csv_streaming_response(
+        "users.csv",
+        ["id", "site_id", "nickname", "phone_number", "is_active", "is_admin", "gold_balance", "created_at"],
+        rows,
+        gzip_output=gzip,
+    )
+
 
-    buffer = io.StringIO()
-    writer = csv.writer(buffer)
-    writer.writerow(["id", "action", "target_type", "target_id", "actor_user_id", "created_at", "details"])
-    for r in rows:
-        writer.writerow([
-            getattr(r, "id", ""),
-            getattr(r, "action", ""),
-            getattr(r, "target_type", ""),
-            getattr(r, "target_id", ""),
-            getattr(r, "actor_user_id", ""),
-            getattr(r, "created_at", ""),
-            getattr(r, "details", ""),
-        ])
-    buffer.seek(0)
-    return StreamingResponse(iter([buffer.getvalue()]), media_type="text/csv", headers={
-        "Content-Disposition": "attachment; filename=admin_audit_logs.csv"
-    })
+@router.get("/transactions.csv")
+async def export_transactions_csv(
+    user_id: Optional[int] = None,
+    product_id: Optional[str] = None,
+    status_filter: Optional[str] = Query(None, alias="status"),
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    max_rows: Optional[int] = None,
+    gzip: bool = False,
+    admin_user = Depends(require_admin_access),
+    db: Session = Depends(get_db),
+):
+    """상점 거래 CSV 스트리밍 export (keyset 커서)."""
+    T = models.ShopTransaction
+    q = db.query(T.id, T.user_id, T.product_id, T.kind, T.quantity, T.unit_price, T.amount, T.status,
+                 T.payment_method, T.receipt_code, T.failure_reason, T.created_at)
+    if user_id is not None:
+        q = q.filter(T.user_id == user_id)
+    if product_id is not None:
+        q = q.filter(T.product_id == product_id)
+    if status_filter is not None:
+        q = q.filter(T.status == status_filter)
+    if start is not None:
+        q = q.filter(T.created_at >= start)
+    if end is not None:
+        q = q.filter(T.created_at <= end)
+    rows = iter_keyset(q, T.id, max_rows=max_rows)
+    return csv_streaming_response(
+        "shop_transactions.csv",
+        ["id", "user_id", "product_id", "kind", "quantity", "unit_price", "amount", "status",
+         "payment_method", "receipt_code", "failure_reason", "created_at"],
+        rows,
+        gzip_output=gzip,
+    )
 
 # ====== Shop/Item Admin (Catalog CRUD) ======
 class AdminCatalogItemIn(BaseModel):
@@ -798,6 +858,69 @@ async def cancel_campaign(
     db.commit()
     return {"success": True}
 
+@router.post("/campaigns/{campaign_id}/send", status_code=status.HTTP_202_ACCEPTED)
+async def send_campaign_now(
+    campaign_id: int,
+    admin_user = Depends(require_admin_access),
+    db: Session = Depends(get_db),
+):
+    """예약 캠페인 즉시 발송 (청크 bulk insert 백그라운드 작업)."""
+    camp = db.query(models.NotificationCampaign).filter(models.NotificationCampaign.id == campaign_id).first()
+    if not camp:
+        raise HTTPException(status_code=404, detail="Campaign not found")
+    if camp.status != "scheduled":
+        raise HTTPException(status_code=400, detail="Only scheduled campaigns can be sent")
+    job = get_job_service().enqueue("campaigns.send", {"campaign_id": campaign_id}, requested_by=getattr(admin_user, 'id', None))
+    return {"success": True, "job_id": job["id"], "status": job["status"]}
+
+
+# ====== 초대코드 대량 생성 / 백그라운드 작업 ======
+class BulkInviteRequest(BaseModel):
+    count: int = Field(10, ge=1, le=100000)
+    length: int = Field(6, ge=4, le=10)
+    max_uses: Optional[int] = 1
+    days_valid: int = Field(30, ge=0)
+
+
+@router.post("/invites/bulk", status_code=status.HTTP_202_ACCEPTED)
+async def enqueue_bulk_invites(
+    body: BulkInviteRequest,
+    admin_user = Depends(require_admin_access),
+):
+    job = get_job_service().enqueue("invites.bulk_generate", body.model_dump(), requested_by=getattr(admin_user, 'id', None))
+    audit_log("admin_invites_bulk", actor_id=getattr(admin_user, 'id', None), meta={"count": body.count, "job_id": job["id"]})
+    return {"success": True, "job_id": job["id"], "status": job["status"]}
+
+
+@router.get("/jobs")
+async def list_jobs(
+    limit: int = Query(20, ge=1, le=100),
+    admin_user = Depends(require_admin_access),
+):
+    return {"items": get_job_service().list_recent(limit)}
+
+
+@router.get("/jobs/{job_id}")
+async def get_job(
+    job_id: str,
+    admin_user = Depends(require_admin_access),
+):
+    job = get_job_service().get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@router.post("/jobs/{job_id}/cancel")
+async def cancel_job(
+    job_id: str,
+    admin_user = Depends(require_admin_access),
+):
+    job = get_job_service().cancel(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
 # ====== Shop Transactions (Admin) ======
 from ..services.shop_service import ShopService
 
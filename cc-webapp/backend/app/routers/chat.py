@@ -1,9 +1,14 @@
 """WebSocket-based chat implementation with CJ AI service integration."""
 
-from fastapi import APIRouter, WebSocket, Depends, HTTPException
-from typing import Dict, Optional
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends, HTTPException, Query
+from datetime import datetime
+from typing import Dict, List, Optional
 import logging
 
+from pydantic import BaseModel, ConfigDict
+from sqlalchemy.orm import Session
+
+from ..database import get_db
 from ..services.cj_ai_service import CJAIService
 from ..auth.simple_auth import get_current_user_id
 from ..models import User
@@ -17,6 +22,24 @@ router = APIRouter(
 # In-memory storage for active connections
 active_connections: Dict[int, WebSocket] = {}
 
+
+class RoomMessageItem(BaseModel):
+    id: int
+    room_id: int
+    sender_id: Optional[int] = None
+    message_type: Optional[str] = None
+    content: str
+    emotion_detected: Optional[str] = None
+    sentiment_score: Optional[float] = None
+    created_at: Optional[datetime] = None
+    model_config = ConfigDict(from_attributes=True)
+
+
+class RoomMessagePage(BaseModel):
+    items: List[RoomMessageItem]
+    next_cursor: Optional[str] = None
+
+
 @router.websocket("/ws/{user_id}")
 async def chat_websocket(
     websocket: WebSocket,
@@ -46,6 +69,45 @@ async def chat_websocket(
         if user_id in active_connections:
             del active_connections[user_id]
 
+@router.websocket("/ws/rooms/{room_id}")
+async def chat_room_websocket(websocket: WebSocket, room_id: int, token: Optional[str] = None):
+    """채팅방 채널 구독 (방 토픽 1개를 모든 참가자 소켓이 공유)."""
+    from ..services.auth_service import AuthService
+    from ..services.chat_service import ChatService
+    from ..database import SessionLocal
+    from ..core import redis_keys
+    from ..realtime import hub
+
+    await websocket.accept()
+    db = SessionLocal()
+    topic = None
+    try:
+        if not token:
+            await websocket.close(code=4401)
+            return
+        token_data = AuthService.verify_token(token, db=db)
+        try:
+            from ..utils.redis import get_redis_manager
+            redis = get_redis_manager().redis_client
+        except Exception:
+            redis = None
+        if not await ChatService(db, redis).is_room_member(room_id, token_data.user_id):
+            await websocket.close(code=4403)
+            return
+        topic = redis_keys.chat_room_channel(room_id)
+        await hub.subscribe(topic, websocket)
+        while True:
+            try:
+                await websocket.receive_text()
+            except WebSocketDisconnect:
+                break
+    except Exception as e:
+        logging.error(f"Chat room WebSocket error for room {room_id}: {str(e)}")
+    finally:
+        if topic:
+            await hub.unsubscribe(topic, websocket)
+        db.close()
+
 @router.get("/status/{user_id}")
 async def get_connection_status(
     user_id: int,
@@ -61,3 +123,24 @@ async def get_connection_status(
         "connected": is_connected,
         "connection_count": len(active_connections)
     }
+
+
+@router.get("/rooms/{room_id}/messages", response_model=RoomMessagePage)
+async def get_room_message_page(
+    room_id: int,
+    limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="keyset cursor (next_cursor of the previous page)"),
+    current_user_id: int = Depends(get_current_user_id),
+    db: Session = Depends(get_db),
+) -> RoomMessagePage:
+    """Keyset page of room messages (oldest first); pass next_cursor to read further back."""
+    from ..services.chat_service import ChatService
+    from ..utils.pagination import InvalidCursor
+
+    try:
+        items, next_cursor = await ChatService(db).get_room_messages_page(room_id, current_user_id, limit, cursor)
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    except ValueError as e:
+        raise HTTPException(status_code=403, detail=str(e))
+    return RoomMessagePage(items=[RoomMessageItem.model_validate(m) for m in items], next_cursor=next_cursor)
@@ -8,11 +8,11 @@ from datetime import datetime, timezone, timedelta
 from ..utils.redis import (
     get_streak_counter,
     get_streak_ttl,
-    get_attendance_month,
 )
 from ..utils.streak_utils import calc_next_streak_reward
 
 from ..services.dashboard_service import DashboardService
+from ..services import attendance_service
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 from ..models.game_models import UserReward
@@ -92,23 +92,15 @@ def get_unified_dashboard(
             # 공통 util 사용
             next_reward = calc_next_streak_reward(streak_count + 1)
 
-            # 주간 attendance (현재 UTC 주간)
+            # 주간 attendance (현재 UTC 주간, 일~토) — 월 경계를 넘는 주도 비트맵 구간 조회 1회
             today_utc = datetime.utcnow().date()
-            year = today_utc.year
-            month = today_utc.month
-            # 월 전체 attendance 집합에서 이번 주 필터 (streak 프론트는 주간 캘린더 표시)
-            month_days = get_attendance_month(str(current_user.id), action_type, year, month)
-            # 이번 주 (일~토) 경계 계산
-            weekday = today_utc.weekday()  # 월=0
-            # Python weekday: Monday=0; 주간 캘린더(일요일 시작) 맞추기 위해 offset 조정
-            # 일요일 시작 주: 현재 날짜의 요일 인덱스 (일요일=0) 계산
             # Convert Monday=0..Sunday=6 -> Sunday=0..Saturday=6
-            monday_based = weekday
-            sunday_based = (monday_based + 1) % 7
+            sunday_based = (today_utc.weekday() + 1) % 7
             week_start = today_utc - timedelta(days=sunday_based)
-            week_dates = [week_start + timedelta(days=i) for i in range(7)]
-            week_days_iso = {d.isoformat() for d in week_dates}
-            attendance_week = [d for d in month_days if d in week_days_iso]
+            attendance_week = [
+                d.isoformat() for d in attendance_service.days_between(
+                    current_user.id, action_type, week_start, week_start + timedelta(days=6))
+            ]
 
             payload["streak"] = {
                 "count": streak_count,
@@ -3,6 +3,7 @@ import logging
 import json as _json
 from fastapi import APIRouter, Depends, HTTPException, Response, WebSocket, WebSocketDisconnect, Query
 from sqlalchemy.orm import Session
+import math
 import random
 import json
 from typing import List, Optional, Dict, Any
@@ -10,11 +11,16 @@ from datetime import datetime, timedelta
 
 from ..database import get_db
 from ..dependencies import get_current_user, get_current_admin_user as get_current_admin
+from ..auth.auth_service import get_current_user_optional
 from ..models.auth_models import User
 from ..models.game_models import Game, UserAction, GameSession as GameSessionModel
 from ..services.simple_user_service import SimpleUserService
 from ..services.game_service import GameService
 from ..services.history_service import log_game_history
+from ..services import leaderboard_service
+from ..services.action_attributes import count_jackpots, summarize_games
+from ..core import game_math
+from ..core.game_math import crash_point_from_uniform
 from ..services.achievement_service import AchievementService
 from pydantic import BaseModel, ConfigDict
 
@@ -33,11 +39,12 @@ from ..schemas.game_schemas import (
     RPSPlayRequest, RPSPlayResponse,
     GachaPullRequest, GachaPullResponse,
     CrashBetRequest, CrashBetResponse,
-    GameStats, ProfileGameStats, Achievement, GameSession, GameLeaderboard
+    GameStats, ProfileGameStats, Achievement, GameSession, GameLeaderboard, LeaderboardEntry
 )
 from app import models
-from sqlalchemy import text, func
+from sqlalchemy import text
 from ..utils.redis import update_streak_counter
+from ..utils.sampling import get_sampler_registry, request_rng
 from ..core.config import settings
 try:  # Kafka optional import
     from app.messaging.kafka import get_kafka_producer  # type: ignore
@@ -68,25 +75,33 @@ except Exception:  # pragma: no cover
 # 표준 사용자 액션 로깅 헬퍼
 # 통일된 envelope: {"v":1, "type":action_type, "ts": iso8601, "data": <payload dict>}
 # data 내부는 각 게임/행동별 스키마 (bet_amount, win_amount 등). 문자열 저장 (Text 컬럼) 최종 직렬화.
+def _action_envelope(action_type: str, data: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "v": 1,
+        "type": action_type,
+        "ts": datetime.utcnow().isoformat() + "Z",
+        "data": data,
+    }
+
+
+def _publish_user_action(envelope: Dict[str, Any]) -> None:
+    # Kafka publish (best-effort)
+    try:
+        producer = get_kafka_producer()
+        if producer:
+            topic = getattr(settings, "KAFKA_USER_ACTION_TOPIC", "topic_user_actions")
+            producer.produce(topic, _json.dumps(envelope, ensure_ascii=False).encode("utf-8"))  # type: ignore
+    except Exception as ke:  # pragma: no cover
+        logger.debug(f"kafka publish skipped: {ke}")
+
+
 def _log_user_action(db: Session, *, user_id: int, action_type: str, data: Dict[str, Any]) -> None:
     try:
-        envelope = {
-            "v": 1,
-            "type": action_type,
-            "ts": datetime.utcnow().isoformat() + "Z",
-            "data": data,
-        }
+        envelope = _action_envelope(action_type, data)
         ua = UserAction(user_id=user_id, action_type=action_type, action_data=_json.dumps(envelope, ensure_ascii=False))
         db.add(ua)
         db.commit()
-        # Kafka publish (best-effort)
-        try:
-            producer = get_kafka_producer()
-            if producer:
-                topic = getattr(settings, "KAFKA_USER_ACTION_TOPIC", "topic_user_actions")
-                producer.produce(topic, _json.dumps(envelope, ensure_ascii=False).encode("utf-8"))  # type: ignore
-        except Exception as ke:  # pragma: no cover
-            logger.debug(f"kafka publish skipped: {ke}")
+        _publish_user_action(envelope)
     except Exception as e:  # 실패 허용 (게임 진행 차단 X)
         try:
             db.rollback()
@@ -141,10 +156,11 @@ class GameHistoryItem(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 class GameHistoryListResponse(BaseModel):
-    total: int
+    total: Optional[int] = None
     items: List[GameHistoryItem]
     limit: int
     offset: int
+    next_cursor: Optional[str] = None
 
 
 class AchievementProgressItem(BaseModel):
@@ -599,6 +615,15 @@ async def get_gacha_stats(
     svc = GameService(db)
     return svc.gacha_service.get_user_gacha_stats(current_user.id)
 
+# 남은 일일 가챠 횟수 (UI 표시용, Redis 쿼터 카운터 GET 1회)
+@router.get("/gacha/quota")
+async def get_gacha_quota(
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    svc = GameService(db)
+    return svc.gacha_service.daily_quota_status(current_user.id, getattr(current_user, 'rank', None), db).to_dict()
+
 # ================= Existing Simple Game Feature Endpoints =================
 
 @router.get("/")
@@ -651,22 +676,15 @@ async def spin_slot(
         raise HTTPException(status_code=400, detail="토큰이 부족합니다")
     
     # 슬롯 결과 생성
-    # Load symbol weights from settings with safe fallback
-    cfg_weights = getattr(settings, 'SLOT_SYMBOL_WEIGHTS', None) or {
-        '🍒': 30, '🍋': 25, '🍊': 20, '🍇': 15, '💎': 8, '7️⃣': 2
-    }
-    # keep order stable for reproducibility in tests
-    symbols = ['🍒', '🍋', '🍊', '🍇', '💎', '7️⃣']
-    weights = [cfg_weights.get(sym, 1) for sym in symbols]
-    reels = [random.choices(symbols, weights=weights)[0] for _ in range(3)]
+    # Load symbol weights from settings with safe fallback (심볼 순서/배당 규칙은 core.game_math 공유)
+    # 가중치 설정별로 1회 컴파일된 alias sampler + 요청 단위 시드 RNG 스트림 (시드는 이력에 기록)
+    weights = game_math.slot_symbol_weights(getattr(settings, 'SLOT_SYMBOL_WEIGHTS', None))
+    reel_sampler = get_sampler_registry().get("slot_reels", list(zip(game_math.SLOT_SYMBOLS, weights)))
+    rng = request_rng()
+    reels = reel_sampler.sample(3, rng)
     
     # 승리 판정
-    win_amount = 0
-    if reels[0] == reels[1] == reels[2]:
-        multiplier = {'🍒': 2, '🍋': 3, '🍊': 4, '🍇': 5, '💎': 10, '7️⃣': 50}
-        win_amount = bet_amount * multiplier.get(reels[0], 1)
-    elif reels[0] == reels[1] or reels[1] == reels[2]:
-        win_amount = int(bet_amount * 1.5)
+    win_amount = game_math.slot_base_win(reels, bet_amount)
     
     # 스트릭/변동 보상: 플레이 스트릭 증가(24h TTL) 및 소폭 보너스 가중치
     # 슬롯 플레이 스트릭은 "플레이 연속 시도" 기준으로 증가(승패 무관). 보너스는 승리 시에만 적용.
@@ -678,9 +696,7 @@ async def spin_slot(
 
     if win_amount > 0:
         # 최대 +20%까지 승리 보너스 (연속 시도 기반) + 경미한 랜덤 변동(±5%)
-        bonus_multiplier = 1.0 + min(max(streak_count, 0) * 0.02, 0.20)
-        rng_variation = random.uniform(0.95, 1.05)
-        win_amount = int(win_amount * bonus_multiplier * rng_variation)
+        win_amount = game_math.slot_final_win(win_amount, streak_count, rng.uniform(*game_math.SLOT_VARIATION_RANGE))
 
     # 잔액 업데이트
     new_balance = SimpleUserService.update_user_tokens(db, current_user.id, -bet_amount + win_amount)
@@ -691,7 +707,7 @@ async def spin_slot(
         "bet_amount": bet_amount,
         "win_amount": win_amount,
         "reels": reels,
-        "is_jackpot": reels[0] == '7️⃣' and reels[0] == reels[1] == reels[2]
+        "is_jackpot": game_math.slot_is_jackpot(reels)
     }
     
     _log_user_action(
@@ -715,7 +731,7 @@ async def spin_slot(
             game_type="slot",
             action_type="WIN" if win_amount > 0 else "BET",
             delta_coin=delta,
-            result_meta={"reels": reels, "bet": bet_amount, "win": win_amount, "jackpot": action_data["is_jackpot"], "streak": streak_count}
+            result_meta={"reels": reels, "bet": bet_amount, "win": win_amount, "jackpot": action_data["is_jackpot"], "streak": streak_count, "rng_seed": rng.seed_value}
         )
     except Exception as e:
         logger.warning(f"slot spin history log failed: {e}")
@@ -886,40 +902,18 @@ async def pull_gacha(
     except Exception:
         old_balance = None
 
-    # pull_count을 10연 단위와 단일 뽑기로 배치 실행
-    batches_of_10 = pull_count // 10
-    singles = pull_count % 10
-
-    all_results: list[str] = []
-    last_animation: str | None = None
-    last_message: str | None = None
-
-    # 10연 배치 실행
-    for _ in range(batches_of_10):
-        try:
-            res = game_service.gacha_pull(current_user.id, 10)
-        except ValueError as ve:
-            msg = str(ve)
-            if "일일 가챠" in msg:
-                # 표준화: 일일 한도 초과 → 429 + 구조화 detail
-                raise HTTPException(status_code=429, detail={"code": "DAILY_GACHA_LIMIT", "message": msg})
-            raise HTTPException(status_code=400, detail=msg)
-        all_results.extend(res.results)
-        last_animation = res.animation_type or last_animation
-        last_message = res.psychological_message or last_message
-
-    # 단일 실행
-    for _ in range(singles):
-        try:
-            res = game_service.gacha_pull(current_user.id, 1)
-        except ValueError as ve:
-            msg = str(ve)
-            if "일일 가챠" in msg:
-                raise HTTPException(status_code=429, detail={"code": "DAILY_GACHA_LIMIT", "message": msg})
-            raise HTTPException(status_code=400, detail=msg)
-        all_results.extend(res.results)
-        last_animation = res.animation_type or last_animation
-        last_message = res.psychological_message or last_message
+    # N 연차 일괄 처리 (10연 묶음/단일 비용 구조 유지, 쿼터·비용·피티·기록 1회)
+    try:
+        res = game_service.gacha_pull_batch(current_user.id, pull_count)
+    except ValueError as ve:
+        msg = str(ve)
+        if "일일 가챠" in msg:
+            # 표준화: 일일 한도 초과 → 429 + 구조화 detail
+            raise HTTPException(status_code=429, detail={"code": "DAILY_GACHA_LIMIT", "message": msg})
+        raise HTTPException(status_code=400, detail=msg)
+    all_results: list[str] = list(res.results)
+    last_animation: str | None = res.animation_type
+    last_message: str | None = res.psychological_message or None
 
     # 현재 잔액 조회
     new_balance = SimpleUserService.get_user_tokens(db, current_user.id)
@@ -948,25 +942,19 @@ async def pull_gacha(
     # special_animation: mirror animation_type for non-normal states for easier FE handling
     special_anim = last_animation if (last_animation in {"near_miss", "epic", "legendary", "pity"}) else None
 
-    # 표준 사용자 액션 로깅 (요약 데이터)
-    try:
-        summary = {
-            "game_type": "gacha",
-            "pull_count": pull_count,
-            "rare_count": rare_count,
-            "ultra_rare_count": ultra_rare_count,
-            "anim": special_anim,
-            "last_animation": last_animation,
-            "items_sample": items[:3],  # 과도한 길이 방지
-        }
-        _log_user_action(
-            db,
-            user_id=current_user.id,
-            action_type="GACHA_PULL",
-            data=summary,
-        )
-    except Exception:
-        pass
+    # 표준 사용자 액션 이벤트 (요약 데이터) — user_actions 행은 pull_batch 가 1건 기록
+    # (여기서 행을 더 쓰면 일일 쿼터 시드 집계가 중복됨) → Kafka 발행만
+    summary = {
+        "user_id": current_user.id,
+        "game_type": "gacha",
+        "pull_count": pull_count,
+        "rare_count": rare_count,
+        "ultra_rare_count": ultra_rare_count,
+        "anim": special_anim,
+        "last_animation": last_animation,
+        "items_sample": items[:3],  # 과도한 길이 방지
+    }
+    _publish_user_action(_action_envelope("GACHA_PULL", summary))
 
     # 실시간 브로드캐스트 (실패 허용)
     try:
@@ -1100,48 +1088,21 @@ async def place_crash_bet(
         game_id = str(uuid.uuid4())
 
         # 개선된 크래시 멀티플라이어 로직 - 더 실제적이고 예측 불가능한 시스템
-        import time, hashlib
+        import time
         seed = f"{current_user.id}:{int(time.time() * 1000)}:{game_id}"
-        hash_val = int(hashlib.md5(seed.encode()).hexdigest()[:8], 16)
-        
-        # 5단계 확률 시스템으로 더 현실적인 분포 구현
-        random_val = (hash_val % 10000) / 10000.0  # 0.0000 - 0.9999
         
-        if random_val < 0.35:    # 35% - 1.0x ~ 1.5x (낮은 배수, 높은 확률)
-            multiplier = 1.0 + (random_val / 0.35) * 0.5
-        elif random_val < 0.60:  # 25% - 1.5x ~ 2.5x (중간 배수)  
-            multiplier = 1.5 + ((random_val - 0.35) / 0.25) * 1.0
-        elif random_val < 0.80:  # 20% - 2.5x ~ 5.0x (높은 배수)
-            multiplier = 2.5 + ((random_val - 0.60) / 0.20) * 2.5
-        elif random_val < 0.95:  # 15% - 5.0x ~ 10.0x (매우 높은 배수)
-            multiplier = 5.0 + ((random_val - 0.80) / 0.15) * 5.0
-        else:                   # 5% - 10.0x ~ 50.0x (잭팟 배수)
-            multiplier = 10.0 + ((random_val - 0.95) / 0.05) * 40.0
-            
-        # 하우스 엣지 적용 (약 5% 하우스 수수료)
-        multiplier = max(1.01, multiplier * 0.95)
-        
-        # 소수점 둘째 자리로 반올림
-        multiplier = round(multiplier, 2)
+        # 5단계 확률 시스템 + 하우스 엣지 (공유 라운드 엔진과 동일 분포)
+        random_val = game_math.crash_uniform_from_seed(seed)  # 0.0000 - 0.9999
+        multiplier = crash_point_from_uniform(random_val)
 
         # 잔액 차감
         user_row.gold_balance -= bet_amount
         if user_row.gold_balance < 0:
             user_row.gold_balance = 0
 
-        win_amount = 0
-        status = "placed"
-        
-        # 자동 캐시아웃 로직 - 중복 당첨 방지
-        if auto_cashout_multiplier and multiplier >= auto_cashout_multiplier:
-            # 자동 캐시아웃 성공 - 한 번만 당첨 처리
-            net_win = int(bet_amount * (auto_cashout_multiplier - 1.0))  # 순이익만 계산
-            win_amount = net_win
-            user_row.gold_balance += net_win  # 순이익만 추가
-            status = "auto_cashed"
-        else:
-            # 크래시 발생 - 손실
-            status = "crashed"
+        # 자동 캐시아웃 로직 - 중복 당첨 방지 (성공 시 순이익만 추가, 실패 시 crashed)
+        win_amount, status = game_math.crash_auto_cashout_win(bet_amount, auto_cashout_multiplier, multiplier)
+        user_row.gold_balance += win_amount
 
         new_balance = user_row.gold_balance
 
@@ -1330,6 +1291,117 @@ async def place_crash_bet(
         'simulated_max_win': simulated_max_win,
     }
 
+# -------------------------------------------------------------------------
+# 공유 라운드 크래시 (멀티플레이어): 샤드별 라운드 루프 1개 + 틱 스트림 + 일괄 정산
+class CrashRoundBetRequest(BaseModel):
+    bet_amount: int
+    auto_cashout_multiplier: Optional[float] = None
+
+
+def _crash_engine_for(user_id: int):
+    from ..services.crash_round_engine import get_crash_engines
+    engine = get_crash_engines().for_user(user_id)
+    if engine.current is None:
+        raise HTTPException(status_code=503, detail="크래시 라운드 엔진이 실행 중이 아닙니다")
+    return engine
+
+
+@router.get("/crash/rounds/current")
+async def get_crash_round(current_user: User = Depends(get_current_user)):
+    engine = _crash_engine_for(current_user.id)
+    state = engine.current.public_state()
+    entry = engine.current.book.get(current_user.id)
+    state["my_bet"] = None if entry is None else {
+        "bet_amount": entry.bet_amount,
+        "auto_cashout": entry.auto_cashout,
+        "cashed_at": entry.cashed_at,
+    }
+    return state
+
+
+@router.post("/crash/rounds/bet")
+async def place_crash_round_bet(
+    request: CrashRoundBetRequest,
+    current_user: User = Depends(get_current_user),
+):
+    """현재 라운드 베팅북에 접수 (베팅액 즉시 차감, 지급은 크래시 시 일괄 정산)."""
+    from ..core.config import settings as _settings
+    from ..services.crash_round_engine import CrashInsufficientFunds, CrashRoundError
+    MIN_BET = int(getattr(_settings, "CRASH_MIN_BET", 10))
+    MAX_BET = int(getattr(_settings, "CRASH_MAX_BET", 100_000))
+    MIN_CASHOUT = float(getattr(_settings, "CRASH_MIN_AUTO_CASHOUT", 1.01))
+    MAX_CASHOUT = float(getattr(_settings, "CRASH_MAX_AUTO_CASHOUT", 100.0))
+    if request.bet_amount < MIN_BET or request.bet_amount > MAX_BET:
+        raise HTTPException(status_code=400, detail=f"베팅 금액은 {MIN_BET}~{MAX_BET} 사이여야 합니다")
+    am = request.auto_cashout_multiplier
+    if am is not None and (math.isnan(am) or am < MIN_CASHOUT or am > MAX_CASHOUT):
+        raise HTTPException(status_code=400, detail=f"자동 캐시아웃 배수는 {MIN_CASHOUT}~{MAX_CASHOUT} 사이여야 합니다")
+    engine = _crash_engine_for(current_user.id)
+    try:
+        rnd = engine.place_bet(current_user.id, request.bet_amount, am)
+    except CrashInsufficientFunds as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except CrashRoundError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return {"success": True, "round_id": rnd.round_id, "shard": rnd.shard, "betting_ends_at": rnd.betting_ends_at}
+
+
+@router.post("/crash/rounds/cashout")
+async def cashout_crash_round(current_user: User = Depends(get_current_user)):
+    from ..services.crash_round_engine import CrashRoundError
+    engine = _crash_engine_for(current_user.id)
+    try:
+        m = engine.cash_out(current_user.id)
+    except CrashRoundError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    entry = engine.current.book[current_user.id]
+    return {"success": True, "round_id": engine.current.round_id, "cashout_multiplier": m,
+            "payout": int(entry.bet_amount * m)}
+
+
+@router.websocket("/ws/crash")
+async def crash_round_ws(websocket: WebSocket, token: Optional[str] = None):
+    """라운드 틱 스트림 구독 (사용자 샤드 토픽)."""
+    from ..services.auth_service import AuthService  # type: ignore
+    from ..database import SessionLocal  # type: ignore
+    from ..realtime import hub
+    from ..services.crash_round_engine import get_crash_engines
+    await websocket.accept()
+    topic = None
+    try:
+        if token is None:
+            auth = websocket.headers.get("authorization") or websocket.headers.get("Authorization")
+            if auth and auth.lower().startswith("bearer "):
+                token = auth.split()[1]
+        if not token:
+            await websocket.close(code=4401)
+            return
+        # 토큰 검증에만 세션 사용 → 구독 루프 동안 커넥션 풀 점유하지 않도록 즉시 반환
+        with SessionLocal() as db:
+            token_data = AuthService.verify_token(token, db=db)
+        engine = get_crash_engines().for_user(token_data.user_id)
+        topic = engine.topic
+        await hub.subscribe(topic, websocket)
+        if engine.current is not None:
+            await websocket.send_json({"type": "crash_round", **engine.current.public_state()})
+        while True:
+            try:
+                _ = await websocket.receive_text()
+            except WebSocketDisconnect:
+                break
+            except Exception:
+                break
+    finally:
+        if topic:
+            try:
+                await hub.unsubscribe(topic, websocket)
+            except Exception:
+                pass
+        try:
+            await websocket.close()
+        except Exception:
+            pass
+
 # -------------------------------------------------------------------------
 # Server-authoritative per-user aggregated crash stats (user_game_stats)
 @router.get("/stats/me")
@@ -1368,18 +1440,23 @@ def get_game_stats(user_id: int, db: Session = Depends(get_db)):
 
     # TODO: 보상 테이블 존재 여부 검증 후 reward 집계 로직 조정 필요
     total_coins_won = 0
-    total_gold_won = 0
     special_items_won = 0
-    jackpots_won = db.query(models.UserAction).filter(
-        models.UserAction.user_id == user_id,
-        models.UserAction.action_data.contains('jackpot')
-    ).count()
+    # 타입 컬럼(game_type/result/bet/win) 게임별 집계 1쿼리 — action_data 파싱 없음
+    summaries = summarize_games(db, user_id).values()
+    plays = sum(s.plays for s in summaries)
+    total_gold_won = sum(s.win_total for s in summaries)
+    total_bet = sum(s.bet_total for s in summaries)
+    win_rate = round(sum(s.wins for s in summaries) / plays, 4) if plays else 0.0
+    # 타입 컬럼 is_jackpot (부분 인덱스) — action_data LIKE '%jackpot%' 는 "is_jackpot": false 까지 매칭
+    jackpots_won = count_jackpots(db, user_id)
 
     return GameStats(
         user_id=user_id,
         total_spins=total_spins,
         total_coins_won=total_coins_won,
         total_gold_won=total_gold_won,
+        total_bet=total_bet,
+        win_rate=win_rate,
         special_items_won=special_items_won,
         jackpots_won=jackpots_won,
         bonus_spins_won=0,
@@ -1418,39 +1495,36 @@ def get_profile_game_stats(user_id: int, db: Session = Depends(get_db)):
         current_session=None
     )
 
-@router.get("/leaderboard", response_model=List[GameLeaderboard])
-def get_game_leaderboard(game_type: Optional[str] = None, limit: int = 10, db: Session = Depends(get_db)):
-    """게임별 또는 전체 리더보드"""
-    if game_type:
-        leaderboard_query = db.query(
-            models.User.id,
-            models.User.nickname,
-            db.func.count(models.UserAction.id).label('score')
-        ).join(
-            models.UserAction, models.User.id == models.UserAction.user_id
-        ).filter(
-            models.UserAction.action_type == game_type
-        ).group_by(
-            models.User.id, models.User.nickname
-        ).order_by(db.text('score DESC')).limit(limit).all()
-    else:
-        leaderboard_query = db.query(
-            models.User.id,
-            models.User.nickname,
-            models.User.total_spent.label('score')
-        ).order_by(models.User.total_spent.desc()).limit(limit).all()
-
-    results: List[GameLeaderboard] = []
-    # NOTE: GameLeaderboard 스키마 구조 조정 필요할 수 있음 (현재 정의와 불일치 가능)
-    for rank, (user_id, nickname, score) in enumerate(leaderboard_query, 1):
-        results.append(GameLeaderboard(
-            game_type=game_type or 'overall',
-            period='daily',
-            entries=[],  # 간단화 - 상세 항목 분리 가능
-            user_rank=rank,
-            updated_at=datetime.utcnow()
-        ))
-    return results
+@router.get("/leaderboard", response_model=GameLeaderboard)
+def get_game_leaderboard(
+    game_type: Optional[str] = None,
+    period: str = Query("daily", pattern="^(daily|weekly|alltime)$"),
+    limit: int = Query(10, ge=1, le=100),
+    around: int = Query(0, ge=0, le=50, description="내 순위 ± around 명 (로그인 시)"),
+    db: Session = Depends(get_db),
+    current_user: Optional[User] = Depends(get_current_user_optional),
+):
+    """게임별 (game_type 생략 시 코인 게임 합산) 기간 리더보드 — Redis ZSET 상위 N + 내 순위 ± k"""
+    board = game_type or leaderboard_service.OVERALL
+    user_id = getattr(current_user, "id", None)
+    view = leaderboard_service.view(db, board, period, limit=limit, user_id=user_id, k=around)
+    ids = {uid for _, uid, _ in view.top} | {uid for _, uid, _ in view.around}
+    nicknames = dict(db.query(models.User.id, models.User.nickname).filter(models.User.id.in_(ids)).all()) if ids else {}
+
+    def _entries(rows):
+        return [LeaderboardEntry(rank=rank, user_id=uid, nickname=nicknames.get(uid) or "", score=score)
+                for rank, uid, score in rows]
+
+    return GameLeaderboard(
+        game_type=game_type or "overall",
+        period=period,
+        bucket=view.bucket,
+        entries=_entries(view.top),
+        user_rank=view.user_rank,
+        user_score=view.user_score,
+        around=_entries(view.around),
+        updated_at=datetime.utcnow(),
+    )
 
 @router.get("/achievements/{user_id}", response_model=List[Achievement])
 def get_user_achievements(user_id: int, db: Session = Depends(get_db)):
@@ -1473,19 +1547,9 @@ def get_user_achievements(user_id: int, db: Session = Depends(get_db)):
 from uuid import uuid4
 
 def calculate_user_streak(user_id: int, db: Session) -> int:
-    today = datetime.utcnow().date()
-    streak = 0
-    for i in range(30):
-        check_date = today - timedelta(days=i)
-        activity = db.query(models.UserAction).filter(
-            models.UserAction.user_id == user_id,
-            func.date(models.UserAction.created_at) == check_date
-        ).first()
-        if activity:
-            streak += 1
-        else:
-            break
-    return streak
+    """오늘까지 연속 활동 일수 (ACTIVE 비트맵, BITFIELD 1회 — 일자별 user_actions 조회 대체)."""
+    from ..services import attendance_service
+    return attendance_service.streak(user_id, attendance_service.ACTIVE)
 
 # --------------------------- GameHistory 조회 엔드포인트 ---------------------------
 @router.get("/history", response_model=GameHistoryListResponse)
@@ -1495,6 +1559,8 @@ def get_game_history(
     since: Optional[str] = None,
     limit: int = 50,
     offset: int = 0,
+    cursor: Optional[str] = None,
+    include_total: Optional[bool] = None,
     current_user: models.User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -1504,10 +1570,13 @@ def get_game_history(
       - game_type, action_type (정확 일치)
       - since (ISO8601 문자열) 이후
     페이지네이션:
-      - limit / offset
-    정렬: 최신(created_at desc)
+      - cursor 지정(또는 offset=0) 시 keyset 모드: 응답의 next_cursor 를 다음 요청에 전달
+      - limit / offset (호환 모드)
+      - include_total: COUNT(*) 포함 여부 (기본: offset 모드 True, cursor 모드 False)
+    정렬: 최신(created_at desc, id desc)
     """
     from ..models.history_models import GameHistory
+    from ..utils.pagination import keyset_page, InvalidCursor
     q = db.query(GameHistory).filter(GameHistory.user_id == current_user.id)
     if game_type:
         q = q.filter(GameHistory.game_type == game_type)
@@ -1519,12 +1588,21 @@ def get_game_history(
             q = q.filter(GameHistory.created_at >= dt)
         except ValueError:
             raise HTTPException(status_code=400, detail="since 형식이 잘못되었습니다(ISO8601)")
-    total = q.count()
-    items = q.order_by(GameHistory.created_at.desc()).limit(min(limit, 200)).offset(offset).all()
+    limit = max(1, min(limit, 200))
+    if include_total is None:
+        include_total = cursor is None
+    total = q.count() if include_total else None
+    if cursor is not None or offset == 0:
+        try:
+            items, next_cursor = keyset_page(q, GameHistory.created_at, GameHistory.id, limit=limit, cursor=cursor)
+        except InvalidCursor:
+            raise HTTPException(status_code=400, detail="cursor 형식이 잘못되었습니다")
+        return GameHistoryListResponse(total=total, items=items, limit=limit, offset=0, next_cursor=next_cursor)
+    items = q.order_by(GameHistory.created_at.desc(), GameHistory.id.desc()).limit(limit).offset(offset).all()
     return GameHistoryListResponse(
         total=total,
         items=items,
-        limit=min(limit,200),
+        limit=limit,
         offset=offset
     )
 
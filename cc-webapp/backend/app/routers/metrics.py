@@ -6,6 +6,7 @@ Endpoint:
   GET /api/metrics/global -> GlobalMetricsResponse
 
 Cache Key: metrics:global:v1  (TTL=5s)
+Source: app.services.live_metrics_service 슬라이딩 윈도우 카운터 (테이블 스캔 없음)
 
 Notes:
 - Only aggregates non-personal, platform-wide counts.
@@ -17,16 +18,13 @@ from fastapi import APIRouter, Depends
 from fastapi.responses import StreamingResponse
 import asyncio
 from pydantic import BaseModel, Field
-from sqlalchemy import select, func, text
 from sqlalchemy.orm import Session
-from datetime import datetime, timedelta
-import os
+from datetime import datetime
 import typing as t
 
 from app.database import get_db
 from app.utils.redis import RedisManager
-from app.models.auth_models import UserSession
-from app.models import UserAction, UserReward
+from app.services.live_metrics_service import get_live_metrics, SLOT_SPINS, BIG_WINS
 
 router = APIRouter(prefix="/api/metrics", tags=["Metrics"])
 
@@ -62,27 +60,16 @@ def get_global_metrics(db: Session = Depends(get_db)) -> GlobalMetricsResponse:
                 pass  # fall through to recompute
 
     now = datetime.utcnow()
-    one_hour_ago = now - timedelta(hours=1)
 
-    # online users: sessions active within last 5 minutes (last_used_at or last_seen field)
-    online_q = select(func.count(func.distinct(UserSession.user_id))).where(
-        (UserSession.last_used_at != None) & (UserSession.last_used_at > now - timedelta(minutes=5))
-    )
-    online_users = db.execute(online_q).scalar() or 0
-
-    # spins_last_hour: count of UserAction where action_type='SLOT_SPIN' in last hour
-    spins_q = select(func.count()).select_from(UserAction).where(
-        (UserAction.action_type == 'SLOT_SPIN') & (UserAction.created_at > one_hour_ago)
-    )
-    spins_last_hour = db.execute(spins_q).scalar() or 0
-
-    # big_wins_last_hour: rewards above threshold in last hour (configurable)
-    # NOTE: UserReward does not have 'created_at' or 'amount_gold'. Use 'claimed_at' and 'gold_amount'.
-    threshold = int(os.getenv("BIG_WIN_THRESHOLD_GOLD", "1000"))
-    big_wins_q = select(func.count()).select_from(UserReward).where(
-        (UserReward.claimed_at > one_hour_ago) & (UserReward.gold_amount != None) & (UserReward.gold_amount > threshold)
-    )
-    big_wins_last_hour = db.execute(big_wins_q).scalar() or 0
+    # O(1) 라이브 카운터 조회 (이벤트 공급 + 주기적 DB 동기화)
+    #  - online_users: 최근 5분 로그인/세션 갱신 distinct (HLL)
+    #  - spins_last_hour: SLOT_SPIN 액션 60분 버킷 합
+    #  - big_wins_last_hour: BIG_WIN_THRESHOLD_GOLD 초과 보상 60분 버킷 합
+    live = get_live_metrics()
+    live.ensure_synced(db)
+    online_users = live.online_users(5)
+    spins_last_hour = live.window_total(SLOT_SPINS, 60)
+    big_wins_last_hour = live.window_total(BIG_WINS, 60)
 
     resp = GlobalMetricsResponse(
         online_users=int(online_users),
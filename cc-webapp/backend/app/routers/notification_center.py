@@ -13,6 +13,7 @@ from ..dependencies import get_current_user
 from ..models.auth_models import User
 from .. import models
 from ..services.notification_service import NotificationService
+from ..utils.pagination import InvalidCursor
 from ..utils.redis import RedisManager
 from ..core.config import settings
 
@@ -37,8 +38,9 @@ class NotificationItem(BaseModel):
 
 class NotificationListResponse(BaseModel):
     items: List[NotificationItem]
-    total: int
+    total: Optional[int] = None
     unread: int
+    next_cursor: Optional[str] = None
 
 
 # ----------------------
@@ -61,20 +63,39 @@ async def list_notifications(
     limit: int = Query(50, ge=1, le=200),
     offset: int = Query(0, ge=0),
     type: Optional[str] = Query(None, alias="notification_type"),
+    cursor: Optional[str] = Query(None, description="keyset cursor (next_cursor of the previous page)"),
+    include_total: Optional[bool] = Query(None, description="include COUNT(*) (default: true in offset mode only)"),
     current_user: User = Depends(get_current_user),
     service: NotificationService = Depends(get_service),
 ):
-    items, total = service.list_notifications(
-        user_id=current_user.id,
-        limit=limit,
-        offset=offset,
-        only_unread=only_unread,
-        notification_type=type,
-    )
+    if cursor is not None or offset == 0:
+        try:
+            items, total, next_cursor = service.list_notifications_page(
+                user_id=current_user.id,
+                limit=limit,
+                cursor=cursor,
+                only_unread=only_unread,
+                notification_type=type,
+                include_total=cursor is None if include_total is None else include_total,
+            )
+        except InvalidCursor:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+    else:
+        items, total = service.list_notifications(
+            user_id=current_user.id,
+            limit=limit,
+            offset=offset,
+            only_unread=only_unread,
+            notification_type=type,
+        )
+        next_cursor = None
+        if include_total is False:
+            total = None
     return NotificationListResponse(
         items=[NotificationItem.model_validate(n) for n in items],
         total=total,
         unread=service.unread_count(current_user.id),
+        next_cursor=next_cursor,
     )
 
 
@@ -112,6 +133,16 @@ async def unread_count(
     return {"count": service.unread_count(current_user.id)}
 
 
+@router.get("/inbox")
+async def inbox(
+    limit: int = Query(10, ge=1, le=20),
+    current_user: User = Depends(get_current_user),
+    service: NotificationService = Depends(get_service),
+):
+    """최신 알림 N건 + 미읽음 수 (배지/드롭다운 폴링용, 캐시 기반)."""
+    return {"items": service.latest(current_user.id, limit), "unread": service.unread_count(current_user.id)}
+
+
 @router.get("/settings/auth", response_model=NotificationSettings)
 async def get_settings_auth(
     current_user: User = Depends(get_current_user),
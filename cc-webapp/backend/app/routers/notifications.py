@@ -1,4 +1,4 @@
-from typing import Optional, Set, List, Dict, Any
+from typing import Optional, Set, Dict, Any
 import asyncio
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Request
@@ -7,27 +7,37 @@ from pydantic import BaseModel
 
 """Notifications router
 
-기존 manager.enqueue / register_sse 구조를 단순화된 hub 브로드캐스트로 점진 전환.
-필요 메서드 미존재 시 No-op Fallback 구성.
+기존 manager.enqueue / register_sse 호출부는 유지하고 발행/보관/재전송은
+services/notification_stream (사용자별 단조 증가 id 스트림)에 위임한다.
+재접속 시 SSE 는 ``Last-Event-ID``, WS 는 ``since`` 커서 이후 이벤트만 재전송.
 """
+from ..services import notification_stream
+
 try:  # pragma: no cover
     from ..realtime import hub as _hub  # type: ignore
 except Exception:  # pragma: no cover
     _hub = None
 
+
+def _parse_cursor(value: Optional[str]) -> Optional[int]:
+    try:
+        return int(value) if value not in (None, "") else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _wanted(ev: Dict[str, Any], topics: Optional[Set[str]]) -> bool:
+    # resync 지시는 토픽 필터와 무관하게 항상 전달
+    return not topics or ev.get("topic") in topics or ev.get("topic") == notification_stream.RESYNC_TOPIC
+
+
 class _LegacyCompatManager:
-    """이전 manager API를 참조하는 기존 코드 호환을 위한 최소 wrapper.
-    SSE/WS 개별 큐 없이 hub.broadcast 로 대체 (MVP 용)
-    """
+    """이전 manager API 호환 wrapper — 발행/재전송은 notification_stream 에 위임."""
     async def connect_ws(self, websocket, user_id: int, topics=None):  # noqa: D401
         await websocket.accept()
 
     def disconnect(self, user_id: int, websocket):  # noqa: D401
-        try:
-            # nothing
-            pass
-        except Exception:
-            pass
+        return None
 
     async def update_ws_topics(self, user_id: int, websocket, topics):
         return None
@@ -35,16 +45,17 @@ class _LegacyCompatManager:
     async def touch_ws(self, user_id: int, websocket):
         return None
 
+    async def enqueue(self, user_id: int, message: Any, priority: int = 0, topic: Optional[str] = None):
+        return notification_stream.publish(user_id, message, topic=topic, priority=priority)
+
     def get_backfill(self, user_id: int, last_event_id):
-        return []
+        return notification_stream.replay(user_id, last_event_id).events
 
     async def register_sse(self, user_id: int):
-        import asyncio
-        q: asyncio.Queue = asyncio.Queue()
-        return q
+        return notification_stream.subscribe(user_id)
 
     async def unregister_sse(self, user_id: int, q):
-        return None
+        notification_stream.unsubscribe(q)
 
 manager = _LegacyCompatManager()
 
@@ -59,29 +70,24 @@ async def websocket_endpoint(websocket: WebSocket, user_id: int):
 
     Query params:
       - topics: comma-separated list of topics to subscribe to (optional)
-      - lastEventId: initial backfill id
+      - since: 마지막으로 받은 이벤트 id (재접속 시 그 이후분만 재전송; 구 ``lastEventId`` 도 허용)
     """
     topics_param = websocket.query_params.get("topics")
     topics: Optional[Set[str]] = set(
         t.strip() for t in topics_param.split(",") if t.strip()
     ) if topics_param else None
+    since = _parse_cursor(websocket.query_params.get("since") or websocket.query_params.get("lastEventId"))
+    state: Dict[str, Any] = {"topics": topics}
 
     await manager.connect_ws(websocket, user_id, topics=topics)
-    # Optional backfill for WS via query param lastEventId
-    last_event_id_param = websocket.query_params.get("lastEventId")
-    if last_event_id_param:
-        try:
-            last_event_id = int(last_event_id_param)
-            for ev in list(manager.get_backfill(user_id, last_event_id)):
-                if topics and ev.get("topic") not in topics:
-                    continue
-                try:
-                    await websocket.send_json(ev)
-                except Exception:
-                    break
-        except Exception:
-            # best-effort, ignore parsing errors
-            pass
+
+    async def _pump():
+        async for ev in notification_stream.follow(user_id, since):
+            if ev is None or not _wanted(ev, state["topics"]):
+                continue
+            await websocket.send_json(ev)
+
+    pump = asyncio.create_task(_pump())
     try:
         while True:
             # Wait for client messages with keepalive handling
@@ -98,12 +104,12 @@ async def websocket_endpoint(websocket: WebSocket, user_id: int):
                 t = str(msg.get("type", "ping")).lower()
                 if t == "subscribe":
                     new_topics = set(map(str, msg.get("topics", []) or []))
-                    topics = (topics or set()) | new_topics
-                    await manager.update_ws_topics(user_id, websocket, topics)
+                    state["topics"] = (state["topics"] or set()) | new_topics
+                    await manager.update_ws_topics(user_id, websocket, state["topics"])
                 elif t == "unsubscribe":
                     remove_topics = set(map(str, msg.get("topics", []) or []))
-                    topics = (topics or set()) - remove_topics
-                    await manager.update_ws_topics(user_id, websocket, topics)
+                    state["topics"] = (state["topics"] or set()) - remove_topics
+                    await manager.update_ws_topics(user_id, websocket, state["topics"])
                 # else ping/noop
                 await manager.touch_ws(user_id, websocket)
             except WebSocketDisconnect:
@@ -113,6 +119,8 @@ async def websocket_endpoint(websocket: WebSocket, user_id: int):
                 await asyncio.sleep(0)
     except WebSocketDisconnect:
         manager.disconnect(user_id, websocket)
+    finally:
+        pump.cancel()
 
 
 # SSE router
@@ -133,49 +141,22 @@ def _format_sse(event: Dict[str, Any]) -> str:
 
 @sse_router.get("/notifications/{user_id}")
 async def sse_notifications(request: Request, user_id: int, topics: Optional[str] = None):
-    """SSE notifications stream for a user with topic filter and backfill support."""
+    """SSE notifications stream for a user with topic filter and ``Last-Event-ID`` resume."""
     topic_set: Optional[Set[str]] = set(t.strip() for t in topics.split(",") if t.strip()) if topics else None
-    last_event_id: Optional[int] = None
-    try:
-        lei = request.headers.get("Last-Event-ID")
-        if lei is not None:
-            last_event_id = int(lei)
-    except Exception:
-        last_event_id = None
+    last_event_id = _parse_cursor(request.headers.get("Last-Event-ID"))
 
     async def event_generator():
-        q = await manager.register_sse(user_id)
-
+        stream = notification_stream.follow(user_id, last_event_id)
         try:
-            for ev in list(manager.get_backfill(user_id, last_event_id)):
-                if topic_set and ev.get("topic") not in topic_set:
-                    continue
-                yield _format_sse(ev)
-        except Exception:
-            pass
-
-        try:
-            while True:
-                try:
-                    priority, ev = await asyncio.wait_for(q.get(), timeout=15.0)
-                    if topic_set and ev.get("topic") not in topic_set:
-                        continue
-                    batch: List[str] = [_format_sse(ev)]
-                    for _ in range(49):
-                        try:
-                            priority2, ev2 = q.get_nowait()
-                            if topic_set and ev2.get("topic") not in topic_set:
-                                continue
-                            batch.append(_format_sse(ev2))
-                        except Exception:
-                            break
-                    yield "".join(batch)
-                except asyncio.TimeoutError:
+            async for ev in stream:
+                if ev is None:
                     yield ": ping\n\n"
+                elif _wanted(ev, topic_set):
+                    yield _format_sse(ev)
                 if await request.is_disconnected():
                     break
         finally:
-            await manager.unregister_sse(user_id, q)
+            await stream.aclose()
 
     return StreamingResponse(event_generator(), media_type="text/event-stream")
 
@@ -199,10 +180,9 @@ async def send_notification(user_id: int, body: SendNotificationRequest):
 @api_router.get("/{user_id}/backfill")
 async def get_backfill(user_id: int, since: Optional[int] = None, topics: Optional[str] = None):
     topic_set: Optional[Set[str]] = set(t.strip() for t in topics.split(",") if t.strip()) if topics else None
-    buf = list(manager.get_backfill(user_id, since))
-    if topic_set:
-        buf = [e for e in buf if e.get("topic") in topic_set]
-    return {"count": len(buf), "items": buf[-200:]}
+    rep = notification_stream.replay(user_id, since)
+    buf = [e for e in rep.events if not topic_set or e.get("topic") in topic_set]
+    return {"count": len(buf), "items": buf[-200:], "latest": rep.latest, "truncated": rep.truncated}
 
 
 __all__ = ["router", "sse_router", "api_router"]
@@ -3,7 +3,7 @@ from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
 from typing import List, Dict
 
-from ..services.quiz_service import QuizService
+from ..services.quiz_service import SUBMIT_DEFAULT_PROFILE, QuizService
 from ..database import get_db
 
 router = APIRouter(
@@ -23,7 +23,7 @@ def get_quiz_details(quiz_id: int, quiz_service: QuizService = Depends(get_quiz_
     Get the details, questions, and answers for a specific quiz.
     """
     try:
-        quiz = quiz_service.get_quiz(quiz_id)
+        quiz = quiz_service.get_definition(quiz_id)
         # A proper response model should be used here, but for now, we return a dict
         return {
             "id": quiz.id,
@@ -51,10 +51,14 @@ def submit_quiz_answers(
     Submit answers for a quiz and get the resulting risk profile.
     """
     try:
-        attempt = quiz_service.submit_answers(
+        # 기존 계약 유지: 잘못된 문항/보기는 무시, 시도 횟수 제한 없음, 기준 미달은 "Low-Risk"
+        attempt = quiz_service.submit_all(
             user_id=user_id,
             quiz_id=quiz_id,
-            answers=request.answers
+            answers=request.answers,
+            strict=False,
+            enforce_limits=False,
+            default_profile=SUBMIT_DEFAULT_PROFILE,
         )
         return {
             "message": "Quiz submitted successfully!",
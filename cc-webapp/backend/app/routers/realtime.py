@@ -12,6 +12,7 @@ UI 상단 헤더, 프로필, 통계 등의 실시간 반영 담당
 """
 
 import asyncio
+import json
 import logging
 from typing import Optional, Dict, Any, List
 from fastapi import APIRouter, Depends, WebSocket, WebSocketDisconnect
@@ -22,6 +23,7 @@ from ..models.auth_models import User
 from ..dependencies import get_current_user
 from ..services.auth_service import AuthService
 from ..realtime.hub import hub
+from ..realtime.snapshot import sync_snapshots
 
 logger = logging.getLogger(__name__)
 
@@ -32,8 +34,11 @@ router = APIRouter(prefix="/api/realtime", tags=["Realtime Sync"])
 async def user_sync_websocket(
     websocket: WebSocket,
     token: Optional[str] = None,
+    since: Optional[int] = None,
 ):
     """사용자별 실시간 동기화 WebSocket
+
+    since: 재접속 클라이언트의 마지막 수신 스냅샷 버전 → 이후 변경분만 sync_delta 로 전송
     
     전송 이벤트 타입:
     - profile_update: 골드, 레벨, 경험치 등 기본 프로필 변경
@@ -42,6 +47,7 @@ async def user_sync_websocket(
     - event_progress: 이벤트 참여/진행 상태 변경
     - reward_granted: 보상 지급 알림
     - stats_update: 게임 통계 업데이트
+    - initial_state / sync_delta: 접속(또는 resync 요청) 시 스냅샷 전체 / 변경분 (version 포함)
     """
     from ..services.auth_service import AuthService
     
@@ -78,14 +84,10 @@ async def user_sync_websocket(
             "timestamp": asyncio.get_event_loop().time()
         })
         
-        # 초기 상태 전송
-        initial_state = await get_user_sync_state(user.id, db)
-        await websocket.send_json({
-            "type": "initial_state",
-            **initial_state
-        })
+        # 초기 상태 전송 (since 지정 시 그 이후 변경분만)
+        await websocket.send_json(await get_user_sync_message(user.id, db, since))
         
-        # 연결 유지 및 ping 처리
+        # 연결 유지 및 ping / resync 처리
         while True:
             try:
                 message = await websocket.receive_text()
@@ -93,6 +95,15 @@ async def user_sync_websocket(
                 if message == "ping":
                     await websocket.send_text("pong")
                     continue
+                # {"type": "resync", "since": <version>} → 변경분 재전송
+                try:
+                    payload = json.loads(message)
+                except ValueError:
+                    continue
+                if isinstance(payload, dict) and payload.get("type") == "resync":
+                    since_v = payload.get("since")
+                    await websocket.send_json(await get_user_sync_message(
+                        user.id, db, since_v if isinstance(since_v, int) else None))
             except WebSocketDisconnect:
                 break
             except Exception as e:
@@ -116,59 +127,34 @@ async def user_sync_websocket(
 
 
 async def get_user_sync_state(user_id: int, db: Session) -> Dict[str, Any]:
-    """사용자 초기 동기화 상태 데이터 수집"""
+    """사용자 초기 동기화 상태 (스냅샷 캐시 HGETALL 1회, 미존재 시 DB 에서 생성)"""
     try:
-        user = db.query(User).filter(User.id == user_id).first()
-        if not user:
+        state = sync_snapshots.get(user_id, db)
+        if state is None:
             return {}
-            
-        # 기본 프로필 데이터
-        profile_data = {
-            "user_id": user.id,
-            "gold_balance": getattr(user, 'gold_balance', 0),
-            "level": getattr(user, 'battlepass_level', 1) or 1,
-            "experience": getattr(user, 'total_experience', 0) or 0,
-            "vip_points": getattr(user, 'vip_points', 0) or 0,
-            "rank": getattr(user, 'user_rank', 'STANDARD'),
-        }
-        
-        # Redis에서 스트릭 정보 가져오기
-        streak_data = {}
-        try:
-            from ..utils.redis import get_streak_counter
-            streak_count = get_streak_counter(str(user.id), "SLOT_SPIN")
-            streak_data = {
-                "streak_count": streak_count,
-                "action_type": "SLOT_SPIN"
-            }
-        except Exception as e:
-            logger.warning(f"Failed to get streak data for user {user_id}: {e}")
-            
-        # 업적 진행도 (간단한 카운트만)
-        achievement_data = {}
-        try:
-            from ..services.achievement_service import AchievementService
-            achievement_service = AchievementService(db)
-            progress = achievement_service.user_progress(user.id)
-            achievement_data = {
-                "total_achievements": len(progress),
-                "unlocked_count": len([p for p in progress if p.get("unlocked", False)])
-            }
-        except Exception as e:
-            logger.warning(f"Failed to get achievement data for user {user_id}: {e}")
-            
-        return {
-            "profile": profile_data,
-            "streak": streak_data,
-            "achievements": achievement_data,
-            "timestamp": asyncio.get_event_loop().time()
-        }
-        
+        return {**state.full(), "timestamp": asyncio.get_event_loop().time()}
     except Exception as e:
         logger.error(f"Error getting sync state for user {user_id}: {e}")
         return {}
 
 
+async def get_user_sync_message(user_id: int, db: Session, since: Optional[int] = None) -> Dict[str, Any]:
+    """since(클라이언트 마지막 수신 버전) 이후 변경분만 담은 sync_delta, 불가하면 initial_state 전체"""
+    state = sync_snapshots.get(user_id, db)
+    if state is None:
+        return {"type": "initial_state"}
+    changes = state.delta(since)
+    if changes is None:
+        return {"type": "initial_state", **state.full(), "timestamp": asyncio.get_event_loop().time()}
+    return {
+        "type": "sync_delta",
+        "since": since,
+        "version": state.version,
+        "changes": changes,
+        "timestamp": asyncio.get_event_loop().time(),
+    }
+
+
 # 브로드캐스트 헬퍼 함수들
 async def broadcast_profile_update(user_id: int, changes: Dict[str, Any]) -> None:
     """프로필 변경 브로드캐스트"""
@@ -10,6 +10,7 @@ from pydantic import BaseModel, Field
 from app.database import get_db
 from app.dependencies import get_current_user, get_current_admin_user as get_current_admin
 from app import models
+from app.services.job_service import get_job_service
 from datetime import datetime, timedelta
 import json
 
@@ -158,85 +159,20 @@ def update_user_segment(
     )
 
 # 4. Calculate RFM Segments
-@router.post("/calculate-rfm")
+@router.post("/calculate-rfm", status_code=status.HTTP_202_ACCEPTED)
 def calculate_rfm_segments(
     days: int = Query(90, description="Number of days to analyze for RFM calculation"),
     current_user: models.User = Depends(get_current_admin),
-    db: Session = Depends(get_db)
 ):
     """
     Recalculate RFM segments for all users
-    Admin only endpoint for batch segment updates
+    Admin only endpoint - enqueues a chunked background job; poll /api/admin/jobs/{job_id}
     """
-    cutoff_date = datetime.now() - timedelta(days=days)
-    
-    # Get all users with activity in the specified period
-    users_with_activity = db.query(
-        models.UserAction.user_id,
-        db.func.max(models.UserAction.created_at).label('last_activity'),
-        db.func.count(models.UserAction.id).label('frequency'),
-        db.func.sum(models.User.total_spent).label('monetary')
-    ).join(
-        models.User, models.UserAction.user_id == models.User.id
-    ).filter(
-        models.UserAction.created_at >= cutoff_date
-    ).group_by(models.UserAction.user_id).all()
-    
-    updated_count = 0
-    
-    for user_id, last_activity, frequency, monetary in users_with_activity:
-        # Calculate RFM scores
-        recency_days = (datetime.now() - last_activity).days
-        
-        # Simple RFM scoring (can be enhanced with more sophisticated algorithms)
-        if recency_days <= 7 and frequency >= 20 and (monetary or 0) >= 100:
-            rfm_group = "WHALE"
-            ltv_score = 100.0
-            risk_profile = "LOW"
-        elif recency_days <= 14 and frequency >= 10 and (monetary or 0) >= 50:
-            rfm_group = "HIGH_VALUE"
-            ltv_score = 75.0
-            risk_profile = "LOW"
-        elif recency_days <= 30 and frequency >= 5:
-            rfm_group = "ENGAGED"
-            ltv_score = 50.0
-            risk_profile = "MEDIUM"
-        elif recency_days <= 60:
-            rfm_group = "AT_RISK"
-            ltv_score = 25.0
-            risk_profile = "HIGH"
-        else:
-            rfm_group = "DORMANT"
-            ltv_score = 10.0
-            risk_profile = "HIGH"
-        
-        # Update or create segment
-        segment = db.query(models.UserSegment).filter(
-            models.UserSegment.user_id == user_id
-        ).first()
-        
-        if not segment:
-            segment = models.UserSegment(
-                user_id=user_id,
-                rfm_group=rfm_group,
-                ltv_score=ltv_score,
-                risk_profile=risk_profile,
-                last_updated=datetime.now()
-            )
-            db.add(segment)
-        else:
-            segment.rfm_group = rfm_group
-            segment.ltv_score = ltv_score
-            segment.risk_profile = risk_profile
-            segment.last_updated = datetime.now()
-        
-        updated_count += 1
-    
-    db.commit()
-    
+    job = get_job_service().enqueue("segments.calculate_rfm", {"days": days}, requested_by=current_user.id)
     return {
-        "message": f"RFM segments calculated successfully",
-        "updated_users": updated_count,
+        "message": "RFM segment calculation queued",
+        "job_id": job["id"],
+        "status": job["status"],
         "calculation_period_days": days
     }
 
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from pydantic import BaseModel, Field, field_validator
 from typing import Optional, Literal, List
 from datetime import datetime
@@ -85,6 +85,7 @@ from ..services.limited_package_service import LimitedPackageService
 from ..schemas.limited_package import LimitedPackageOut, LimitedBuyRequest, LimitedBuyReceipt
 from ..kafka_client import send_kafka_message
 from ..utils.redis import get_redis_manager
+from ..services.fraud.fraud_service import Decision as FraudDecision, get_fraud_service
 from ..core.config import settings
 from ..utils.utils import WebhookUtils
 from fastapi import Request, BackgroundTasks
@@ -301,7 +302,7 @@ def list_limited_catalog_compat():
     summary="[Compat] Buy limited-time package (no auth)",
     operation_id="compat_buy_limited_package",
 )
-def buy_limited_compat(req: LimitedBuyCompatRequest, *, db = Depends(get_db), background_tasks: BackgroundTasks):
+def buy_limited_compat(req: LimitedBuyCompatRequest, request: Request, *, db = Depends(get_db), background_tasks: BackgroundTasks):
     user_id = int(req.user_id)
     rman = get_redis_manager()
     idem = (req.idempotency_key or '').strip() or None
@@ -326,51 +327,6 @@ def buy_limited_compat(req: LimitedBuyCompatRequest, *, db = Depends(get_db), ba
     if not user:
         raise HTTPException(status_code=401, detail="Unauthorized")
 
-    # --- Fraud 차단 선제 룰 (시도 직전 윈도 검사) ---
-    rclient = getattr(rman, 'redis_client', None)
-    FRAUD_WINDOW = 300  # 5분
-    FRAUD_MAX_COUNT = 20
-    FRAUD_MAX_CARD_UNIQUE = 3
-    if rclient:
-        try:
-            now_ts = int(time.time())
-            zkey = f"user:buy:ts:{user_id}"
-            if hasattr(rclient, 'zremrangebyscore'):
-                rclient.zremrangebyscore(zkey, 0, now_ts - FRAUD_WINDOW)
-            count = 0
-            if hasattr(rclient, 'zcount'):
-                count = rclient.zcount(zkey, now_ts - FRAUD_WINDOW, now_ts)
-            skey = f"user:buy:cards:{user_id}"
-            exists_fn = getattr(rclient, 'exists', None)
-            scard_fn = getattr(rclient, 'scard', None)
-            if callable(exists_fn) and callable(scard_fn) and exists_fn(skey):
-                card_uniques = scard_fn(skey)
-            else:
-                card_uniques = 0
-            if count >= FRAUD_MAX_COUNT or card_uniques >= FRAUD_MAX_CARD_UNIQUE:
-                _metric_inc("limited", "fail", "FRAUD_BLOCK")
-                try:
-                    db.add(models.ShopTransaction(
-                        user_id=user_id,
-                        product_id=pkg.code if pkg else req.code,
-                        kind="gold",
-                        quantity=req.quantity,
-                        unit_price=0,
-                        amount=0,
-                        payment_method="card" if req.card_token else "unknown",
-                        status="failed",
-                        failure_reason="fraud_velocity_threshold",
-                        extra={"limited": True, "reason": "FRAUD_BLOCK", "count_5m": int(count), "cards_5m": int(card_uniques)},
-                    ))
-                    db.commit()
-                except Exception:
-                    pass
-                raise HTTPException(status_code=429, detail="Fraud velocity threshold")
-        except HTTPException:
-            raise
-        except Exception:
-            pass
-
     # Fast path idempotency
     if idem and rman.redis_client:
         try:
@@ -385,6 +341,38 @@ def buy_limited_compat(req: LimitedBuyCompatRequest, *, db = Depends(get_db), ba
         except Exception:
             pass
 
+    # --- Fraud 속도 룰 (시도 기록 + 사용자/IP/카드/기기 윈도 평가, Redis 왕복 1회) ---
+    # 멱등 재시도는 위에서 이미 반환 → 같은 구매가 속도 윈도에 중복 집계되지 않음
+    try:
+        fraud = get_fraud_service().check_purchase(
+            user_id,
+            amount=pkg.price_cents * req.quantity,
+            ip=request.client.host if request.client else None,
+            card_token=req.card_token,
+            device_id=request.headers.get("x-device-id"),
+        )
+    except Exception:
+        fraud = None
+    if fraud is not None and fraud.decision != FraudDecision.ALLOW:
+        _metric_inc("limited", "fail", "FRAUD_BLOCK")
+        try:
+            db.add(models.ShopTransaction(
+                user_id=user_id,
+                product_id=pkg.code if pkg else req.code,
+                kind="gold",
+                quantity=req.quantity,
+                unit_price=0,
+                amount=0,
+                payment_method="card" if req.card_token else "unknown",
+                status="failed",
+                failure_reason="fraud_velocity_threshold",
+                extra={"limited": True, "reason": "FRAUD_BLOCK", "rules": fraud.reason, "scores": fraud.scores},
+            ))
+            db.commit()
+        except Exception:
+            pass
+        raise HTTPException(status_code=429, detail="Fraud velocity threshold")
+
     # Per-user limit check → 403
     already = LimitedPackageService.get_user_purchased(pkg.code, user_id)
     if pkg.per_user_limit and already + req.quantity > pkg.per_user_limit:
@@ -1311,9 +1299,17 @@ def buy(
 
 
 @router.get("/transactions")
-def list_my_transactions(limit: int = 20, db = Depends(get_db), current_user = Depends(get_current_user)):
+def list_my_transactions(response: Response, limit: int = 20, cursor: Optional[str] = None, db = Depends(get_db), current_user = Depends(get_current_user)):
+    """최신순 거래내역. 다음 페이지 커서는 ``X-Next-Cursor`` 헤더로 전달 (본문은 기존 리스트 형식 유지)."""
+    from ..utils.pagination import InvalidCursor
     svc = ShopService(db)
-    return svc.list_transactions(current_user.id, limit)
+    try:
+        items, next_cursor = svc.list_transactions_page(current_user.id, max(1, min(limit, 200)), cursor)
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return items
 
 
 @router.post("/transactions/{receipt}/settle")
@@ -1404,6 +1400,16 @@ def buy_limited(req: LimitedBuyRequest, *, db = Depends(get_db), current_user =
 
     _metric_inc("limited", "start", None)
 
+    # Idempotency fast path: 이미 성공한 키의 재시도는 레이트 리밋/속도 윈도를 건드리기 전에 반환
+    if idem and rman.redis_client:
+        try:
+            exists_fn = getattr(rman.redis_client, 'exists', None)
+            if callable(exists_fn) and exists_fn(_idem_key(user_id, req.package_id, idem)):
+                cur_user = db.query(models.User).filter(models.User.id == user_id).first()
+                return LimitedBuyReceipt(success=True, message="중복 요청 처리됨", user_id=user_id, code=req.package_id, new_gold_balance=getattr(cur_user, 'gold_balance', 0) if cur_user else None)
+        except Exception:
+            pass
+
     # Rate limiting (10초 5회) - 단, 프로모 코드 사용 시 먼저 프로모 사용 가능 여부 체크 후 적용
     # (PROMO_EXHAUSTED 응답이 RATE_LIMIT보다 우선되도록 하여 테스트 기대 충족)
     defer_rate_limit_check = bool(req.promo_code)
@@ -1426,11 +1432,6 @@ def buy_limited(req: LimitedBuyRequest, *, db = Depends(get_db), current_user =
     # Idempotency pre-lock: 동시 중복 처리 방지
     if idem and rman.redis_client:
         try:
-            exists_fn = getattr(rman.redis_client, 'exists', None)
-            if callable(exists_fn) and exists_fn(_idem_key(user_id, req.package_id, idem)):
-                # 이미 성공 처리됨
-                cur_user = db.query(models.User).filter(models.User.id == user_id).first()
-                return LimitedBuyReceipt(success=True, message="중복 요청 처리됨", user_id=user_id, code=req.package_id, new_gold_balance=getattr(cur_user, 'gold_balance', 0) if cur_user else None)
             # pre-lock 획득 시도
             set_fn = getattr(rman.redis_client, 'set', None)
             ok = set_fn(_idem_lock_key(user_id, req.package_id, idem), "1", nx=True, ex=60) if callable(set_fn) else True
@@ -1789,29 +1790,12 @@ def buy_limited(req: LimitedBuyRequest, *, db = Depends(get_db), current_user =
         except Exception:
             pass
 
-    # Fraud velocity 1차 룰 (사후 기록) - 임계 초과 시에도 성공 후 별도 처리 가능
-    if rman.redis_client:
-        try:
-            zkey = f"user:buy:ts:{user_id}"
-            now_ts = int(time.time())
-            zadd_fn = getattr(rman.redis_client, 'zadd', None)
-            zrem_fn = getattr(rman.redis_client, 'zremrangebyscore', None)
-            expire_fn = getattr(rman.redis_client, 'expire', None)
-            if callable(zadd_fn):
-                zadd_fn(zkey, {str(now_ts): now_ts})
-            if callable(zrem_fn):
-                zrem_fn(zkey, 0, now_ts - 300)
-            if callable(expire_fn):
-                expire_fn(zkey, 600)
-            if req.card_token:
-                skey = f"user:buy:cards:{user_id}"
-                sadd_fn = getattr(rman.redis_client, 'sadd', None)
-                if callable(sadd_fn):
-                    sadd_fn(skey, req.card_token)
-                if callable(expire_fn):
-                    expire_fn(skey, 600)
-        except Exception:
-            pass
+    # Fraud velocity 사후 기록 (성공 구매도 윈도 집계에 반영, 임계 초과는 경고 로그로만 표시)
+    # 멱등 재시도는 상단 fast path 에서 반환되므로 여기까지 오지 않음 (구매 1건 = 기록 1회)
+    try:
+        get_fraud_service().check_purchase(user_id, amount=total_price_cents, card_token=req.card_token)
+    except Exception:
+        pass
 
     _metric_inc("limited", "success", None)
     try:
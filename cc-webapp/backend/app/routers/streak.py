@@ -22,6 +22,7 @@ from ..utils.redis import (
 )
 from app.utils.redis import get_redis  # 일일 중복 가드용 직접 Redis 접근
 from app.utils.streak_utils import calc_next_streak_reward
+from app.services import attendance_service
 
 router = APIRouter(prefix="/api/streak", tags=["Streaks"])
 
@@ -94,7 +95,7 @@ async def tick(
     ttl = get_streak_ttl(str(current_user.id), action_type)
     next_reward = calc_next_streak_reward(cnt + 1)
 
-    # 출석 기록 (증가 여부와 무관하게 하루 한 번 기록 시도 – SADD idempotent)
+    # 출석 기록 (증가 여부와 무관하게 하루 한 번 기록 시도 – SETBIT idempotent)
     try:
         record_attendance_day(str(current_user.id), action_type, today_iso)
     except Exception:
@@ -166,6 +167,36 @@ async def history(
     return AttendanceHistory(action_type=action_type, year=year, month=month, days=days)
 
 
+class AttendanceSummaryResponse(BaseModel):
+    action_type: str
+    today: str
+    streak: int
+    attended_today: bool
+    month_days: List[str]
+    active_7d: int
+    active_30d: int
+    first_day: Optional[str] = None
+
+
+@router.get("/summary", response_model=AttendanceSummaryResponse)
+async def summary(
+    action_type: str = Query(DEFAULT_ACTION),
+    current_user: User = Depends(get_current_user),
+):
+    """출석 비트맵 요약: 연속 일수(오늘 미출석이면 어제까지) + 이번 달 캘린더 + 최근 7/30일 (Redis 왕복 1회)."""
+    s = attendance_service.summary(current_user.id, action_type, grace_today=True)
+    return AttendanceSummaryResponse(
+        action_type=action_type,
+        today=s.today.isoformat(),
+        streak=s.streak,
+        attended_today=s.attended_today,
+        month_days=[d.isoformat() for d in s.calendar],
+        active_7d=s.active_days.get(7, 0),
+        active_30d=s.active_days.get(30, 0),
+        first_day=s.first_day.isoformat() if s.first_day else None,
+    )
+
+
 # ----------------------
 # Streak Protection 토글
 # ----------------------
@@ -54,6 +54,9 @@ class GameStats(BaseModel):
     total_spins: int = 0
     total_coins_won: int = 0
     total_gems_won: int = 0
+    total_gold_won: int = 0
+    total_bet: int = 0
+    win_rate: float = 0.0
     special_items_won: int = 0
     jackpots_won: int = 0
     bonus_spins_won: int = 0
@@ -174,8 +177,11 @@ class GameLeaderboard(BaseModel):
     """게임 리더보드 응답"""
     game_type: str
     period: str
+    bucket: Optional[str] = None  # 20261019 | 2026-W42 | all
     entries: List[LeaderboardEntry] = []
     user_rank: Optional[int] = None
+    user_score: Optional[int] = None
+    around: List[LeaderboardEntry] = []  # 내 순위 ± k
     updated_at: datetime
 
 
@@ -6,20 +6,325 @@ Features:
  - Stable hashing of (user_id, flag_key)
  - Idempotent: existing assignment returned
  - Simple even distribution across provided variants
+ - Stateless assignment engine (``AssignmentEngine``):
+     * 변형은 해시 + 인메모리 실험 설정(가중치/홀드아웃/솔트/기간)만으로 계산 → 요청 경로 DB 쓰기 없음
+     * 균등 가중치 + 솔트 없음이면 기존 ``assign`` 결과와 동일 (기존 ab_test_participants 행과 일관)
+     * 노출(exposure)은 ``ExposureBuffer`` 에 모아 ClickHouse ``ab_flags`` 로 배치 적재
+       (요청 스레드는 버퍼에 추가만, 적재는 백그라운드 flusher 스레드 / 스케줄러 작업)
+     * ``assign_all`` — 페이지 로드 시 활성 실험 전체 일괄 배정
+ - 레지스트리는 ``ab_test_experiments`` (assign 요청 변형 목록, 순서 유지) + ``ab_test_participants`` 의
+   (test_name, variant) 로부터 적재 (``load_experiments``):
+   앱 시작 시 1회 + 스케줄러 주기 재적재 + ``ABTestService.assign`` 이 새 실험/변형을 기록할 때.
+   변형은 저장된 요청 목록(→ 재시작 후에도 기존 해시 배정과 동일), 목록이 없는 과거 실험만
+   관측 변형으로 유도 (A/B 만 관측되면 A/B).
+   ``register`` 로 등록한 설정은 유지
 
 Planned extensions (documented for future work):
- - Weighted variants
- - Time-bounded experiments (start/end)
- - Exclusion cohorts / holdouts
- - ClickHouse export pipeline
+ - Exclusion cohorts (segment 기반)
 """
 from __future__ import annotations
 
 import hashlib
-from typing import Optional
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from .. import models
+from ..core.config import settings
+
+logger = logging.getLogger(__name__)
+
+HOLDOUT_BUCKETS = 10000  # 홀드아웃 해상도 (0.01%)
+EXPOSURE_DEDUPE_MAX = 100_000  # 프로세스 내 중복 노출 억제 집합 상한
+
+
+def _stable_hash(user_id: int, flag_key: str, salt: str = "") -> int:
+    raw = f"{user_id}:{flag_key}:{salt}" if salt else f"{user_id}:{flag_key}"
+    h = hashlib.sha256(raw.encode()).hexdigest()
+    return int(h[:8], 16)  # first 32 bits
+
+
+@dataclass(frozen=True)
+class Experiment:
+    """인메모리 실험 설정.
+
+    weights: variants 와 같은 길이의 정수 가중치 (None = 균등)
+    holdout_pct: 0~100, 실험에서 제외할 사용자 비율 (별도 해시 → 변형 분포와 독립)
+    salt: 재무작위화가 필요할 때 변경 (변경 시 배정이 전부 바뀜)
+    """
+    key: str
+    variants: Tuple[str, ...] = ("A", "B")
+    weights: Optional[Tuple[int, ...]] = None
+    holdout_pct: float = 0.0
+    salt: str = ""
+    active: bool = True
+    start_at: Optional[datetime] = None
+    end_at: Optional[datetime] = None
+    origin: str = "config"  # "db" = ab_test_participants 에서 유도 (재적재 시 교체 대상)
+    _cumulative: Tuple[int, ...] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "variants", tuple(self.variants))
+        if not self.variants:
+            raise ValueError("variants must be non-empty")
+        weights = tuple(int(w) for w in self.weights) if self.weights is not None else (1,) * len(self.variants)
+        if len(weights) != len(self.variants) or any(w < 0 for w in weights) or sum(weights) <= 0:
+            raise ValueError("weights must be non-negative, match variants and sum > 0")
+        if not 0.0 <= float(self.holdout_pct) <= 100.0:
+            raise ValueError("holdout_pct must be within 0..100")
+        object.__setattr__(self, "weights", weights)
+        acc, cumulative = 0, []
+        for w in weights:
+            acc += w
+            cumulative.append(acc)
+        object.__setattr__(self, "_cumulative", tuple(cumulative))
+
+    def is_live(self, now: Optional[datetime] = None) -> bool:
+        if not self.active:
+            return False
+        now = now or datetime.utcnow()
+        if self.start_at and now < self.start_at:
+            return False
+        if self.end_at and now >= self.end_at:
+            return False
+        return True
+
+    def in_holdout(self, user_id: int) -> bool:
+        if self.holdout_pct <= 0:
+            return False
+        bucket = _stable_hash(user_id, self.key, f"holdout{self.salt}") % HOLDOUT_BUCKETS
+        return bucket < self.holdout_pct * HOLDOUT_BUCKETS / 100
+
+    def variant_for(self, user_id: int) -> str:
+        # 균등 가중치면 bucket == h % len(variants) → 기존 assign 과 동일 인덱스
+        bucket = _stable_hash(user_id, self.key, self.salt) % self._cumulative[-1]
+        for variant, upper in zip(self.variants, self._cumulative):
+            if bucket < upper:
+                return variant
+        return self.variants[-1]  # pragma: no cover - cumulative 마지막 값 > bucket 보장
+
+
+class ExperimentRegistry:
+    """프로세스 내 실험 설정 저장소 (읽기는 락 없이 스냅샷 dict 참조)."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._experiments: Dict[str, Experiment] = {}
+
+    def register(self, experiment: Experiment) -> Experiment:
+        with self._lock:
+            updated = dict(self._experiments)
+            updated[experiment.key] = experiment
+            self._experiments = updated
+        return experiment
+
+    def load(self, experiments: Sequence[Experiment]) -> None:
+        """설정 전체 교체 (배포/관리자 설정 반영 시)."""
+        with self._lock:
+            self._experiments = {e.key: e for e in experiments}
+
+    def sync(self, experiments: Sequence[Experiment]) -> None:
+        """DB 유도 실험(origin="db") 교체. 직접 등록한 설정(origin="config")은 유지."""
+        with self._lock:
+            updated = {k: e for k, e in self._experiments.items() if e.origin != "db"}
+            for e in experiments:
+                updated.setdefault(e.key, e)
+            self._experiments = updated
+
+    def remove(self, key: str) -> None:
+        with self._lock:
+            updated = dict(self._experiments)
+            updated.pop(key, None)
+            self._experiments = updated
+
+    def get(self, key: str) -> Optional[Experiment]:
+        return self._experiments.get(key)
+
+    def active(self, now: Optional[datetime] = None) -> List[Experiment]:
+        now = now or datetime.utcnow()
+        return [e for e in self._experiments.values() if e.is_live(now)]
+
+
+def _clickhouse_sink(rows: List[Dict]) -> None:
+    if not settings.CLICKHOUSE_ENABLED:
+        return
+    from ..olap.clickhouse_client import ClickHouseClient
+    ClickHouseClient().insert_ab_flags(rows)
+
+
+class ExposureBuffer:
+    """노출 기록 배치 버퍼.
+
+    - (user_id, flag_key, variant) 는 프로세스 내에서 1회만 기록 (상한 초과 시 집합 초기화)
+    - ``add`` 는 버퍼에 추가만 한다. batch_size 도달 / flush_seconds 경과 시 백그라운드
+      flusher 스레드를 깨워 적재 (요청 스레드에서 ClickHouse 호출 없음)
+    - 잔여분은 주기 작업(``flush_exposures``)도 비움
+    - sink 실패 시 로그만 남기고 버림 (olap_worker 와 동일하게 요청 경로를 막지 않음)
+    """
+
+    def __init__(
+        self,
+        sink: Optional[Callable[[List[Dict]], None]] = None,
+        batch_size: Optional[int] = None,
+        flush_seconds: Optional[float] = None,
+        *,
+        background: bool = True,
+    ) -> None:
+        self.sink = sink or _clickhouse_sink
+        self.batch_size = batch_size or settings.OLAP_BATCH_SIZE
+        self.flush_seconds = flush_seconds if flush_seconds is not None else settings.OLAP_FLUSH_SECONDS
+        self.background = background
+        self._lock = threading.Lock()
+        self._rows: List[Dict] = []
+        self._seen: set = set()
+        self._last_flush = time.monotonic()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def add(self, user_id: int, flag_key: str, variant: str) -> None:
+        ident = (user_id, flag_key, variant)
+        with self._lock:
+            if ident in self._seen:
+                return
+            if len(self._seen) >= EXPOSURE_DEDUPE_MAX:
+                self._seen.clear()
+            self._seen.add(ident)
+            self._rows.append({"user_id": user_id, "flag_key": flag_key, "variant": variant})
+            due = len(self._rows) >= self.batch_size or time.monotonic() - self._last_flush >= self.flush_seconds
+        if due and self.background:
+            self._ensure_thread()
+            self._wake.set()
+
+    def _ensure_thread(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="ab-exposure-flusher", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(self.flush_seconds)
+            self._wake.clear()
+            self.flush()
+
+    def flush(self) -> int:
+        with self._lock:
+            rows, self._rows = self._rows, []
+            self._last_flush = time.monotonic()
+        if not rows:
+            return 0
+        try:
+            self.sink(rows)
+        except Exception as e:
+            logger.warning("ab exposure flush failed (dropped %d rows): %s", len(rows), e)
+            return 0
+        return len(rows)
+
+
+class AssignmentEngine:
+    """해시 + 인메모리 설정만으로 변형을 계산하는 무상태 배정 엔진."""
+
+    def __init__(self, registry: Optional[ExperimentRegistry] = None, exposures: Optional[ExposureBuffer] = None) -> None:
+        self.registry = registry if registry is not None else ExperimentRegistry()
+        self.exposures = exposures if exposures is not None else ExposureBuffer()
+
+    def assign(self, user_id: int, key: str, *, default_variants: Sequence[str] = ("A", "B"), log_exposure: bool = True) -> Optional[str]:
+        """변형 반환. 홀드아웃 또는 비활성 실험이면 None (호출 측 기본 경험 사용).
+
+        등록되지 않은 key 는 default_variants 균등 분배 (기존 /variant 동작과 동일)."""
+        experiment = self.registry.get(key)
+        if experiment is None:
+            experiment = Experiment(key=key, variants=tuple(default_variants))
+        elif not experiment.is_live():
+            return None
+        if experiment.in_holdout(user_id):
+            return None
+        variant = experiment.variant_for(user_id)
+        if log_exposure:
+            self.exposures.add(user_id, key, variant)
+        return variant
+
+    def control_variant(self, key: str, default_variants: Sequence[str] = ("A", "B")) -> str:
+        """홀드아웃/비활성 사용자에게 보여줄 기본 경험 (첫 번째 변형)."""
+        experiment = self.registry.get(key)
+        return experiment.variants[0] if experiment is not None else tuple(default_variants)[0]
+
+    def assign_all(self, user_id: int, *, log_exposure: bool = True) -> Dict[str, str]:
+        """활성 실험 전체 일괄 배정 (홀드아웃 실험은 결과에서 제외)."""
+        out: Dict[str, str] = {}
+        for experiment in self.registry.active():
+            if experiment.in_holdout(user_id):
+                continue
+            variant = experiment.variant_for(user_id)
+            out[experiment.key] = variant
+            if log_exposure:
+                self.exposures.add(user_id, experiment.key, variant)
+        return out
+
+
+_engine: Optional[AssignmentEngine] = None
+
+
+def get_assignment_engine() -> AssignmentEngine:
+    global _engine
+    if _engine is None:
+        _engine = AssignmentEngine()
+    return _engine
+
+
+def flush_exposures() -> int:
+    """버퍼 잔여 노출 적재 (스케줄러/종료 훅)."""
+    if _engine is None:
+        return 0
+    return _engine.exposures.flush()
+
+
+DEFAULT_VARIANTS = ("A", "B")
+
+
+def _db_variants(observed: set) -> Tuple[str, ...]:
+    # 기존 /variant 기본값(A/B) 실험은 관측 행이 한쪽뿐이어도 A/B 2분할, 그 외는 관측 변형 정렬 순
+    if observed <= set(DEFAULT_VARIANTS):
+        return DEFAULT_VARIANTS
+    return tuple(sorted(observed))
+
+
+def load_experiments(db: Session, registry: Optional[ExperimentRegistry] = None) -> int:
+    """``ab_test_experiments`` / ``ab_test_participants`` 로 레지스트리 동기화. 적재한 실험 수 반환.
+
+    저장된 변형 목록(``ABTestService.assign`` 요청값, 순서 유지)이 관측 변형을 모두 포함하면 그대로 쓴다.
+    목록이 없는 과거 실험은 이 프로세스가 알고 있는 목록 → 관측 변형 순으로 유도한다.
+    """
+    registry = registry if registry is not None else get_assignment_engine().registry
+    P = models.ABTestParticipant
+    E = models.ABTestExperiment
+    observed: Dict[str, set] = {}
+    for test_name, variant in db.query(P.test_name, P.variant).distinct():
+        if test_name and variant:
+            observed.setdefault(test_name, set()).add(variant)
+    configured = {name: tuple(variants) for name, variants in db.query(E.test_name, E.variants) if variants}
+    experiments = []
+    for key in observed.keys() | configured.keys():
+        seen = observed.get(key, set())
+        current = registry.get(key)
+        if key in configured and seen <= set(configured[key]):
+            experiments.append(Experiment(key=key, variants=configured[key], origin="db"))
+        elif current is not None and current.origin == "db" and seen <= set(current.variants):
+            experiments.append(current)
+        else:
+            experiments.append(Experiment(key=key, variants=_db_variants(seen), origin="db"))
+    registry.sync(experiments)
+    return len(experiments)
 
 
 class ABTestService:
@@ -27,9 +332,7 @@ class ABTestService:
         self.db = db
 
     def _stable_hash(self, user_id: int, flag_key: str) -> int:
-        raw = f"{user_id}:{flag_key}".encode()
-        h = hashlib.sha256(raw).hexdigest()
-        return int(h[:8], 16)  # first 32 bits
+        return _stable_hash(user_id, flag_key)
 
     def assign(self, user_id: int, test_name: str, variants: list[str] | tuple[str, ...]) -> models.ABTestParticipant:
         existing = self.db.query(models.ABTestParticipant).filter(
@@ -42,12 +345,38 @@ class ABTestService:
             raise ValueError("variants must be non-empty")
         h_val = self._stable_hash(user_id, test_name)
         variant = variants[h_val % len(variants)]
+        self._persist_variants(test_name, variants)
         row = models.ABTestParticipant(user_id=user_id, test_name=test_name, variant=variant)
         self.db.add(row)
         self.db.commit()
         self.db.refresh(row)
+        self._sync_registry(test_name, variants)
         return row
 
+    def _persist_variants(self, test_name: str, variants: Sequence[str]) -> None:
+        # 배정에 쓴 변형 목록을 순서 그대로 저장 (재시작 후 load_experiments 가 같은 인덱스로 재구성)
+        config = self.db.get(models.ABTestExperiment, test_name)
+        if config is None:
+            self.db.add(models.ABTestExperiment(test_name=test_name, variants=list(variants)))
+        elif list(config.variants or ()) != list(variants):
+            config.variants = list(variants)
+        else:
+            return
+        try:
+            self.db.commit()
+        except IntegrityError:
+            self.db.rollback()  # 동시 첫 배정 — 다른 요청이 같은 목록을 먼저 저장
+
+    @staticmethod
+    def _sync_registry(test_name: str, variants: Sequence[str]) -> None:
+        # 새 실험/변형 목록을 이 프로세스 레지스트리에 즉시 반영 (다른 워커는 주기 재적재).
+        # 요청 순서를 그대로 쓰므로 엔진 배정 == 위 해시 배정
+        registry = get_assignment_engine().registry
+        current = registry.get(test_name)
+        if current is not None and (current.origin != "db" or current.variants == tuple(variants)):
+            return
+        registry.register(Experiment(key=test_name, variants=tuple(variants), origin="db"))
+
     def get(self, user_id: int, test_name: str) -> Optional[models.ABTestParticipant]:
         return self.db.query(models.ABTestParticipant).filter(
             models.ABTestParticipant.user_id == user_id,
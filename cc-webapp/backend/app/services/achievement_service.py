@@ -9,6 +9,7 @@ from ..models.achievement_models import Achievement, UserAchievement
 from ..models.history_models import GameHistory
 from ..models.notification_models import Notification
 from ..realtime.hub import hub
+from . import notification_counters, notification_stream
 from .achievement_evaluator import AchievementEvaluatorRegistry, EvalContext, EvalResult
 
 
@@ -55,6 +56,7 @@ class AchievementService:
             return []
 
         unlocked_codes: List[str] = []
+        unlocked: List[tuple[Achievement, int]] = []
         ctx = EvalContext(db=self.db, history=history)
 
         for ach in self.list_active():
@@ -74,34 +76,59 @@ class AchievementService:
                 ua.is_unlocked = True
                 ua.unlocked_at = datetime.utcnow()
                 unlocked_codes.append(ach.code)
-                notif = Notification(
-                    user_id=history.user_id,
-                    title=f"Achievement Unlocked: {ach.title}",
-                    message=ach.description or ach.code,
-                    notification_type="achievement_unlock",
-                    related_code=ach.code,
-                )
-                self.db.add(notif)
-                hub.broadcast(history.user_id, {
-                    "type": "achievement_unlock",
-                    "code": ach.code,
-                    "title": ach.title,
-                    "reward_coins": ach.reward_coins,
-                    "reward_gold": 0,
-                })
-                try:
-                    from ..routers.realtime import broadcast_achievement_progress
-                    import asyncio
-                    loop = asyncio.get_event_loop()
-                    if loop.is_running():
-                        loop.create_task(broadcast_achievement_progress(
-                            user_id=history.user_id,
-                            achievement_code=ach.code,
-                            progress=result.progress,
-                            unlocked=True
-                        ))
-                except Exception:
-                    pass
+                unlocked.append((ach, result.progress))
+        if unlocked:
+            self._notify_unlocks(history.user_id, unlocked)
         return unlocked_codes
 
+    def _notify_unlocks(self, user_id: int, unlocked: List[tuple[Achievement, int]]) -> None:
+        """해제 알림 생성 + 카운터 증감(같은 트랜잭션) → commit → Redis 카운터/리플레이 스트림 발행.
+
+        ``campaign_dispatcher.send_campaign`` 과 같은 순서 — 배지/인박스/재연결 스트림이 즉시 반영된다.
+        """
+        notifs = [
+            Notification(
+                user_id=user_id,
+                title=f"Achievement Unlocked: {ach.title}",
+                message=ach.description or ach.code,
+                notification_type="achievement_unlock",
+            )
+            for ach, _ in unlocked
+        ]
+        self.db.add_all(notifs)
+        deltas = {user_id: (len(notifs), len(notifs))}
+        notification_counters.bump(self.db, deltas)
+        self.db.commit()
+        notification_counters.publish(deltas)
+        for n in notifs:
+            notification_stream.publish(user_id, {
+                "notification_id": n.id,
+                "title": n.title,
+                "message": n.message,
+                "notification_type": n.notification_type,
+                "created_at": n.created_at.isoformat() if n.created_at else None,
+            })
+        try:
+            from ..routers.realtime import broadcast_achievement_progress
+            import asyncio
+            loop = asyncio.get_event_loop()
+            if loop.is_running():
+                for ach, progress in unlocked:
+                    loop.create_task(hub.broadcast({
+                        "type": "achievement_unlock",
+                        "user_id": user_id,
+                        "code": ach.code,
+                        "title": ach.title,
+                        "reward_coins": ach.reward_coins,
+                        "reward_gold": 0,
+                    }))
+                    loop.create_task(broadcast_achievement_progress(
+                        user_id=user_id,
+                        achievement_code=ach.code,
+                        progress=progress,
+                        unlocked=True
+                    ))
+        except Exception:
+            pass
+
     # Aggregation helpers moved into achievement_evaluator strategies.
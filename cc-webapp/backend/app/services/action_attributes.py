@@ -0,0 +1,277 @@
+"""user_actions 타입 속성 (game_type / bet / win / result / is_jackpot).
+
+action_data(Text JSON) 는 그대로 보존하되, 자주 필터/집계되는 속성을 INSERT 시점에
+전용 컬럼으로 추출한다 → 잭팟 수 / 승률 / 베팅 합계 쿼리가 LIKE·json.loads 없이 인덱스 스캔.
+
+- ``extract_attributes``: 엔벨로프(``{"v":1,"type","ts","data":{...}}``), 평문 JSON,
+  /api/actions 의 ``context`` 페이로드를 모두 해석. 파싱 불가/비게임 액션은 빈 dict.
+- ``install_action_attribute_listeners``: UserAction mapper ``before_insert`` 에서 비어 있는 컬럼만 채움
+  (ORM 경로 전부). Core bulk INSERT(크래시 정산)는 호출 측이 직접 채운다.
+- ``backfill_action_attributes``: 기존 행 id 키셋 청크 UPDATE (재실행 안전). 청크마다 스캔한
+  마지막 id(high-water)를 Redis(미연결 시 프로세스 메모리)에 기록 → 재실행은 그 이후 행만 스캔
+  (추출 불가 비게임 행은 계속 NULL 이므로 매번 전체 재스캔하지 않도록).
+- ``summarize_games``: (game_type) 별 플레이/승/베팅·당첨 합계/잭팟 1쿼리 집계.
+"""
+from __future__ import annotations
+
+import json
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import case, event, func, update
+from sqlalchemy.orm import Session
+
+from .. import models
+from ..core import redis_keys
+from ..utils.redis import get_redis_manager
+
+logger = logging.getLogger(__name__)
+
+ATTRIBUTE_COLUMNS = ("game_type", "bet", "win", "result", "is_jackpot")
+BACKFILL_CHUNK_SIZE = 1000
+
+# action_type 접두어 → game_type (payload 에 game_type 이 없는 레거시 행 보정)
+_GAME_PREFIXES = {
+    "SLOT": "slot",
+    "RPS": "rps",
+    "CRASH": "crash",
+    "GACHA": "gacha",
+    "ROULETTE": "roulette",
+}
+# 게임별 결과 표기 → win / lose / draw
+_RESULT_ALIASES = {
+    "win": "win", "won": "win", "cashed": "win", "cashout": "win", "jackpot": "win",
+    "lose": "lose", "loss": "lose", "lost": "lose", "crashed": "lose",
+    "draw": "draw", "tie": "draw",
+}
+_BET_KEYS = ("bet_amount", "bet", "cost")
+_WIN_KEYS = ("win_amount", "win", "payout")
+
+
+def _decode(action_data: Any) -> Optional[Dict[str, Any]]:
+    if isinstance(action_data, dict):
+        return action_data
+    if not action_data or not isinstance(action_data, str) or action_data[:1] != "{":
+        return None  # 멱등키 등 평문 문자열
+    try:
+        payload = json.loads(action_data)
+    except (TypeError, ValueError):
+        return None
+    return payload if isinstance(payload, dict) else None
+
+
+def _int(value: Any) -> Optional[int]:
+    if isinstance(value, bool) or value is None:
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _first(data: Dict[str, Any], keys) -> Optional[int]:
+    for k in keys:
+        v = _int(data.get(k))
+        if v is not None:
+            return v
+    return None
+
+
+def extract_attributes(action_type: Optional[str], action_data: Any) -> Dict[str, Any]:
+    """action_type + action_data → 타입 속성 dict (값을 알 수 없는 키는 생략)."""
+    payload = _decode(action_data) or {}
+    data = payload
+    if isinstance(payload.get("data"), dict) and "v" in payload:
+        data = payload["data"]
+    elif isinstance(payload.get("context"), dict):
+        data = payload["context"]
+
+    out: Dict[str, Any] = {}
+    game_type = data.get("game_type") or data.get("game")
+    if not game_type and action_type:
+        game_type = _GAME_PREFIXES.get(str(action_type).split("_", 1)[0].upper())
+    if isinstance(game_type, str) and game_type:
+        out["game_type"] = game_type.lower()[:20]
+
+    bet = _first(data, _BET_KEYS)
+    win = _first(data, _WIN_KEYS)
+    if bet is not None:
+        out["bet"] = bet
+    if win is not None:
+        out["win"] = win
+
+    raw = data.get("result")
+    if raw is None:
+        raw = data.get("status")
+    result = _RESULT_ALIASES.get(str(raw).lower()) if isinstance(raw, str) else None
+    if result is None and "game_type" in out and bet is not None and win is not None:
+        result = "win" if win > 0 else "lose"
+    if result:
+        out["result"] = result
+
+    jackpot = data.get("is_jackpot", data.get("jackpot"))
+    if isinstance(jackpot, bool):
+        out["is_jackpot"] = jackpot
+    elif "game_type" in out and out["game_type"] == "slot" and "result" in out:
+        out["is_jackpot"] = False
+    return out
+
+
+# ------------------------------------------------------------------ 쓰기 시점 추출
+def _fill(mapper: Any, connection: Any, target: "models.UserAction") -> None:
+    if any(getattr(target, c) is not None for c in ATTRIBUTE_COLUMNS):
+        return  # 호출 측이 명시 지정
+    try:
+        for k, v in extract_attributes(target.action_type, target.action_data).items():
+            setattr(target, k, v)
+    except Exception:  # pragma: no cover - 로깅 경로는 절대 실패시키지 않음
+        logger.debug("user_action attribute extraction failed type=%s", target.action_type, exc_info=True)
+
+
+_installed = False
+
+
+def install_action_attribute_listeners() -> None:
+    """UserAction INSERT 직전 타입 속성 채움 리스너 등록 (멱등)."""
+    global _installed
+    if _installed:
+        return
+    event.listen(models.UserAction, "before_insert", _fill)
+    _installed = True
+
+
+# ------------------------------------------------------------------ 백필
+_memory_high_water = 0
+
+
+def _redis():
+    try:
+        return get_redis_manager().redis_client
+    except Exception:
+        return None
+
+
+def get_backfill_high_water() -> int:
+    """이전 백필이 스캔을 마친 마지막 user_actions.id (없으면 0)."""
+    r = _redis()
+    if r is not None:
+        try:
+            raw = r.get(redis_keys.action_attr_backfill_hwm())
+            return int(raw) if raw is not None else 0
+        except Exception:
+            logger.warning("action attribute backfill high-water read failed", exc_info=True)
+    return _memory_high_water
+
+
+def _set_backfill_high_water(last_id: int) -> None:
+    global _memory_high_water
+    _memory_high_water = last_id
+    r = _redis()
+    if r is not None:
+        try:
+            r.set(redis_keys.action_attr_backfill_hwm(), last_id)
+        except Exception:
+            logger.warning("action attribute backfill high-water write failed", exc_info=True)
+
+
+def _unfilled() -> List[Any]:
+    UA = models.UserAction
+    return [UA.action_data.isnot(None), *(getattr(UA, c).is_(None) for c in ATTRIBUTE_COLUMNS)]
+
+
+def count_unfilled(db: Session, *, after_id: int = 0) -> int:
+    """백필 대상(action_data 는 있으나 타입 컬럼이 모두 NULL) 중 id > after_id 행 수."""
+    UA = models.UserAction
+    return int(db.query(func.count(UA.id)).filter(UA.id > after_id, *_unfilled()).scalar() or 0)
+
+
+def backfill_action_attributes(db: Session, *, chunk_size: int = BACKFILL_CHUNK_SIZE,
+                               on_chunk: Optional[Callable[[int, int], None]] = None,
+                               from_start: bool = False) -> Dict[str, int]:
+    """타입 컬럼이 모두 비어 있는 기존 행을 id 키셋 청크로 채운다.
+
+    청크마다 commit + high-water 기록 → ``on_chunk(scanned, updated)``. 추출 결과가 없는 행(비게임 액션)은
+    NULL 로 남는다. 재실행은 high-water 이후 행만 스캔 (``from_start=True`` 면 처음부터).
+    """
+    UA = models.UserAction
+    last_id = 0 if from_start else get_backfill_high_water()
+    scanned = updated = 0
+    while True:
+        rows = (
+            db.query(UA.id, UA.action_type, UA.action_data)
+            .filter(UA.id > last_id, *_unfilled())
+            .order_by(UA.id)
+            .limit(chunk_size)
+            .all()
+        )
+        if not rows:
+            break
+        batch: List[Dict[str, Any]] = []
+        for rid, action_type, action_data in rows:
+            attrs = extract_attributes(action_type, action_data)
+            if attrs:
+                batch.append({"id": rid, **attrs})
+        for params in batch:
+            db.execute(update(UA.__table__).where(UA.__table__.c.id == params.pop("id")).values(**params))
+        db.commit()
+        last_id = rows[-1][0]
+        _set_backfill_high_water(last_id)
+        scanned += len(rows)
+        updated += len(batch)
+        if on_chunk:
+            on_chunk(scanned, updated)
+    return {"scanned": scanned, "updated": updated, "high_water": last_id}
+
+
+# ------------------------------------------------------------------ 집계
+@dataclass
+class GameSummary:
+    game_type: str
+    plays: int = 0
+    wins: int = 0
+    bet_total: int = 0
+    win_total: int = 0
+    jackpots: int = 0
+
+    @property
+    def win_rate(self) -> float:
+        return round(self.wins / self.plays, 4) if self.plays else 0.0
+
+
+def summarize_games(db: Session, user_id: int, *, game_type: Optional[str] = None,
+                    since: Optional[datetime] = None) -> Dict[str, GameSummary]:
+    """사용자 게임별 집계 — ix_user_actions_user_game_created 범위 스캔 1회."""
+    UA = models.UserAction
+    q = db.query(
+        UA.game_type,
+        func.count(UA.id),
+        func.sum(case((UA.result == "win", 1), else_=0)),
+        func.coalesce(func.sum(UA.bet), 0),
+        func.coalesce(func.sum(UA.win), 0),
+        func.sum(case((UA.is_jackpot.is_(True), 1), else_=0)),
+    ).filter(UA.user_id == user_id, UA.game_type.isnot(None), UA.result.isnot(None))
+    if game_type:
+        q = q.filter(UA.game_type == game_type)
+    if since:
+        q = q.filter(UA.created_at >= since)
+    return {
+        gt: GameSummary(gt, int(n or 0), int(w or 0), int(b or 0), int(p or 0), int(j or 0))
+        for gt, n, w, b, p, j in q.group_by(UA.game_type).all()
+    }
+
+
+def count_jackpots(db: Session, user_id: int) -> int:
+    """잭팟 수 — 부분 인덱스 ix_user_actions_jackpot (WHERE is_jackpot) 스캔."""
+    UA = models.UserAction
+    # ``= true`` (IS TRUE 아님) → SQLite 부분 인덱스 조건(is_jackpot = 1)과도 일치
+    jackpot = UA.is_jackpot == True  # noqa: E712
+    return int(db.query(func.count(UA.id)).filter(UA.user_id == user_id, jackpot).scalar() or 0)
+
+
+__all__ = [
+    "ATTRIBUTE_COLUMNS", "GameSummary", "extract_attributes", "install_action_attribute_listeners",
+    "count_unfilled", "get_backfill_high_water", "backfill_action_attributes", "summarize_games",
+    "count_jackpots",
+]
@@ -0,0 +1,174 @@
+"""Admin background job definitions (registered into ``job_service``).
+
+각 작업은 자체 SessionLocal 세션을 열고 청크 단위로 commit 하며, 청크마다
+``ctx.advance`` 로 진행률을 기록한다 (취소 요청 시 다음 청크 경계에서 중단).
+"""
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+from sqlalchemy import func
+
+from .. import models
+from ..database import SessionLocal
+from .action_attributes import backfill_action_attributes, count_unfilled, get_backfill_high_water
+from .campaign_dispatcher import send_campaign
+from .invite_service import InviteService
+from .notification_counters import reconcile_counters
+from .partition_service import run_maintenance as run_partition_maintenance
+from .job_service import JobCancelled, JobContext, register_job
+
+RFM_CHUNK_SIZE = 500
+INVITE_CHUNK_SIZE = 1000
+CAMPAIGN_CHUNK_SIZE = 1000
+ACTION_ATTR_CHUNK_SIZE = 1000
+
+
+def classify_rfm(recency_days: int, frequency: int, monetary: float) -> tuple[str, float, str]:
+    """RFM 점수 → (rfm_group, ltv_score, risk_profile)."""
+    if recency_days <= 7 and frequency >= 20 and monetary >= 100:
+        return "WHALE", 100.0, "LOW"
+    if recency_days <= 14 and frequency >= 10 and monetary >= 50:
+        return "HIGH_VALUE", 75.0, "LOW"
+    if recency_days <= 30 and frequency >= 5:
+        return "ENGAGED", 50.0, "MEDIUM"
+    if recency_days <= 60:
+        return "AT_RISK", 25.0, "HIGH"
+    return "DORMANT", 10.0, "HIGH"
+
+
+@register_job("segments.calculate_rfm")
+def calculate_rfm_job(ctx: JobContext, days: int = 90, chunk_size: int = RFM_CHUNK_SIZE) -> Dict[str, Any]:
+    db = SessionLocal()
+    try:
+        now = datetime.now()
+        cutoff_date = now - timedelta(days=days)
+        UA = models.UserAction
+        activity = (
+            db.query(UA.user_id, func.max(UA.created_at), func.count(UA.id))
+            .filter(UA.created_at >= cutoff_date)
+            .group_by(UA.user_id)
+            .order_by(UA.user_id)
+            .all()
+        )
+        ctx.set_total(len(activity))
+        updated = 0
+        for start in range(0, len(activity), chunk_size):
+            chunk = activity[start:start + chunk_size]
+            ids = [row[0] for row in chunk]
+            # 청크 단위 IN 조회 2회 (결제 합계 / 기존 세그먼트) → 사용자별 쿼리 제거
+            Tx = models.ShopTransaction
+            monetary = dict(
+                db.query(Tx.user_id, func.coalesce(func.sum(Tx.amount), 0))
+                .filter(Tx.user_id.in_(ids), Tx.status == "success")
+                .group_by(Tx.user_id)
+                .all()
+            )
+            segments = {
+                s.user_id: s
+                for s in db.query(models.UserSegment).filter(models.UserSegment.user_id.in_(ids)).all()
+            }
+            for user_id, last_activity, frequency in chunk:
+                recency_days = (now - last_activity.replace(tzinfo=None)).days if last_activity else days
+                rfm_group, ltv_score, risk_profile = classify_rfm(recency_days, int(frequency or 0), float(monetary.get(user_id) or 0))
+                seg = segments.get(user_id)
+                if seg is None:
+                    db.add(models.UserSegment(user_id=user_id, rfm_group=rfm_group, ltv_score=ltv_score,
+                                              risk_profile=risk_profile, last_updated=now))
+                else:
+                    seg.rfm_group = rfm_group
+                    seg.ltv_score = ltv_score
+                    seg.risk_profile = risk_profile
+                    seg.last_updated = now
+            db.commit()
+            db.expunge_all()
+            updated += len(chunk)
+            ctx.advance(len(chunk))
+        return {"updated_users": updated, "calculation_period_days": days}
+    finally:
+        db.close()
+
+
+@register_job("invites.bulk_generate")
+def bulk_invites_job(ctx: JobContext, count: int = 10, length: int = 6, max_uses: Optional[int] = 1,
+                     days_valid: int = 30, chunk_size: int = INVITE_CHUNK_SIZE) -> Dict[str, Any]:
+    db = SessionLocal()
+    try:
+        svc = InviteService(db)
+        ctx.set_total(count)
+        codes: list[str] = []
+        while len(codes) < count:
+            n = min(chunk_size, count - len(codes))
+            codes.extend(svc.insert_bulk_invite_codes(n, length, max_uses, days_valid))
+            ctx.advance(n)
+        return {"created": len(codes), "codes": codes}
+    finally:
+        db.close()
+
+
+@register_job("campaigns.send")
+def send_campaign_job(ctx: JobContext, campaign_id: int, chunk_size: int = CAMPAIGN_CHUNK_SIZE) -> Dict[str, Any]:
+    db = SessionLocal()
+    try:
+        camp = db.query(models.NotificationCampaign).filter(models.NotificationCampaign.id == campaign_id).first()
+        if not camp:
+            raise ValueError(f"campaign {campaign_id} not found")
+
+        def _progress(sent: int, total: int) -> None:
+            if ctx.total != total:
+                ctx.set_total(total)
+            ctx.advance(sent - ctx.done)
+
+        # send_campaign 이 먼저 점유(scheduled → sending) — 스케줄러/다른 워커가 발송 중이면 CampaignAlreadyClaimed
+        try:
+            sent = send_campaign(db, camp, now=datetime.utcnow().replace(tzinfo=timezone.utc),
+                                 chunk_size=chunk_size, on_chunk=_progress)
+        except JobCancelled:
+            # 부분 발송 후 취소: 스케줄러가 전체를 재발송하지 않도록 상태 전환
+            camp.status = "cancelled"
+            db.add(camp)
+            db.commit()
+            raise
+        return {"campaign_id": campaign_id, "notifications": sent}
+    finally:
+        db.close()
+
+
+@register_job("notifications.reconcile_counters")
+def reconcile_notification_counters_job(ctx: JobContext, chunk_size: int = CAMPAIGN_CHUNK_SIZE) -> Dict[str, Any]:
+    db = SessionLocal()
+    try:
+        def _progress(done: int, total: int) -> None:
+            if ctx.total != total:
+                ctx.set_total(total)
+            ctx.advance(done - ctx.done)
+
+        repaired = reconcile_counters(db, chunk_size=chunk_size, on_chunk=_progress)
+        return {"repaired": repaired}
+    finally:
+        db.close()
+
+
+@register_job("storage.maintain_partitions")
+def maintain_partitions_job(ctx: JobContext, archive: Optional[bool] = None) -> Dict[str, Any]:
+    db = SessionLocal()
+    try:
+        ctx.set_total(1)
+        result = run_partition_maintenance(db, archive=archive)
+        ctx.advance(1)
+        return result
+    finally:
+        db.close()
+
+
+@register_job("actions.backfill_attributes")
+def backfill_action_attributes_job(ctx: JobContext, chunk_size: int = ACTION_ATTR_CHUNK_SIZE) -> Dict[str, Any]:
+    db = SessionLocal()
+    try:
+        ctx.set_total(count_unfilled(db, after_id=get_backfill_high_water()))
+        return backfill_action_attributes(
+            db, chunk_size=chunk_size, on_chunk=lambda scanned, _updated: ctx.advance(scanned - ctx.done)
+        )
+    finally:
+        db.close()
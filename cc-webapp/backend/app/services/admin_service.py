@@ -97,40 +97,20 @@ class AdminService:
         """
         from datetime import datetime, timedelta
         now = datetime.utcnow()
-        five_min_ago = now - timedelta(minutes=5)
         ten_min_ago = now - timedelta(minutes=10)
-        today_start = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
 
         # 기본 통계 재사용
         basic = self.get_system_stats()
 
-        # 온라인 사용자 (최근 5분 세션)
-        try:
-            online_users = self.db.query(models.UserSession.user_id) \
-                .filter(models.UserSession.last_used_at > five_min_ago, models.UserSession.is_active == True) \
-                .distinct().count()
-        except Exception:
-            online_users = 0
-
-        # 매출 합계 (ShopTransaction)
-        from sqlalchemy import func
-        try:
-            total_revenue = self.db.query(func.coalesce(func.sum(models.ShopTransaction.amount), 0)) \
-                .filter(models.ShopTransaction.status == 'success').scalar() or 0
-        except Exception:
-            total_revenue = 0
-        try:
-            today_revenue = self.db.query(func.coalesce(func.sum(models.ShopTransaction.amount), 0)) \
-                .filter(models.ShopTransaction.status == 'success', models.ShopTransaction.created_at >= today_start).scalar() or 0
-        except Exception:
-            today_revenue = 0
-
-        # Pending actions (pending 거래)
-        try:
-            pending_actions = self.db.query(models.ShopTransaction.id) \
-                .filter(models.ShopTransaction.status == 'pending').count()
-        except Exception:
-            pending_actions = 0
+        # 온라인 사용자 / 매출 / pending 거래: 라이브 카운터 O(1) 조회
+        # (shop_transactions / user_sessions 스캔은 주기적 동기화 시에만 발생)
+        from .live_metrics_service import get_live_metrics, REVENUE_TOTAL, PENDING_TX
+        live = get_live_metrics()
+        live.ensure_synced(self.db)
+        online_users = live.online_users(5)
+        total_revenue = live.gauge(REVENUE_TOTAL)
+        today_revenue = live.today_revenue(now=now)
+        pending_actions = live.gauge(PENDING_TX)
 
         # Critical alerts (최근 10분 지정 action)
         CRITICAL_ACTIONS = ['LIMITED_STOCK_ZERO', 'FRAUD_BLOCK', 'PAYMENT_FAIL_SPIKE']
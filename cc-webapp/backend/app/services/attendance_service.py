@@ -0,0 +1,384 @@
+"""Bitmap attendance & streak engine.
+
+출석/활동 기록을 사용자 × 액션당 Redis 비트맵 1개(1일 = 1비트)로 보관한다.
+기존 구조(월별 SADD 세트 + 120일 EXPIRE 재설정, 스트릭 계산 시 하루씩 user_actions 조회 최대 30회)를 대체.
+
+- 키: ``attendance:<action>:<user_id>`` — 비트 오프셋 = EPOCH(2020-01-01) 이후 경과 일수 (UTC)
+  → 사용자 × 액션 1년치 46바이트, 만료 없음
+- 기록: SETBIT (이전 비트 반환 → 당일 최초 기록 여부)
+- 스트릭: BITFIELD GET u63 청크 여러 개로 오늘부터 과거 378일을 한 번에 읽어 연속 1 비트 수 계산
+- 캘린더(월/주): BITFIELD GET u<n> 1회 → 비트 → 날짜
+- 최근 N일 활동 일수: BITCOUNT <start> <end> BIT (Redis 7)
+- ``summary`` 는 위 조회를 파이프라인 1회로 묶어 사용자당 왕복 1회 (리텐션 코호트는 ``*_many``)
+- ``ACTIVE`` 비트맵: 모든 user_actions INSERT 를 commit 시점에 기록 (세션 리스너 / crash 정산 bulk 경로)
+- Redis 미연결: 프로세스 메모리 세트 (워커 간 공유 안 됨, 기존 _fallback_cache 와 동일 수준)
+- 기존 데이터 이관: ``backfill_from_user_actions`` / ``scripts/backfill_attendance.py``
+"""
+from __future__ import annotations
+
+import calendar
+import logging
+import threading
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from .. import models
+from ..core import redis_keys
+from ..utils.redis import get_redis_manager
+from ..utils.session_hooks import register_commit_hook
+
+logger = logging.getLogger(__name__)
+
+EPOCH = date(2020, 1, 1)
+ACTIVE = "ACTIVE"
+CHUNK_BITS = 63          # BITFIELD unsigned 최대 폭
+STREAK_CHUNKS = 6        # 1회 왕복으로 읽는 스트릭 범위 = 378일 (초과 시에만 추가 왕복)
+_PIPE_CHUNK = 1000
+
+# (user_id, action_type, day)
+Mark = Tuple[int, str, date]
+
+
+def day_offset(day: date) -> int:
+    return (day - EPOCH).days
+
+
+def offset_day(offset: int) -> date:
+    return EPOCH + timedelta(days=offset)
+
+
+def _today() -> date:
+    return datetime.utcnow().date()
+
+
+def _as_day(value: Any) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+
+def _redis():
+    try:
+        return get_redis_manager().redis_client
+    except Exception:
+        return None
+
+
+# ------------------------------------------------------------------ memory fallback
+_memory_lock = threading.Lock()
+_memory: Dict[str, Set[int]] = {}
+
+
+def clear_memory() -> None:
+    with _memory_lock:
+        _memory.clear()
+
+
+def _mem_bits(key: str) -> Set[int]:
+    with _memory_lock:
+        return set(_memory.get(key, ()))
+
+
+# ------------------------------------------------------------------ bit layout helpers
+def _chunks(start: int, end: int) -> List[Tuple[int, int]]:
+    """[start, end] 오프셋 구간을 (offset, width≤63) BITFIELD GET 청크로 분할 (오래된 → 최근)."""
+    out = []
+    start = max(start, 0)
+    while start <= end:
+        width = min(CHUNK_BITS, end - start + 1)
+        out.append((start, width))
+        start += width
+    return out
+
+
+def _set_offsets(chunks: Sequence[Tuple[int, int]], values: Sequence[Any]) -> List[int]:
+    # BITFIELD GET: offset 비트가 MSB → 청크 내 j 번째 일자 = (width-1-j) 번째 비트
+    out = []
+    for (offset, width), value in zip(chunks, values):
+        v = int(value or 0)
+        out.extend(offset + j for j in range(width) if (v >> (width - 1 - j)) & 1)
+    return out
+
+
+def _streak_from(bits: Set[int], end: int, floor: int, grace_today: bool) -> Tuple[int, bool]:
+    """end 부터 과거로 연속된 1 비트 수. (count, floor 까지 끊김 없이 이어짐 여부)"""
+    if grace_today and end not in bits:
+        end -= 1
+    count = 0
+    off = end
+    while off >= floor and off in bits:
+        count += 1
+        off -= 1
+    return count, off < floor
+
+
+def _bitfield_args(key: str, chunks: Sequence[Tuple[int, int]]) -> List[Any]:
+    args: List[Any] = ["BITFIELD", key]
+    for offset, width in chunks:
+        args += ["GET", f"u{width}", offset]
+    return args
+
+
+# ------------------------------------------------------------------ record
+def record(user_id: int, action_type: str, day: Optional[Any] = None) -> bool:
+    """user × action × day 비트 설정. 당일 최초 기록이면 True (Redis 오류 시 False)."""
+    day = _as_day(day) if day is not None else _today()
+    off = day_offset(day)
+    if off < 0:
+        return False
+    key = redis_keys.attendance(action_type, user_id)
+    r = _redis()
+    if r is None:
+        with _memory_lock:
+            bits = _memory.setdefault(key, set())
+            first = off not in bits
+            bits.add(off)
+        return first
+    try:
+        return not r.setbit(key, off, 1)
+    except Exception:
+        logger.warning("attendance record failed user=%s action=%s", user_id, action_type, exc_info=True)
+        return False
+
+
+def record_many(marks: Iterable[Mark]) -> int:
+    """(user_id, action_type, day) 목록 SETBIT (중복 제거 후 파이프라인, best-effort). 처리 건수 반환."""
+    todo = {(redis_keys.attendance(a, uid), day_offset(_as_day(d))) for uid, a, d in marks if uid is not None}
+    todo = sorted((k, o) for k, o in todo if o >= 0)
+    if not todo:
+        return 0
+    r = _redis()
+    if r is None:
+        with _memory_lock:
+            for key, off in todo:
+                _memory.setdefault(key, set()).add(off)
+        return len(todo)
+    try:
+        for i in range(0, len(todo), _PIPE_CHUNK):
+            pipe = r.pipeline(transaction=False)
+            for key, off in todo[i:i + _PIPE_CHUNK]:
+                pipe.setbit(key, off, 1)
+            pipe.execute()
+    except Exception:
+        logger.warning("attendance record_many failed (%s marks)", len(todo), exc_info=True)
+        return 0
+    return len(todo)
+
+
+# ------------------------------------------------------------------ queries
+@dataclass
+class AttendanceSummary:
+    user_id: int
+    action_type: str
+    today: date
+    streak: int = 0
+    attended_today: bool = False
+    calendar: List[date] = field(default_factory=list)
+    active_days: Dict[int, int] = field(default_factory=dict)  # 최근 N일 → 활동 일수
+    first_day: Optional[date] = None
+    backend: str = "memory"
+
+
+def days_between(user_id: int, action_type: str, start: date, end: date) -> List[date]:
+    """[start, end] 구간의 기록 일자 목록 (BITFIELD 1회)."""
+    key = redis_keys.attendance(action_type, user_id)
+    lo, hi = day_offset(start), day_offset(end)
+    if hi < 0 or hi < lo:
+        return []
+    r = _redis()
+    if r is None:
+        return [offset_day(o) for o in sorted(_mem_bits(key)) if lo <= o <= hi]
+    chunks = _chunks(lo, hi)
+    try:
+        values = r.execute_command(*_bitfield_args(key, chunks))
+    except Exception:
+        logger.warning("attendance range read failed user=%s action=%s", user_id, action_type, exc_info=True)
+        return []
+    return [offset_day(o) for o in _set_offsets(chunks, values)]
+
+
+def month(user_id: int, action_type: str, year: int, month_: int) -> List[date]:
+    last = calendar.monthrange(year, month_)[1]
+    return days_between(user_id, action_type, date(year, month_, 1), date(year, month_, last))
+
+
+def streak(user_id: int, action_type: str, today: Optional[date] = None, *, grace_today: bool = False) -> int:
+    """today 부터 과거로 연속 기록 일수. grace_today=True 면 오늘 미기록 시 어제부터 센다."""
+    today = today or _today()
+    return summary(user_id, action_type, today, windows=(), calendar_range=None, grace_today=grace_today).streak
+
+
+def active_days(user_id: int, action_type: str, days: int, today: Optional[date] = None) -> int:
+    """최근 days 일(오늘 포함) 중 기록 일수 (BITCOUNT ... BIT)."""
+    today = today or _today()
+    return summary(user_id, action_type, today, windows=(days,), calendar_range=None,
+                   with_streak=False).active_days.get(days, 0)
+
+
+def summary(user_id: int, action_type: str, today: Optional[date] = None, *,
+            windows: Sequence[int] = (7, 30), calendar_range: Optional[Tuple[date, date]] = (),
+            grace_today: bool = False, with_streak: bool = True) -> AttendanceSummary:
+    """스트릭 + 캘린더 + 최근 N일 활동 일수 + 최초 기록일을 파이프라인 1회로 조회.
+
+    calendar_range 기본값(빈 튜플)은 today 가 속한 월, None 이면 캘린더 생략.
+    378일을 넘는 스트릭만 이어지는 구간을 추가 BITFIELD 로 읽는다.
+    """
+    today = today or _today()
+    out = AttendanceSummary(user_id=user_id, action_type=action_type, today=today)
+    key = redis_keys.attendance(action_type, user_id)
+    end = day_offset(today)
+    if calendar_range == ():
+        calendar_range = (today.replace(day=1), today.replace(day=calendar.monthrange(today.year, today.month)[1]))
+    if end < 0:
+        return out
+    streak_chunks = _chunks(end - CHUNK_BITS * STREAK_CHUNKS + 1, end) if with_streak else []
+    cal_chunks = _chunks(day_offset(calendar_range[0]), day_offset(calendar_range[1])) if calendar_range else []
+    window_ranges = [(n, max(end - n + 1, 0)) for n in windows if n > 0]
+
+    r = _redis()
+    if r is None:
+        bits = _mem_bits(key)
+        out.attended_today = end in bits
+        if with_streak:
+            out.streak, _ = _streak_from(bits, end, 0, grace_today)
+        if calendar_range:
+            cal_lo, cal_hi = day_offset(calendar_range[0]), day_offset(calendar_range[1])
+            out.calendar = [offset_day(o) for o in sorted(bits) if cal_lo <= o <= cal_hi]
+        out.active_days = {n: sum(1 for o in bits if lo <= o <= end) for n, lo in window_ranges}
+        out.first_day = offset_day(min(bits)) if bits else None
+        return out
+
+    out.backend = "redis"
+    try:
+        pipe = r.pipeline(transaction=False)
+        pipe.getbit(key, end)
+        if streak_chunks or cal_chunks:
+            pipe.execute_command(*_bitfield_args(key, streak_chunks + cal_chunks))
+        for _, lo in window_ranges:
+            pipe.execute_command("BITCOUNT", key, lo, end, "BIT")
+        pipe.execute_command("BITPOS", key, 1)
+        res = pipe.execute()
+        out.attended_today = bool(res[0])
+        pos = 1
+        if streak_chunks or cal_chunks:
+            values = list(res[pos] or [])
+            pos += 1
+            out.calendar = [offset_day(o) for o in _set_offsets(cal_chunks, values[len(streak_chunks):])]
+            if streak_chunks:
+                floor = streak_chunks[0][0]
+                bits = set(_set_offsets(streak_chunks, values[:len(streak_chunks)]))
+                out.streak, open_ended = _streak_from(bits, end, floor, grace_today)
+                while open_ended and floor > 0:
+                    # 378일 초과 연속 — 끊길 때까지 이전 구간 추가 조회 (드묾)
+                    more = _chunks(floor - CHUNK_BITS * STREAK_CHUNKS, floor - 1)
+                    bits = set(_set_offsets(more, r.execute_command(*_bitfield_args(key, more))))
+                    extra, open_ended = _streak_from(bits, floor - 1, more[0][0], False)
+                    out.streak += extra
+                    floor = more[0][0]
+        for n, _ in window_ranges:
+            out.active_days[n] = int(res[pos] or 0)
+            pos += 1
+        first = int(res[pos]) if res[pos] is not None else -1
+        out.first_day = offset_day(first) if first >= 0 else None
+    except Exception:
+        logger.warning("attendance summary failed user=%s action=%s", user_id, action_type, exc_info=True)
+    return out
+
+
+def active_days_many(user_ids: Sequence[int], action_type: str, days: int,
+                     today: Optional[date] = None) -> Dict[int, int]:
+    """다수 사용자 최근 days 일 활동 일수 (리텐션/코호트용, 파이프라인 1회)."""
+    today = today or _today()
+    end = day_offset(today)
+    lo = max(end - days + 1, 0)
+    if end < 0 or days <= 0:
+        return {uid: 0 for uid in user_ids}
+    r = _redis()
+    if r is None:
+        return {uid: sum(1 for o in _mem_bits(redis_keys.attendance(action_type, uid)) if lo <= o <= end)
+                for uid in user_ids}
+    try:
+        pipe = r.pipeline(transaction=False)
+        for uid in user_ids:
+            pipe.execute_command("BITCOUNT", redis_keys.attendance(action_type, uid), lo, end, "BIT")
+        return {uid: int(v or 0) for uid, v in zip(user_ids, pipe.execute())}
+    except Exception:
+        logger.warning("attendance active_days_many failed", exc_info=True)
+        return {uid: 0 for uid in user_ids}
+
+
+def attended_on_many(user_ids: Sequence[int], action_type: str, day: date) -> Dict[int, bool]:
+    """다수 사용자의 특정 일자 기록 여부 (D+N 리텐션, GETBIT 파이프라인 1회)."""
+    off = day_offset(day)
+    if off < 0:
+        return {uid: False for uid in user_ids}
+    r = _redis()
+    if r is None:
+        return {uid: off in _mem_bits(redis_keys.attendance(action_type, uid)) for uid in user_ids}
+    try:
+        pipe = r.pipeline(transaction=False)
+        for uid in user_ids:
+            pipe.getbit(redis_keys.attendance(action_type, uid), off)
+        return {uid: bool(v) for uid, v in zip(user_ids, pipe.execute())}
+    except Exception:
+        logger.warning("attendance attended_on_many failed", exc_info=True)
+        return {uid: False for uid in user_ids}
+
+
+# ------------------------------------------------------------------ backfill
+def backfill_from_user_actions(db: Session, *, since: Optional[date] = None, until: Optional[date] = None,
+                               action_types: Sequence[str] = (), batch: int = 5000) -> int:
+    """user_actions 의 (user_id, 일자) 를 ACTIVE 비트맵으로 이관 (action_types 지정 시 해당 액션 비트맵도).
+
+    DISTINCT 일자 단위로 스트리밍 → batch 마다 SETBIT 파이프라인. SETBIT 은 멱등이라 재실행 안전.
+    """
+    UA = models.UserAction
+    day_col = func.date(UA.created_at)
+    q = db.query(UA.user_id, UA.action_type, day_col).filter(UA.created_at.isnot(None))
+    if since:
+        q = q.filter(UA.created_at >= datetime.combine(since, datetime.min.time()))
+    if until:
+        q = q.filter(UA.created_at < datetime.combine(until + timedelta(days=1), datetime.min.time()))
+    q = q.distinct()
+    wanted = set(action_types)
+    written = 0
+    marks: List[Mark] = []
+    for uid, action, day in q.yield_per(batch):
+        if day is None:
+            continue
+        marks.append((uid, ACTIVE, day))
+        if action in wanted:
+            marks.append((uid, action, day))
+        if len(marks) >= batch:
+            written += record_many(marks)
+            marks = []
+    written += record_many(marks)
+    return written
+
+
+# ------------------------------------------------------------------ ACTIVE 비트맵 세션 리스너
+_PENDING_KEY = "attendance_active_marks"
+
+
+def _collect(session: Session, pending: Set[Mark]) -> None:
+    for obj in session.new:
+        if isinstance(obj, models.UserAction) and obj.user_id is not None:
+            pending.add((obj.user_id, ACTIVE, _as_day(obj.created_at or datetime.utcnow())))
+
+
+def install_attendance_listeners() -> None:
+    """모든 Session 에 user_actions INSERT → ACTIVE 비트 기록 리스너 등록 (멱등)."""
+    register_commit_hook(_PENDING_KEY, _collect, record_many)
+
+
+__all__ = [
+    "EPOCH", "ACTIVE", "AttendanceSummary", "day_offset", "offset_day", "record", "record_many",
+    "days_between", "month", "streak", "active_days", "summary", "active_days_many", "attended_on_many",
+    "backfill_from_user_actions", "install_attendance_listeners", "clear_memory",
+]
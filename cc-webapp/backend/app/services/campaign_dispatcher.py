@@ -4,14 +4,56 @@ from __future__ import annotations
 
 Processes due NotificationCampaigns by creating Notification rows for targeted users
 and marking campaigns as sent. Designed to be called by a scheduler periodically.
+
+A sender first claims the campaign (``scheduled`` -> ``sending`` conditional UPDATE), so the
+scheduler, the admin "send now" job and other workers never send the same campaign at once.
+The claim is a lease refreshed on every chunk commit; a ``sending`` campaign whose lease
+expired (process died mid-run) can be claimed again and resumes after ``sent_cursor``.
 """
 
-from datetime import datetime, timezone
-from typing import List, Set
+from datetime import datetime, timedelta, timezone
+from typing import Callable, List, Set
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy import and_, insert, or_, update
 
 from app import models
+from app.services import notification_counters, notification_stream
+
+
+CLAIM_LEASE_SECONDS = 600
+
+
+class CampaignAlreadyClaimed(ValueError):
+    """Another sender holds the campaign (or it is no longer scheduled)."""
+
+
+def _utcnow() -> datetime:
+    return datetime.utcnow().replace(tzinfo=timezone.utc)
+
+
+def _claimable(now: datetime, lease_seconds: int):
+    C = models.NotificationCampaign
+    stale = now - timedelta(seconds=lease_seconds)
+    return or_(
+        C.status == "scheduled",
+        and_(C.status == "sending", or_(C.claimed_at == None, C.claimed_at < stale)),  # noqa: E711
+    )
+
+
+def claim_campaign(db: Session, camp: models.NotificationCampaign, *,
+                   lease_seconds: int = CLAIM_LEASE_SECONDS) -> bool:
+    """Atomically move the campaign to ``sending`` (checks rowcount). Returns whether we own it."""
+    C = models.NotificationCampaign
+    now = _utcnow()
+    res = db.execute(
+        update(C)
+        .where(C.id == camp.id, _claimable(now, lease_seconds))
+        .values(status="sending", claimed_at=now)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    db.refresh(camp)
+    return res.rowcount == 1
 
 
 def _parse_user_ids(csv_text: str | None) -> List[int]:
@@ -53,9 +95,9 @@ def _target_user_ids(db: Session, campaign: models.NotificationCampaign) -> Set[
 
 
 def dispatch_due_campaigns(db: Session, now: datetime | None = None) -> int:
-    """Dispatch campaigns that are due (scheduled and time <= now).
+    """Dispatch campaigns that are due (scheduled and time <= now, or an expired send lease).
 
-    Returns number of campaigns processed.
+    Returns number of campaigns processed (campaigns claimed by another sender are skipped).
     """
     if now is None:
         now = datetime.utcnow().replace(tzinfo=timezone.utc)
@@ -63,7 +105,7 @@ def dispatch_due_campaigns(db: Session, now: datetime | None = None) -> int:
     due_campaigns: List[models.NotificationCampaign] = (
         db.query(models.NotificationCampaign)
         .filter(
-            models.NotificationCampaign.status == "scheduled",
+            _claimable(_utcnow(), CLAIM_LEASE_SECONDS),
             # If scheduled_at is NULL, treat as immediate
             (models.NotificationCampaign.scheduled_at == None)  # noqa: E711
             | (models.NotificationCampaign.scheduled_at <= now)
@@ -73,29 +115,67 @@ def dispatch_due_campaigns(db: Session, now: datetime | None = None) -> int:
 
     processed = 0
     for camp in due_campaigns:
-        user_ids = _target_user_ids(db, camp)
-        if not user_ids:
-            # Nothing to do, mark as sent to avoid endless retries
-            camp.status = "sent"
-            camp.sent_at = now
-            db.add(camp)
-            db.commit()
-            processed += 1
+        try:
+            send_campaign(db, camp, now=now)
+        except CampaignAlreadyClaimed:
             continue
-        # Create notifications for each user
-        for uid in user_ids:
-            notif = models.Notification(
-                user_id=uid,
-                title=getattr(camp, "title", ""),
-                message=getattr(camp, "message", ""),
-                is_sent=False,
-            )
-            db.add(notif)
-        # Mark campaign as sent
-        camp.status = "sent"
-        camp.sent_at = now
-        db.add(camp)
-        db.commit()
         processed += 1
 
     return processed
+
+
+def send_campaign(
+    db: Session,
+    camp: models.NotificationCampaign,
+    now: datetime | None = None,
+    *,
+    chunk_size: int = 1000,
+    on_chunk: Callable[[int, int], None] | None = None,
+) -> int:
+    """Create Notification rows for a campaign in bulk chunks and mark it sent.
+
+    Each chunk commits together with ``camp.sent_cursor`` (last user_id delivered), so a
+    retry after a crash/restart resumes after the cursor instead of re-sending (and
+    re-publishing to the replay stream) chunks that were already delivered.
+
+    The campaign is claimed first (see ``claim_campaign``); raises ``CampaignAlreadyClaimed``
+    when another sender holds it or it is no longer scheduled.
+
+    ``on_chunk(sent, total)`` is invoked after each committed chunk (job progress /
+    cancellation hook). Returns number of notifications created by this call.
+    """
+    if now is None:
+        now = datetime.utcnow().replace(tzinfo=timezone.utc)
+    if not claim_campaign(db, camp):
+        raise CampaignAlreadyClaimed(f"campaign {camp.id} is not claimable (status={camp.status})")
+    cursor = camp.sent_cursor or 0
+    user_ids = sorted(uid for uid in _target_user_ids(db, camp) if uid > cursor)
+    total = len(user_ids)
+    title = getattr(camp, "title", "")
+    message = getattr(camp, "message", "")
+    sent = 0
+    for start in range(0, total, chunk_size):
+        chunk = user_ids[start:start + chunk_size]
+        db.execute(
+            insert(models.Notification),
+            [{"user_id": uid, "title": title, "message": message, "is_sent": False, "created_at": now} for uid in chunk],
+        )
+        deltas = {uid: (1, 1) for uid in chunk}
+        notification_counters.bump(db, deltas)
+        camp.sent_cursor = chunk[-1]
+        camp.claimed_at = _utcnow()  # 리스 갱신
+        db.add(camp)
+        db.commit()
+        notification_counters.publish(deltas)
+        notification_stream.publish_many(
+            chunk, {"campaign_id": camp.id, "title": title, "message": message}, topic="campaign"
+        )
+        sent += len(chunk)
+        if on_chunk:
+            on_chunk(sent, total)
+    # Mark campaign as sent (empty target also marked to avoid endless retries)
+    camp.status = "sent"
+    camp.sent_at = now
+    db.add(camp)
+    db.commit()
+    return sent
@@ -4,19 +4,40 @@
 실시간 채팅 및 AI 대화 시스템
 """
 
+import inspect
 import logging
 import json
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Set, Tuple
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, desc
 
 from .. import models
+from ..core import redis_keys
+from ..utils.pagination import keyset_page
+from ..utils.session_hooks import register_commit_hook
 from ..schemas.chat_schemas import ChatMessageCreate, ChatRoomCreate
 from ..utils.emotion_engine import EmotionEngine
 
 logger = logging.getLogger(__name__)
 
+# 참가자 SET 캐시 TTL (참가/퇴장 commit 시 즉시 삭제, TTL 은 안전망)
+ROOM_MEMBERS_TTL_SECONDS = 3600
+# 빈 방도 캐시로 표현하기 위한 센티널 멤버 (user id 는 1 부터)
+_MEMBERS_SENTINEL = "0"
+
+# KEYS[1]=members SET  KEYS[2]=epoch  ARGV: epoch(조회 전 값, 없으면 ""), ttl, member, member, ...
+# 무효화(epoch INCR → DEL)가 DB 조회 이후 끼어들었으면 채우지 않음 (오래된 참가자 집합 복원 방지)
+_FILL_MEMBERS_LUA = """
+if (redis.call('GET', KEYS[2]) or '') ~= ARGV[1] then
+  return 0
+end
+redis.call('DEL', KEYS[1])
+redis.call('SADD', KEYS[1], unpack(ARGV, 3))
+redis.call('EXPIRE', KEYS[1], tonumber(ARGV[2]))
+return 1
+"""
+
 
 class ChatService:
     def __init__(self, db: Session, redis=None):
@@ -80,6 +101,7 @@ class ChatService:
             
             self.db.add(participant)
             self.db.commit()
+            await self._invalidate_room_members(room_id)
             
             return True
             
@@ -88,57 +110,64 @@ class ChatService:
             self.db.rollback()
             return False
 
-    async def send_message(
-        self, 
-        user_id: int, 
-        room_id: int, 
-        message_data: ChatMessageCreate
-    ) -> models.ChatMessage:
-        """메시지 전송"""
+    async def leave_chat_room(self, user_id: int, room_id: int) -> bool:
+        """채팅방 퇴장 (참가 레코드 비활성화)"""
         try:
-            # 채팅방 참가 확인
-            participant = self.db.query(models.ChatParticipant).filter(
+            updated = self.db.query(models.ChatParticipant).filter(
                 and_(
                     models.ChatParticipant.user_id == user_id,
                     models.ChatParticipant.room_id == room_id,
                     models.ChatParticipant.is_active == True
                 )
-            ).first()
+            ).update({models.ChatParticipant.is_active: False}, synchronize_session=False)
+            self.db.commit()
+            if updated:
+                await self._invalidate_room_members(room_id)
+            return bool(updated)
             
-            if not participant:
+        except Exception as e:
+            logger.error(f"Failed to leave chat room: {str(e)}")
+            self.db.rollback()
+            return False
+
+    async def send_message(
+        self, 
+        user_id: int, 
+        room_id: int, 
+        message_data: ChatMessageCreate
+    ) -> models.ChatMessage:
+        """메시지 전송 (메시지 + 감정 메타데이터 단일 커밋, 방 채널 1회 publish)"""
+        try:
+            # 채팅방 참가 확인 (Redis 참가자 SET 캐시)
+            if not await self.is_room_member(room_id, user_id):
                 raise ValueError("User is not a participant of this room")
             
-            # 메시지 생성
+            # 감정 분석을 INSERT 전에 수행 → 메시지와 함께 기록
+            emotion_result = None
+            if message_data.content:
+                emotion_result = await self.emotion_engine.detect_emotion_from_text(
+                    message_data.content
+                )
+            
             message = models.ChatMessage(
                 room_id=room_id,
                 sender_id=user_id,
                 content=message_data.content,
-                message_type=message_data.message_type,
-                sent_at=datetime.utcnow(),
-                metadata=message_data.metadata or {}
+                message_type=getattr(message_data.message_type, "value", message_data.message_type),
+                reply_to_id=message_data.reply_to_id,
+                thread_id=message_data.thread_id,
+                created_at=datetime.utcnow(),
             )
+            if emotion_result:
+                message.emotion_detected = emotion_result.get("emotion")
+                message.sentiment_score = emotion_result.get("sentiment_score")
             
             self.db.add(message)
             self.db.commit()
             self.db.refresh(message)
             
-            # 감정 분석 (비동기)
-            if message_data.content:
-                emotion_result = await self.emotion_engine.detect_emotion_from_text(
-                    message_data.content
-                )
-                
-                # 감정 결과를 메타데이터에 저장
-                if emotion_result:
-                    message.metadata = {
-                        **message.metadata,
-                        "emotion": emotion_result
-                    }
-                    self.db.commit()
-            
-            # Redis에 실시간 알림 (있는 경우)
-            if self.redis:
-                await self._notify_room_participants(room_id, message)
+            # 방 채널 실시간 알림
+            await self._notify_room_participants(room_id, message)
             
             return message
             
@@ -154,7 +183,14 @@ class ChatService:
         limit: int = 50,
         offset: int = 0
     ) -> List[models.ChatMessage]:
-        """채팅방 메시지 조회"""
+        """채팅방 메시지 조회 (offset 호환 모드)"""
+        if offset == 0:
+            try:
+                messages, _ = await self.get_room_messages_page(room_id, user_id, limit=limit)
+            except ValueError as e:
+                logger.error(f"Failed to get room messages: {str(e)}")
+                return []
+            return messages
         try:
             # 참가 권한 확인
             participant = self.db.query(models.ChatParticipant).filter(
@@ -174,11 +210,11 @@ class ChatService:
             
             if participant.joined_at:
                 query = query.filter(
-                    models.ChatMessage.sent_at >= participant.joined_at
+                    models.ChatMessage.created_at >= participant.joined_at
                 )
             
             messages = query.order_by(
-                desc(models.ChatMessage.sent_at)
+                desc(models.ChatMessage.created_at), desc(models.ChatMessage.id)
             ).offset(offset).limit(limit).all()
             
             return list(reversed(messages))  # 시간순 정렬
@@ -187,6 +223,48 @@ class ChatService:
             logger.error(f"Failed to get room messages: {str(e)}")
             return []
 
+    async def get_room_messages_page(
+        self,
+        room_id: int,
+        user_id: int,
+        limit: int = 50,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[models.ChatMessage], Optional[str]]:
+        """채팅방 메시지 keyset 페이지 조회 (최신 → 과거, next_cursor 로 이전 메시지 이어 읽기)
+
+        잘못된 커서는 InvalidCursor, 참가자가 아니면 ValueError.
+        """
+        try:
+            participant = self.db.query(models.ChatParticipant).filter(
+                and_(
+                    models.ChatParticipant.user_id == user_id,
+                    models.ChatParticipant.room_id == room_id
+                )
+            ).first()
+            
+            if not participant:
+                raise ValueError("User is not authorized to view this room")
+            
+            query = self.db.query(models.ChatMessage).filter(
+                models.ChatMessage.room_id == room_id
+            )
+            if participant.joined_at:
+                query = query.filter(
+                    models.ChatMessage.created_at >= participant.joined_at
+                )
+            
+            messages, next_cursor = keyset_page(
+                query, models.ChatMessage.created_at, models.ChatMessage.id,
+                limit=limit, cursor=cursor
+            )
+            return list(reversed(messages)), next_cursor  # 시간순 정렬
+            
+        except ValueError:
+            raise  # 잘못된 커서(InvalidCursor) / 비참가자 → 호출부에서 400/403
+        except Exception as e:
+            logger.error(f"Failed to get room messages: {str(e)}")
+            return [], None
+
     async def create_ai_conversation(
         self,
         user_id: int,
@@ -416,39 +494,87 @@ class ChatService:
         room_id: int, 
         message: models.ChatMessage
     ):
-        """실시간 알림 전송 (Redis)"""
+        """실시간 알림 전송 (방 채널 1회 publish).
+
+        참가자별 publish 대신 방 채널(``chat:room:<id>``)에 한 번만 발행한다.
+        - Redis: 다른 인스턴스/소비자용 채널 publish 1회 (각 워커의 ``chat_room_relay`` 가 로컬 허브로 전달)
+        - RealtimeHub: 이 프로세스에서 방 토픽을 구독 중인 소켓에 1회 직렬화 후 전송
+        발신자 본인 필터링은 클라이언트가 sender_id 로 처리한다.
+        """
+        channel = redis_keys.chat_room_channel(room_id)
+        sent_at = message.created_at or datetime.utcnow()
+        notification = {
+            "type": "new_message",
+            "room_id": room_id,
+            "message_id": message.id,
+            "sender_id": message.sender_id,
+            "content": message.content,
+            "emotion": message.emotion_detected,
+            "timestamp": sent_at.isoformat()
+        }
+        if self.redis:
+            try:
+                # origin: 다른 워커의 릴레이만 전달 (이 워커 구독자는 아래 허브 publish 로 수신)
+                from ..realtime.relay import INSTANCE_ID, ORIGIN_FIELD
+                payload = json.dumps({**notification, ORIGIN_FIELD: INSTANCE_ID})
+                await self._call(self.redis.publish(channel, payload))
+            except Exception as e:
+                logger.error(f"Failed to publish room message: {str(e)}")
         try:
-            if not self.redis:
-                return
-            
-            # 채팅방 참가자 목록
-            participants = self.db.query(models.ChatParticipant).filter(
-                and_(
-                    models.ChatParticipant.room_id == room_id,
-                    models.ChatParticipant.is_active == True
-                )
-            ).all()
-            
-            notification = {
-                "type": "new_message",
-                "room_id": room_id,
-                "message_id": message.id,
-                "sender_id": message.sender_id,
-                "content": message.content,
-                "timestamp": message.sent_at.isoformat()
-            }
-            
-            # 각 참가자에게 알림
-            for participant in participants:
-                if participant.user_id != message.sender_id:  # 본인 제외
-                    await self.redis.publish(
-                        f"user_{participant.user_id}_chat",
-                        json.dumps(notification)
-                    )
-                    
+            from ..realtime import hub
+            await hub.publish(channel, notification)
         except Exception as e:
             logger.error(f"Failed to notify participants: {str(e)}")
 
+    async def is_room_member(self, room_id: int, user_id: int) -> bool:
+        """활성 참가자 여부 (Redis SET 캐시 → 미스 시 DB 로드 후 epoch 비교 채움)."""
+        if self.redis:
+            key = redis_keys.chat_room_members(room_id)
+            epoch_key = redis_keys.chat_room_members_epoch(room_id)
+            try:
+                if await self._call(self.redis.exists(key)):
+                    return bool(await self._call(self.redis.sismember(key, str(user_id))))
+                epoch = await self._call(self.redis.get(epoch_key))
+                if isinstance(epoch, bytes):
+                    epoch = epoch.decode()
+                members = self._load_room_members(room_id)
+                await self._call(self.redis.eval(
+                    _FILL_MEMBERS_LUA, 2, key, epoch_key, epoch or "", ROOM_MEMBERS_TTL_SECONDS,
+                    _MEMBERS_SENTINEL, *(str(m) for m in members),
+                ))
+                return user_id in members
+            except Exception as e:
+                logger.warning(f"Room member cache unavailable, falling back to DB: {str(e)}")
+        return user_id in self._load_room_members(room_id)
+
+    def _load_room_members(self, room_id: int) -> Set[int]:
+        rows = self.db.query(models.ChatParticipant.user_id).filter(
+            and_(
+                models.ChatParticipant.room_id == room_id,
+                models.ChatParticipant.is_active == True
+            )
+        ).all()
+        return {r[0] for r in rows}
+
+    async def _invalidate_room_members(self, room_id: int) -> None:
+        if not self.redis:
+            return
+        try:
+            # epoch 먼저 올려 진행 중인 채우기(변경 전 DB 조회분)를 무효화한 뒤 삭제
+            epoch_key = redis_keys.chat_room_members_epoch(room_id)
+            await self._call(self.redis.incr(epoch_key))
+            await self._call(self.redis.expire(epoch_key, ROOM_MEMBERS_TTL_SECONDS))
+            await self._call(self.redis.delete(redis_keys.chat_room_members(room_id)))
+        except Exception as e:
+            logger.warning(f"Failed to invalidate room member cache: {str(e)}")
+
+    @staticmethod
+    async def _call(result):
+        """동기(redis-py) / 비동기(redis.asyncio) 클라이언트 결과 모두 지원."""
+        if inspect.isawaitable(result):
+            return await result
+        return result
+
     async def update_emotion_profile(
         self,
         user_id: int,
@@ -490,3 +616,42 @@ class ChatService:
             logger.error(f"Failed to update emotion profile: {str(e)}")
             self.db.rollback()
             raise
+
+
+# ------------------------------------------------------------------ ChatParticipant commit 리스너
+# 서비스 밖 ORM 경로(chat_router 등)의 참가/퇴장도 commit 시 참가자 SET 캐시를 삭제 (재적재는 조회 시)
+_PENDING_KEY = "chat_member_changes"
+
+
+def invalidate_room_members(room_ids) -> None:
+    """참가자 SET 캐시 삭제 + epoch 증가 (동기 Redis, best-effort)."""
+    room_ids = [rid for rid in room_ids if rid is not None]
+    if not room_ids:
+        return
+    try:
+        from ..utils.redis import get_redis_manager
+        r = get_redis_manager().redis_client
+    except Exception:
+        r = None
+    if r is None:
+        return
+    try:
+        for rid in room_ids:
+            epoch_key = redis_keys.chat_room_members_epoch(rid)
+            r.incr(epoch_key)
+            r.expire(epoch_key, ROOM_MEMBERS_TTL_SECONDS)
+        r.delete(*[redis_keys.chat_room_members(rid) for rid in room_ids])
+    except Exception as e:
+        logger.warning(f"Failed to invalidate room member cache: {str(e)}")
+
+
+def _collect(session: Session, pending: Set[int]) -> None:
+    for objs in (session.new, session.dirty, session.deleted):
+        for obj in objs:
+            if isinstance(obj, models.ChatParticipant):
+                pending.add(obj.room_id)
+
+
+def install_chat_member_listeners() -> None:
+    """모든 Session 에 ChatParticipant 변경 → 참가자 SET 캐시 삭제 리스너 등록 (멱등)."""
+    register_commit_hook(_PENDING_KEY, _collect, invalidate_room_members)
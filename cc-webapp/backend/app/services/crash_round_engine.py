@@ -0,0 +1,411 @@
+"""Shared-round multiplayer crash engine.
+
+기존 ``POST /api/games/crash/bet`` 는 요청마다 라운드 전체를 시뮬레이션하고
+crash_sessions / user_actions / game_history / user_game_stats 를 베팅 1건씩 기록한다.
+이 엔진은 샤드별 라운드 루프 1개가 모든 플레이어를 처리한다.
+
+라운드 수명주기 (샤드당 asyncio 태스크 1개):
+  1) betting  : ``CRASH_BETTING_SECONDS`` 동안 인메모리 베팅북에 접수 (DB 쓰기 없음)
+  2) running  : ``CRASH_TICK_MS`` 간격으로 배수 m(t)=e^(g·t) 계산 → 틱 1회 직렬화 후
+                ``RealtimeHub.publish("crash:<shard>")`` 로 구독자 전체에 전송.
+                자동 캐시아웃은 목표 배수 정렬 리스트 포인터로 처리 (틱당 O(신규 캐시아웃))
+  3) crashed  : 모든 베팅/캐시아웃을 단일 트랜잭션으로 일괄 정산
+                (users 잔액 executemany UPDATE, user_actions / game_history bulk INSERT,
+                user_game_stats 배치 증분, commit 후 리더보드 ZINCRBY) 후 결과 이벤트 1회 publish
+  종료/재배포로 betting·running 중 루프가 취소되면 ``stop`` 이 라운드를 무효(voided) 처리하고 베팅액을 환불
+
+정산 규칙은 기존 단일 요청 모드와 동일: 베팅액은 접수 시점에 조건부 UPDATE 로 즉시 차감
+(``gold_balance >= bet`` 불충족 시 거부), 캐시아웃 시 bet × 배수 지급 (순이익 bet × (m - 1)).
+크래시 배수 분포는 ``crash_point_from_uniform`` 공유.
+"""
+from __future__ import annotations
+
+import asyncio
+import bisect
+import json
+import logging
+import math
+import os
+import secrets
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import bindparam, insert, update
+
+from .. import models
+from ..realtime.snapshot import patch_balances
+from . import attendance_service, leaderboard_service
+from ..core.game_math import crash_point_from_uniform
+
+logger = logging.getLogger(__name__)
+
+BETTING = "betting"
+RUNNING = "running"
+CRASHED = "crashed"
+VOIDED = "voided"
+
+
+class CrashRoundError(ValueError):
+    """베팅/캐시아웃 거부 (라운드 단계 불일치, 중복 베팅 등)."""
+
+
+class CrashInsufficientFunds(CrashRoundError):
+    """베팅액 차감 실패 (잔액 부족)."""
+
+
+@dataclass
+class BookEntry:
+    user_id: int
+    bet_amount: int
+    auto_cashout: Optional[float] = None
+    cashed_at: Optional[float] = None
+
+
+@dataclass
+class CrashRound:
+    round_id: str
+    shard: int
+    crash_point: float
+    phase: str = BETTING
+    betting_ends_at: float = 0.0
+    started_at: float = 0.0
+    multiplier: float = 1.0
+    book: Dict[int, BookEntry] = field(default_factory=dict)
+    # 자동 캐시아웃 목표 배수 오름차순 (target, user_id) + 처리 포인터
+    auto_targets: List[tuple] = field(default_factory=list)
+    auto_ptr: int = 0
+
+    def public_state(self) -> Dict[str, Any]:
+        state = {
+            "round_id": self.round_id,
+            "shard": self.shard,
+            "phase": self.phase,
+            "multiplier": self.multiplier,
+            "players": len(self.book),
+            "betting_ends_at": self.betting_ends_at,
+        }
+        if self.phase == CRASHED:
+            state["crash_point"] = self.crash_point
+        return state
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+class CrashRoundEngine:
+    """단일 샤드 라운드 루프."""
+
+    def __init__(
+        self,
+        shard: int = 0,
+        *,
+        betting_seconds: Optional[float] = None,
+        tick_ms: Optional[float] = None,
+        growth_per_sec: Optional[float] = None,
+        cooldown_seconds: Optional[float] = None,
+        session_factory: Optional[Callable[[], Any]] = None,
+        publisher: Optional[Any] = None,
+        rng: Optional[Callable[[], float]] = None,
+    ) -> None:
+        self.shard = shard
+        self.betting_seconds = betting_seconds if betting_seconds is not None else _env_float("CRASH_BETTING_SECONDS", 8.0)
+        self.tick_seconds = (tick_ms if tick_ms is not None else _env_float("CRASH_TICK_MS", 100.0)) / 1000.0
+        self.growth = growth_per_sec if growth_per_sec is not None else _env_float("CRASH_GROWTH_PER_SEC", 0.12)
+        self.cooldown_seconds = cooldown_seconds if cooldown_seconds is not None else _env_float("CRASH_COOLDOWN_SECONDS", 3.0)
+        if session_factory is None:
+            from ..database import SessionLocal
+            session_factory = SessionLocal
+        self._session_factory = session_factory
+        if publisher is None:
+            from ..realtime import hub as publisher
+        self._publisher = publisher
+        self._rng = rng or (lambda: secrets.randbelow(10_000) / 10_000.0)
+        self.topic = f"crash:{shard}"
+        self.current: Optional[CrashRound] = None
+        self._task: Optional[asyncio.Task] = None
+        self.last_settlement: Optional[Dict[str, Any]] = None
+
+    # ------------------------------------------------------------------ rounds
+    def new_round(self) -> CrashRound:
+        rnd = CrashRound(
+            round_id=uuid.uuid4().hex,
+            shard=self.shard,
+            crash_point=crash_point_from_uniform(self._rng()),
+            betting_ends_at=time.time() + self.betting_seconds,
+        )
+        self.current = rnd
+        return rnd
+
+    def place_bet(self, user_id: int, bet_amount: int, auto_cashout: Optional[float] = None) -> CrashRound:
+        """베팅 접수 (betting 단계, 사용자당 1건). 베팅액은 이 시점에 원자적으로 차감."""
+        rnd = self.current
+        if rnd is None or rnd.phase != BETTING:
+            raise CrashRoundError("베팅 가능한 라운드가 없습니다")
+        if user_id in rnd.book:
+            raise CrashRoundError("이미 이번 라운드에 베팅했습니다")
+        bet_amount = int(bet_amount)
+        self._debit(user_id, bet_amount)
+        entry = BookEntry(user_id, bet_amount, float(auto_cashout) if auto_cashout else None)
+        if rnd.phase == VOIDED:  # 차감 도중 stop() 이 라운드를 무효 처리
+            self._refund([entry])
+            raise CrashRoundError("베팅 가능한 라운드가 없습니다")
+        rnd.book[user_id] = entry
+        if auto_cashout:
+            bisect.insort(rnd.auto_targets, (float(auto_cashout), user_id))
+        return rnd
+
+    def _debit(self, user_id: int, amount: int) -> None:
+        # UPDATE ... WHERE gold_balance >= :bet — 다른 라운드/상점 등과 동시에 써도 초과 베팅 불가
+        U = models.User.__table__
+        db = self._session_factory()
+        try:
+            res = db.execute(
+                update(U)
+                .where(U.c.id == user_id, U.c.gold_balance >= amount)
+                .values(gold_balance=U.c.gold_balance - amount)
+            )
+            if res.rowcount != 1:
+                db.rollback()
+                raise CrashInsufficientFunds("골드가 부족합니다")
+            db.commit()
+            patch_balances(db, [user_id])  # Core UPDATE 는 스냅샷 commit 리스너를 거치지 않음
+        finally:
+            db.close()
+
+    def cash_out(self, user_id: int) -> float:
+        """수동 캐시아웃 (running 단계의 현재 배수로 확정)."""
+        rnd = self.current
+        if rnd is None or rnd.phase != RUNNING:
+            raise CrashRoundError("진행 중인 라운드가 없습니다")
+        entry = rnd.book.get(user_id)
+        if entry is None:
+            raise CrashRoundError("이번 라운드 베팅이 없습니다")
+        if entry.cashed_at is not None:
+            raise CrashRoundError("이미 캐시아웃했습니다")
+        entry.cashed_at = rnd.multiplier
+        return entry.cashed_at
+
+    def advance(self, rnd: CrashRound, elapsed: float) -> bool:
+        """경과 시간 기준 배수 갱신 + 자동 캐시아웃 처리. 크래시 시 True."""
+        m = round(math.exp(self.growth * elapsed), 2)
+        crashed = m >= rnd.crash_point
+        rnd.multiplier = rnd.crash_point if crashed else m
+        # 목표 배수 도달 자동 캐시아웃 (크래시 배수와 같으면 성공 처리 — 단일 요청 모드의 >= 규칙)
+        limit = rnd.crash_point if crashed else m
+        targets = rnd.auto_targets
+        while rnd.auto_ptr < len(targets) and targets[rnd.auto_ptr][0] <= limit:
+            target, uid = targets[rnd.auto_ptr]
+            entry = rnd.book[uid]
+            if entry.cashed_at is None:
+                entry.cashed_at = target
+            rnd.auto_ptr += 1
+        if crashed:
+            rnd.phase = CRASHED
+        return crashed
+
+    # -------------------------------------------------------------- settlement
+    def settle(self, rnd: CrashRound) -> Dict[str, Any]:
+        """라운드 전체 정산 (단일 트랜잭션)."""
+        entries = list(rnd.book.values())
+        summary = {"round_id": rnd.round_id, "bets": len(entries), "winners": 0, "total_bet": 0, "total_payout": 0}
+        if not entries:
+            return summary
+        ts = datetime.utcnow()
+        balance_rows = []
+        action_rows = []
+        history_rows = []
+        stats_rows = []
+        for e in entries:
+            won = e.cashed_at is not None and e.cashed_at <= rnd.crash_point
+            payout = int(e.bet_amount * e.cashed_at) if won else 0
+            summary["total_bet"] += e.bet_amount
+            summary["total_payout"] += payout
+            summary["winners"] += 1 if won else 0
+            if payout:
+                balance_rows.append({"uid": e.user_id, "payout": payout})
+            action_rows.append({
+                "user_id": e.user_id,
+                "action_type": "CRASH_BET",
+                "action_data": json.dumps({
+                    "v": 1,
+                    "type": "CRASH_BET",
+                    "ts": ts.isoformat() + "Z",
+                    "data": {
+                        "game_type": "crash",
+                        "round_id": rnd.round_id,
+                        "bet_amount": e.bet_amount,
+                        "auto_cashout": e.auto_cashout,
+                        "cashout_multiplier": e.cashed_at if won else None,
+                        "actual_multiplier": rnd.crash_point,
+                        "win_amount": max(0, payout - e.bet_amount),
+                        "status": "cashed" if won else "crashed",
+                    },
+                }, ensure_ascii=False),
+                "created_at": ts,
+                # Core bulk INSERT 는 mapper before_insert 를 거치지 않으므로 타입 속성도 직접 채움
+                "game_type": "crash",
+                "bet": e.bet_amount,
+                "win": max(0, payout - e.bet_amount),
+                "result": "win" if won else "lose",
+                "is_jackpot": False,
+            })
+            history_rows.append({
+                "user_id": e.user_id,
+                "game_type": "crash",
+                "action_type": "WIN" if won else "BET",
+                "delta_coin": payout - e.bet_amount,
+                "delta_gem": 0,
+                "result_meta": {"round_id": rnd.round_id, "bet": e.bet_amount, "win": payout,
+                                "actual_multiplier": rnd.crash_point},
+                "created_at": ts,
+            })
+            stats_rows.append((e.user_id, e.bet_amount, payout, e.cashed_at if won else rnd.crash_point))
+
+        from .game_stats_service import GameStatsService
+        U = models.User
+        db = self._session_factory()
+        try:
+            # 지급: 당첨자만 executemany 1회 (베팅액은 접수 시 차감 완료)
+            if balance_rows:
+                db.execute(
+                    update(U.__table__)
+                    .where(U.__table__.c.id == bindparam("uid"))
+                    .values(gold_balance=U.__table__.c.gold_balance + bindparam("payout")),
+                    balance_rows,
+                    execution_options={"synchronize_session": False},
+                )
+            db.execute(insert(models.UserAction.__table__), action_rows)
+            db.execute(insert(models.GameHistory.__table__), history_rows)
+            GameStatsService(db).apply_round_batch(stats_rows)
+            db.commit()
+            patch_balances(db, [r["uid"] for r in balance_rows])
+        except Exception:
+            db.rollback()
+            logger.exception("crash round settlement failed round=%s bets=%s", rnd.round_id, len(entries))
+            self._refund(entries)  # 라운드 무효 → 차감된 베팅액 반환
+            raise
+        finally:
+            db.close()
+        leaderboard_service.record_many(
+            [(h["user_id"], "crash", leaderboard_service.score_for("crash", h["action_type"], h["delta_coin"]))
+             for h in history_rows],
+            at=ts,
+        )
+        # Core bulk INSERT 는 세션 리스너(session.new)를 거치지 않으므로 활동 비트를 직접 기록
+        attendance_service.record_many(
+            [(a["user_id"], attendance_service.ACTIVE, ts) for a in action_rows]
+        )
+        self.last_settlement = summary
+        return summary
+
+    def _refund(self, entries: List[BookEntry]) -> None:
+        """라운드 무효 처리 (정산 실패 / 정산 전 종료): 접수 시 차감한 베팅액 환불."""
+        U = models.User.__table__
+        db = self._session_factory()
+        try:
+            db.execute(
+                update(U).where(U.c.id == bindparam("uid")).values(gold_balance=U.c.gold_balance + bindparam("bet")),
+                [{"uid": e.user_id, "bet": e.bet_amount} for e in entries],
+                execution_options={"synchronize_session": False},
+            )
+            db.commit()
+            patch_balances(db, [e.user_id for e in entries])
+        except Exception:
+            db.rollback()
+            logger.exception("crash round refund failed bets=%s", len(entries))
+        finally:
+            db.close()
+
+    # -------------------------------------------------------------------- loop
+    async def run_round(self, rnd: Optional[CrashRound] = None) -> Dict[str, Any]:
+        """라운드 1회 실행 (rnd 미지정 시 새 라운드 개설 → betting 대기 → running → 정산)."""
+        rnd = rnd or self.new_round()
+        await self._publisher.publish(self.topic, {"type": "crash_round", **rnd.public_state()})
+        await asyncio.sleep(max(0.0, rnd.betting_ends_at - time.time()))
+        rnd.phase = RUNNING
+        rnd.started_at = time.monotonic()
+        while True:
+            crashed = self.advance(rnd, time.monotonic() - rnd.started_at)
+            await self._publisher.publish(self.topic, {"type": "crash_tick", "round_id": rnd.round_id, "m": rnd.multiplier})
+            if crashed:
+                break
+            await asyncio.sleep(self.tick_seconds)
+        summary = await asyncio.to_thread(self.settle, rnd)
+        await self._publisher.publish(
+            self.topic,
+            {"type": "crash_result", **rnd.public_state(), "winners": summary["winners"], "bets": summary["bets"]},
+            remember=True,
+        )
+        return summary
+
+    async def run_forever(self) -> None:
+        while True:
+            try:
+                await self.run_round()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("crash round loop error shard=%s", self.shard)
+            await asyncio.sleep(self.cooldown_seconds)
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_event_loop().create_task(self.run_forever())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._task = None
+        # 정산 전(betting/running)에 중단된 라운드 → 무효 처리 후 환불 (crashed 는 정산이 이미 시작됨)
+        rnd = self.current
+        if rnd is not None and rnd.phase in (BETTING, RUNNING):
+            rnd.phase = VOIDED
+            entries = list(rnd.book.values())
+            if entries:
+                await asyncio.to_thread(self._refund, entries)
+
+
+class CrashEngineManager:
+    """샤드별 엔진 보관 (user_id % shards 로 배정)."""
+
+    def __init__(self, shards: Optional[int] = None) -> None:
+        self.shards = max(1, shards if shards is not None else int(os.getenv("CRASH_SHARDS", "1")))
+        self.engines = [CrashRoundEngine(i) for i in range(self.shards)]
+
+    def for_user(self, user_id: int) -> CrashRoundEngine:
+        return self.engines[user_id % self.shards]
+
+    def start(self) -> None:
+        for e in self.engines:
+            e.start()
+
+    async def stop(self) -> None:
+        for e in self.engines:
+            await e.stop()
+
+
+_manager: Optional[CrashEngineManager] = None
+
+
+def get_crash_engines() -> CrashEngineManager:
+    global _manager
+    if _manager is None:
+        _manager = CrashEngineManager()
+    return _manager
+
+
+__all__ = [
+    "CrashRoundEngine", "CrashEngineManager", "CrashRound", "CrashRoundError", "CrashInsufficientFunds", "BookEntry",
+    "crash_point_from_uniform", "get_crash_engines",
+]
@@ -0,0 +1,172 @@
+"""Per-user daily game quota counters (Redis, UTC day).
+
+게임 서비스가 플레이마다 ``count_daily_actions`` (user_actions COUNT(*)) 로 일일 한도를
+판정하던 구조를 대체한다.
+
+- 키: ``quota:daily:<game>:<yyyymmdd>:<user_id>`` (다음 UTC 자정에 EXPIREAT)
+- ``consume``: 한도 확인 + 차감을 Lua 스크립트 1회(EVALSHA)로 원자 처리
+  → 동시 요청이 한도를 넘겨 통과하는 check-then-act 경쟁 제거
+- 콜드 키(당일 첫 접근/Redis 재시작): 호출부가 넘긴 ``seed`` 콜백으로 DB 집계를 1회 수행해
+  카운터를 초기화한 뒤 재시도 (이후 요청은 DB 미접근)
+- Redis 미연결: ``seed`` (DB 집계) 결과로 판정하는 기존 동작으로 fallback.
+  이 경우 차감은 호출부가 기록하는 user_actions 행 자체가 담당한다.
+"""
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+
+from ..core import redis_keys
+from ..utils.redis import get_redis_manager
+
+logger = logging.getLogger(__name__)
+
+# KEYS[1]=counter  ARGV: limit, amount, seed(-1=unknown), expire_at(epoch)
+# 반환: {status, used}  status 1=차감 성공, 0=한도 초과, -1=콜드 키(seed 필요)
+_CONSUME_LUA = """
+local cur = redis.call('GET', KEYS[1])
+if not cur then
+  local seed = tonumber(ARGV[3])
+  if seed < 0 then return {-1, 0} end
+  redis.call('SET', KEYS[1], seed, 'NX')
+  redis.call('EXPIREAT', KEYS[1], tonumber(ARGV[4]))
+  cur = redis.call('GET', KEYS[1])
+end
+cur = tonumber(cur)
+local amount = tonumber(ARGV[2])
+if cur + amount > tonumber(ARGV[1]) then return {0, cur} end
+return {1, redis.call('INCRBY', KEYS[1], amount)}
+"""
+
+
+@dataclass
+class QuotaStatus:
+    game: str
+    limit: int
+    used: int
+    resets_at: datetime
+
+    @property
+    def remaining(self) -> int:
+        return max(0, self.limit - self.used)
+
+    def to_dict(self) -> dict:
+        return {
+            "game": self.game,
+            "limit": self.limit,
+            "used": self.used,
+            "remaining": self.remaining,
+            "resets_at": self.resets_at.isoformat() + "Z",
+        }
+
+
+class QuotaExceeded(Exception):
+    def __init__(self, status: QuotaStatus):
+        super().__init__(f"daily quota exceeded: {status.game} ({status.limit})")
+        self.status = status
+
+
+def _utc_day(now: Optional[datetime] = None) -> tuple[str, datetime]:
+    now = now or datetime.utcnow()
+    midnight = now.replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
+    return now.strftime("%Y%m%d"), midnight
+
+
+class DailyQuotaService:
+    def __init__(self) -> None:
+        self._sha: Optional[str] = None
+
+    @property
+    def _redis(self):
+        try:
+            return get_redis_manager().redis_client
+        except Exception:
+            return None
+
+    @property
+    def redis_enabled(self) -> bool:
+        return self._redis is not None
+
+    def _eval(self, r, key: str, limit: int, amount: int, seed: int, expire_at: int):
+        if self._sha is None:
+            self._sha = r.script_load(_CONSUME_LUA)
+        try:
+            return r.evalsha(self._sha, 1, key, limit, amount, seed, expire_at)
+        except Exception as e:
+            if "NOSCRIPT" not in str(e):
+                raise
+            self._sha = r.script_load(_CONSUME_LUA)
+            return r.evalsha(self._sha, 1, key, limit, amount, seed, expire_at)
+
+    def consume(self, user_id: int, game: str, limit: int, seed: Callable[[], int], *,
+                amount: int = 1, now: Optional[datetime] = None) -> QuotaStatus:
+        """한도 확인 + 차감 (원자). 초과 시 QuotaExceeded.
+
+        seed: 당일 사용량을 DB 에서 집계하는 콜백 (콜드 키 / Redis 미연결 시에만 호출)
+        """
+        day, resets_at = _utc_day(now)
+        r = self._redis
+        if r is not None:
+            key = redis_keys.daily_quota(game, day, user_id)
+            expire_at = int((resets_at - datetime(1970, 1, 1)).total_seconds())
+            try:
+                status, used = self._eval(r, key, limit, amount, -1, expire_at)
+                if int(status) == -1:
+                    status, used = self._eval(r, key, limit, amount, int(seed() or 0), expire_at)
+                st = QuotaStatus(game, limit, int(used), resets_at)
+                if int(status) == 0:
+                    raise QuotaExceeded(st)
+                return st
+            except QuotaExceeded:
+                raise
+            except Exception:
+                logger.warning("daily quota redis consume failed (fallback to DB count)", exc_info=True)
+        used = int(seed() or 0)
+        st = QuotaStatus(game, limit, used, resets_at)
+        if used + amount > limit:
+            raise QuotaExceeded(st)
+        st.used = used + amount
+        return st
+
+    def refund(self, user_id: int, game: str, *, amount: int = 1, now: Optional[datetime] = None) -> None:
+        """차감 후 후속 단계(토큰 차감 등) 실패 시 쿼터 반환."""
+        r = self._redis
+        if r is None:
+            return
+        day, _ = _utc_day(now)
+        try:
+            key = redis_keys.daily_quota(game, day, user_id)
+            # 키가 없으면(자정 경과 등) 음수 카운터를 만들지 않음
+            if r.exists(key):
+                r.decrby(key, amount)
+        except Exception:
+            logger.warning("daily quota refund failed", exc_info=True)
+
+    def status(self, user_id: int, game: str, limit: int, seed: Callable[[], int], *,
+               now: Optional[datetime] = None) -> QuotaStatus:
+        """남은 플레이 수 조회 (GET 1회, 콜드 키일 때만 seed)."""
+        day, resets_at = _utc_day(now)
+        r = self._redis
+        if r is not None:
+            try:
+                raw = r.get(redis_keys.daily_quota(game, day, user_id))
+                if raw is not None:
+                    return QuotaStatus(game, limit, int(raw), resets_at)
+            except Exception:
+                logger.warning("daily quota redis read failed", exc_info=True)
+        return QuotaStatus(game, limit, int(seed() or 0), resets_at)
+
+
+_quota_service: Optional[DailyQuotaService] = None
+
+
+def get_daily_quota_service() -> DailyQuotaService:
+    global _quota_service
+    if _quota_service is None:
+        _quota_service = DailyQuotaService()
+    return _quota_service
+
+
+__all__ = ["DailyQuotaService", "QuotaStatus", "QuotaExceeded", "get_daily_quota_service"]
@@ -2,30 +2,24 @@
 
 Goals (phase skeleton):
 - Provide lightweight event ingestion hook (record_attempt)
-- Simple Redis rate counter pattern (user + action + rolling window)
-- Placeholder rule evaluation (returns ALLOW / SOFT_BLOCK / HARD_BLOCK)
+- Sliding-window velocity rules (velocity.py): user/IP/card counts, amount sums, distinct cards
+  per user/device — declared in settings.FRAUD_VELOCITY_RULES, evaluated in one Redis round trip
+- Rule evaluation returns ALLOW / SOFT_BLOCK / HARD_BLOCK (worst decision among hit rules)
 - Structured result object for future audit logging
 
 Future TODO (not implemented yet):
 - Persistent audit log table (user_id, action, decision, scores, meta, ts)
 - Rule DSL parser (YAML/JSON -> compiled predicates)
 - Weighted scoring model & threshold tuning (A/B)
-- Automatic decay of risk score (sliding window)
 - Integration with notification / admin dashboard
 """
 from __future__ import annotations
 from dataclasses import dataclass
 from enum import Enum
-from typing import Any, Dict, Optional
-import time
+from typing import Any, Dict, Optional, Sequence
 import logging
 
-try:  # Optional dependency: redis
-    import redis  # type: ignore
-except ImportError:  # pragma: no cover
-    redis = None  # type: ignore
-
-from ...utils.redis import get_redis  # adjusted relative path
+from ...core.config import settings
 
 logger = logging.getLogger(__name__)
 
@@ -45,40 +39,31 @@ RATE_WINDOW_SEC = 60
 MAX_ACTIONS_PER_WINDOW = 50  # placeholder threshold (tune later)
 
 class FraudService:
-    def __init__(self):
-        self._redis = get_redis()
-
-    def _incr_rate(self, user_id: int, action: str) -> int:
-        if not self._redis:
-            return -1  # signal no redis (skip rate limiting but still allow)
-        key = f"fraud:rate:{user_id}:{action}:{int(time.time() // RATE_WINDOW_SEC)}"
-        try:
-            pipe = self._redis.pipeline()
-            pipe.incr(key, 1)
-            pipe.expire(key, RATE_WINDOW_SEC + 5)
-            count, _ = pipe.execute()
-            return int(count)
-        except Exception:  # pragma: no cover
-            logger.warning("FraudService rate incr failed", exc_info=True)
-            return -1
+    def __init__(self, rules: Optional[Sequence[Any]] = None, *, memory_fallback: Optional[bool] = None):
+        from .velocity import VelocityEngine, VelocityRule  # velocity → Decision 순환 import 회피
+
+        fallback = settings.FRAUD_VELOCITY_MEMORY_FALLBACK if memory_fallback is None else memory_fallback
+        self.purchase_velocity = VelocityEngine(
+            "purchase", settings.FRAUD_VELOCITY_RULES if rules is None else rules, memory_fallback=fallback,
+        )
+        self.action_velocity = VelocityEngine(
+            "action", [VelocityRule("rate_1m", "count", "action", RATE_WINDOW_SEC, MAX_ACTIONS_PER_WINDOW)],
+            memory_fallback=fallback,
+        )
 
     def record_attempt(self, user_id: int, action: str, meta: Optional[Dict[str, Any]] = None) -> FraudResult:
         """Record an action attempt and evaluate minimal heuristic rules.
 
         Current heuristics:
-        - If Redis available and count > MAX_ACTIONS_PER_WINDOW => SOFT_BLOCK (rate exceeded)
-        - Placeholder: reserved for future rules (geo anomaly, velocity, IP clustering, etc.)
+        - If Redis available and count in the last 60s > MAX_ACTIONS_PER_WINDOW => SOFT_BLOCK (rate exceeded)
+        - Placeholder: reserved for future rules (geo anomaly, IP clustering, etc.)
         """
-        count = self._incr_rate(user_id, action)
-        scores: Dict[str, float] = {}
+        res = self.action_velocity.check({"action": f"{user_id}:{action}"})
+        scores: Dict[str, float] = res.values()
         reason = None
-        decision = Decision.ALLOW
-
-        if count >= 0:
-            scores["rate_1m"] = float(count)
-            if count > MAX_ACTIONS_PER_WINDOW:
-                decision = Decision.SOFT_BLOCK
-                reason = f"rate_exceeded>{MAX_ACTIONS_PER_WINDOW}"  # future: dynamic threshold categories
+        decision = res.decision
+        if decision != Decision.ALLOW:
+            reason = f"rate_exceeded>{MAX_ACTIONS_PER_WINDOW}"  # future: dynamic threshold categories
 
         # Future rule hooks (pseudo-code placeholders)
         # if self._geo_anomaly(user_id, meta): ...
@@ -86,6 +71,37 @@ class FraudService:
 
         return FraudResult(decision=decision, scores=scores, reason=reason, meta=meta)
 
+    def check_purchase(
+        self,
+        user_id: int,
+        *,
+        amount: float = 0,
+        ip: Optional[str] = None,
+        card_token: Optional[str] = None,
+        device_id: Optional[str] = None,
+        meta: Optional[Dict[str, Any]] = None,
+    ) -> FraudResult:
+        """구매 시도 1건 기록 + 속도 룰 전체 평가 (Redis 왕복 1회).
+
+        scores: 룰 이름 → 윈도 내 값 (현재 시도 포함), reason: hit 룰 이름 (콤마 구분).
+        Redis 미연결(메모리 fallback off)이면 평가 없이 ALLOW.
+        """
+        res = self.purchase_velocity.check(
+            {"user": user_id, "ip": ip, "card": card_token, "device": device_id}, amount,
+        )
+        hits = [o.rule.name for o in res.hits]
+        decision = res.decision
+        if hits:
+            logger.warning(
+                "fraud velocity hit user=%s decision=%s rules=%s", user_id, decision.value, hits,
+                extra={"event": "fraud_velocity_hit", "user_id": user_id, "rules": hits},
+            )
+        out_meta = dict(meta or {})
+        out_meta["velocity_backend"] = res.backend
+        return FraudResult(
+            decision=decision, scores=res.values(), reason=",".join(hits) or None, meta=out_meta,
+        )
+
 # Convenience singleton (lightweight)
 _fraud_service: Optional[FraudService] = None
 
@@ -0,0 +1,364 @@
+"""Sliding-window velocity engine (Redis sorted sets, rules compiled to one Lua script).
+
+설정(``FRAUD_VELOCITY_RULES``)의 룰 목록을 ``CompiledRuleSet`` 으로 한 번 컴파일한다.
+
+- 저장소: 스코프별 이벤트 ZSET 1개 (member=``<ms>:<nonce>:<amount>``, score=ms) 를 윈도가 다른
+  count/sum 룰이 공유하고, distinct 룰은 (스코프, 필드)별 ZSET (member=값, score=최근 ms)
+- 검사 1회 = EVALSHA 1회: 모든 저장소 기록 + 최대 윈도 밖 정리 + PEXPIRE + 룰별 값 계산.
+  룰별 소요 시간(µs)은 스크립트 안에서 TIME 으로 측정해 값과 함께 반환
+- 판정(임계 비교/결정 등급)은 Python 쪽에서 수행 → 결과는 ``VelocityResult``
+- Redis 미연결/오류: ``memory_fallback`` 이면 동일 의미의 프로세스 메모리 윈도, 아니면 평가 생략(허용)
+- 메트릭: 검사 왕복 시간, 룰별 소요 시간, 룰별 hit/pass 카운터 (prometheus_client 미설치 시 생략)
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from ...core import redis_keys
+from ...utils.redis import get_redis_manager
+from .fraud_service import Decision
+
+logger = logging.getLogger(__name__)
+
+try:  # optional prometheus metrics
+    from prometheus_client import Counter, Histogram  # type: ignore
+    _CHECK_SECONDS = Histogram(
+        "fraud_velocity_check_seconds", "Velocity rule set evaluation round trip", ["ruleset", "backend"],
+        buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1),
+    )
+    _RULE_SECONDS = Histogram(
+        "fraud_velocity_rule_seconds", "Per-rule evaluation time inside the velocity script", ["ruleset", "rule"],
+        buckets=(0.00001, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.005),
+    )
+    _RULE_RESULTS = Counter(
+        "fraud_velocity_rule_evaluations_total", "Velocity rule evaluations by result", ["ruleset", "rule", "result"],
+    )
+except Exception:  # pragma: no cover
+    _CHECK_SECONDS = None
+    _RULE_SECONDS = None
+    _RULE_RESULTS = None
+
+KINDS = ("count", "sum", "distinct")
+_SEVERITY = {Decision.ALLOW: 0, Decision.SOFT_BLOCK: 1, Decision.HARD_BLOCK: 2}
+
+
+def worst_decision(decisions) -> Decision:  # noqa: ANN001
+    return max(decisions, key=_SEVERITY.__getitem__, default=Decision.ALLOW)
+
+
+@dataclass(frozen=True)
+class VelocityRule:
+    name: str
+    kind: str  # count | sum | distinct
+    scope: str  # 집계 대상 식별자 (user | ip | card | device | ...)
+    window: int  # seconds
+    threshold: float  # 윈도 내 허용 최대값 (현재 시도 포함)
+    decision: Decision = Decision.SOFT_BLOCK
+    field: Optional[str] = None  # distinct 대상 식별자
+
+    def __post_init__(self) -> None:
+        if self.kind not in KINDS:
+            raise ValueError(f"velocity rule {self.name}: unknown kind {self.kind!r}")
+        if self.window <= 0:
+            raise ValueError(f"velocity rule {self.name}: window must be positive")
+        if self.kind == "distinct" and not self.field:
+            raise ValueError(f"velocity rule {self.name}: distinct rule requires field")
+
+    @classmethod
+    def from_config(cls, raw: Mapping[str, Any]) -> "VelocityRule":
+        return cls(
+            name=str(raw["name"]),
+            kind=str(raw.get("kind", "count")),
+            scope=str(raw["scope"]),
+            window=int(raw["window"]),
+            threshold=float(raw["threshold"]),
+            decision=Decision(raw.get("decision", Decision.SOFT_BLOCK.value)),
+            field=raw.get("field"),
+        )
+
+
+# 저장소 식별: (scope, None)=이벤트 ZSET, (scope, field)=distinct ZSET
+Store = Tuple[str, Optional[str]]
+
+
+class CompiledRuleSet:
+    """룰 목록 → 저장소 배치 + 단일 Lua 스크립트.
+
+    EVALSHA 인자 계약 (numkeys = 저장소 수):
+      KEYS[j]          저장소 j 의 키
+      ARGV[1]          now (epoch ms)
+      ARGV[2]          이벤트 member (``<ms>:<nonce>:<amount>``)
+      ARGV[2 + j]      저장소 j 에 기록할 값 (이벤트 저장소는 "1", distinct 는 필드 값, "" = 식별자 없음 → 생략)
+    반환: 룰 순서대로 [값, µs, 값, µs, ...] (식별자 없는 룰의 값은 "-1")
+    """
+
+    def __init__(self, rules: Sequence[VelocityRule]) -> None:
+        names = [r.name for r in rules]
+        if len(set(names)) != len(names):
+            raise ValueError("velocity rule names must be unique")
+        self.rules: Tuple[VelocityRule, ...] = tuple(rules)
+        stores: "OrderedDict[Store, int]" = OrderedDict()
+        for r in self.rules:
+            store = (r.scope, r.field if r.kind == "distinct" else None)
+            stores[store] = max(stores.get(store, 0), r.window)
+        self.stores: Tuple[Store, ...] = tuple(stores)
+        self.max_window_ms: Tuple[int, ...] = tuple(w * 1000 for w in stores.values())
+        self.rule_store: Tuple[int, ...] = tuple(
+            self.stores.index((r.scope, r.field if r.kind == "distinct" else None)) for r in self.rules
+        )
+        self.script = self._render()
+
+    def _render(self) -> str:
+        lines = [
+            "local now = tonumber(ARGV[1])",
+            "local ev = ARGV[2]",
+            "local out = {}",
+        ]
+        for j, ((_, fld), max_ms) in enumerate(zip(self.stores, self.max_window_ms), start=1):
+            member = "ev" if fld is None else f"ARGV[{2 + j}]"
+            lines += [
+                f"if ARGV[{2 + j}] ~= '' then",
+                f"  redis.call('ZADD', KEYS[{j}], now, {member})",
+                f"  redis.call('ZREMRANGEBYSCORE', KEYS[{j}], '-inf', now - {max_ms})",
+                f"  redis.call('PEXPIRE', KEYS[{j}], {max_ms})",
+                "end",
+            ]
+        lines.append("local t0 = redis.call('TIME')")
+        for i, (rule, j) in enumerate(zip(self.rules, self.rule_store), start=1):
+            j += 1
+            lo = f"'(' .. (now - {rule.window * 1000})"
+            if rule.kind == "sum":
+                calc = [
+                    "  local s = 0",
+                    f"  for _, m in ipairs(redis.call('ZRANGEBYSCORE', KEYS[{j}], {lo}, '+inf')) do",
+                    "    s = s + (tonumber(string.match(m, ':([^:]*)$')) or 0)",
+                    "  end",
+                    "  v = tostring(s)",
+                ]
+            else:  # count / distinct: 윈도 내 member 수
+                calc = [f"  v = tostring(redis.call('ZCOUNT', KEYS[{j}], {lo}, '+inf'))"]
+            lines += [
+                f"-- {rule.name} ({rule.kind} {rule.scope}{':' + rule.field if rule.field else ''} {rule.window}s)",
+                "do",
+                "  local v = '-1'",
+                f"  if ARGV[{2 + j}] ~= '' then",
+                *["  " + c for c in calc],
+                "  end",
+                "  local t1 = redis.call('TIME')",
+                f"  out[{2 * i - 1}] = v",
+                f"  out[{2 * i}] = tostring((t1[1] - t0[1]) * 1000000 + (t1[2] - t0[2]))",
+                "  t0 = t1",
+                "end",
+            ]
+        lines.append("return out")
+        return "\n".join(lines) + "\n"
+
+    def keys_and_values(self, subject: Mapping[str, Any]) -> Tuple[List[str], List[str]]:
+        """subject(식별자 이름 → 값) → 저장소별 키 / 기록 값."""
+        keys: List[str] = []
+        values: List[str] = []
+        for scope, fld in self.stores:
+            ident = subject.get(scope)
+            ident = "" if ident is None else str(ident)
+            if fld is None:
+                keys.append(redis_keys.fraud_events(scope, ident or "-"))
+                values.append("1" if ident else "")
+            else:
+                val = subject.get(fld)
+                val = "" if val is None else str(val)
+                keys.append(redis_keys.fraud_distinct(scope, fld, ident or "-"))
+                values.append(val if ident and val else "")
+        return keys, values
+
+
+def _amount_str(amount: float) -> str:
+    return str(int(amount)) if float(amount).is_integer() else repr(float(amount))
+
+
+class MemoryWindowStore:
+    """CompiledRuleSet 스크립트와 같은 의미의 프로세스 메모리 구현 (Redis 미연결 fallback / 테스트)."""
+
+    def __init__(self, max_keys: int = 50_000) -> None:
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        self._data: "OrderedDict[str, Dict[str, int]]" = OrderedDict()
+
+    def _zset(self, key: str) -> Dict[str, int]:
+        z = self._data.get(key)
+        if z is None:
+            z = self._data[key] = {}
+            if len(self._data) > self.max_keys:
+                self._data.popitem(last=False)
+        else:
+            self._data.move_to_end(key)
+        return z
+
+    def apply(self, compiled: CompiledRuleSet, keys: Sequence[str], values: Sequence[str],
+              now_ms: int, member: str) -> List[Tuple[float, float]]:
+        out: List[Tuple[float, float]] = []
+        with self._lock:
+            for (_, fld), key, val, max_ms in zip(compiled.stores, keys, values, compiled.max_window_ms):
+                if not val:
+                    continue
+                z = self._zset(key)
+                z[member if fld is None else val] = now_ms
+                for m in [m for m, ts in z.items() if ts <= now_ms - max_ms]:
+                    del z[m]
+            for rule, j in zip(compiled.rules, compiled.rule_store):
+                started = time.perf_counter()
+                if not values[j]:
+                    out.append((-1.0, 0.0))
+                    continue
+                cutoff = now_ms - rule.window * 1000
+                z = self._data.get(keys[j], {})
+                if rule.kind == "sum":
+                    v = sum(float(m.rsplit(":", 1)[1]) for m, ts in z.items() if ts > cutoff)
+                else:
+                    v = float(sum(1 for ts in z.values() if ts > cutoff))
+                out.append((v, (time.perf_counter() - started) * 1e6))
+        return out
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+@dataclass
+class RuleOutcome:
+    rule: VelocityRule
+    value: float  # -1 = 식별자 없음(미평가)
+    micros: float
+
+    @property
+    def hit(self) -> bool:
+        return self.value >= 0 and self.value > self.rule.threshold
+
+
+@dataclass
+class VelocityResult:
+    ruleset: str
+    backend: str  # redis | memory | none
+    outcomes: List[RuleOutcome] = field(default_factory=list)
+
+    @property
+    def evaluated(self) -> bool:
+        return self.backend != "none"
+
+    @property
+    def hits(self) -> List[RuleOutcome]:
+        return [o for o in self.outcomes if o.hit]
+
+    @property
+    def decision(self) -> Decision:
+        return worst_decision(o.rule.decision for o in self.hits)
+
+    def values(self) -> Dict[str, float]:
+        return {o.rule.name: o.value for o in self.outcomes if o.value >= 0}
+
+
+class _RuleStats:
+    __slots__ = ("evaluations", "hits", "micros")
+
+    def __init__(self) -> None:
+        self.evaluations = 0
+        self.hits = 0
+        self.micros = 0.0
+
+
+class VelocityEngine:
+    """룰셋 1개 = 컴파일된 스크립트 1개. ``check`` 는 기록 + 평가를 왕복 1회로 수행한다."""
+
+    def __init__(self, name: str, rules: Sequence[Any], *, memory_fallback: bool = False,
+                 memory_store: Optional[MemoryWindowStore] = None) -> None:
+        self.name = name
+        self.compiled = CompiledRuleSet([r if isinstance(r, VelocityRule) else VelocityRule.from_config(r) for r in rules])
+        self.memory_fallback = memory_fallback
+        self.memory = memory_store or MemoryWindowStore()
+        self._sha: Optional[str] = None
+        self._stats: Dict[str, _RuleStats] = {r.name: _RuleStats() for r in self.compiled.rules}
+
+    @property
+    def _redis(self):
+        try:
+            return get_redis_manager().redis_client
+        except Exception:
+            return None
+
+    def _eval(self, r, keys: List[str], args: List[str]):
+        script = self.compiled.script
+        if self._sha is None:
+            self._sha = r.script_load(script)
+        try:
+            return r.evalsha(self._sha, len(keys), *keys, *args)
+        except Exception as e:
+            if "NOSCRIPT" not in str(e):
+                raise
+            self._sha = r.script_load(script)
+            return r.evalsha(self._sha, len(keys), *keys, *args)
+
+    def check(self, subject: Mapping[str, Any], amount: float = 0, *, now: Optional[float] = None) -> VelocityResult:
+        """시도 1건 기록 + 전체 룰 평가. subject: {"user": 1, "ip": "...", "card": "...", "device": "..."}"""
+        now_ms = int((time.time() if now is None else now) * 1000)
+        member = f"{now_ms}:{uuid.uuid4().hex[:12]}:{_amount_str(amount)}"
+        keys, values = self.compiled.keys_and_values(subject)
+        started = time.perf_counter()
+        raw: Optional[List[Tuple[float, float]]] = None
+        backend = "none"
+        r = self._redis
+        if r is not None:
+            try:
+                flat = self._eval(r, keys, [str(now_ms), member, *values])
+                raw = [(float(flat[i]), float(flat[i + 1])) for i in range(0, len(flat), 2)]
+                backend = "redis"
+            except Exception:
+                logger.warning("fraud velocity redis eval failed (ruleset=%s)", self.name, exc_info=True)
+        if raw is None and self.memory_fallback:
+            raw = self.memory.apply(self.compiled, keys, values, now_ms, member)
+            backend = "memory"
+        result = VelocityResult(self.name, backend)
+        if raw is None:
+            return result
+        result.outcomes = [RuleOutcome(rule, v, us) for rule, (v, us) in zip(self.compiled.rules, raw)]
+        self._record(result, time.perf_counter() - started)
+        return result
+
+    def _record(self, result: VelocityResult, elapsed: float) -> None:
+        try:
+            if _CHECK_SECONDS is not None:
+                _CHECK_SECONDS.labels(self.name, result.backend).observe(elapsed)
+            for o in result.outcomes:
+                if o.value < 0:
+                    continue
+                st = self._stats[o.rule.name]
+                st.evaluations += 1
+                st.hits += int(o.hit)
+                st.micros += o.micros
+                if _RULE_RESULTS is not None:
+                    _RULE_RESULTS.labels(self.name, o.rule.name, "hit" if o.hit else "pass").inc()
+                    _RULE_SECONDS.labels(self.name, o.rule.name).observe(o.micros / 1e6)
+        except Exception as e:  # 계측 실패는 판정에 영향 없음
+            logger.debug("fraud velocity metrics failed: %s", e)
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """룰별 평가 수 / hit 수 / hit 비율 / 평균 소요(µs) (프로세스 누적)."""
+        out: Dict[str, Dict[str, float]] = {}
+        for name, st in self._stats.items():
+            n = st.evaluations
+            out[name] = {
+                "evaluations": n,
+                "hits": st.hits,
+                "hit_rate": st.hits / n if n else 0.0,
+                "avg_us": st.micros / n if n else 0.0,
+            }
+        return out
+
+
+__all__ = [
+    "worst_decision", "VelocityRule", "CompiledRuleSet", "MemoryWindowStore", "RuleOutcome", "VelocityResult", "VelocityEngine",
+]
@@ -1,13 +1,18 @@
 from dataclasses import dataclass
 from typing import List, Dict, Tuple, Optional
 from sqlalchemy.orm import Session
+import asyncio
 import random
 import os
 import json
 import logging
 
 from .token_service import TokenService
+from .daily_quota_service import QuotaExceeded, QuotaStatus, get_daily_quota_service
+from . import leaderboard_service
 from ..repositories.game_repository import GameRepository
+from ..core import game_math
+from ..utils.sampling import AliasTable, get_sampler_registry
 from .. import models
 
 
@@ -21,6 +26,15 @@ class GachaPullResult:
     psychological_message: str = ""
 
 
+@dataclass
+class GachaDraws:
+    results: List[str]
+    pity_count: int
+    history: List[str]
+    near_miss_occurred: bool
+    animation_type: str
+
+
 class GachaService:
     """가챠 뽑기 로직을 담당하는 서비스.
 
@@ -29,20 +43,15 @@ class GachaService:
     """
 
     # 수익성 개선을 위한 하우스 엣지가 적용된 확률 테이블 (심리적 효과 강화)
-    DEFAULT_RARITY_TABLE: list[tuple[str, float]] = [
-        ("Legendary", 0.002),   # 0.2% (극도로 희귀 - 심리적 갈망 증폭)
-        ("Epic", 0.025),        # 2.5% (감소하여 희소성 강화)
-        ("Rare", 0.15),         # 15% (감소)
-        ("Common", 0.65),       # 65% (감소)
-        ("Near_Miss_Epic", 0.08),    # 8% (Epic 근접 실패)
-        ("Near_Miss_Legendary", 0.093), # 9.3% (Legendary 근접 실패)
-    ]
+    DEFAULT_RARITY_TABLE: list[tuple[str, float]] = list(game_math.GACHA_DEFAULT_RARITY_TABLE)
 
     # 레거시 테스트 호환 (이전 비용 구조: 1회 50 / 10회 450)
     LEGACY_COST_SINGLE = 50
     LEGACY_COST_TEN = 450
     NEW_COST_SINGLE = 5000
     NEW_COST_TEN = 50000
+    # 일일 쿼터 카운터 게임 키 (quota:daily:gacha:...)
+    QUOTA_GAME = "gacha"
 
     def __init__(self, repository: GameRepository | None = None, token_service: TokenService | None = None, db: Optional[Session] = None, *, legacy_cost_mode: bool | None = None) -> None:
         self.repo = repository or GameRepository()
@@ -79,16 +88,8 @@ class GachaService:
         return {}
     
     def _calculate_near_miss_probability(self, user_id: int, current_count: int) -> float:
-        """근접 실패 확률 계산 (심리적 효과 최적화)"""
-        base_near_miss_rate = 0.173  # 기본 17.3% (Epic + Legendary 근접 실패)
-        
-        # 연속 실패 횟수가 많을수록 근접 실패 확률 증가 (재도전 유도)
-        if current_count > 50:
-            base_near_miss_rate += 0.1  # +10%
-        elif current_count > 30:
-            base_near_miss_rate += 0.05  # +5%
-        
-        return min(base_near_miss_rate, 0.3)  # 최대 30%로 제한
+        """근접 실패 확률 계산 (심리적 효과 최적화, 규칙은 core.game_math 공유)"""
+        return game_math.gacha_near_miss_probability(current_count)
     
     def _generate_psychological_message(self, rarity: str, near_miss: bool, consecutive_fails: int) -> str:
         """심리적 메시지 생성"""
@@ -128,6 +129,29 @@ class GachaService:
         if legacy_cost_mode is not None:
             self.legacy_cost_mode = legacy_cost_mode
 
+    @staticmethod
+    def daily_limit_for(rank: Optional[str]) -> int:
+        return 5 if rank == 'VIP' else 3
+
+    def _count_daily_pulls(self, db: Session, user_id: int) -> int:
+        try:
+            if hasattr(self.repo, 'count_daily_actions'):
+                # pull_batch 는 N 연차를 1행(quota_units)으로 기록 → 행 수가 아닌 단위 합계로 시드
+                raw = self.repo.count_daily_actions(db, user_id, "GACHA_PULL", units_key="quota_units") or 0
+                try:
+                    return int(raw)
+                except Exception:
+                    return 0
+        except Exception:
+            pass
+        return 0
+
+    def daily_quota_status(self, user_id: int, rank: Optional[str], db: Session) -> QuotaStatus:
+        """남은 가챠 횟수 (UI 표시용)."""
+        return get_daily_quota_service().status(
+            user_id, self.QUOTA_GAME, self.daily_limit_for(rank), lambda: self._count_daily_pulls(db, user_id)
+        )
+
     def pull(self, user_id: int, count: int = 1, db: Optional[Session] = None, *_, **__) -> GachaPullResult:
         """가챠 뽑기 수행.
 
@@ -146,19 +170,11 @@ class GachaService:
         # 사용자 랭크 조회 (일일 제한 판단)
         user = db.query(models.User).filter(models.User.id == user_id).first() if 'models' in globals() else None
         rank = getattr(user, 'rank', 'STANDARD') if user else 'STANDARD'
-        daily_limit = 5 if rank == 'VIP' else 3
-        # 일일 가챠 횟수(액션 카운트) 확인
-        daily_count = 0
+        daily_limit = self.daily_limit_for(rank)
+        # 일일 가챠 횟수 확인 + 차감 (Redis 원자 카운터 1회, 콜드 키/미연결 시 액션 카운트)
         try:
-            if hasattr(self.repo, 'count_daily_actions'):
-                raw = self.repo.count_daily_actions(db, user_id, "GACHA_PULL") or 0
-                try:
-                    daily_count = int(raw)
-                except Exception:
-                    daily_count = 0
-        except Exception:
-            daily_count = 0
-        if daily_count >= daily_limit:
+            get_daily_quota_service().consume(user_id, self.QUOTA_GAME, daily_limit, lambda: self._count_daily_pulls(db, user_id))
+        except QuotaExceeded:
             raise ValueError(f"일일 가챠 횟수({daily_limit}회)를 초과했습니다.")
 
         pulls = 10 if (count or 1) >= 10 else 1
@@ -170,9 +186,9 @@ class GachaService:
 
         deducted_tokens = self.token_service.deduct_tokens(user_id, cost)
         if deducted_tokens is None:
+            get_daily_quota_service().refund(user_id, self.QUOTA_GAME)
             raise ValueError("토큰이 부족합니다.")
 
-        results: List[str] = []
         current_count = 0
         history = []
         try:
@@ -193,91 +209,13 @@ class GachaService:
             current_count = 0
             history = []
         
-        # 근접 실패 추적
-        near_miss_occurred = False
-        animation_type = "normal"
         consecutive_fails = current_count
-
-        rarity_table = self.rarity_table
-
-        for _ in range(pulls):
-            current_count += 1
-            pity = current_count >= 90
-            rnd = random.random()
-            cumulative = 0.0
-            rarity = "Common"
-            
-            # 심리적 효과를 위한 확률 조정
-            adjusted_table = []
-            near_miss_boost = self._calculate_near_miss_probability(user_id, current_count)
-            
-            for name, prob in rarity_table:
-                adj_prob = prob
-                
-                # 과거 히스토리 기반 확률 조정 (중복 방지 효과 감소)
-                if history and name in history:
-                    adj_prob *= 0.8  # 기존 0.5에서 0.8로 완화
-                
-                # 근접 실패 확률 부스트
-                if "Near_Miss" in name:
-                    adj_prob = near_miss_boost / 2  # Epic과 Legendary로 분배
-                
-                adjusted_table.append((name, adj_prob))
-                cumulative += adj_prob
-                
-                if rnd <= cumulative:
-                    rarity = name
-                    break
-            
-            # 피티 시스템 적용
-            if pity and rarity not in {"Epic", "Legendary"}:
-                rarity = "Epic"
-                current_count = 0
-                animation_type = "pity"
-            
-            # 근접 실패 처리 (심리적 효과 강화)
-            if "Near_Miss" in rarity:
-                near_miss_occurred = True
-                animation_type = "near_miss"
-                
-                if rarity == "Near_Miss_Epic":
-                    # Epic 근처에서 실패 → Rare로 변환
-                    actual_rarity = "Rare"
-                    results.append(f"{actual_rarity}_near_miss_epic")
-                elif rarity == "Near_Miss_Legendary":
-                    # Legendary 근처에서 실패 → Epic으로 변환 (위로)
-                    actual_rarity = "Epic"
-                    results.append(f"{actual_rarity}_near_miss_legendary")
-                else:
-                    actual_rarity = "Common"
-                    results.append(f"{actual_rarity}_near_miss")
-                
-                rarity = actual_rarity
-            else:
-                # 보상 풀 제한을 rarity 확정 전에 적용해야 Legendary 재고 0 시 리스트에 잘못 포함되지 않음
-                final_rarity = rarity
-                if self.reward_pool:
-                    available = self.reward_pool.get(final_rarity, 0)
-                    if available <= 0:
-                        # 재고 소진 → Common 강등
-                        final_rarity = "Common"
-                    else:
-                        self.reward_pool[final_rarity] = available - 1
-
-                results.append(final_rarity)
-
-                # 특별 애니메이션 타입 설정 (강등 적용 후 기준)
-                if final_rarity == "Legendary":
-                    animation_type = "legendary"
-                elif final_rarity == "Epic":
-                    animation_type = "epic"
-
-                rarity = final_rarity
-
-            # 히스토리 업데이트 (실제 획득 아이템 기록 - near miss 변형 제거 후)
-            actual_rarity = rarity.replace("_near_miss_epic", "").replace("_near_miss_legendary", "").replace("_near_miss", "")
-            history.insert(0, actual_rarity)
-            history = history[:10]
+        draw = self._resolve_draws(user_id, pulls, current_count, history)
+        results = draw.results
+        current_count = draw.pity_count
+        history = draw.history
+        near_miss_occurred = draw.near_miss_occurred
+        animation_type = draw.animation_type
 
         # 가챠 카운트 업데이트
         try:
@@ -329,6 +267,193 @@ class GachaService:
             psychological_message=psychological_message
         )
 
+    def _sampler_for(self, version: tuple, present: frozenset, boost: float, cache: Dict[tuple, AliasTable]) -> AliasTable:
+        """(히스토리 보유 등급, 근접 실패 부스트) 상태별 alias sampler.
+
+        조정 규칙은 기존 per-draw 루프와 동일: 히스토리에 있는 등급 ×0.8,
+        Near_Miss 항목은 boost/2 로 대체, 누적 1 미만 잔여 구간은 Common.
+        상태 조합은 최대 2^len(table) × 3 이므로 전역 레지스트리에 (테이블 버전, 상태) 별로
+        1회만 컴파일되고, 요청 내에서는 로컬 dict 로 재조회한다.
+        """
+        key = (present, boost)
+        hit = cache.get(key)
+        if hit is None:
+            hit = cache[key] = get_sampler_registry().variant(
+                "gacha_rarity", version, key,
+                lambda: game_math.gacha_rarity_masses(version, present, boost),
+            )
+        return hit
+
+    def _resolve_draws(self, user_id: int, pulls: int, current_count: int, history: List[str], rng=None) -> "GachaDraws":
+        """N 회 뽑기 결과 산출 (피티/근접 실패/보상 풀/히스토리 감쇠 규칙 유지).
+
+        draw 당 rng.random() 1회 + 캐시된 alias 테이블 O(1) 추첨 (rng 기본값: random 모듈).
+        """
+        rng = rng or random
+        version = tuple((str(n), float(p)) for n, p in self.rarity_table)  # 설정 변경(update_config) 시 새 테이블 세트
+        cache: Dict[tuple, AliasTable] = {}
+        table_names = {name for name, _ in self.rarity_table}
+        results: List[str] = []
+        history = list(history)
+        near_miss_occurred = False
+        animation_type = "normal"
+
+        for _ in range(pulls):
+            current_count += 1
+            pity = current_count >= game_math.GACHA_PITY_THRESHOLD
+
+            # 심리적 효과를 위한 확률 조정 (상태별 alias 테이블 재사용)
+            present = frozenset(table_names.intersection(history)) if history else frozenset()
+            rarity = self._sampler_for(version, present, self._calculate_near_miss_probability(user_id, current_count), cache).draw(rng)
+
+            # 피티 시스템 적용 + 근접 실패 변환 (Epic 근접 → Rare, Legendary 근접 → Epic)
+            shown, rarity, is_near_miss, pity_hit = game_math.gacha_resolve_rarity(rarity, pity)
+            if pity_hit:
+                current_count = 0
+                animation_type = "pity"
+
+            # 근접 실패 처리 (심리적 효과 강화)
+            if is_near_miss:
+                near_miss_occurred = True
+                animation_type = "near_miss"
+                results.append(shown)
+            else:
+                # 보상 풀 제한을 rarity 확정 전에 적용해야 Legendary 재고 0 시 리스트에 잘못 포함되지 않음
+                final_rarity = rarity
+                if self.reward_pool:
+                    available = self.reward_pool.get(final_rarity, 0)
+                    if available <= 0:
+                        # 재고 소진 → Common 강등
+                        final_rarity = "Common"
+                    else:
+                        self.reward_pool[final_rarity] = available - 1
+
+                results.append(final_rarity)
+
+                # 특별 애니메이션 타입 설정 (강등 적용 후 기준)
+                if final_rarity == "Legendary":
+                    animation_type = "legendary"
+                elif final_rarity == "Epic":
+                    animation_type = "epic"
+
+                rarity = final_rarity
+
+            # 히스토리 업데이트 (실제 획득 아이템 기록)
+            history.insert(0, rarity)
+            del history[game_math.GACHA_HISTORY_SIZE:]
+
+        return GachaDraws(results, current_count, history, near_miss_occurred, animation_type)
+
+    def pull_batch(self, user_id: int, count: int, db: Optional[Session] = None) -> GachaPullResult:
+        """N 연차 일괄 처리 (라우터의 10연/단일 반복 호출 대체).
+
+        - 일일 쿼터: 기존 호출 단위(10연 묶음 + 단일)만큼 1회 원자 차감 (전부 또는 실패)
+        - 사용자 행 1회 조회(랭크 + 잔액), 비용 차감 + 액션 기록을 단일 commit
+        - 피티 카운터/히스토리 Redis 읽기/쓰기 각 1회
+        """
+        db = db or getattr(self.token_service, 'db', None)
+        if db is None:
+            raise ValueError("Database session not provided")
+        count = max(1, int(count or 1))
+        tens, singles = divmod(count, 10)
+        units = tens + singles
+        if self.legacy_cost_mode:
+            cost = tens * self.LEGACY_COST_TEN + singles * self.LEGACY_COST_SINGLE
+        else:
+            cost = tens * self.NEW_COST_TEN + singles * self.NEW_COST_SINGLE
+
+        user = db.query(models.User).filter(models.User.id == user_id).with_for_update().first()
+        if user is None:
+            raise ValueError("사용자를 찾을 수 없습니다.")
+        daily_limit = self.daily_limit_for(getattr(user, 'rank', 'STANDARD'))
+        quota = get_daily_quota_service()
+        try:
+            quota.consume(user_id, self.QUOTA_GAME, daily_limit, lambda: self._count_daily_pulls(db, user_id), amount=units)
+        except QuotaExceeded:
+            db.rollback()
+            raise ValueError(f"일일 가챠 횟수({daily_limit}회)를 초과했습니다.")
+
+        balance = int(user.gold_balance or 0)
+        if balance < cost:
+            db.rollback()
+            quota.refund(user_id, self.QUOTA_GAME, amount=units)
+            raise ValueError("토큰이 부족합니다.")
+
+        current_count = 0
+        history: List[str] = []
+        try:
+            current_count = int(self.repo.get_gacha_count(user_id) or 0)
+            raw_history = self.repo.get_gacha_history(user_id) or []
+            history = raw_history if isinstance(raw_history, list) else []
+        except Exception:
+            current_count, history = 0, []
+        consecutive_fails = current_count
+
+        draw = self._resolve_draws(user_id, count, current_count, history)
+
+        user.gold_balance = balance - cost
+        db.add(models.UserAction(user_id=user_id, action_type="GACHA_PULL", action_data=json.dumps({
+            "game_type": "gacha",
+            "pulls": count,
+            "quota_units": units,
+            "cost": cost,
+            "results": draw.results,
+            "animation_type": draw.animation_type,
+            "near_miss": draw.near_miss_occurred,
+            "legacy_cost_mode": self.legacy_cost_mode,
+        })))
+        # 리더보드 재구성 원본 (game_history) — 같은 commit
+        db.add(models.GameHistory(
+            user_id=user_id, game_type="gacha", action_type="PULL", delta_coin=-cost,
+            result_meta={"pulls": count, "cost": cost, "animation_type": draw.animation_type},
+        ))
+        try:
+            db.commit()
+        except Exception:
+            db.rollback()
+            quota.refund(user_id, self.QUOTA_GAME, amount=units)
+            raise
+        leaderboard_service.record(user_id, "gacha", leaderboard_service.score_for("gacha", "PULL", -cost, {"pulls": count}))
+        self._broadcast_balance(user_id, balance - cost, -cost)
+
+        try:
+            self.repo.set_gacha_count(user_id, draw.pity_count)
+            self.repo.set_gacha_history(user_id, draw.history)
+        except Exception:
+            pass
+
+        return GachaPullResult(
+            results=draw.results,
+            tokens_change=-cost,
+            balance=balance - cost,
+            near_miss_occurred=draw.near_miss_occurred,
+            animation_type=draw.animation_type,
+            psychological_message=self._generate_psychological_message(
+                rarity=draw.results[0] if draw.results else "Common",
+                near_miss=draw.near_miss_occurred,
+                consecutive_fails=consecutive_fails,
+            ),
+        )
+
+    @staticmethod
+    def _broadcast_balance(user_id: int, balance: int, delta: int) -> None:
+        """잔액 변경 실시간 브로드캐스트 (이벤트 루프 안에서 호출된 경우만, 실패 허용)."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        try:
+            from ..realtime import hub
+            loop.create_task(hub.broadcast({
+                "type": "balance_update",
+                "user_id": user_id,
+                "balance": balance,
+                "delta": delta,
+                "source": "gacha_pull",
+            }))
+        except Exception:
+            pass
+
     def get_user_gacha_stats(self, user_id: int) -> Dict[str, any]:
         """유저 가챠 통계 정보 반환"""
         current_count = self.repo.get_gacha_count(user_id)
@@ -341,7 +466,7 @@ class GachaService:
         
         return {
             "current_pity_count": current_count,
-            "pulls_until_pity": max(0, 90 - current_count),
+            "pulls_until_pity": max(0, game_math.GACHA_PITY_THRESHOLD - current_count),
             "recent_history": history[:5],
             "rarity_counts": rarity_counts,
             "luck_score": self._calculate_luck_score(history)
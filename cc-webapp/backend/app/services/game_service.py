@@ -1,11 +1,10 @@
 import random
 import uuid
-from datetime import datetime, date
+from datetime import datetime
 from typing import Dict, List, Optional
 from sqlalchemy.orm import Session
 
-from ..models.game_models import GameSession, GameStats, DailyGameLimit
-from ..models.auth_models import User
+from ..models.game_models import GameSession, GameStats
 from .slot_service import SlotSpinResult, SlotService
 from .roulette_service import RouletteSpinResult, RouletteService, PrizeRouletteSpinResult
 from .gacha_service import GachaPullResult, GachaService
@@ -102,6 +101,13 @@ class GameService:
             raise ValueError("Database session not provided to GameService.gacha_pull")
         return self.gacha_service.pull(user_id, count, db)
 
+    def gacha_pull_batch(self, user_id: int, count: int, db: Session | None = None) -> GachaPullResult:
+        """N 연차 가챠 일괄 실행 (쿼터/비용/피티/기록을 1회 처리)."""
+        db = db or self.db
+        if db is None:
+            raise ValueError("Database session not provided to GameService.gacha_pull_batch")
+        return self.gacha_service.pull_batch(user_id, count, db)
+
     def rps_play(self, user_id: int, choice: str, bet_amount: int, db: Session | None = None) -> RPSResult:
         """RPS (Rock-Paper-Scissors) 게임 플레이.
         
@@ -224,35 +230,6 @@ class GameService:
             'totalWon': stats.total_won
         }
     
-    @staticmethod
-    def check_daily_limit(db: Session, user_id: int, game_type: str) -> bool:
-        """일일 게임 제한 확인"""
-        today = date.today()
-        limit = db.query(DailyGameLimit).filter_by(
-            user_id=user_id,
-            game_type=game_type,
-            date=today
-        ).first()
-        
-        if not limit:
-            # 제한 레코드 생성
-            user = db.query(User).filter_by(id=user_id).first()
-            max_plays = 30 if game_type == 'slot' else 15 if game_type == 'crash' else 3
-            if user.vip_tier > 0:
-                max_plays = int(max_plays * 1.5)
-                
-            limit = DailyGameLimit(
-                user_id=user_id,
-                game_type=game_type,
-                date=today,
-                play_count=0,
-                max_plays=max_plays
-            )
-            db.add(limit)
-            db.commit()
-        
-        return limit.play_count < limit.max_plays
-    
     @staticmethod
     def process_slot_spin(db: Session, user_id: int, bet_amount: int) -> Dict:
         """슬롯머신 스핀 처리"""
@@ -1,7 +1,7 @@
 from __future__ import annotations
-from typing import Optional
+from typing import Iterable, Optional, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import func, case
+from sqlalchemy import func, case, insert
 from decimal import Decimal
 from ..models.game_stats_models import UserGameStats
 from ..models.history_models import GameHistory
@@ -144,6 +144,57 @@ class GameStatsService:
         self.db.flush()
         return stats
 
+    def apply_round_batch(self, results: Iterable[Tuple[int, int, int, float]]) -> int:
+        """Apply many settled crash bets at once (shared-round settlement).
+
+        results: (user_id, bet_amount, payout_amount, final_multiplier) — payout is gross return (0 if lost).
+        GameHistory rows are bulk inserted and aggregates are incremented in memory using the same
+        WIN/BET row rules as ``update_from_round`` / ``recalculate_user`` (no per-user recompute query).
+        Caller owns the transaction (flush only).
+        """
+        rows = list(results)
+        if not rows:
+            return 0
+        user_ids = {uid for uid, *_ in rows}
+        stats_by_user = {
+            s.user_id: s for s in self.db.query(UserGameStats).filter(UserGameStats.user_id.in_(user_ids)).all()
+        }
+        now = datetime.utcnow()
+        history = []
+        for user_id, bet_amount, payout, final_multiplier in rows:
+            stats = stats_by_user.get(user_id)
+            if stats is None:
+                stats = UserGameStats(user_id=user_id, total_bets=0, total_wins=0, total_losses=0, total_profit=0)
+                self.db.add(stats)
+                stats_by_user[user_id] = stats
+            won = payout > 0
+            delta = int(payout - bet_amount) if won else -int(bet_amount)
+            history.append({
+                "user_id": user_id,
+                "game_type": GAME_TYPE_CRASH,
+                "action_type": ACTION_WIN if won else ACTION_BET,
+                "delta_coin": delta,
+                "delta_gem": 0,
+                "result_meta": {
+                    "bet_amount": int(bet_amount),
+                    "win_amount": int(payout),
+                    "final_multiplier": float(final_multiplier) if final_multiplier is not None else None,
+                },
+                "created_at": now,
+            })
+            if won and delta > 0:
+                stats.total_wins = int(stats.total_wins or 0) + 1
+            elif not won:
+                stats.total_losses = int(stats.total_losses or 0) + 1
+            stats.total_bets = int(stats.total_wins or 0) + int(stats.total_losses or 0)
+            stats.total_profit = Decimal(str(stats.total_profit or 0)) + delta
+            if final_multiplier and (stats.highest_multiplier is None or float(final_multiplier) > float(stats.highest_multiplier)):
+                stats.highest_multiplier = Decimal(str(final_multiplier))
+            stats.updated_at = now
+        self.db.execute(insert(GameHistory), history)
+        self.db.flush()
+        return len(rows)
+
     def recalculate_user(self, user_id: int) -> Optional[UserGameStats]:
         """Full authoritative recomputation from GameHistory for crash only (MVP).
 
@@ -57,6 +57,15 @@ def log_game_history(
         )
         db.add(record)
         db.commit()
+        # 리더보드 ZINCRBY (commit 이후, 실패 허용)
+        try:
+            from . import leaderboard_service
+            leaderboard_service.record(
+                user_id, game_type, leaderboard_service.score_for(game_type, action_type, delta_coin, result_meta),
+                at=record.created_at,
+            )
+        except Exception as le:  # pragma: no cover
+            logger.debug("Leaderboard update failed: %s", le)
         # 비동기 브로드캐스트 (실패 허용) - 이벤트 최소 페이로드
         try:
             payload = {
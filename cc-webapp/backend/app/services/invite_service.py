@@ -1,6 +1,7 @@
 """
 초대 코드 검증 및 관리 서비스
 """
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any, List
@@ -199,8 +200,7 @@ class InviteService:
             - 유효기간 및 사용 횟수 제한 설정
         """
         # 초대코드 문자셋 정의 (혼동하기 쉬운 문자 제외)
-        charset = string.ascii_uppercase + string.digits
-        charset = charset.replace('O', '').replace('0', '').replace('I', '').replace('1', '')
+        charset = self._code_charset()
         
         # 초대코드 생성
         while True:
@@ -247,7 +247,54 @@ class InviteService:
         Returns:
             생성된 초대코드 목록
         """
-        result = []
-        for _ in range(count):
-            result.append(self.generate_secure_invite_code(length, max_uses, days_valid))
-        return result
+        codes = self.insert_bulk_invite_codes(count, length, max_uses, days_valid)
+        if not codes:
+            return []
+        return self.db.query(InviteCode).filter(InviteCode.code.in_(codes)).all()
+
+    def insert_bulk_invite_codes(self, count: int = 10, length: int = 6, max_uses: int = 1, days_valid: int = 30) -> List[str]:
+        """
+        set 기반 초대코드 대량 insert
+        Returns:
+            생성된 코드 문자열 목록
+        Notes:
+            - 후보 코드를 메모리에서 일괄 생성 → 기존 코드와의 충돌은 IN 조회 1회로 제거
+            - 부족분만 재생성 후 multi-row INSERT + 단일 commit (코드당 조회/commit 루프 제거)
+        """
+        if count <= 0:
+            return []
+        charset = self._code_charset()
+        codes: set = set()
+        # 코드 공간 대비 요청 수가 과도하면 무한 루프 방지
+        for _ in range(100):
+            need = count - len(codes)
+            if need <= 0:
+                break
+            candidates = set()
+            while len(candidates) < need:
+                code = ''.join(secrets.choice(charset) for _ in range(length))
+                if code not in self.FIXED_CODES and code not in codes:
+                    candidates.add(code)
+            taken = {c for (c,) in self.db.query(InviteCode.code).filter(InviteCode.code.in_(candidates)).all()}
+            codes |= candidates - taken
+        if len(codes) < count:
+            raise UserServiceException("초대코드 생성 공간이 부족합니다.", "INVITE_CODE_SPACE_EXHAUSTED")
+
+        now = datetime.utcnow()
+        expires_at = now + timedelta(days=days_valid) if days_valid else None
+        self.db.execute(
+            insert(InviteCode),
+            [
+                {"code": code, "is_used": False, "created_at": now, "expires_at": expires_at,
+                 "max_uses": max_uses, "used_count": 0}
+                for code in codes
+            ],
+        )
+        self.db.commit()
+        return sorted(codes)
+
+    @staticmethod
+    def _code_charset() -> str:
+        # 혼동하기 쉬운 문자(O/0/I/1) 제외
+        charset = string.ascii_uppercase + string.digits
+        return charset.replace('O', '').replace('0', '').replace('I', '').replace('1', '')
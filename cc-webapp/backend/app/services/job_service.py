@@ -0,0 +1,274 @@
+"""Admin background job runner (progress / cancellation / status).
+
+HTTP 요청 안에서 대량 작업(RFM 재계산, 초대코드 대량 생성, 캠페인 발송)을 수행하면
+워커를 점유하고 타임아웃이 발생한다. 이 모듈은 작업을 큐에 넣고 job_id 를 즉시 반환하며,
+작업은 청크 단위로 진행률을 기록하고 청크 경계에서 취소 요청을 확인한다.
+
+실행 백엔드:
+- ``JOBS_USE_CELERY=1``: ``app.tasks.run_admin_job`` Celery 태스크로 위임 (워커 프로세스)
+- 기본값: 프로세스 내 ThreadPoolExecutor (dev/test, 브로커 미기동 환경)
+
+상태 저장소:
+- Redis hash ``job:<job_id>`` (TTL 7일) + 최근 작업 목록 ``jobs:recent`` (LPUSH/LTRIM)
+- Redis 미연결 시 프로세스 메모리 fallback (RedisManager 관례)
+
+작업 등록:
+    @register_job("invites.bulk_generate")
+    def _bulk(ctx: JobContext, count: int, ...): ...
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from ..utils.redis import get_redis_manager
+
+logger = logging.getLogger(__name__)
+
+JOB_TTL_SECONDS = 60 * 60 * 24 * 7
+RECENT_LIMIT = 100
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+TERMINAL_STATES = {SUCCEEDED, FAILED, CANCELLED}
+
+
+class JobCancelled(Exception):
+    """청크 경계에서 취소 요청이 감지됨."""
+
+
+def _job_key(job_id: str) -> str:
+    return f"job:{job_id}"
+
+
+_RECENT_KEY = "jobs:recent"
+
+
+class JobStore:
+    """작업 상태 저장소 (Redis hash, 메모리 fallback)."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._mem: Dict[str, Dict[str, Any]] = {}
+        self._mem_recent: List[str] = []
+
+    @property
+    def _redis(self):
+        try:
+            return get_redis_manager().redis_client
+        except Exception:
+            return None
+
+    @staticmethod
+    def _encode(fields: Dict[str, Any]) -> Dict[str, str]:
+        return {k: json.dumps(v, default=str) for k, v in fields.items()}
+
+    @staticmethod
+    def _decode(raw: Dict[Any, Any]) -> Dict[str, Any]:
+        out: Dict[str, Any] = {}
+        for k, v in raw.items():
+            k = k.decode() if isinstance(k, bytes) else k
+            v = v.decode() if isinstance(v, bytes) else v
+            try:
+                out[k] = json.loads(v)
+            except Exception:
+                out[k] = v
+        return out
+
+    def create(self, job: Dict[str, Any]) -> None:
+        r = self._redis
+        if r is not None:
+            try:
+                pipe = r.pipeline()
+                pipe.hset(_job_key(job["id"]), mapping=self._encode(job))
+                pipe.expire(_job_key(job["id"]), JOB_TTL_SECONDS)
+                pipe.lpush(_RECENT_KEY, job["id"])
+                pipe.ltrim(_RECENT_KEY, 0, RECENT_LIMIT - 1)
+                pipe.execute()
+                return
+            except Exception:
+                logger.warning("job store create failed (fallback to memory)", exc_info=True)
+        with self._lock:
+            self._mem[job["id"]] = dict(job)
+            self._mem_recent.insert(0, job["id"])
+            for stale in self._mem_recent[RECENT_LIMIT:]:
+                self._mem.pop(stale, None)
+            del self._mem_recent[RECENT_LIMIT:]
+
+    def update(self, job_id: str, **fields: Any) -> None:
+        fields["updated_at"] = datetime.utcnow().isoformat()
+        r = self._redis
+        if r is not None:
+            try:
+                r.hset(_job_key(job_id), mapping=self._encode(fields))
+                return
+            except Exception:
+                logger.warning("job store update failed job=%s", job_id, exc_info=True)
+        with self._lock:
+            if job_id in self._mem:
+                self._mem[job_id].update(fields)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        r = self._redis
+        if r is not None:
+            try:
+                raw = r.hgetall(_job_key(job_id))
+                return self._decode(raw) if raw else None
+            except Exception:
+                logger.warning("job store get failed job=%s", job_id, exc_info=True)
+        with self._lock:
+            job = self._mem.get(job_id)
+            return dict(job) if job else None
+
+    def recent(self, limit: int = 20) -> List[Dict[str, Any]]:
+        r = self._redis
+        if r is not None:
+            try:
+                ids = [i.decode() if isinstance(i, bytes) else i for i in r.lrange(_RECENT_KEY, 0, limit - 1)]
+                return [j for j in (self.get(i) for i in ids) if j]
+            except Exception:
+                logger.warning("job store recent failed (fallback to memory)", exc_info=True)
+        with self._lock:
+            ids = list(self._mem_recent[:limit])
+        return [j for j in (self.get(i) for i in ids) if j]
+
+
+class JobContext:
+    """작업 함수에 전달되는 진행률/취소 핸들."""
+
+    def __init__(self, store: JobStore, job_id: str) -> None:
+        self._store = store
+        self.job_id = job_id
+        self.total = 0
+        self.done = 0
+
+    def set_total(self, total: int) -> None:
+        self.total = int(total)
+        self._store.update(self.job_id, total=self.total, done=self.done)
+
+    def advance(self, n: int = 1) -> None:
+        """진행률 갱신 + 취소 확인 (청크 경계에서 호출)."""
+        self.done += int(n)
+        self._store.update(self.job_id, done=self.done)
+        self.check_cancelled()
+
+    def check_cancelled(self) -> None:
+        job = self._store.get(self.job_id) or {}
+        if job.get("cancel_requested"):
+            raise JobCancelled()
+
+
+JobFunc = Callable[..., Any]
+_REGISTRY: Dict[str, JobFunc] = {}
+
+
+def register_job(name: str) -> Callable[[JobFunc], JobFunc]:
+    def _wrap(fn: JobFunc) -> JobFunc:
+        _REGISTRY[name] = fn
+        return fn
+    return _wrap
+
+
+class JobService:
+    def __init__(self, store: Optional[JobStore] = None) -> None:
+        self.store = store or JobStore()
+        self._executor = ThreadPoolExecutor(max_workers=int(os.getenv("JOBS_LOCAL_WORKERS", "2")), thread_name_prefix="admin-job")
+
+    def enqueue(self, name: str, params: Optional[Dict[str, Any]] = None, *, requested_by: Optional[int] = None) -> Dict[str, Any]:
+        _ensure_jobs_loaded()
+        if name not in _REGISTRY:
+            raise ValueError(f"unknown job: {name}")
+        now = datetime.utcnow().isoformat()
+        job = {
+            "id": uuid.uuid4().hex,
+            "name": name,
+            "params": params or {},
+            "status": QUEUED,
+            "total": 0,
+            "done": 0,
+            "result": None,
+            "error": None,
+            "cancel_requested": False,
+            "requested_by": requested_by,
+            "created_at": now,
+            "updated_at": now,
+        }
+        self.store.create(job)
+        if os.getenv("JOBS_USE_CELERY", "0") == "1":
+            from ..tasks import run_admin_job
+            run_admin_job.delay(job["id"])
+        else:
+            self._executor.submit(self.run, job["id"])
+        return job
+
+    def run(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """작업 실행 (Celery 태스크 / 로컬 executor 공용 진입점)."""
+        _ensure_jobs_loaded()
+        job = self.store.get(job_id)
+        if not job or job.get("status") in TERMINAL_STATES:
+            return job
+        if job.get("cancel_requested"):
+            self.store.update(job_id, status=CANCELLED, finished_at=datetime.utcnow().isoformat())
+            return self.store.get(job_id)
+        fn = _REGISTRY.get(job["name"])
+        ctx = JobContext(self.store, job_id)
+        self.store.update(job_id, status=RUNNING, started_at=datetime.utcnow().isoformat())
+        try:
+            result = fn(ctx, **(job.get("params") or {}))
+            self.store.update(job_id, status=SUCCEEDED, result=result, finished_at=datetime.utcnow().isoformat())
+        except JobCancelled:
+            self.store.update(job_id, status=CANCELLED, finished_at=datetime.utcnow().isoformat())
+        except Exception as e:
+            logger.exception("admin job failed job=%s name=%s", job_id, job.get("name"))
+            self.store.update(job_id, status=FAILED, error=str(e), finished_at=datetime.utcnow().isoformat())
+        return self.store.get(job_id)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return self.store.get(job_id)
+
+    def list_recent(self, limit: int = 20) -> List[Dict[str, Any]]:
+        return self.store.recent(limit)
+
+    def cancel(self, job_id: str) -> Optional[Dict[str, Any]]:
+        job = self.store.get(job_id)
+        if not job:
+            return None
+        if job.get("status") not in TERMINAL_STATES:
+            self.store.update(job_id, cancel_requested=True)
+        return self.store.get(job_id)
+
+
+_jobs_loaded = False
+
+
+def _ensure_jobs_loaded() -> None:
+    # 작업 정의 모듈 import → register_job 데코레이터 실행
+    global _jobs_loaded
+    if not _jobs_loaded:
+        from . import admin_jobs  # noqa: F401
+        _jobs_loaded = True
+
+
+_job_service: Optional[JobService] = None
+
+
+def get_job_service() -> JobService:
+    global _job_service
+    if _job_service is None:
+        _job_service = JobService()
+    return _job_service
+
+
+__all__ = [
+    "JobService", "JobContext", "JobStore", "JobCancelled", "register_job", "get_job_service",
+    "QUEUED", "RUNNING", "SUCCEEDED", "FAILED", "CANCELLED",
+]
@@ -0,0 +1,364 @@
+"""Per-game, per-period leaderboards on Redis sorted sets.
+
+``/api/games/leaderboard`` 가 요청마다 user_actions GROUP BY (또는 users.total_spent 정렬) 를
+수행하던 구조를 대체한다.
+
+- 보드: 게임(slot/crash/rps/gacha) + 코인 게임 합산(``all``) × 기간(daily/weekly/alltime)
+  → ``lb:<game>:<period>:<bucket>`` ZSET (member=user_id, score=점수)
+- 점수: 코인 게임은 라운드 순이익 합계(max(delta_coin, 0)), 가챠는 뽑기 횟수.
+  ``score_for`` (실시간 ZINCRBY) 와 ``aggregate`` (game_history 재구성) 가 같은 정의를 쓴다
+- 갱신: game_history 기록 commit 이후 ``record`` / ``record_many`` — 파이프라인 1회로 모든 보드 ZINCRBY
+- 조회: 상위 N + 내 순위 ± k (ZREVRANGE / ZREVRANK, O(log n + k))
+- 콜드 키(Redis 재시작/만료): ``:built`` 마커가 없으면 game_history 집계로 재구성 (락 1개).
+  ``:staging`` 에 적재 후 RENAME 으로 교체 — 집계 중 라이브 보드에 들어온 ZINCRBY 는 집계 전
+  스냅샷(``:base``) 대비 증분만큼 교체 직전에 재적용 (유실 없음)
+- 기간 종료: ``snapshot_rollover`` 가 직전 daily/weekly 버킷 상위 N 을 leaderboard_snapshots 에 1회 기록
+- Redis 미연결: game_history 집계를 짧게(LEADERBOARD_MEMORY_TTL_SECONDS) 메모리 캐시해 응답
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import case, func, insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from .. import models
+from ..core import redis_keys
+from ..core.config import settings
+from ..utils.redis import get_redis_manager
+
+logger = logging.getLogger(__name__)
+
+COIN_GAMES = ("slot", "crash", "rps")
+OVERALL = "all"
+BOARDS = COIN_GAMES + ("gacha", OVERALL)
+PERIODS = ("daily", "weekly", "alltime")
+SNAPSHOT_PERIODS = ("daily", "weekly")
+ROUND_ACTIONS = ("BET", "WIN", "LOSE", "DRAW", "JACKPOT")
+PERIOD_TTL_SECONDS = {"daily": 3 * 86400, "weekly": 15 * 86400, "alltime": None}
+REBUILD_LOCK_SECONDS = 30
+_ZADD_CHUNK = 1000
+
+# KEYS: live, staging, base(집계 전 live 스냅샷), built  ARGV: ttl(0 = 만료 없음) → 교체 후 멤버 수
+# 집계 이후 live 에 쌓인 증분(live - base)을 staging 에 더한 뒤 원자 교체
+_SWAP_LUA = """
+local cur = redis.call('ZRANGE', KEYS[1], 0, -1, 'WITHSCORES')
+for i = 1, #cur, 2 do
+  local delta = tonumber(cur[i + 1]) - tonumber(redis.call('ZSCORE', KEYS[3], cur[i]) or '0')
+  if delta ~= 0 then
+    redis.call('ZINCRBY', KEYS[2], delta, cur[i])
+  end
+end
+redis.call('DEL', KEYS[3])
+if redis.call('EXISTS', KEYS[2]) == 1 then
+  redis.call('RENAME', KEYS[2], KEYS[1])
+else
+  redis.call('DEL', KEYS[1])
+end
+redis.call('SET', KEYS[4], '1')
+local ttl = tonumber(ARGV[1])
+if ttl > 0 then
+  redis.call('EXPIRE', KEYS[1], ttl)
+  redis.call('EXPIRE', KEYS[4], ttl)
+else
+  redis.call('PERSIST', KEYS[1])
+end
+return redis.call('ZCARD', KEYS[1])
+"""
+
+# (user_id, score)
+Ranked = List[Tuple[int, int]]
+
+
+# ------------------------------------------------------------------ periods / scoring
+def period_bucket(period: str, at: Optional[datetime] = None) -> str:
+    at = at or datetime.utcnow()
+    if period == "daily":
+        return at.strftime("%Y%m%d")
+    if period == "weekly":
+        year, week, _ = at.isocalendar()
+        return f"{year}-W{week:02d}"
+    return "all"
+
+
+def period_range(period: str, bucket: str) -> Tuple[Optional[datetime], Optional[datetime]]:
+    """버킷 → [start, end) (alltime 은 (None, None))."""
+    if period == "daily":
+        start = datetime.strptime(bucket, "%Y%m%d")
+        return start, start + timedelta(days=1)
+    if period == "weekly":
+        start = datetime.strptime(f"{bucket}-1", "%G-W%V-%u")
+        return start, start + timedelta(days=7)
+    return None, None
+
+
+def previous_bucket(period: str, now: Optional[datetime] = None) -> str:
+    now = now or datetime.utcnow()
+    return period_bucket(period, now - timedelta(days=1 if period == "daily" else 7))
+
+
+def boards_for(game_type: str) -> Tuple[str, ...]:
+    if game_type in COIN_GAMES:
+        return (game_type, OVERALL)
+    if game_type == "gacha":
+        return ("gacha",)
+    return ()
+
+
+def score_for(game_type: str, action_type: str, delta_coin: int = 0, meta: Optional[Dict[str, Any]] = None) -> int:
+    """game_history 1행의 리더보드 점수 (aggregate 의 SQL 집계와 동일 정의)."""
+    if game_type == "gacha":
+        return int((meta or {}).get("pulls") or 1) if action_type == "PULL" else 0
+    if game_type in COIN_GAMES and action_type in ROUND_ACTIONS:
+        return max(int(delta_coin or 0), 0)
+    return 0
+
+
+# ------------------------------------------------------------------ redis helpers
+def _redis():
+    try:
+        return get_redis_manager().redis_client
+    except Exception:
+        return None
+
+
+def _int(v: Any) -> int:
+    return int(float(v.decode() if isinstance(v, bytes) else v))
+
+
+def _pairs(rows: Iterable[Tuple[Any, Any]]) -> Ranked:
+    return [(_int(m), _int(s)) for m, s in rows]
+
+
+def record(user_id: int, game_type: str, score: int, at: Optional[datetime] = None) -> None:
+    record_many([(user_id, game_type, score)], at)
+
+
+def record_many(rows: Sequence[Tuple[int, str, int]], at: Optional[datetime] = None) -> None:
+    """(user_id, game_type, score) 목록을 모든 해당 보드 × 기간에 ZINCRBY (파이프라인 1회, best-effort).
+
+    반드시 game_history commit 이후 호출 — 콜드 키 재구성은 DB 를 원본으로 덮어쓴다.
+    """
+    r = _redis()
+    rows = [(uid, g, int(s)) for uid, g, s in rows if uid is not None and s and int(s) > 0]
+    if r is None or not rows:
+        return
+    at = at or datetime.utcnow()
+    try:
+        pipe = r.pipeline(transaction=False)
+        touched = set()
+        for uid, game_type, score in rows:
+            for board in boards_for(game_type):
+                for period in PERIODS:
+                    key = redis_keys.leaderboard(board, period, period_bucket(period, at))
+                    pipe.zincrby(key, score, str(uid))
+                    touched.add((key, period))
+        for key, period in touched:
+            ttl = PERIOD_TTL_SECONDS[period]
+            if ttl:
+                pipe.expire(key, ttl)
+        pipe.execute()
+    except Exception:
+        logger.warning("leaderboard record failed", exc_info=True)
+
+
+# ------------------------------------------------------------------ aggregation / rebuild
+def aggregate(db: Session, board: str, period: str, bucket: str) -> Dict[int, int]:
+    """game_history 기준 보드 점수 집계 (콜드 키 재구성 / Redis 미연결 / 스냅샷 원본)."""
+    GH = models.GameHistory
+    start, end = period_range(period, bucket)
+    games = COIN_GAMES if board == OVERALL else (board,)
+    if board not in BOARDS:
+        return {}
+    if board == "gacha":
+        q = db.query(GH.user_id, GH.result_meta).filter(GH.game_type == "gacha", GH.action_type == "PULL")
+        if start is not None:
+            q = q.filter(GH.created_at >= start, GH.created_at < end)
+        totals: Dict[int, int] = defaultdict(int)
+        for uid, meta in q.yield_per(5000):
+            totals[uid] += score_for("gacha", "PULL", 0, meta if isinstance(meta, dict) else None)
+        return dict(totals)
+    q = db.query(GH.user_id, func.sum(case((GH.delta_coin > 0, GH.delta_coin), else_=0))).filter(
+        GH.game_type.in_(games), GH.action_type.in_(ROUND_ACTIONS),
+    )
+    if start is not None:
+        q = q.filter(GH.created_at >= start, GH.created_at < end)
+    return {uid: int(total) for uid, total in q.group_by(GH.user_id) if total and int(total) > 0}
+
+
+def rebuild(db: Session, board: str, period: str, bucket: str) -> Optional[int]:
+    """Redis 보드를 game_history 집계로 원자 교체. 다른 워커가 재구성 중이면 None.
+
+    집계 전에 라이브 보드를 ``:base`` 로 복사해 두고, 교체 시 그 이후 ``record`` 증분을 재적용한다.
+    반환: 교체 후 보드 멤버 수.
+    """
+    r = _redis()
+    if r is None:
+        return None
+    key = redis_keys.leaderboard(board, period, bucket)
+    lock = redis_keys.leaderboard_lock(board, period, bucket)
+    if not r.set(lock, "1", nx=True, ex=REBUILD_LOCK_SECONDS):
+        return None
+    staging = redis_keys.leaderboard_staging(board, period, bucket)
+    base = redis_keys.leaderboard_base(board, period, bucket)
+    try:
+        pipe = r.pipeline(transaction=True)
+        pipe.zunionstore(base, [key])
+        pipe.expire(base, REBUILD_LOCK_SECONDS)
+        pipe.execute()
+        totals = aggregate(db, board, period, bucket)
+        pipe = r.pipeline(transaction=False)
+        pipe.delete(staging)
+        items = [(str(uid), score) for uid, score in totals.items()]
+        for i in range(0, len(items), _ZADD_CHUNK):
+            pipe.zadd(staging, dict(items[i:i + _ZADD_CHUNK]))
+        pipe.expire(staging, REBUILD_LOCK_SECONDS)
+        pipe.execute()
+        built = redis_keys.leaderboard_built(board, period, bucket)
+        return int(r.eval(_SWAP_LUA, 4, key, staging, base, built, PERIOD_TTL_SECONDS[period] or 0))
+    finally:
+        try:
+            r.delete(lock)
+        except Exception:
+            pass
+
+
+_memory_lock = threading.Lock()
+_memory: Dict[Tuple[str, str, str], Tuple[float, Ranked, Dict[int, int]]] = {}
+
+
+def _memory_board(db: Session, board: str, period: str, bucket: str) -> Tuple[Ranked, Dict[int, int]]:
+    key = (board, period, bucket)
+    now = time.monotonic()
+    hit = _memory.get(key)
+    if hit is not None and hit[0] > now:
+        return hit[1], hit[2]
+    # ZREVRANGE 와 같은 순서 (점수 내림차순, 동점은 member 문자열 내림차순)
+    ranked = sorted(aggregate(db, board, period, bucket).items(), key=lambda x: (x[1], str(x[0])), reverse=True)
+    index = {uid: i for i, (uid, _) in enumerate(ranked)}
+    with _memory_lock:
+        _memory[key] = (now + settings.LEADERBOARD_MEMORY_TTL_SECONDS, ranked, index)
+    return ranked, index
+
+
+def clear_memory_cache() -> None:
+    with _memory_lock:
+        _memory.clear()
+
+
+# ------------------------------------------------------------------ queries
+@dataclass
+class BoardView:
+    board: str
+    period: str
+    bucket: str
+    top: List[Tuple[int, int, int]] = field(default_factory=list)  # (rank, user_id, score)
+    user_rank: Optional[int] = None
+    user_score: Optional[int] = None
+    around: List[Tuple[int, int, int]] = field(default_factory=list)
+
+
+def _ranked(rows: Ranked, first_rank: int) -> List[Tuple[int, int, int]]:
+    return [(first_rank + i, uid, score) for i, (uid, score) in enumerate(rows)]
+
+
+def view(db: Session, board: str, period: str = "daily", *, limit: int = 10,
+         user_id: Optional[int] = None, k: int = 0, bucket: Optional[str] = None) -> BoardView:
+    """상위 limit 명 + (user_id 지정 시) 내 순위 ± k. 순위는 1부터."""
+    if period not in PERIODS:
+        raise ValueError(f"unknown leaderboard period: {period}")
+    bucket = bucket or period_bucket(period)
+    out = BoardView(board, period, bucket)
+    if board not in BOARDS or limit <= 0:
+        return out
+    r = _redis()
+    if r is not None:
+        try:
+            return _view_redis(r, db, out, limit, user_id, k)
+        except Exception:
+            logger.warning("leaderboard redis read failed (fallback to DB aggregate)", exc_info=True)
+    ranked, index = _memory_board(db, board, period, bucket)
+    out.top = _ranked(ranked[:limit], 1)
+    if user_id is not None and user_id in index:
+        pos = index[user_id]
+        out.user_rank, out.user_score = pos + 1, ranked[pos][1]
+        lo = max(0, pos - k)
+        out.around = _ranked(ranked[lo:pos + k + 1], lo + 1)
+    return out
+
+
+def _view_redis(r, db: Session, out: BoardView, limit: int, user_id: Optional[int], k: int) -> BoardView:  # noqa: ANN001
+    key = redis_keys.leaderboard(out.board, out.period, out.bucket)
+    for attempt in range(2):
+        pipe = r.pipeline(transaction=False)
+        pipe.exists(redis_keys.leaderboard_built(out.board, out.period, out.bucket))
+        pipe.zrevrange(key, 0, limit - 1, withscores=True)
+        if user_id is not None:
+            pipe.zrevrank(key, str(user_id))
+        res = pipe.execute()
+        if not res[0] and attempt == 0 and rebuild(db, out.board, out.period, out.bucket) is not None:
+            continue  # 재구성 완료 → 재조회 (다른 워커가 재구성 중이면 현재 값으로 응답)
+        break
+    out.top = _ranked(_pairs(res[1]), 1)
+    rank = res[2] if user_id is not None else None
+    if rank is not None:
+        pos = int(rank)
+        lo = max(0, pos - k)
+        rows = _pairs(r.zrevrange(key, lo, pos + k, withscores=True))
+        out.around = _ranked(rows, lo + 1)
+        out.user_rank = pos + 1
+        out.user_score = next((s for _, uid, s in out.around if uid == user_id), None)
+    return out
+
+
+# ------------------------------------------------------------------ snapshots
+def snapshot(db: Session, board: str, period: str, bucket: str, top_n: Optional[int] = None) -> int:
+    """버킷 상위 N 을 leaderboard_snapshots 에 기록 (이미 있으면 0)."""
+    S = models.LeaderboardSnapshot
+    exists = db.query(S.id).filter(S.game_type == board, S.period == period, S.bucket == bucket).first()
+    if exists is not None:
+        return 0
+    top_n = top_n or settings.LEADERBOARD_SNAPSHOT_TOP_N
+    entries = view(db, board, period, limit=top_n, bucket=bucket).top
+    if not entries:
+        return 0
+    now = datetime.utcnow()
+    try:
+        db.execute(insert(S), [
+            {"game_type": board, "period": period, "bucket": bucket, "rank": rank,
+             "user_id": uid, "score": score, "created_at": now}
+            for rank, uid, score in entries
+        ])
+        db.commit()
+    except IntegrityError:  # 다른 워커가 먼저 기록
+        db.rollback()
+        return 0
+    return len(entries)
+
+
+def snapshot_rollover(db: Session, now: Optional[datetime] = None) -> int:
+    """직전 daily/weekly 버킷 전체 보드 스냅샷 (멱등 — 스케줄러가 주기적으로 호출)."""
+    written = 0
+    for period in SNAPSHOT_PERIODS:
+        bucket = previous_bucket(period, now)
+        for board in BOARDS:
+            try:
+                written += snapshot(db, board, period, bucket)
+            except Exception:
+                db.rollback()
+                logger.warning("leaderboard snapshot failed board=%s %s:%s", board, period, bucket, exc_info=True)
+    return written
+
+
+__all__ = [
+    "COIN_GAMES", "OVERALL", "BOARDS", "PERIODS", "BoardView", "period_bucket", "period_range", "previous_bucket",
+    "boards_for", "score_for", "record", "record_many", "aggregate", "rebuild", "view", "snapshot",
+    "snapshot_rollover", "clear_memory_cache",
+]
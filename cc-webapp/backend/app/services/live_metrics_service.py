@@ -0,0 +1,406 @@
+"""Live platform counters (sliding window) fed by domain events.
+
+대시보드/관리자 통계가 매 요청마다 hot 테이블(user_sessions, user_actions,
+user_rewards, shop_transactions)을 COUNT/SUM 스캔하던 구조를 대체한다.
+
+구성:
+- 분 단위 버킷 카운터: ``metrics:live:cnt:<name>:<minute>`` (INCRBY, TTL 2h)
+  → 최근 N분 합계는 MGET 1회로 계산 (spins/hour, big wins/hour)
+- 온라인 사용자: 분 버킷별 HyperLogLog ``metrics:live:online:<minute>``
+  → PFCOUNT k1..k5 1회로 distinct 사용자 근사치
+- 게이지: ``metrics:live:gauge:<name>`` (누적 매출, pending 거래 수, 일자별 매출)
+
+공급 경로:
+- SQLAlchemy Session 이벤트(after_flush → after_commit)로 UserAction(SLOT_SPIN),
+  UserReward(빅윈), ShopTransaction(status 전이), UserSession(로그인/갱신)을 감지하여
+  커밋이 확정된 경우에만 반영한다. 게임/상점/인증 경로는 별도 호출 없이 자동 공급된다.
+- Redis 미연결 시 프로세스 메모리 fallback (RedisManager 관례와 동일)
+
+정합성:
+- ``ensure_synced(db)`` 는 동기화 마커가 없을 때(콜드 스타트, 주기 만료)만 DB 스캔으로
+  버킷/게이지를 재구성한다. 원시 SQL 경로 등 이벤트 누락으로 인한 drift 는 이 주기
+  (LIVE_METRICS_RESYNC_SECONDS, 기본 600s)마다 교정된다.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from ..core import redis_keys
+from ..utils.redis import get_redis_manager
+from ..utils.session_hooks import register_commit_hook
+
+logger = logging.getLogger(__name__)
+
+BUCKET_SECONDS = 60
+BUCKET_TTL_SECONDS = 60 * 60 * 2       # 최대 조회 윈도우(60분) + 여유
+ONLINE_TTL_SECONDS = 60 * 15
+DAY_GAUGE_TTL_SECONDS = 60 * 60 * 24 * 2
+ONLINE_WINDOW_MINUTES = 5
+
+# 카운터/게이지 이름 (대시보드 계약)
+SLOT_SPINS = "slot_spins"
+BIG_WINS = "big_wins"
+REVENUE_TOTAL = "revenue_total"
+PENDING_TX = "shop_pending"
+
+
+def _big_win_threshold() -> int:
+    return int(os.getenv("BIG_WIN_THRESHOLD_GOLD", "1000"))
+
+
+def _resync_seconds() -> int:
+    return int(os.getenv("LIVE_METRICS_RESYNC_SECONDS", "600"))
+
+
+def _bucket_of(ts: float) -> int:
+    return int(ts // BUCKET_SECONDS)
+
+
+def _day_gauge(day: datetime) -> str:
+    return f"revenue_day:{day.strftime('%Y%m%d')}"
+
+
+def _epoch(dt: Optional[datetime]) -> float:
+    if dt is None:
+        return time.time()
+    # naive datetime 은 UTC 로 간주 (모델 default=datetime.utcnow)
+    return (dt - datetime(1970, 1, 1)).total_seconds() if dt.tzinfo is None else dt.timestamp()
+
+
+class LiveMetricsService:
+    """분 버킷 카운터 + HLL + 게이지. Redis 우선, 실패 시 메모리 fallback."""
+
+    def __init__(self, redis_client: Any = None):
+        self._explicit_client = redis_client
+        self._lock = threading.Lock()
+        self._mem_counts: Dict[str, Dict[int, int]] = defaultdict(dict)
+        self._mem_online: Dict[int, set] = {}
+        self._mem_gauges: Dict[str, int] = {}
+        self._mem_synced_until = 0.0
+
+    # ----- backend -----
+    @property
+    def _redis(self):
+        if self._explicit_client is not None:
+            return self._explicit_client
+        try:
+            return get_redis_manager().redis_client
+        except Exception:
+            return None
+
+    # ----- writes -----
+    def incr(self, name: str, amount: int = 1, *, ts: Optional[float] = None) -> None:
+        bucket = _bucket_of(ts if ts is not None else time.time())
+        r = self._redis
+        if r is not None:
+            try:
+                key = redis_keys.live_bucket(name, bucket)
+                pipe = r.pipeline()
+                pipe.incrby(key, int(amount))
+                pipe.expire(key, BUCKET_TTL_SECONDS)
+                pipe.execute()
+                return
+            except Exception:
+                logger.warning("live metrics incr failed name=%s", name, exc_info=True)
+        with self._lock:
+            slot = self._mem_counts[name]
+            slot[bucket] = slot.get(bucket, 0) + int(amount)
+            self._trim_mem(slot, bucket)
+
+    def mark_online(self, user_id: int, *, ts: Optional[float] = None) -> None:
+        bucket = _bucket_of(ts if ts is not None else time.time())
+        r = self._redis
+        if r is not None:
+            try:
+                key = redis_keys.live_online(bucket)
+                pipe = r.pipeline()
+                pipe.pfadd(key, str(user_id))
+                pipe.expire(key, ONLINE_TTL_SECONDS)
+                pipe.execute()
+                return
+            except Exception:
+                logger.warning("live metrics pfadd failed user=%s", user_id, exc_info=True)
+        with self._lock:
+            self._mem_online.setdefault(bucket, set()).add(int(user_id))
+            for b in [b for b in self._mem_online if b < bucket - ONLINE_TTL_SECONDS // BUCKET_SECONDS]:
+                del self._mem_online[b]
+
+    def gauge_incr(self, name: str, amount: int, *, ttl: Optional[int] = None) -> None:
+        r = self._redis
+        if r is not None:
+            try:
+                key = redis_keys.live_gauge(name)
+                pipe = r.pipeline()
+                pipe.incrby(key, int(amount))
+                if ttl:
+                    pipe.expire(key, ttl)
+                pipe.execute()
+                return
+            except Exception:
+                logger.warning("live metrics gauge incr failed name=%s", name, exc_info=True)
+        with self._lock:
+            self._mem_gauges[name] = self._mem_gauges.get(name, 0) + int(amount)
+
+    def gauge_set(self, name: str, value: int, *, ttl: Optional[int] = None) -> None:
+        r = self._redis
+        if r is not None:
+            try:
+                key = redis_keys.live_gauge(name)
+                if ttl:
+                    r.setex(key, ttl, int(value))
+                else:
+                    r.set(key, int(value))
+                return
+            except Exception:
+                logger.warning("live metrics gauge set failed name=%s", name, exc_info=True)
+        with self._lock:
+            self._mem_gauges[name] = int(value)
+
+    # ----- reads (O(1) round trip) -----
+    def window_total(self, name: str, minutes: int, *, ts: Optional[float] = None) -> int:
+        current = _bucket_of(ts if ts is not None else time.time())
+        buckets = range(current - minutes + 1, current + 1)
+        r = self._redis
+        if r is not None:
+            try:
+                vals = r.mget([redis_keys.live_bucket(name, b) for b in buckets])
+                return sum(int(v) for v in vals if v is not None)
+            except Exception:
+                logger.warning("live metrics mget failed name=%s", name, exc_info=True)
+        with self._lock:
+            slot = self._mem_counts.get(name) or {}
+            return sum(slot.get(b, 0) for b in buckets)
+
+    def online_users(self, minutes: int = ONLINE_WINDOW_MINUTES, *, ts: Optional[float] = None) -> int:
+        current = _bucket_of(ts if ts is not None else time.time())
+        buckets = range(current - minutes + 1, current + 1)
+        r = self._redis
+        if r is not None:
+            try:
+                return int(r.pfcount(*[redis_keys.live_online(b) for b in buckets]) or 0)
+            except Exception:
+                logger.warning("live metrics pfcount failed", exc_info=True)
+        with self._lock:
+            users: set = set()
+            for b in buckets:
+                users |= self._mem_online.get(b, set())
+            return len(users)
+
+    def gauge(self, name: str) -> int:
+        r = self._redis
+        if r is not None:
+            try:
+                v = r.get(redis_keys.live_gauge(name))
+                return int(v) if v is not None else 0
+            except Exception:
+                logger.warning("live metrics gauge get failed name=%s", name, exc_info=True)
+        with self._lock:
+            return int(self._mem_gauges.get(name, 0))
+
+    def today_revenue(self, *, now: Optional[datetime] = None) -> int:
+        return self.gauge(_day_gauge(now or datetime.utcnow()))
+
+    # ----- shop status transitions -----
+    def record_transaction_change(self, *, amount: int, old_status: Optional[str], new_status: Optional[str], created_at: Optional[datetime] = None) -> None:
+        """ShopTransaction status 전이를 매출/pending 게이지에 반영."""
+        if old_status == new_status:
+            return
+        amount = int(amount or 0)
+        if new_status == "success" or old_status == "success":
+            sign = 1 if new_status == "success" else -1
+            self.gauge_incr(REVENUE_TOTAL, sign * amount)
+            self.gauge_incr(_day_gauge(created_at or datetime.utcnow()), sign * amount, ttl=DAY_GAUGE_TTL_SECONDS)
+        if new_status == "pending" or old_status == "pending":
+            self.gauge_incr(PENDING_TX, 1 if new_status == "pending" else -1)
+
+    # ----- DB reconciliation -----
+    def is_synced(self) -> bool:
+        r = self._redis
+        if r is not None:
+            try:
+                return bool(r.exists(redis_keys.live_sync_marker()))
+            except Exception:
+                pass
+        return time.time() < self._mem_synced_until
+
+    def _mark_synced(self) -> None:
+        ttl = _resync_seconds()
+        r = self._redis
+        if r is not None:
+            try:
+                r.setex(redis_keys.live_sync_marker(), ttl, int(time.time()))
+                return
+            except Exception:
+                pass
+        self._mem_synced_until = time.time() + ttl
+
+    def ensure_synced(self, db: Session) -> None:
+        if not self.is_synced():
+            self.sync_from_db(db)
+
+    def sync_from_db(self, db: Session, *, now: Optional[datetime] = None) -> None:
+        """DB 스캔으로 버킷/게이지 재구성 (콜드 스타트/주기 drift 교정 전용)."""
+        from .. import models
+        from ..models.auth_models import UserSession
+
+        now = now or datetime.utcnow()
+        hour_ago = now - timedelta(hours=1)
+        today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+
+        def _rebuild(name: str, stamps: Iterable[Optional[datetime]]) -> None:
+            counts: Dict[int, int] = {}
+            for dt in stamps:
+                if dt is None:
+                    continue
+                b = _bucket_of(_epoch(dt))
+                counts[b] = counts.get(b, 0) + 1
+            current = _bucket_of(_epoch(now))
+            buckets = range(current - 59, current + 1)
+            r = self._redis
+            if r is not None:
+                try:
+                    pipe = r.pipeline()
+                    for b in buckets:
+                        pipe.setex(redis_keys.live_bucket(name, b), BUCKET_TTL_SECONDS, counts.get(b, 0))
+                    pipe.execute()
+                    return
+                except Exception:
+                    logger.warning("live metrics rebuild failed name=%s", name, exc_info=True)
+            with self._lock:
+                self._mem_counts[name] = {b: counts.get(b, 0) for b in buckets}
+
+        try:
+            spins = db.query(models.UserAction.created_at).filter(
+                models.UserAction.action_type == "SLOT_SPIN",
+                models.UserAction.created_at > hour_ago,
+            ).all()
+            _rebuild(SLOT_SPINS, (row[0] for row in spins))
+
+            big_wins = db.query(models.UserReward.claimed_at).filter(
+                models.UserReward.claimed_at > hour_ago,
+                models.UserReward.gold_amount != None,  # noqa: E711
+                models.UserReward.gold_amount > _big_win_threshold(),
+            ).all()
+            _rebuild(BIG_WINS, (row[0] for row in big_wins))
+
+            sessions = db.query(UserSession.user_id, UserSession.last_used_at).filter(
+                UserSession.last_used_at != None,  # noqa: E711
+                UserSession.last_used_at > now - timedelta(minutes=ONLINE_WINDOW_MINUTES),
+            ).all()
+            for user_id, last_used in sessions:
+                self.mark_online(user_id, ts=_epoch(last_used))
+
+            ST = models.ShopTransaction
+            total_revenue = db.query(func.coalesce(func.sum(ST.amount), 0)).filter(ST.status == "success").scalar() or 0
+            today_revenue = db.query(func.coalesce(func.sum(ST.amount), 0)).filter(
+                ST.status == "success", ST.created_at >= today_start
+            ).scalar() or 0
+            pending = db.query(func.count(ST.id)).filter(ST.status == "pending").scalar() or 0
+            self.gauge_set(REVENUE_TOTAL, int(total_revenue))
+            self.gauge_set(_day_gauge(now), int(today_revenue), ttl=DAY_GAUGE_TTL_SECONDS)
+            self.gauge_set(PENDING_TX, int(pending))
+        except Exception:
+            # 테이블 미존재 등: 이벤트 기반 값만 사용하고 다음 주기에 재시도
+            logger.warning("live metrics DB sync failed", exc_info=True)
+            try:
+                db.rollback()
+            except Exception:
+                pass
+        self._mark_synced()
+
+    def reset(self) -> None:
+        """메모리 상태 초기화 (테스트 전용)."""
+        with self._lock:
+            self._mem_counts.clear()
+            self._mem_online.clear()
+            self._mem_gauges.clear()
+            self._mem_synced_until = 0.0
+
+    @staticmethod
+    def _trim_mem(slot: Dict[int, int], current: int) -> None:
+        horizon = current - BUCKET_TTL_SECONDS // BUCKET_SECONDS
+        for b in [b for b in slot if b < horizon]:
+            del slot[b]
+
+
+_live_metrics: Optional[LiveMetricsService] = None
+
+
+def get_live_metrics() -> LiveMetricsService:
+    global _live_metrics
+    if _live_metrics is None:
+        _live_metrics = LiveMetricsService()
+    return _live_metrics
+
+
+# ---------------------------------------------------------------------------
+# Session 이벤트 공급기: flush 시점에 변경을 수집 → commit 확정 시 반영
+# ---------------------------------------------------------------------------
+_PENDING_KEY = "live_metrics_pending"
+
+
+def _collect(session: Session, pending: List[tuple]) -> None:
+    from sqlalchemy import inspect as sa_inspect
+    from .. import models
+    from ..models.auth_models import UserSession
+
+    for obj in session.new:
+        if isinstance(obj, models.UserAction):
+            if obj.action_type == "SLOT_SPIN":
+                pending.append(("incr", SLOT_SPINS))
+        elif isinstance(obj, models.UserReward):
+            if obj.gold_amount is not None and obj.gold_amount > _big_win_threshold():
+                pending.append(("incr", BIG_WINS))
+        elif isinstance(obj, models.ShopTransaction):
+            pending.append(("tx", obj.amount, None, obj.status or "success", obj.created_at))
+        elif isinstance(obj, UserSession):
+            pending.append(("online", obj.user_id))
+    for obj in session.dirty:
+        if isinstance(obj, models.ShopTransaction):
+            hist = sa_inspect(obj).attrs.status.history
+            if hist.has_changes():
+                old = hist.deleted[0] if hist.deleted else None
+                pending.append(("tx", obj.amount, old, obj.status, obj.created_at))
+        elif isinstance(obj, UserSession):
+            if sa_inspect(obj).attrs.last_used_at.history.has_changes():
+                pending.append(("online", obj.user_id))
+
+
+def _apply(pending: List[tuple]) -> None:
+    svc = get_live_metrics()
+    for item in pending:
+        try:
+            kind = item[0]
+            if kind == "incr":
+                svc.incr(item[1])
+            elif kind == "online":
+                svc.mark_online(item[1])
+            elif kind == "tx":
+                svc.record_transaction_change(amount=item[1], old_status=item[2], new_status=item[3], created_at=item[4])
+        except Exception:  # 실패 허용 (요청 경로 차단 X)
+            logger.debug("live metrics apply failed item=%s", item, exc_info=True)
+
+
+def install_live_metrics_listeners() -> None:
+    """모든 Session 에 공급기 등록 (멱등)."""
+    register_commit_hook(_PENDING_KEY, _collect, _apply, factory=list)
+
+
+__all__ = [
+    "LiveMetricsService",
+    "get_live_metrics",
+    "install_live_metrics_listeners",
+    "SLOT_SPINS",
+    "BIG_WINS",
+    "REVENUE_TOTAL",
+    "PENDING_TX",
+]
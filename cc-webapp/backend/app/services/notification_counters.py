@@ -0,0 +1,251 @@
+"""Per-user notification counters + latest-N inbox cache.
+
+배지 갱신/목록 조회마다 ``notifications`` 에 COUNT(*) 를 수행하던 구조를 대체한다.
+
+- DB 원본: ``notification_counters`` (user_id, unread_count, total_count)
+  → 알림 생성/읽음/전체읽음/캠페인 발송과 **같은 트랜잭션**에서 증감 (``bump``, commit 은 호출부)
+- Redis 캐시: ``notif:counters:<user_id>`` HASH (unread/total)
+  → commit 이후 ``publish`` 에서 키가 있을 때만 HINCRBY (Lua 1회). 실패 시 키 삭제 →
+    다음 조회가 DB 카운터에서 재적재하므로 DB 와 어긋난 값이 남지 않는다
+- 인박스: ``notif:inbox:<user_id>`` 최신 ``INBOX_SIZE`` 건 JSON (변경 시 삭제, 조회 시 재적재)
+- ``reconcile_counters``: notifications 집계와 비교해 드리프트 보정 (스케줄러/관리자 작업)
+  → DB 카운터 행 보정 + 이미 있는 Redis 키도 집계값으로 덮어씀 (DB 는 맞고 캐시만 어긋난 경우 포함)
+
+Redis 미연결 시 DB 카운터 행 1건 조회(PK)로 동작한다.
+"""
+from __future__ import annotations
+
+import json
+import logging
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Set, Tuple
+
+from sqlalchemy import case, func, insert, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from .. import models
+from ..core import redis_keys
+from ..utils.redis import get_redis_manager
+
+logger = logging.getLogger(__name__)
+
+INBOX_SIZE = 20
+INBOX_TTL_SECONDS = 300
+COUNTER_TTL_SECONDS = 7 * 24 * 3600
+
+# KEYS[1]=counter hash  ARGV: d_unread, d_total — 키가 있을 때만 증감 (콜드 키는 조회 시 DB 에서 적재)
+_HINCR_IF_EXISTS_LUA = """
+if redis.call('EXISTS', KEYS[1]) == 0 then return 0 end
+redis.call('HINCRBY', KEYS[1], 'unread', ARGV[1])
+redis.call('HINCRBY', KEYS[1], 'total', ARGV[2])
+return 1
+"""
+
+# KEYS[1]=counter hash  ARGV: unread, total — 키가 있고 값이 다를 때만 덮어씀 (reconcile 보정). 반환: 변경 여부
+_HSET_IF_EXISTS_LUA = """
+if redis.call('EXISTS', KEYS[1]) == 0 then return 0 end
+local cur = redis.call('HMGET', KEYS[1], 'unread', 'total')
+if cur[1] == ARGV[1] and cur[2] == ARGV[2] then return 0 end
+redis.call('HSET', KEYS[1], 'unread', ARGV[1], 'total', ARGV[2])
+return 1
+"""
+
+# user_id -> (unread 증감, total 증감)
+Deltas = Dict[int, Tuple[int, int]]
+
+
+def _redis():
+    try:
+        return get_redis_manager().redis_client
+    except Exception:
+        return None
+
+
+def _grouped_counts(db: Session, user_ids: Iterable[int]) -> Dict[int, Tuple[int, int]]:
+    """notifications 기준 사용자별 (unread, total) 집계 (IN 1회)."""
+    N = models.Notification
+    ids = list(user_ids)
+    if not ids:
+        return {}
+    rows = (
+        db.query(N.user_id, func.sum(case((N.is_read == False, 1), else_=0)), func.count(N.id))  # noqa: E712
+        .filter(N.user_id.in_(ids))
+        .group_by(N.user_id)
+        .all()
+    )
+    return {uid: (int(unread or 0), int(total or 0)) for uid, unread, total in rows}
+
+
+def bump(db: Session, deltas: Deltas) -> None:
+    """DB 카운터 증감 (commit 하지 않음 — 알림 변경과 같은 트랜잭션).
+
+    카운터 행이 없는 사용자는 현재 notifications 집계로 생성한다 (flush 이후 호출 → 이번 변경 포함).
+    """
+    deltas = {uid: d for uid, d in deltas.items() if uid is not None}
+    if not deltas:
+        return
+    C = models.NotificationCounter
+    db.flush()
+    by_delta: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+    for uid, d in deltas.items():
+        by_delta[d].append(uid)
+    for (du, dt), ids in by_delta.items():
+        if du or dt:
+            db.execute(
+                update(C)
+                .where(C.user_id.in_(ids))
+                .values(unread_count=C.unread_count + du, total_count=C.total_count + dt)
+                .execution_options(synchronize_session=False)
+            )
+    existing = {uid for (uid,) in db.query(C.user_id).filter(C.user_id.in_(list(deltas)))}
+    missing = [uid for uid in deltas if uid not in existing]
+    if not missing:
+        return
+    counts = _grouped_counts(db, missing)
+    rows = [{"user_id": uid, "unread_count": counts.get(uid, (0, 0))[0], "total_count": counts.get(uid, (0, 0))[1]}
+            for uid in missing]
+    try:
+        with db.begin_nested():
+            db.execute(insert(C), rows)
+    except IntegrityError:
+        # 동시 생성 경합: 다른 트랜잭션이 먼저 행을 만든 경우 증감만 적용
+        for row in rows:
+            du, dt = deltas[row["user_id"]]
+            db.execute(
+                update(C)
+                .where(C.user_id == row["user_id"])
+                .values(unread_count=C.unread_count + du, total_count=C.total_count + dt)
+                .execution_options(synchronize_session=False)
+            )
+
+
+def publish(deltas: Deltas) -> None:
+    """commit 이후 Redis 카운터 증감 + 인박스 무효화 (best-effort)."""
+    r = _redis()
+    if r is None or not deltas:
+        return
+    try:
+        pipe = r.pipeline(transaction=False)
+        for uid, (du, dt) in deltas.items():
+            pipe.eval(_HINCR_IF_EXISTS_LUA, 1, redis_keys.notif_counters(uid), du, dt)
+            pipe.delete(redis_keys.notif_inbox(uid))
+        pipe.execute()
+    except Exception:
+        logger.warning("notification counter redis update failed; dropping cached counters", exc_info=True)
+        try:
+            r.delete(*[redis_keys.notif_counters(uid) for uid in deltas])
+        except Exception:
+            pass
+
+
+def get_counts(db: Session, user_id: int) -> Tuple[int, int]:
+    """(unread, total) — Redis HASH → DB 카운터 행 → (없으면) 집계 후 생성."""
+    r = _redis()
+    key = redis_keys.notif_counters(user_id)
+    if r is not None:
+        try:
+            cached = r.hmget(key, "unread", "total")
+            if cached and cached[0] is not None and cached[1] is not None:
+                return max(0, int(cached[0])), max(0, int(cached[1]))
+        except Exception:
+            logger.warning("notification counter redis read failed", exc_info=True)
+    row = db.get(models.NotificationCounter, user_id)
+    if row is None:
+        bump(db, {user_id: (0, 0)})
+        db.commit()
+        row = db.get(models.NotificationCounter, user_id)
+    unread, total = int(row.unread_count or 0), int(row.total_count or 0)
+    if r is not None:
+        try:
+            pipe = r.pipeline(transaction=False)
+            pipe.hset(key, mapping={"unread": unread, "total": total})
+            pipe.expire(key, COUNTER_TTL_SECONDS)
+            pipe.execute()
+        except Exception:
+            pass
+    return max(0, unread), max(0, total)
+
+
+def _serialize(n: models.Notification) -> Dict[str, Any]:
+    return {
+        "id": n.id,
+        "title": n.title,
+        "message": n.message,
+        "notification_type": n.notification_type,
+        "is_read": bool(n.is_read),
+        "created_at": n.created_at.isoformat() if n.created_at else None,
+        "read_at": n.read_at.isoformat() if n.read_at else None,
+    }
+
+
+def latest(db: Session, user_id: int, limit: int = INBOX_SIZE) -> List[Dict[str, Any]]:
+    """최신 알림 N건 (Redis 캐시, 미스 시 DB 조회 후 INBOX_SIZE 건 적재)."""
+    limit = max(1, min(int(limit), INBOX_SIZE))
+    r = _redis()
+    key = redis_keys.notif_inbox(user_id)
+    if r is not None:
+        try:
+            raw = r.get(key)
+            if raw is not None:
+                return json.loads(raw)[:limit]
+        except Exception:
+            logger.warning("notification inbox cache read failed", exc_info=True)
+    N = models.Notification
+    items = [
+        _serialize(n)
+        for n in db.query(N).filter(N.user_id == user_id).order_by(N.created_at.desc(), N.id.desc()).limit(INBOX_SIZE)
+    ]
+    if r is not None:
+        try:
+            r.setex(key, INBOX_TTL_SECONDS, json.dumps(items))
+        except Exception:
+            pass
+    return items[:limit]
+
+
+def reconcile_counters(db: Session, *, chunk_size: int = 1000, on_chunk=None) -> int:
+    """notifications 집계와 카운터(DB 행 + Redis 키)를 비교해 차이를 보정. 반환: 보정된 사용자 수."""
+    C = models.NotificationCounter
+    N = models.Notification
+    user_ids = sorted(
+        {uid for (uid,) in db.query(N.user_id).distinct()}
+        | {uid for (uid,) in db.query(C.user_id)}
+    )
+    repaired = 0
+    r = _redis()
+    for start in range(0, len(user_ids), chunk_size):
+        chunk = user_ids[start:start + chunk_size]
+        actual = _grouped_counts(db, chunk)
+        stored = {row.user_id: row for row in db.query(C).filter(C.user_id.in_(chunk))}
+        drifted: Set[int] = set()
+        for uid in chunk:
+            unread, total = actual.get(uid, (0, 0))
+            row = stored.get(uid)
+            if row is None:
+                db.add(C(user_id=uid, unread_count=unread, total_count=total))
+                drifted.add(uid)
+            elif row.unread_count != unread or row.total_count != total:
+                row.unread_count, row.total_count = unread, total
+                drifted.add(uid)
+        db.commit()
+        if r is not None:
+            try:
+                pipe = r.pipeline(transaction=False)
+                for uid in chunk:
+                    unread, total = actual.get(uid, (0, 0))
+                    pipe.eval(_HSET_IF_EXISTS_LUA, 1, redis_keys.notif_counters(uid), unread, total)
+                drifted.update(uid for uid, changed in zip(chunk, pipe.execute()) if changed)
+            except Exception:
+                logger.warning("notification counter cache repair failed; dropping cached counters", exc_info=True)
+                try:
+                    r.delete(*[redis_keys.notif_counters(uid) for uid in chunk])
+                except Exception:
+                    pass
+        repaired += len(drifted)
+        if on_chunk:
+            on_chunk(min(start + chunk_size, len(user_ids)), len(user_ids))
+    return repaired
+
+
+__all__ = ["INBOX_SIZE", "bump", "publish", "get_counts", "latest", "reconcile_counters"]
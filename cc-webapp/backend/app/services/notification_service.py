@@ -7,6 +7,8 @@ from sqlalchemy.exc import SQLAlchemyError
 
 from app import models
 from app.utils.redis import RedisManager
+from app.utils.pagination import keyset_page
+from app.services import notification_counters, notification_stream
 from app.core.config import settings
 try:
     from pywebpush import webpush  # type: ignore
@@ -71,8 +73,18 @@ class NotificationService:
 
         try:
             self.db.add(db_notification)
+            deltas = {user_id: (1, 1)}
+            notification_counters.bump(self.db, deltas)
             self.db.commit()
+            notification_counters.publish(deltas)
             self.db.refresh(db_notification)
+            notification_stream.publish(user_id, {
+                "notification_id": db_notification.id,
+                "title": db_notification.title,
+                "message": db_notification.message,
+                "notification_type": db_notification.notification_type,
+                "created_at": db_notification.created_at.isoformat() if db_notification.created_at else None,
+            })
             return db_notification
         except SQLAlchemyError as e:
             # Log the error
@@ -102,9 +114,13 @@ class NotificationService:
                 q = q.filter(models.Notification.is_read == False)
             if notification_type:
                 q = q.filter(models.Notification.notification_type == notification_type)
-            total = q.count()
+                total = q.count()
+            else:
+                # 필터가 타입 없음/미읽음뿐이면 카운터 저장소로 대체 (COUNT(*) 제거)
+                unread, all_total = notification_counters.get_counts(self.db, user_id)
+                total = unread if only_unread else all_total
             items = (
-                q.order_by(models.Notification.created_at.desc())
+                q.order_by(models.Notification.created_at.desc(), models.Notification.id.desc())
                  .offset(max(0, int(offset)))
                  .limit(max(1, min(int(limit), 200)))
                  .all()
@@ -114,6 +130,42 @@ class NotificationService:
             self.db.rollback()
             raise e
 
+    def list_notifications_page(
+        self,
+        user_id: int,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        only_unread: bool = False,
+        notification_type: Optional[str] = None,
+        include_total: bool = False,
+    ) -> Tuple[List[models.Notification], Optional[int], Optional[str]]:
+        """
+        Keyset (cursor) variant of list_notifications: (created_at, id) cursor, no OFFSET.
+
+        Returns (items, total_count or None, next_cursor). Raises InvalidCursor on a bad cursor.
+        """
+        try:
+            q = self.db.query(models.Notification).filter(models.Notification.user_id == user_id)
+            if only_unread:
+                q = q.filter(models.Notification.is_read == False)
+            if notification_type:
+                q = q.filter(models.Notification.notification_type == notification_type)
+            total = None
+            if include_total:
+                if notification_type:
+                    total = q.count()
+                else:
+                    unread, all_total = notification_counters.get_counts(self.db, user_id)
+                    total = unread if only_unread else all_total
+            items, next_cursor = keyset_page(
+                q, models.Notification.created_at, models.Notification.id,
+                limit=max(1, min(int(limit), 200)), cursor=cursor,
+            )
+            return items, total, next_cursor
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise e
+
     def mark_as_read(self, user_id: int, notification_id: int, read: bool = True) -> Optional[models.Notification]:
         """Mark a single notification read/unread if owned by the user."""
         try:
@@ -124,9 +176,14 @@ class NotificationService:
             )
             if not n:
                 return None
+            deltas = {}
+            if bool(n.is_read) != bool(read):
+                deltas = {user_id: (-1 if read else 1, 0)}
             n.is_read = bool(read)
             n.read_at = datetime.utcnow().replace(tzinfo=timezone.utc) if read else None
+            notification_counters.bump(self.db, deltas)
             self.db.commit()
+            notification_counters.publish(deltas)
             self.db.refresh(n)
             return n
         except SQLAlchemyError:
@@ -144,23 +201,31 @@ class NotificationService:
                     models.Notification.read_at: datetime.utcnow().replace(tzinfo=timezone.utc)
                 }, synchronize_session=False)
             )
+            deltas = {user_id: (-int(updated), 0)} if updated else {}
+            notification_counters.bump(self.db, deltas)
             self.db.commit()
+            notification_counters.publish(deltas)
             return int(updated or 0)
         except SQLAlchemyError:
             self.db.rollback()
             return 0
 
     def unread_count(self, user_id: int) -> int:
-        """Return unread notifications count for user."""
+        """Return unread notifications count for user (counter store, O(1))."""
         try:
-            return self.db.query(models.Notification).filter(
-                models.Notification.user_id == user_id,
-                models.Notification.is_read == False
-            ).count()
+            return notification_counters.get_counts(self.db, user_id)[0]
         except SQLAlchemyError:
             self.db.rollback()
             return 0
 
+    def latest(self, user_id: int, limit: int = notification_counters.INBOX_SIZE) -> List[dict]:
+        """Latest-N inbox (cached)."""
+        try:
+            return notification_counters.latest(self.db, user_id, limit)
+        except SQLAlchemyError:
+            self.db.rollback()
+            return []
+
     # ---------------------
     # Web Push (VAPID)
     # ---------------------
@@ -0,0 +1,299 @@
+"""Per-user notification replay stream (monotonic event ids, capped history).
+
+재접속마다 REST 로 전체 목록을 다시 받던 구조를 대체한다. SSE 는 ``Last-Event-ID``,
+WebSocket 은 접속 시 ``since`` 커서를 보내 끊긴 동안 놓친 이벤트만 재전송 받는다.
+
+- 발행 단일 창구: ``publish`` / ``publish_many`` (NotificationService.create_notification,
+  campaign_dispatcher.send_campaign, /api/notifications/{id}/send) — DB commit 이후 호출
+- Redis: ``notif:seq:<uid>`` INCR 로 사용자별 1,2,3… id 부여 → ``notif:stream:<uid>`` Stream 에
+  ``<id>-0`` 으로 XADD (MAXLEN ~ ``NOTIFICATION_STREAM_MAXLEN``, TTL ``NOTIFICATION_STREAM_TTL_SECONDS``)
+  Lua 1회로 원자 처리. seq 키는 만료시키지 않는다 (id 재사용 방지)
+- 재전송: ``replay(uid, since)`` = XRANGE ``<since+1>-0 +`` + seq GET (파이프라인 1회).
+  id 가 연속이므로 첫 이벤트 id 가 since+1 보다 크거나 since 가 현재 seq 보다 크면 ``truncated``
+  → 클라이언트는 REST 로 전체 재조회
+- 실시간: 같은 프로세스 구독자 큐로 즉시 전달. 다른 워커에서 발행된 이벤트는 id 공백 감지 /
+  유휴 타임아웃마다 ``replay`` 로 따라잡는다 (``follow``)
+- Redis 미연결: 프로세스 메모리 ring (deque maxlen) — 같은 id/절단 의미. 백엔드 전환 시에도 id 는
+  단조 증가: ring 은 마지막으로 본 Redis id 다음부터, Redis 는 ring 이 부여한 id 다음부터 이어서 부여
+  (구독자 ``last`` 커서보다 작은 id 로 발행되어 ``follow`` 에서 버려지지 않도록)
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Deque, Dict, Iterable, List, Optional, Set, Tuple
+
+from ..core import redis_keys
+from ..core.config import settings
+from ..utils.redis import get_redis_manager
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TOPIC = "notification"
+RESYNC_TOPIC = "resync"
+REPLAY_LIMIT = 500
+
+# KEYS[1]=seq KEYS[2]=stream  ARGV: maxlen, ttl, event json(id 제외), 최소 seq(메모리 ring 부여분) → 새 id
+_PUBLISH_LUA = """
+local floor = tonumber(ARGV[4])
+if floor > 0 and tonumber(redis.call('GET', KEYS[1]) or '0') < floor then
+  redis.call('SET', KEYS[1], floor)
+end
+local id = redis.call('INCR', KEYS[1])
+redis.call('XADD', KEYS[2], 'MAXLEN', '~', ARGV[1], id .. '-0', 'e', ARGV[3])
+redis.call('EXPIRE', KEYS[2], ARGV[2])
+return id
+"""
+
+
+@dataclass
+class Replay:
+    events: List[Dict[str, Any]] = field(default_factory=list)
+    latest: int = 0
+    truncated: bool = False
+
+
+def _redis():
+    try:
+        return get_redis_manager().redis_client
+    except Exception:
+        return None
+
+
+def _event(topic: Optional[str], data: Any, priority: int) -> Dict[str, Any]:
+    return {
+        "topic": topic or DEFAULT_TOPIC,
+        "priority": int(priority or 0),
+        "data": data,
+        "ts": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+def _text(v: Any) -> str:
+    return v.decode() if isinstance(v, (bytes, bytearray)) else str(v)
+
+
+def _is_truncated(since: Optional[int], events: List[Dict[str, Any]], latest: int) -> bool:
+    if since is None:
+        return False
+    if since > latest:
+        return True  # seq 초기화 등 미래 커서
+    first = events[0]["id"] if events else latest + 1
+    return since < latest and first > since + 1
+
+
+# ------------------------------------------------------------------ 메모리 ring (Redis 미연결)
+_lock = threading.Lock()
+_memory: Dict[int, Tuple[int, Deque[Dict[str, Any]]]] = {}
+_redis_seen: Dict[int, int] = {}  # 사용자별 마지막으로 본 Redis seq (ring id 시작점)
+
+
+def _note_redis_seq(user_id: int, seq: int) -> None:
+    with _lock:
+        if seq > _redis_seen.get(user_id, 0):
+            _redis_seen[user_id] = seq
+
+
+def _memory_seq(user_id: int) -> int:
+    with _lock:
+        entry = _memory.get(user_id)
+        return entry[0] if entry else 0
+
+
+def _memory_publish(user_id: int, ev: Dict[str, Any]) -> Dict[str, Any]:
+    with _lock:
+        seq, ring = _memory.get(user_id) or (0, deque(maxlen=settings.NOTIFICATION_STREAM_MAXLEN))
+        seq = max(seq, _redis_seen.get(user_id, 0)) + 1
+        ev = {"id": seq, **ev}
+        ring.append(ev)
+        _memory[user_id] = (seq, ring)
+    return ev
+
+
+def _memory_replay(user_id: int, since: Optional[int], limit: int) -> Replay:
+    with _lock:
+        seq, ring = _memory.get(user_id) or (0, deque())
+        seq = max(seq, _redis_seen.get(user_id, 0))
+        events = [dict(e) for e in ring if since is None or e["id"] > since][:limit]
+    return Replay(events, seq, _is_truncated(since, events, seq))
+
+
+def clear_memory() -> None:
+    with _lock:
+        _memory.clear()
+        _redis_seen.clear()
+
+
+# ------------------------------------------------------------------ 구독자 (프로세스 로컬)
+@dataclass(eq=False)
+class Subscription:
+    user_id: int
+    queue: "asyncio.Queue[Tuple[int, Dict[str, Any]]]"
+    loop: asyncio.AbstractEventLoop
+
+
+_subscribers: Dict[int, Set[Subscription]] = {}
+
+
+def subscribe(user_id: int) -> Subscription:
+    sub = Subscription(user_id, asyncio.Queue(), asyncio.get_running_loop())
+    with _lock:
+        _subscribers.setdefault(user_id, set()).add(sub)
+    return sub
+
+
+def unsubscribe(sub: Subscription) -> None:
+    with _lock:
+        subs = _subscribers.get(sub.user_id)
+        if subs is not None:
+            subs.discard(sub)
+            if not subs:
+                _subscribers.pop(sub.user_id, None)
+
+
+def _fanout(events: Iterable[Tuple[int, Dict[str, Any]]]) -> None:
+    with _lock:
+        targets = [(sub, ev) for uid, ev in events for sub in _subscribers.get(uid, ())]
+    for sub, ev in targets:
+        try:
+            # 동기 라우터/스레드풀에서 발행될 수 있으므로 구독자 루프에 위임
+            sub.loop.call_soon_threadsafe(sub.queue.put_nowait, (ev["priority"], ev))
+        except RuntimeError:
+            unsubscribe(sub)  # 루프 종료됨
+
+
+# ------------------------------------------------------------------ 발행 / 재전송
+def publish_many(user_ids: Iterable[int], data: Any, *, topic: Optional[str] = None,
+                 priority: int = 0) -> List[Dict[str, Any]]:
+    """사용자별 이벤트 발행 (id 부여 + 보관 + 로컬 구독자 전달). Redis 파이프라인 1회.
+
+    반환: id 가 붙은 이벤트 목록. Redis 실패 시 메모리 ring 으로 대체 — 파이프라인 일부만 실패하면
+    실패한 사용자만 대체 (성공한 사용자의 스트림 id 와 중복 발행하지 않음).
+    """
+    ids = [uid for uid in user_ids if uid is not None]
+    if not ids:
+        return []
+    base = _event(topic, data, priority)
+    r = _redis()
+    published: List[Tuple[int, Dict[str, Any]]] = []
+    failed = ids
+    if r is not None:
+        try:
+            payload = json.dumps(base, ensure_ascii=False, default=str)
+            pipe = r.pipeline(transaction=False)
+            for uid in ids:
+                pipe.eval(_PUBLISH_LUA, 2, redis_keys.notif_seq(uid), redis_keys.notif_stream(uid),
+                          settings.NOTIFICATION_STREAM_MAXLEN, settings.NOTIFICATION_STREAM_TTL_SECONDS, payload,
+                          _memory_seq(uid))
+            results = pipe.execute(raise_on_error=False)
+            failed = []
+            for uid, new_id in zip(ids, results):
+                if isinstance(new_id, Exception):
+                    failed.append(uid)
+                else:
+                    published.append((uid, {"id": int(new_id), **base}))
+                    _note_redis_seq(uid, int(new_id))
+            if failed:
+                logger.warning("notification stream publish failed users=%s/%s (%s)",
+                               len(failed), len(ids), next(e for e in results if isinstance(e, Exception)))
+        except Exception:
+            logger.warning("notification stream publish failed users=%s", len(ids), exc_info=True)
+            published, failed = [], ids
+    if failed:
+        fallback = {uid: _memory_publish(uid, dict(base)) for uid in failed}
+        done = dict(published)
+        published = [(uid, done.get(uid) or fallback[uid]) for uid in ids]
+    _fanout(published)
+    return [ev for _, ev in published]
+
+
+def publish(user_id: int, data: Any, *, topic: Optional[str] = None, priority: int = 0) -> Optional[Dict[str, Any]]:
+    out = publish_many([user_id], data, topic=topic, priority=priority)
+    return out[0] if out else None
+
+
+def replay(user_id: int, since: Optional[int] = None, *, limit: int = REPLAY_LIMIT) -> Replay:
+    """since 이후(미지정 시 보관분 전체) 이벤트 + 최신 id + 절단 여부."""
+    r = _redis()
+    if r is None:
+        return _memory_replay(user_id, since, limit)
+    try:
+        pipe = r.pipeline(transaction=False)
+        pipe.xrange(redis_keys.notif_stream(user_id), min=f"{(since or 0) + 1}-0", max="+", count=limit)
+        pipe.get(redis_keys.notif_seq(user_id))
+        entries, seq = pipe.execute()
+    except Exception:
+        logger.warning("notification stream replay failed user=%s", user_id, exc_info=True)
+        return _memory_replay(user_id, since, limit)
+    events: List[Dict[str, Any]] = []
+    for entry_id, fields in entries or []:
+        raw = fields.get(b"e", fields.get("e")) if isinstance(fields, dict) else None
+        if raw is None:
+            continue
+        try:
+            events.append({"id": int(_text(entry_id).split("-", 1)[0]), **json.loads(_text(raw))})
+        except (TypeError, ValueError):
+            continue
+    latest = int(_text(seq)) if seq is not None else 0
+    _note_redis_seq(user_id, latest)
+    return Replay(events, latest, _is_truncated(since, events, latest))
+
+
+def resync_event(since: Optional[int], latest: int) -> Dict[str, Any]:
+    """보관 범위를 벗어난 커서 → 클라이언트에 전체 재조회 지시.
+
+    id 는 latest: SSE 프레임이 ``id: <latest>`` 를 실어 브라우저 Last-Event-ID 가 공백 너머로 전진
+    (재연결 시 같은 절단 커서로 resync 가 반복되지 않음).
+    """
+    return {"id": latest, "topic": RESYNC_TOPIC, "priority": 0, "data": {"since": since, "latest": latest}}
+
+
+async def follow(user_id: int, since: Optional[int] = None, *,
+                 idle_timeout: float = 15.0) -> AsyncIterator[Optional[Dict[str, Any]]]:
+    """since 이후 재전송 → 실시간 이벤트 순서대로 yield. 유휴 타임아웃마다 None (keepalive).
+
+    구독을 먼저 등록한 뒤 재전송하므로 그 사이 발행분도 id 중복 제거로 한 번만 전달된다.
+    """
+    sub = subscribe(user_id)
+    try:
+        rep = replay(user_id, since) if since is not None else Replay(latest=replay(user_id, 0, limit=1).latest)
+        if rep.truncated:
+            yield resync_event(since, rep.latest)
+        last = since if since is not None and not rep.truncated else rep.latest
+        for ev in rep.events:
+            if ev["id"] > last:
+                last = ev["id"]
+                yield ev
+        while True:
+            try:
+                _, ev = await asyncio.wait_for(sub.queue.get(), timeout=idle_timeout)
+            except asyncio.TimeoutError:
+                ev = None
+            if ev is not None and ev["id"] <= last:
+                continue
+            if ev is None or ev["id"] > last + 1:
+                # 다른 워커 발행분 (로컬 큐에 없음) 따라잡기
+                for missed in replay(user_id, last).events:
+                    if missed["id"] > last:
+                        last = missed["id"]
+                        yield missed
+                if ev is None:
+                    yield None
+                    continue
+                if ev["id"] <= last:
+                    continue
+            last = ev["id"]
+            yield ev
+    finally:
+        unsubscribe(sub)
+
+
+__all__ = [
+    "DEFAULT_TOPIC", "RESYNC_TOPIC", "Replay", "Subscription", "publish", "publish_many", "replay",
+    "resync_event", "follow", "subscribe", "unsubscribe", "clear_memory",
+]
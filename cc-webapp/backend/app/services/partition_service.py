@@ -0,0 +1,326 @@
+"""Monthly partitions + retention/archival for game_history / user_actions.
+
+두 테이블은 대부분의 조회가 ``user_id + created_at 구간`` (이력 페이지, 일일 한도, 스트릭, 업적 합계)인데
+무기한 누적되는 단일 테이블이었다. 마이그레이션(20261020_history_partitions)이 PostgreSQL 에서
+``created_at`` RANGE 파티션 테이블로 전환하고(기존 테이블은 ``<table>_legacy`` 파티션으로 무복사 attach),
+이 모듈이 운영 중 유지보수를 담당한다.
+
+- ``ensure_future_partitions``: 이번 달 ~ N개월 뒤 월 파티션 사전 생성 (``<table>_pYYYYMM``, 기존 범위와 겹치면 생략)
+- ``archive_expired``: 보존 기간(월)이 지난 구간을 압축 JSONL 파일(또는 ClickHouse)로 내보낸 뒤 제거
+    * 파티션 테이블: 파티션 단위 DETACH → DROP (행 단위 DELETE/VACUUM 없음)
+    * 비파티션(SQLite 테스트 DB / 전환 전 PostgreSQL): 월 구간별 export → id 배치 DELETE
+      (월 구간 전체를 단일 트랜잭션으로 삭제 — 중간 실패 시 롤백되어 모든 행이 남음)
+  내보내기/삭제가 실패한 구간은 그대로 남는다 (다음 실행에서 전체 재내보내기, 파일은 덮어씀 → 멱등)
+- ``run_maintenance``: 스케줄러/관리자 작업 진입점 (아카이브는 STORAGE_ARCHIVE_ENABLED 일 때만)
+"""
+from __future__ import annotations
+
+import gzip
+import json
+import logging
+import os
+import re
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import Table, delete, func, select, text
+from sqlalchemy.orm import Session
+
+from .. import models
+from ..core.config import settings
+
+logger = logging.getLogger(__name__)
+
+PARTITIONED_TABLES: Dict[str, Table] = {
+    "game_history": models.GameHistory.__table__,
+    "user_actions": models.UserAction.__table__,
+}
+SINKS = ("file", "clickhouse")
+_BOUND_RE = re.compile(r"FROM \((?:'([^']+)'|MINVALUE)\) TO \((?:'([^']+)'|MAXVALUE)\)")
+
+
+@dataclass
+class Partition:
+    table: str
+    name: str
+    start: Optional[datetime]  # None = MINVALUE
+    end: Optional[datetime]    # None = MAXVALUE
+    is_default: bool = False
+
+    def overlaps(self, start: datetime, end: datetime) -> bool:
+        if self.is_default:
+            return False
+        return (self.start is None or self.start < end) and (self.end is None or start < self.end)
+
+
+@dataclass
+class ArchiveResult:
+    table: str
+    start: Optional[datetime]
+    end: datetime
+    rows: int
+    mode: str                 # detach | delete
+    sink: str
+    location: Optional[str] = None
+    partition: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "table": self.table, "partition": self.partition, "rows": self.rows, "mode": self.mode,
+            "sink": self.sink, "location": self.location,
+            "start": self.start.isoformat() if self.start else None, "end": self.end.isoformat(),
+        }
+
+
+# ------------------------------------------------------------------ month helpers
+def month_start(at: datetime) -> datetime:
+    return datetime(at.year, at.month, 1)
+
+
+def add_months(at: datetime, n: int) -> datetime:
+    idx = at.year * 12 + (at.month - 1) + n
+    return datetime(idx // 12, idx % 12 + 1, 1)
+
+
+def partition_name(table: str, month: datetime) -> str:
+    return f"{table}_p{month:%Y%m}"
+
+
+def parse_bound(table: str, name: str, expr: str) -> Partition:
+    """pg_get_expr(relpartbound) 문자열 → Partition."""
+    if expr.strip().upper() == "DEFAULT":
+        return Partition(table, name, None, None, is_default=True)
+    m = _BOUND_RE.search(expr)
+    if not m:
+        raise ValueError(f"unsupported partition bound: {expr}")
+    start, end = (datetime.fromisoformat(v[:19]) if v else None for v in m.groups())
+    return Partition(table, name, start, end)
+
+
+# ------------------------------------------------------------------ catalog (PostgreSQL)
+def is_postgres(db: Session) -> bool:
+    return db.get_bind().dialect.name == "postgresql"
+
+
+def is_partitioned(db: Session, table: str) -> bool:
+    if not is_postgres(db):
+        return False
+    return bool(db.execute(
+        text("SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:t)"), {"t": table}
+    ).first())
+
+
+def list_partitions(db: Session, table: str) -> List[Partition]:
+    if not is_partitioned(db, table):
+        return []
+    rows = db.execute(text(
+        "SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid WHERE i.inhparent = to_regclass(:t) ORDER BY c.relname"
+    ), {"t": table}).all()
+    return [parse_bound(table, name, expr) for name, expr in rows]
+
+
+def ensure_future_partitions(db: Session, months_ahead: Optional[int] = None,
+                             now: Optional[datetime] = None) -> List[str]:
+    """이번 달 ~ months_ahead 개월 뒤까지 월 파티션 생성. 생성된 파티션 이름 목록 반환."""
+    months_ahead = settings.STORAGE_PARTITION_MONTHS_AHEAD if months_ahead is None else months_ahead
+    first = month_start(now or datetime.utcnow())
+    created: List[str] = []
+    for table in PARTITIONED_TABLES:
+        parts = list_partitions(db, table)
+        if not parts:
+            continue
+        for i in range(months_ahead + 1):
+            start = add_months(first, i)
+            end = add_months(start, 1)
+            if any(p.overlaps(start, end) for p in parts):
+                continue
+            name = partition_name(table, start)
+            try:
+                db.execute(text(
+                    f'CREATE TABLE IF NOT EXISTS "{name}" PARTITION OF "{table}" '
+                    f"FOR VALUES FROM ('{start:%Y-%m-%d}') TO ('{end:%Y-%m-%d}')"
+                ))
+                db.commit()
+                created.append(name)
+                parts.append(Partition(table, name, start, end))
+            except Exception:
+                # DEFAULT 파티션에 해당 월 행이 이미 있으면 실패 → 운영자 확인 필요 (다음 달은 계속 시도)
+                db.rollback()
+                logger.warning("partition create failed %s", name, exc_info=True)
+    return created
+
+
+# ------------------------------------------------------------------ archive sinks
+def _rows(db: Session, table: Table, start: Optional[datetime], end: datetime, batch: int) -> Iterable[Dict[str, Any]]:
+    col = table.c.created_at
+    q = select(table).where(col < end)
+    if start is not None:
+        q = q.where(col >= start)
+    for row in db.execute(q.order_by(table.c.id).execution_options(yield_per=batch)):
+        yield dict(row._mapping)
+
+
+def _label(start: Optional[datetime], end: datetime) -> str:
+    return f"{start:%Y%m}" if start is not None else f"upto_{end:%Y%m}"
+
+
+def _export_file(rows: Iterable[Dict[str, Any]], table: str, label: str, archive_dir: str) -> Tuple[int, str]:
+    folder = os.path.join(archive_dir, table)
+    os.makedirs(folder, exist_ok=True)
+    path = os.path.join(folder, f"{table}_{label}.jsonl.gz")
+    tmp = path + ".tmp"
+    n = 0
+    with gzip.open(tmp, "wt", encoding="utf-8") as fh:
+        for row in rows:
+            fh.write(json.dumps(row, default=str, ensure_ascii=False))
+            fh.write("\n")
+            n += 1
+    os.replace(tmp, path)  # 완료된 파일만 노출 (중단 시 .tmp 잔존 → 재실행이 덮어씀)
+    return n, path
+
+
+_CH_ARCHIVE_DDL = """
+CREATE TABLE IF NOT EXISTS history_archive (
+    source LowCardinality(String),
+    id Int64,
+    user_id Int32,
+    created_at DateTime64(3),
+    payload String CODEC(ZSTD)
+) ENGINE = ReplacingMergeTree()
+PARTITION BY (source, toYYYYMM(created_at))
+ORDER BY (source, user_id, created_at, id)
+"""
+
+
+def _export_clickhouse(rows: Iterable[Dict[str, Any]], table: str, batch: int) -> Tuple[int, str]:
+    from ..olap.clickhouse_client import ClickHouseClient
+
+    ch = ClickHouseClient()
+    ch.execute(_CH_ARCHIVE_DDL)
+    n = 0
+    buf: List[str] = []
+
+    def _flush() -> None:
+        if buf:
+            ch.execute("INSERT INTO history_archive FORMAT JSONEachRow\n" + "\n".join(buf))
+            buf.clear()
+
+    for row in rows:
+        created = row.get("created_at")
+        buf.append(json.dumps({
+            "source": table, "id": row["id"], "user_id": row.get("user_id") or 0,
+            "created_at": created.strftime("%Y-%m-%d %H:%M:%S.%f")[:23] if created else "1970-01-01 00:00:00",
+            "payload": json.dumps(row, default=str, ensure_ascii=False),
+        }))
+        n += 1
+        if len(buf) >= batch:
+            _flush()
+    _flush()
+    return n, f"clickhouse:{settings.CLICKHOUSE_DATABASE}.history_archive"
+
+
+def _export(db: Session, table: str, start: Optional[datetime], end: datetime, sink: str,
+            archive_dir: str, batch: int) -> Tuple[int, str]:
+    rows = _rows(db, PARTITIONED_TABLES[table], start, end, batch)
+    if sink == "clickhouse":
+        return _export_clickhouse(rows, table, batch)
+    return _export_file(rows, table, _label(start, end), archive_dir)
+
+
+# ------------------------------------------------------------------ retention
+def archive_expired(db: Session, *, now: Optional[datetime] = None, retention: Optional[Dict[str, int]] = None,
+                    sink: Optional[str] = None, archive_dir: Optional[str] = None,
+                    batch: int = 5000) -> List[ArchiveResult]:
+    """보존 기간이 지난 월 구간을 내보낸 뒤 제거. retention: table → 보존 개월 수 (0 이하 = 무기한)."""
+    retention = settings.STORAGE_RETENTION_MONTHS if retention is None else retention
+    sink = sink or settings.STORAGE_ARCHIVE_SINK
+    archive_dir = archive_dir or settings.STORAGE_ARCHIVE_DIR
+    if sink not in SINKS:
+        raise ValueError(f"unknown archive sink: {sink}")
+    first = month_start(now or datetime.utcnow())
+    results: List[ArchiveResult] = []
+    for table, months in retention.items():
+        if table not in PARTITIONED_TABLES or not months or months <= 0:
+            continue
+        cutoff = add_months(first, -int(months))
+        if is_partitioned(db, table):
+            results += _archive_partitions(db, table, cutoff, sink, archive_dir, batch)
+        else:
+            results += _archive_ranges(db, table, cutoff, sink, archive_dir, batch)
+    return results
+
+
+def _archive_partitions(db: Session, table: str, cutoff: datetime, sink: str, archive_dir: str,
+                        batch: int) -> List[ArchiveResult]:
+    out = []
+    for p in list_partitions(db, table):
+        if p.is_default or p.end is None or p.end > cutoff:
+            continue
+        try:
+            rows, location = _export(db, table, p.start, p.end, sink, archive_dir, batch)
+            db.execute(text(f'ALTER TABLE "{table}" DETACH PARTITION "{p.name}"'))
+            db.execute(text(f'DROP TABLE "{p.name}"'))
+            db.commit()
+        except Exception:
+            db.rollback()
+            logger.warning("partition archive failed %s", p.name, exc_info=True)
+            continue
+        out.append(ArchiveResult(table, p.start, p.end, rows, "detach", sink, location, p.name))
+    return out
+
+
+def _archive_ranges(db: Session, table: str, cutoff: datetime, sink: str, archive_dir: str,
+                    batch: int) -> List[ArchiveResult]:
+    t = PARTITIONED_TABLES[table]
+    oldest = db.execute(select(func.min(t.c.created_at)).where(t.c.created_at < cutoff)).scalar()
+    if oldest is None:
+        return []
+    out = []
+    start = month_start(oldest)
+    while start < cutoff:
+        end = add_months(start, 1)
+        try:
+            rows, location = _export(db, table, start, end, sink, archive_dir, batch)
+            if rows:
+                _delete_range(db, t, start, end, batch)
+        except Exception:
+            db.rollback()
+            logger.warning("range archive failed %s %s", table, _label(start, end), exc_info=True)
+            start = end
+            continue
+        if rows:
+            out.append(ArchiveResult(table, start, end, rows, "delete", sink, location))
+        start = end
+    return out
+
+
+def _delete_range(db: Session, t: Table, start: datetime, end: datetime, batch: int) -> None:
+    """월 구간 id 배치 DELETE 후 1회 commit.
+
+    배치마다 commit 하면 중간 실패 시 일부만 삭제된 채 남고, 다음 실행의 export 가 남은 행만으로
+    아카이브 파일을 덮어써 이미 삭제된 행이 아카이브에서도 사라진다.
+    """
+    rng = (t.c.created_at >= start, t.c.created_at < end)
+    while True:
+        ids = [r[0] for r in db.execute(select(t.c.id).where(*rng).limit(batch))]
+        if not ids:
+            break
+        db.execute(delete(t).where(t.c.id.in_(ids)))
+    db.commit()
+
+
+def run_maintenance(db: Session, *, now: Optional[datetime] = None, archive: Optional[bool] = None) -> Dict[str, Any]:
+    """미래 파티션 사전 생성 + (활성화 시) 보존 기간 경과 구간 아카이브."""
+    created = ensure_future_partitions(db, now=now)
+    archive = settings.STORAGE_ARCHIVE_ENABLED if archive is None else archive
+    archived = archive_expired(db, now=now) if archive else []
+    return {"created": created, "archived": [a.to_dict() for a in archived]}
+
+
+__all__ = [
+    "PARTITIONED_TABLES", "Partition", "ArchiveResult", "month_start", "add_months", "partition_name",
+    "parse_bound", "is_partitioned", "list_partitions", "ensure_future_partitions", "archive_expired",
+    "run_maintenance",
+]
@@ -2,18 +2,192 @@
 🧠 Casino-Club F2P - Quiz Service (확장)
 ======================================
 퀴즈 게임 비즈니스 로직 서비스
+
+퀴즈 정의 캐시:
+- 퀴즈/문항/보기를 1회 조회(selectinload)해 불변 ``CompiledQuiz`` 로 컴파일 후 프로세스 메모리에 보관
+- 채점은 (question_id, answer_id) → (score, is_correct) 인덱스 조회만 수행 (문항 수와 무관한 DB 왕복)
+- Quiz/QuizQuestion/QuizAnswer 변경이 commit 되면 Session 이벤트로 해당 퀴즈 무효화
+  (다중 워커 대비 TTL 로 상한)
 """
 
 import logging
-from sqlalchemy.orm import Session
-from typing import List, Dict, Any, Optional
+import threading
+import time
+from dataclasses import dataclass
+from types import MappingProxyType
+from sqlalchemy.orm import Session, selectinload
+from typing import List, Dict, Any, FrozenSet, Mapping, Optional, Tuple
 from datetime import datetime, timedelta
 
 from .. import models
 from ..schemas.quiz_schemas import QuizAttemptCreate
+from ..utils.session_hooks import register_commit_hook
 
 logger = logging.getLogger(__name__)
 
+QUIZ_CACHE_TTL_SECONDS = 300
+# (초과 기준 점수, 프로필) — 높은 기준부터 검사, 모두 미달이면 RISK_PROFILE_DEFAULT
+RISK_PROFILE_THRESHOLDS: Tuple[Tuple[int, str], ...] = ((10, "High-Risk"), (5, "Calculated-Risk"))
+RISK_PROFILE_DEFAULT = "Conservative"
+# /quiz/{id}/submit 가 기존 submit_answers 시절부터 반환하던 기준 미달 프로필 (클라이언트 호환)
+SUBMIT_DEFAULT_PROFILE = "Low-Risk"
+
+
+@dataclass(frozen=True)
+class CompiledAnswer:
+    id: int
+    text: str
+    score: int
+    is_correct: bool
+
+
+@dataclass(frozen=True)
+class CompiledQuestion:
+    id: int
+    text: str
+    points: int
+    answers: Tuple[CompiledAnswer, ...]
+
+
+@dataclass(frozen=True)
+class QuizScore:
+    total_score: int
+    correct_answers: int
+    answered: int
+
+
+@dataclass(frozen=True)
+class CompiledQuiz:
+    """퀴즈 정의 불변 스냅샷."""
+    id: int
+    title: str
+    description: Optional[str]
+    quiz_type: Optional[str]
+    max_attempts: int
+    is_active: bool
+    questions: Tuple[CompiledQuestion, ...]
+    question_ids: FrozenSet[int]
+    answer_index: Mapping[Tuple[int, int], CompiledAnswer]
+    risk_thresholds: Tuple[Tuple[int, str], ...] = RISK_PROFILE_THRESHOLDS
+
+    @property
+    def question_count(self) -> int:
+        return len(self.questions)
+
+    def lookup(self, question_id: int, answer_id: Optional[int]) -> Optional[CompiledAnswer]:
+        if answer_id is None:
+            return None
+        return self.answer_index.get((int(question_id), int(answer_id)))
+
+    def score(self, answers: Mapping[Any, Any], *, strict: bool = False) -> QuizScore:
+        """{question_id: answer_id} 채점. strict 면 정의에 없는 문항/보기에 ValueError."""
+        total = correct = 0
+        for question_id, answer_id in answers.items():
+            answer = self.lookup(question_id, answer_id)
+            if answer is None:
+                if strict:
+                    raise ValueError(f"Invalid answer {answer_id} for question {question_id}")
+                continue
+            total += answer.score
+            correct += 1 if answer.is_correct else 0
+        return QuizScore(total_score=total, correct_answers=correct, answered=len(answers))
+
+    def risk_profile(self, total_score: int, default: str = RISK_PROFILE_DEFAULT) -> str:
+        for threshold, profile in self.risk_thresholds:
+            if total_score > threshold:
+                return profile
+        return default
+
+
+def compile_quiz(quiz: models.Quiz) -> CompiledQuiz:
+    questions = []
+    index: Dict[Tuple[int, int], CompiledAnswer] = {}
+    for q in sorted(quiz.questions, key=lambda q: (q.order or 0, q.id)):
+        answers = tuple(
+            CompiledAnswer(id=a.id, text=a.text, score=a.score or 0, is_correct=bool(a.is_correct))
+            for a in sorted(q.answers, key=lambda a: (a.order or 0, a.id))
+        )
+        for a in answers:
+            index[(q.id, a.id)] = a
+        questions.append(CompiledQuestion(id=q.id, text=q.text, points=q.points or 0, answers=answers))
+    return CompiledQuiz(
+        id=quiz.id,
+        title=quiz.title,
+        description=quiz.description,
+        quiz_type=quiz.quiz_type,
+        max_attempts=quiz.max_attempts if quiz.max_attempts is not None else 3,
+        is_active=quiz.is_active is not False,
+        questions=tuple(questions),
+        question_ids=frozenset(q.id for q in questions),
+        answer_index=MappingProxyType(index),
+    )
+
+
+_cache_lock = threading.Lock()
+_quiz_cache: Dict[int, Tuple[float, CompiledQuiz]] = {}
+
+
+def get_compiled_quiz(db: Session, quiz_id: int) -> CompiledQuiz:
+    """캐시된 퀴즈 정의 (미스 시 퀴즈+문항+보기 1회 로드). 없으면 ValueError."""
+    now = time.monotonic()
+    hit = _quiz_cache.get(quiz_id)
+    if hit is not None and now - hit[0] < QUIZ_CACHE_TTL_SECONDS:
+        return hit[1]
+    quiz = (
+        db.query(models.Quiz)
+        .options(selectinload(models.Quiz.questions).selectinload(models.QuizQuestion.answers))
+        .filter(models.Quiz.id == quiz_id)
+        .first()
+    )
+    if not quiz:
+        raise ValueError("Quiz not found")
+    compiled = compile_quiz(quiz)
+    with _cache_lock:
+        _quiz_cache[quiz_id] = (now, compiled)
+    return compiled
+
+
+def invalidate_quiz_cache(quiz_id: Optional[int] = None) -> None:
+    """퀴즈 정의 캐시 무효화 (quiz_id=None → 전체)."""
+    with _cache_lock:
+        if quiz_id is None:
+            _quiz_cache.clear()
+        else:
+            _quiz_cache.pop(quiz_id, None)
+
+
+# ---------------------------------------------------------------------------
+# Session 이벤트: 정의 변경 flush 수집 → commit 확정 시 무효화
+# ---------------------------------------------------------------------------
+_PENDING_KEY = "quiz_cache_invalidate"
+_ALL = object()
+
+
+def _collect(session: Session, pending: set) -> None:
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, models.Quiz):
+            key = obj.id
+        elif isinstance(obj, models.QuizQuestion):
+            key = obj.quiz_id
+        elif isinstance(obj, models.QuizAnswer):
+            key = _ALL  # 보기 → 퀴즈 역참조는 lazy load 가 필요하므로 전체 무효화 (관리자 편집은 드묾)
+        else:
+            continue
+        pending.add(key)
+
+
+def _apply(pending: set) -> None:
+    if _ALL in pending or None in pending:
+        invalidate_quiz_cache()
+        return
+    for quiz_id in pending:
+        invalidate_quiz_cache(quiz_id)
+
+
+def install_quiz_cache_listeners() -> None:
+    """모든 Session 에 퀴즈 정의 무효화 리스너 등록 (멱등)."""
+    register_commit_hook(_PENDING_KEY, _collect, _apply)
+
 
 class QuizService:
     def __init__(self, db: Session, redis=None):
@@ -29,6 +203,10 @@ class QuizService:
             raise ValueError("Quiz not found")
         return quiz
 
+    def get_definition(self, quiz_id: int) -> CompiledQuiz:
+        """컴파일된 퀴즈 정의 (프로세스 캐시)."""
+        return get_compiled_quiz(self.db, quiz_id)
+
     async def start_quiz_attempt(
         self, 
         user_id: int, 
@@ -37,26 +215,12 @@ class QuizService:
     ) -> models.UserQuizAttempt:
         """퀴즈 시도 시작"""
         try:
-            # 퀴즈 존재 확인
-            quiz = self.db.query(models.Quiz).filter(models.Quiz.id == quiz_id).first()
-            if not quiz:
-                raise ValueError("Quiz not found")
+            # 퀴즈 존재 확인 / 문제 수 (캐시된 정의)
+            quiz = self.get_definition(quiz_id)
             
             # 최대 시도 횟수 확인
-            existing_attempts = self.db.query(models.UserQuizAttempt).filter(
-                models.UserQuizAttempt.user_id == user_id,
-                models.UserQuizAttempt.quiz_id == quiz_id,
-                models.UserQuizAttempt.status == "completed"
-            ).count()
-            
-            max_attempts = getattr(quiz, 'max_attempts', 3)
-            if existing_attempts >= max_attempts:
-                raise ValueError("Maximum attempts exceeded")
-            
-            # 문제 수 조회
-            question_count = self.db.query(models.QuizQuestion).filter(
-                models.QuizQuestion.quiz_id == quiz_id
-            ).count()
+            self._check_attempt_limit(user_id, quiz)
+            question_count = quiz.question_count
             
             # 시도 생성 (기존 모델 구조 사용)
             attempt = models.UserQuizAttempt(
@@ -105,27 +269,18 @@ class QuizService:
             question_id = answer_data.get("question_id")
             answer_id = answer_data.get("answer_id")
             
-            # 문제 조회
-            question = self.db.query(models.QuizQuestion).filter(
-                models.QuizQuestion.id == question_id
-            ).first()
-            
-            if not question:
+            # 문제/정답 확인 (캐시된 정의에서 조회)
+            quiz = self.get_definition(attempt.quiz_id)
+            if question_id is None or int(question_id) not in quiz.question_ids:
                 raise ValueError("Question not found")
             
-            # 정답 확인
             is_correct = False
             points_earned = 0
             
-            if answer_id:
-                quiz_answer = self.db.query(models.QuizAnswer).filter(
-                    models.QuizAnswer.id == answer_id,
-                    models.QuizAnswer.question_id == question_id
-                ).first()
-                
-                if quiz_answer:
-                    points_earned = getattr(quiz_answer, 'score', 0)
-                    is_correct = getattr(quiz_answer, 'is_correct', False)
+            quiz_answer = quiz.lookup(question_id, answer_id) if answer_id else None
+            if quiz_answer:
+                points_earned = quiz_answer.score
+                is_correct = quiz_answer.is_correct
             
             # 답변을 JSON에 저장
             current_answers = attempt.answers_json or {}
@@ -134,7 +289,7 @@ class QuizService:
             
             # 점수 업데이트
             if hasattr(attempt, 'total_score'):
-                attempt.total_score = getattr(attempt, 'total_score', 0) + points_earned
+                attempt.total_score = (attempt.total_score or 0) + points_earned
             
             self.db.commit()
             
@@ -188,29 +343,80 @@ class QuizService:
             raise
 
     def _calculate_total_score(self, attempt: models.UserQuizAttempt) -> int:
-        """총 점수 계산"""
-        total_score = 0
-        answers = attempt.answers_json or {}
-        
-        for question_id_str, answer_id in answers.items():
-            question_id = int(question_id_str)
-            answer = self.db.query(models.QuizAnswer).filter(
-                models.QuizAnswer.id == answer_id,
-                models.QuizAnswer.question_id == question_id
-            ).first()
-            if answer and hasattr(answer, 'score'):
-                total_score += answer.score
-        
-        return total_score
+        """총 점수 계산 (캐시된 정의로 메모리 채점)"""
+        return self.get_definition(attempt.quiz_id).score(attempt.answers_json or {}).total_score
 
     def _determine_risk_profile(self, total_score: int) -> str:
         """리스크 프로필 결정"""
-        if total_score > 10:
-            return "High-Risk"
-        elif total_score > 5:
-            return "Calculated-Risk"
-        else:
-            return "Conservative"
+        for threshold, profile in RISK_PROFILE_THRESHOLDS:
+            if total_score > threshold:
+                return profile
+        return RISK_PROFILE_DEFAULT
+
+    def _check_attempt_limit(self, user_id: int, quiz: CompiledQuiz) -> None:
+        existing_attempts = self.db.query(models.UserQuizAttempt).filter(
+            models.UserQuizAttempt.user_id == user_id,
+            models.UserQuizAttempt.quiz_id == quiz.id,
+            models.UserQuizAttempt.status == "completed"
+        ).count()
+        if existing_attempts >= quiz.max_attempts:
+            raise ValueError("Maximum attempts exceeded")
+
+    def submit_all(
+        self,
+        user_id: int,
+        quiz_id: int,
+        answers: Dict[int, int],
+        *,
+        session_id: Optional[str] = None,
+        started_at: Optional[datetime] = None,
+        update_segment: bool = True,
+        strict: bool = True,
+        enforce_limits: bool = True,
+        default_profile: str = RISK_PROFILE_DEFAULT,
+    ) -> models.UserQuizAttempt:
+        """전체 답안지 일괄 제출.
+
+        - 캐시된 정의로 메모리 채점 (strict: 정의에 없는 문항/보기 → ValueError, 아니면 무시)
+        - enforce_limits: 비활성 퀴즈 / 최대 시도 횟수 초과 시 ValueError
+        - 완료된 시도 1행 + (선택) UserSegment.risk_profile 갱신을 단일 commit 으로 기록
+        """
+        quiz = self.get_definition(quiz_id)
+        if enforce_limits:
+            if not quiz.is_active:
+                raise ValueError("Quiz is not active")
+            self._check_attempt_limit(user_id, quiz)
+        result = quiz.score(answers, strict=strict)
+        risk_profile = quiz.risk_profile(result.total_score, default_profile)
+        now = datetime.utcnow()
+        attempt = models.UserQuizAttempt(
+            user_id=user_id,
+            quiz_id=quiz_id,
+            session_id=session_id,
+            start_time=started_at or now,
+            submitted_at=now,
+            completion_time=int((now - started_at).total_seconds()) if started_at else None,
+            total_score=result.total_score,
+            correct_answers=result.correct_answers,
+            total_questions=quiz.question_count,
+            final_score=result.total_score,
+            risk_profile_result=risk_profile,
+            answers_json={str(q): a for q, a in answers.items()},
+            status="completed",
+        )
+        try:
+            self.db.add(attempt)
+            if update_segment:
+                segment = self.db.query(models.UserSegment).filter_by(user_id=user_id).first()
+                if segment:
+                    segment.risk_profile = risk_profile
+                else:
+                    self.db.add(models.UserSegment(user_id=user_id, risk_profile=risk_profile, rfm_group="New"))
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        return attempt
 
     async def get_user_stats(self, user_id: int) -> Dict[str, Any]:
         """사용자 퀴즈 통계"""
@@ -0,0 +1,296 @@
+"""Segment label resolver (process LRU → Redis hash → DB) + parsed segment game config.
+
+게임/서비스 경로마다 ``UserSegment`` 를 조회하고 ``SEGMENT_PROB_ADJUST_JSON`` / ``HOUSE_EDGE_JSON`` 을
+인스턴스 생성 시마다 다시 파싱하던 구조를 대체한다. 정상 상태에서 하우스 엣지 결정은 DB 왕복 0회.
+
+- 라벨: 프로세스 LRU (TTL ``SEGMENT_LABEL_CACHE_TTL_SECONDS``, 최대 ``SEGMENT_LABEL_CACHE_SIZE`` 건)
+  → Redis HASH ``segments:labels`` (field=user_id, 값 ``<label>|<기록 epoch>``, 세그먼트 없음은 ``-``)
+  → DB (조회 결과 write-through)
+- Redis 항목 유효 시간 ``SEGMENT_LABEL_REDIS_TTL_SECONDS``: 경과 항목은 miss 로 보고 DB 에서 다시 채운다
+  (HASH 자체도 같은 TTL 로 EXPIRE). 조회 경로 채우기는 Lua compare-and-set — 필드가 없거나 만료된
+  경우에만 기록하므로, 옛 라벨을 읽은 조회가 commit 리스너의 새 라벨을 늦게 덮어쓰지 못한다
+- 갱신: UserSegment commit 리스너가 변경된 라벨을 Redis HASH 에 무조건 기록(HSET)하고 로컬 LRU 항목을 교체
+  (RFM 재계산 작업/라우터/서비스 모든 ORM 경로). 다른 워커의 로컬 항목은 TTL 안에 수렴
+- 설정: 두 환경 변수 원문을 키로 한 번만 파싱 (원문이 바뀌면 = 새 설정 버전 → 재파싱)
+- ``labels_for``: 작업용 일괄 조회 (LRU → HMGET 1회 → 남은 사용자 IN 조회)
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from .. import models
+from ..core import redis_keys
+from ..core.config import settings
+from ..utils.redis import get_redis_manager
+from ..utils.session_hooks import register_commit_hook
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SEGMENT_PROB_ADJUST = {
+    "Whale": 0.02,
+    "Low": -0.02,
+    "Medium": 0.0,
+}
+DEFAULT_HOUSE_EDGE = {
+    "Whale": 0.05,
+    "Medium": 0.10,
+    "Low": 0.15,
+}
+DEFAULT_LABEL = "Low"
+FALLBACK_HOUSE_EDGE = 0.10
+
+_NONE = "-"  # Redis HASH 의 "세그먼트 없음" 값 (음성 캐시)
+_IN_CHUNK = 1000
+
+# KEYS[1]=hash  ARGV: now, ttl, field, value, field, value, ...
+# 필드가 없거나 기록 시각(값의 마지막 '|' 뒤)이 ttl 보다 오래된 경우에만 기록 (조회 경로 채우기)
+_FILL_LUA = """
+local now, ttl = tonumber(ARGV[1]), tonumber(ARGV[2])
+local written = 0
+for i = 3, #ARGV - 1, 2 do
+  local cur = redis.call('HGET', KEYS[1], ARGV[i])
+  local ts = cur and tonumber(string.match(cur, '|(%d+)$'))
+  if not ts or ts + ttl <= now then
+    redis.call('HSET', KEYS[1], ARGV[i], ARGV[i + 1])
+    written = written + 1
+  end
+end
+redis.call('EXPIRE', KEYS[1], ttl)
+return written
+"""
+
+
+# ------------------------------------------------------------------ 설정 (버전별 1회 파싱)
+@dataclass(frozen=True)
+class SegmentConfig:
+    version: Tuple[Optional[str], Optional[str]]
+    prob_adjust: Mapping[str, float]
+    house_edge: Mapping[str, float]
+
+    def adjust_probability(self, base_prob: float, label: Optional[str]) -> float:
+        new_prob = base_prob + self.prob_adjust.get(label or DEFAULT_LABEL, 0.0)
+        return max(0.0, min(new_prob, 1.0))
+
+    def edge_for(self, label: Optional[str]) -> float:
+        return self.house_edge.get(label or DEFAULT_LABEL, FALLBACK_HOUSE_EDGE)
+
+
+def _parse_json(name: str, raw: Optional[str], default: Dict[str, float]) -> Mapping[str, float]:
+    if raw:
+        try:
+            data = json.loads(raw)
+            if isinstance(data, dict):
+                return MappingProxyType({k: float(v) for k, v in data.items()})
+        except (json.JSONDecodeError, ValueError, TypeError) as e:
+            logger.warning("%s 파싱 실패: %s", name, e)
+    return MappingProxyType(dict(default))
+
+
+@lru_cache(maxsize=8)
+def _parse_config(prob_raw: Optional[str], edge_raw: Optional[str]) -> SegmentConfig:
+    return SegmentConfig(
+        version=(prob_raw, edge_raw),
+        prob_adjust=_parse_json("SEGMENT_PROB_ADJUST_JSON", prob_raw, DEFAULT_SEGMENT_PROB_ADJUST),
+        house_edge=_parse_json("HOUSE_EDGE_JSON", edge_raw, DEFAULT_HOUSE_EDGE),
+    )
+
+
+def segment_config() -> SegmentConfig:
+    """현재 확률 보정/하우스 엣지 설정 (환경 변수 원문이 같으면 캐시된 파싱 결과)."""
+    return _parse_config(os.getenv("SEGMENT_PROB_ADJUST_JSON"), os.getenv("HOUSE_EDGE_JSON"))
+
+
+# ------------------------------------------------------------------ 라벨 리졸버
+def _text(v: Any) -> Optional[str]:
+    if v is None:
+        return None
+    return v.decode() if isinstance(v, (bytes, bytearray)) else str(v)
+
+
+class SegmentResolver:
+    """user_id → rfm_group 라벨 (없으면 None)."""
+
+    def __init__(self, max_size: Optional[int] = None, ttl_seconds: Optional[float] = None) -> None:
+        self.max_size = max_size or settings.SEGMENT_LABEL_CACHE_SIZE
+        self.ttl = ttl_seconds if ttl_seconds is not None else settings.SEGMENT_LABEL_CACHE_TTL_SECONDS
+        self._lock = threading.Lock()
+        self._lru: "OrderedDict[int, Tuple[float, Optional[str]]]" = OrderedDict()
+
+    @property
+    def _redis(self):
+        try:
+            return get_redis_manager().redis_client
+        except Exception:
+            return None
+
+    # ---- 로컬 LRU
+    def _get_local(self, user_id: int) -> Tuple[bool, Optional[str]]:
+        with self._lock:
+            hit = self._lru.get(user_id)
+            if hit is None:
+                return False, None
+            if hit[0] < time.monotonic():
+                del self._lru[user_id]
+                return False, None
+            self._lru.move_to_end(user_id)
+            return True, hit[1]
+
+    def _put_local(self, labels: Mapping[int, Optional[str]]) -> None:
+        expires = time.monotonic() + self.ttl
+        with self._lock:
+            for uid, label in labels.items():
+                self._lru[uid] = (expires, label)
+                self._lru.move_to_end(uid)
+            while len(self._lru) > self.max_size:
+                self._lru.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._lru.clear()
+
+    # ---- Redis HASH
+    @property
+    def redis_ttl(self) -> int:
+        return int(settings.SEGMENT_LABEL_REDIS_TTL_SECONDS)
+
+    def _redis_get(self, user_ids: List[int]) -> Dict[int, Optional[str]]:
+        r = self._redis
+        if r is None or not user_ids:
+            return {}
+        try:
+            values = r.hmget(redis_keys.segment_labels(), [str(uid) for uid in user_ids])
+        except Exception:
+            logger.warning("segment label redis read failed", exc_info=True)
+            return {}
+        oldest = int(time.time()) - self.redis_ttl
+        out: Dict[int, Optional[str]] = {}
+        for uid, raw in zip(user_ids, values or []):
+            label, _, ts = (_text(raw) or "").rpartition("|")
+            if not ts.isdigit() or int(ts) <= oldest:
+                continue  # 없음 / 만료 / 구형식 → DB 재조회
+            out[uid] = None if label == _NONE else label
+        return out
+
+    def _encode(self, labels: Mapping[int, Optional[str]]) -> Dict[str, str]:
+        now = int(time.time())
+        return {str(uid): f"{label if label else _NONE}|{now}" for uid, label in labels.items()}
+
+    def _redis_fill(self, labels: Mapping[int, Optional[str]]) -> None:
+        """조회 경로 write-through: 없거나 만료된 필드만 기록 (commit 리스너 값 보존)."""
+        r = self._redis
+        if r is None or not labels:
+            return
+        args: List[Any] = [int(time.time()), self.redis_ttl]
+        for field_, value in self._encode(labels).items():
+            args += [field_, value]
+        try:
+            r.eval(_FILL_LUA, 1, redis_keys.segment_labels(), *args)
+        except Exception:
+            logger.warning("segment label redis fill failed", exc_info=True)
+
+    def _redis_put(self, labels: Mapping[int, Optional[str]]) -> None:
+        """세그먼트 변경 반영: 무조건 기록 (HSET) + HASH TTL 갱신."""
+        r = self._redis
+        if r is None or not labels:
+            return
+        key = redis_keys.segment_labels()
+        try:
+            pipe = r.pipeline(transaction=False)
+            pipe.hset(key, mapping=self._encode(labels))
+            pipe.expire(key, self.redis_ttl)
+            pipe.execute()
+        except Exception:
+            logger.warning("segment label redis write failed", exc_info=True)
+
+    # ---- DB
+    @staticmethod
+    def _db_get(db: Session, user_ids: List[int]) -> Dict[int, Optional[str]]:
+        S = models.UserSegment
+        if len(user_ids) == 1:
+            seg = db.query(S).filter(S.user_id == user_ids[0]).first()
+            return {user_ids[0]: (seg.rfm_group or None) if seg else None}
+        out: Dict[int, Optional[str]] = {uid: None for uid in user_ids}
+        for start in range(0, len(user_ids), _IN_CHUNK):
+            chunk = user_ids[start:start + _IN_CHUNK]
+            for uid, label in db.query(S.user_id, S.rfm_group).filter(S.user_id.in_(chunk)):
+                out[uid] = label or None
+        return out
+
+    # ---- 공개 API
+    def labels_for(self, db: Session, user_ids: Iterable[int]) -> Dict[int, Optional[str]]:
+        """일괄 라벨 조회 (LRU → Redis HMGET 1회 → DB IN 조회). 세그먼트 없는 사용자는 None."""
+        out: Dict[int, Optional[str]] = {}
+        missing: List[int] = []
+        for uid in dict.fromkeys(u for u in user_ids if u is not None):
+            hit, label = self._get_local(uid)
+            if hit:
+                out[uid] = label
+            else:
+                missing.append(uid)
+        if missing:
+            found = self._redis_get(missing)
+            out.update(found)
+            self._put_local(found)
+            missing = [uid for uid in missing if uid not in found]
+        if missing:
+            loaded = self._db_get(db, missing)
+            out.update(loaded)
+            self._put_local(loaded)
+            self._redis_fill(loaded)
+        return out
+
+    def label(self, db: Session, user_id: int) -> Optional[str]:
+        return self.labels_for(db, [user_id]).get(user_id)
+
+    def house_edge(self, db: Session, user_id: int) -> float:
+        return segment_config().edge_for(self.label(db, user_id))
+
+    def adjust_probability(self, db: Session, user_id: int, base_prob: float) -> float:
+        return segment_config().adjust_probability(base_prob, self.label(db, user_id))
+
+    def store_many(self, labels: Mapping[int, Optional[str]]) -> None:
+        """세그먼트 변경 반영 (commit 이후): Redis HASH 갱신 + 로컬 LRU 교체."""
+        if not labels:
+            return
+        self._redis_put(labels)
+        self._put_local(labels)
+
+
+segment_resolver = SegmentResolver()
+
+
+# ------------------------------------------------------------------ UserSegment commit 리스너
+_PENDING_KEY = "segment_label_changes"
+
+
+def _collect(session: Session, pending: Dict[int, Optional[str]]) -> None:
+    for objs, deleted in ((session.new, False), (session.dirty, False), (session.deleted, True)):
+        for obj in objs:
+            if isinstance(obj, models.UserSegment) and obj.user_id is not None:
+                pending[obj.user_id] = None if deleted else (obj.rfm_group or None)
+
+
+def _apply(pending: Dict[int, Optional[str]]) -> None:
+    segment_resolver.store_many(pending)
+
+
+def install_segment_listeners() -> None:
+    """모든 Session 에 UserSegment 변경 → 라벨 캐시 갱신 리스너 등록 (멱등)."""
+    register_commit_hook(_PENDING_KEY, _collect, _apply, factory=dict)
+
+
+__all__ = [
+    "DEFAULT_SEGMENT_PROB_ADJUST", "DEFAULT_HOUSE_EDGE", "DEFAULT_LABEL", "SegmentConfig", "segment_config",
+    "SegmentResolver", "segment_resolver", "install_segment_listeners",
+]
@@ -2,12 +2,13 @@ from __future__ import annotations
 
 from sqlalchemy.orm import Session
 from sqlalchemy import inspect
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from typing import Literal
 from datetime import datetime
 import uuid
 
 from .. import models
+from ..utils.pagination import keyset_page
 from .token_service import TokenService
 from .payment_gateway import PaymentGatewayService
 import json
@@ -198,13 +199,17 @@ class ShopService:
                 raise e
 
     def list_transactions(self, user_id: int, limit: int = 20) -> List[Dict[str, Any]]:
+        items, _ = self.list_transactions_page(user_id, limit)
+        return items
+
+    def list_transactions_page(
+        self, user_id: int, limit: int = 20, cursor: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """최신순 거래내역 keyset 페이지 (created_at, id 커서). 반환: (items, next_cursor)"""
         if self._table_exists('shop_transactions'):
-            rows = (
-                self.db.query(models.ShopTransaction)
-                .filter(models.ShopTransaction.user_id == user_id)
-                .order_by(models.ShopTransaction.id.desc())
-                .limit(limit)
-                .all()
+            q = self.db.query(models.ShopTransaction).filter(models.ShopTransaction.user_id == user_id)
+            rows, next_cursor = keyset_page(
+                q, models.ShopTransaction.created_at, models.ShopTransaction.id, limit=limit, cursor=cursor
             )
             return [
                 {
@@ -219,17 +224,14 @@ class ShopService:
                     "created_at": r.created_at.isoformat() if r.created_at else None,
                 }
                 for r in rows
-            ]
+            ], next_cursor
         # Fallback: derive from UserAction logs
-        logs = (
-            self.db.query(models.UserAction)
-            .filter(
-                models.UserAction.user_id == user_id,
-                models.UserAction.action_type.in_(['PURCHASE_GOLD', 'BUY_PACKAGE'])
-            )
-            .order_by(models.UserAction.id.desc())
-            .limit(limit)
-            .all()
+        q = self.db.query(models.UserAction).filter(
+            models.UserAction.user_id == user_id,
+            models.UserAction.action_type.in_(['PURCHASE_GOLD', 'BUY_PACKAGE'])
+        )
+        logs, next_cursor = keyset_page(
+            q, models.UserAction.created_at, models.UserAction.id, limit=limit, cursor=cursor
         )
         out: List[Dict[str, Any]] = []
         for a in logs:
@@ -248,7 +250,7 @@ class ShopService:
                 "receipt_code": data.get('receipt_code'),
                 "created_at": None,
             })
-        return out
+        return out, next_cursor
 
     # ----- admin helpers -----
     def admin_search_transactions(
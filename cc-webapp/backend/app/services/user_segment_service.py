@@ -1,64 +1,36 @@
-import json
 import logging
-import os
 from sqlalchemy.orm import Session
 
-from app import models
+from .segment_resolver import (
+    DEFAULT_HOUSE_EDGE,
+    DEFAULT_LABEL,
+    DEFAULT_SEGMENT_PROB_ADJUST,
+    segment_config,
+    segment_resolver,
+)
 
 logger = logging.getLogger(__name__)
 
 class UserSegmentService:
     """Service for retrieving user segment and adjusting game probabilities."""
 
-    DEFAULT_SEGMENT_PROB_ADJUST = {
-        "Whale": 0.02,
-        "Low": -0.02,
-        "Medium": 0.0,
-    }
+    DEFAULT_SEGMENT_PROB_ADJUST = DEFAULT_SEGMENT_PROB_ADJUST
 
-    DEFAULT_HOUSE_EDGE = {
-        "Whale": 0.05,
-        "Medium": 0.10,
-        "Low": 0.15,
-    }
+    DEFAULT_HOUSE_EDGE = DEFAULT_HOUSE_EDGE
 
     def __init__(self, db: Session) -> None:
-        """서비스 초기화. 환경 변수에서 설정을 로드한다."""
+        """서비스 초기화. 설정은 segment_config() 의 버전별 파싱 결과를 공유한다."""
         self.db = db
-        self.SEGMENT_PROB_ADJUST = self._load_json_env(
-            "SEGMENT_PROB_ADJUST_JSON", self.DEFAULT_SEGMENT_PROB_ADJUST
-        )
-        self.HOUSE_EDGE = self._load_json_env(
-            "HOUSE_EDGE_JSON", self.DEFAULT_HOUSE_EDGE
-        )
-
-    def _load_json_env(self, name: str, default: dict) -> dict:
-        """환경 변수에서 JSON 구성을 읽어 들인다."""
-        value = os.getenv(name)
-        if not value:
-            return default
-        try:
-            data = json.loads(value)
-            if isinstance(data, dict):
-                return {k: float(v) for k, v in data.items()}
-        except (json.JSONDecodeError, ValueError) as e:
-            logger.warning("%s 파싱 실패: %s", name, e)
-        return default
+        self.config = segment_config()
+        self.SEGMENT_PROB_ADJUST = self.config.prob_adjust
+        self.HOUSE_EDGE = self.config.house_edge
 
     def get_segment_label(self, user_id: int) -> str:
-        seg = (
-            self.db.query(models.UserSegment)
-            .filter(models.UserSegment.user_id == user_id)
-            .first()
-        )
-        if not seg or not seg.rfm_group:
-            return "Low"
-        return seg.rfm_group
+        # 프로세스 LRU → Redis HASH → DB (segment_resolver)
+        return segment_resolver.label(self.db, user_id) or DEFAULT_LABEL
 
     def adjust_probability(self, base_prob: float, segment_label: str) -> float:
-        adj = self.SEGMENT_PROB_ADJUST.get(segment_label, 0.0)
-        new_prob = base_prob + adj
-        return max(0.0, min(new_prob, 1.0))
+        return self.config.adjust_probability(base_prob, segment_label)
 
     def get_house_edge(self, segment_label: str) -> float:
-        return self.HOUSE_EDGE.get(segment_label, 0.10)
+        return self.config.edge_for(segment_label)
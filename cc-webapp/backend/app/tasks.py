@@ -16,3 +16,10 @@ def process_user_action(user_id: int, action: str):
     logger.info(f"Processing action {action} for user {user_id}")
     # 여기에 실제 액션 처리 로직 추가
     return f"Action {action} processed for user {user_id}"
+
+@celery_app.task
+def run_admin_job(job_id: str):
+    """관리자 백그라운드 작업 실행 (JOBS_USE_CELERY=1)"""
+    from app.services.job_service import get_job_service
+    job = get_job_service().run(job_id)
+    return (job or {}).get("status")
@@ -200,6 +200,26 @@ def _ensure_schema():
 									pass
 		except Exception:
 			pass
+	# 잔존 SQLite DB: 신규 nullable 컬럼 보강 (create_all 은 기존 테이블에 컬럼을 추가하지 않음)
+	try:
+		if engine.url.get_backend_name() == 'sqlite':
+			from sqlalchemy import inspect as _insp4
+			insp = _insp4(engine)
+			added = {
+				'user_actions': (('game_type', 'VARCHAR(20)'), ('bet', 'INTEGER'), ('win', 'INTEGER'),
+								 ('result', 'VARCHAR(20)'), ('is_jackpot', 'BOOLEAN')),
+				'notification_campaigns': (('sent_cursor', 'INTEGER'), ('claimed_at', 'DATETIME')),
+			}
+			for table, typed in added.items():
+				if not insp.has_table(table):
+					continue
+				cols = {c['name'] for c in insp.get_columns(table)}
+				with engine.begin() as conn:
+					for name, type_ in typed:
+						if name not in cols:
+							conn.execute(_text(f'ALTER TABLE {table} ADD COLUMN {name} {type_}'))
+	except Exception:
+		pass
 	yield
 
 
@@ -431,3 +451,13 @@ def auth_token(client):
 
 	return _get
 
+
+
+@pytest.fixture
+def assert_max_queries():
+	"""Return the query-budget context manager: ``with assert_max_queries(5): client.get(...)``.
+
+	TestClient 포털 스레드에서 실행된 쿼리까지 집계하며, 초과 시 실행 문장 목록과 함께 실패한다.
+	"""
+	from app.core.query_metrics import assert_max_queries as _assert_max_queries
+	return _assert_max_queries
@@ -0,0 +1,125 @@
+import threading
+import uuid
+from collections import Counter
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import models
+from app.database import SessionLocal
+from app.services import abtest_service
+from app.services.abtest_service import (
+    ABTestService,
+    AssignmentEngine,
+    Experiment,
+    ExperimentRegistry,
+    ExposureBuffer,
+    load_experiments,
+)
+
+
+def _engine(batch_size=1000):
+    sunk = []
+    engine = AssignmentEngine(ExperimentRegistry(), ExposureBuffer(sink=sunk.extend, batch_size=batch_size, flush_seconds=3600))
+    return engine, sunk
+
+
+def test_unregistered_key_matches_legacy_hash():
+    engine, _ = _engine()
+    legacy = ABTestService(db=None)
+    for uid in range(200):
+        assert engine.assign(uid, "homepage_cta") == ["A", "B"][legacy._stable_hash(uid, "homepage_cta") % 2]
+
+
+def test_weights_holdout_and_window():
+    engine, _ = _engine()
+    engine.registry.register(Experiment(key="w", variants=("control", "x"), weights=(9, 1), holdout_pct=20))
+    engine.registry.register(Experiment(key="old", end_at=datetime.utcnow() - timedelta(days=1)))
+    results = Counter(engine.assign(uid, "w", log_exposure=False) for uid in range(20000))
+    assert 0.18 < results[None] / 20000 < 0.22
+    assert 8 < results["control"] / results["x"] < 10.5
+    assert engine.assign(1, "old") is None
+    assert engine.assign(7, "w") == engine.assign(7, "w")
+
+    with pytest.raises(ValueError):
+        Experiment(key="bad", variants=("a", "b"), weights=(1,))
+
+
+def test_assign_all_and_batched_exposures():
+    engine, sunk = _engine(batch_size=4)
+    engine.registry.load([Experiment(key="a"), Experiment(key="b", variants=("x", "y", "z")),
+                          Experiment(key="off", active=False)])
+    first = engine.assign_all(42)
+    assert set(first) == {"a", "b"} and first == engine.assign_all(42)
+    assert sunk == [] and len(engine.exposures) == 2  # 중복 노출은 1회만 버퍼링
+
+    caller = threading.get_ident()
+    threads = []
+    done = threading.Event()
+    engine.exposures.sink = lambda rows: (threads.append(threading.get_ident()), sunk.extend(rows), done.set())
+    engine.assign_all(43)
+    # 배치 도달 → 요청 스레드가 아닌 백그라운드 flusher 가 적재
+    assert done.wait(5) and threads == [threads[0]] and threads[0] != caller
+    assert len(sunk) == 4 and len(engine.exposures) == 0
+    assert {"user_id": 42, "flag_key": "b", "variant": first["b"]} in sunk
+
+    engine.assign(44, "a")
+    assert engine.exposures.flush() == 1 and len(sunk) == 5
+
+
+def test_registry_loads_from_participants(monkeypatch):
+    engine, _ = _engine()
+    monkeypatch.setattr(abtest_service, "_engine", engine)
+    engine.registry.register(Experiment(key="configured", variants=("x", "y"), weights=(3, 1)))
+    key = f"exp_{uuid.uuid4().hex[:8]}"
+    db = SessionLocal()
+    try:
+        tag = uuid.uuid4().hex[:8]
+        user = models.User(site_id=f"ab_{tag}", nickname=f"ab_{tag}", phone_number=f"018{tag}",
+                           password_hash="x", invite_code="5858")
+        db.add(user)
+        db.commit()
+        row = ABTestService(db).assign(user.id, key, ["ctl", "t1", "t2"])
+        # 새 실험 기록 → 요청 변형 목록 그대로 즉시 반영, assign_all 에 포함
+        assert engine.registry.get(key).variants == ("ctl", "t1", "t2")
+        assert engine.assign_all(user.id, log_exposure=False)[key] == row.variant
+        assert load_experiments(db) >= 1
+        assert engine.registry.get(key).variants == ("ctl", "t1", "t2")
+        assert engine.registry.get("configured").weights == (3, 1)
+
+        # 다른 워커(빈 레지스트리): 기존 /variant 실험은 행이 한쪽 변형뿐이어도 A/B 로 적재
+        legacy_key = f"{key}_ab"
+        ABTestService(db).assign(user.id, legacy_key, ["A", "B"])
+        fresh = ExperimentRegistry()
+        load_experiments(db, fresh)
+        assert fresh.get(legacy_key).variants == ("A", "B") and fresh.get(key).origin == "db"
+    finally:
+        db.close()
+
+
+def test_restart_keeps_configured_variant_order(monkeypatch):
+    # 재시작(빈 레지스트리) 후에도 비정렬 목록 / 참가자 없는 변형이 저장 순서대로 복원 → /variant == 저장 행
+    engine, _ = _engine()
+    monkeypatch.setattr(abtest_service, "_engine", engine)
+    key = f"exp_{uuid.uuid4().hex[:8]}"
+    variants = ["zeta", "ctl", "alpha", "unused"]
+    db = SessionLocal()
+    try:
+        rows = []
+        for _ in range(6):
+            tag = uuid.uuid4().hex[:8]
+            user = models.User(site_id=f"ab_{tag}", nickname=f"ab_{tag}", phone_number=f"018{tag}",
+                               password_hash="x", invite_code="5858")
+            db.add(user)
+            db.commit()
+            rows.append(ABTestService(db).assign(user.id, key, variants))
+        assert db.get(models.ABTestExperiment, key).variants == variants
+
+        restarted, _ = _engine()
+        monkeypatch.setattr(abtest_service, "_engine", restarted)
+        load_experiments(db)
+        assert restarted.registry.get(key).variants == tuple(variants)
+        for row in rows:
+            assert restarted.assign(row.user_id, key, log_exposure=False) == row.variant
+    finally:
+        db.close()
@@ -0,0 +1,112 @@
+import json
+import uuid
+
+from sqlalchemy import update
+
+from app import models
+from app.database import SessionLocal
+from app.services import action_attributes as aa
+
+
+def _envelope(action_type, **data):
+    return json.dumps({"v": 1, "type": action_type, "ts": "2026-10-21T00:00:00Z", "data": data})
+
+
+def _user(db):
+    tag = uuid.uuid4().hex[:8]
+    u = models.User(site_id=f"aa_{tag}", nickname=f"aa_{tag}", phone_number=f"018{tag}",
+                    password_hash="x", invite_code="5858")
+    db.add(u)
+    db.commit()
+    return u.id
+
+
+def test_extract_attributes_payload_shapes():
+    slot = aa.extract_attributes("SLOT_SPIN", _envelope("SLOT_SPIN", game_type="slot", bet_amount=10,
+                                                        win_amount=0, is_jackpot=False))
+    assert slot == {"game_type": "slot", "bet": 10, "win": 0, "result": "lose", "is_jackpot": False}
+    rps = aa.extract_attributes("RPS_PLAY", _envelope("RPS_PLAY", bet_amount=5, win_amount=0, result="draw"))
+    assert rps == {"game_type": "rps", "bet": 5, "win": 0, "result": "draw"}
+    crash = aa.extract_attributes("CRASH_BET", _envelope("CRASH_BET", game_type="crash", bet_amount=7,
+                                                         win_amount=14, status="cashed"))
+    assert crash["result"] == "win" and crash["win"] == 14
+    gacha = aa.extract_attributes("GACHA_PULL", json.dumps({"game_type": "gacha", "pulls": 10, "cost": 900}))
+    assert gacha == {"game_type": "gacha", "bet": 900}
+    ctx = aa.extract_attributes("CLICK", json.dumps({"context": {"game": "SLOT", "bet": 3, "win": 9}}))
+    assert ctx["game_type"] == "slot" and ctx["result"] == "win"
+    # 멱등키 평문 / 깨진 JSON / 비게임 액션
+    assert aa.extract_attributes("REWARD_GRANT", "idem-123") == {}
+    assert aa.extract_attributes("LOGIN", "{broken") == {}
+    assert aa.extract_attributes("LOGIN", json.dumps({"ip": "1.2.3.4"})) == {}
+
+
+def test_insert_listener_backfill_and_summary():
+    aa.install_action_attribute_listeners()
+    db = SessionLocal()
+    try:
+        uid = _user(db)
+        UA = models.UserAction
+        db.add_all([
+            UA(user_id=uid, action_type="SLOT_SPIN",
+               action_data=_envelope("SLOT_SPIN", game_type="slot", bet_amount=10, win_amount=500, is_jackpot=True)),
+            UA(user_id=uid, action_type="SLOT_SPIN",
+               action_data=_envelope("SLOT_SPIN", game_type="slot", bet_amount=10, win_amount=0, is_jackpot=False)),
+            UA(user_id=uid, action_type="RPS_PLAY",
+               action_data=_envelope("RPS_PLAY", game_type="rps", bet_amount=20, win_amount=40, result="win")),
+            # 명시 지정 값은 덮어쓰지 않음
+            UA(user_id=uid, action_type="SLOT_SPIN", action_data="{}", game_type="slot", bet=1, win=0,
+               result="lose", is_jackpot=False),
+        ])
+        db.commit()
+        assert aa.count_jackpots(db, uid) == 1
+
+        stats = aa.summarize_games(db, uid)
+        assert (stats["slot"].plays, stats["slot"].wins, stats["slot"].bet_total) == (3, 1, 21)
+        assert stats["slot"].jackpots == 1 and stats["slot"].win_rate == round(1 / 3, 4)
+        assert (stats["rps"].plays, stats["rps"].win_total, stats["rps"].win_rate) == (1, 40, 1.0)
+        assert set(aa.summarize_games(db, uid, game_type="rps")) == {"rps"}
+
+        # 컬럼 도입 이전 행 시뮬레이션 → 백필
+        db.execute(update(UA.__table__).where(UA.__table__.c.user_id == uid)
+                   .values(game_type=None, bet=None, win=None, result=None, is_jackpot=None))
+        db.add(UA(user_id=uid, action_type="LOGIN", action_data=json.dumps({"ip": "x"})))
+        db.commit()
+        assert aa.count_jackpots(db, uid) == 0
+        chunks = []
+        out = aa.backfill_action_attributes(db, chunk_size=2, on_chunk=lambda s, u: chunks.append((s, u)))
+        assert out["updated"] >= 3 and chunks and chunks[-1] == (out["scanned"], out["updated"])
+        assert aa.count_jackpots(db, uid) == 1
+        assert aa.summarize_games(db, uid)["rps"].bet_total == 20
+        # 재실행: high-water 이후 행만 스캔 (추출 불가 LOGIN 행을 다시 읽지 않음)
+        again = aa.backfill_action_attributes(db)
+        assert again == {"scanned": 0, "updated": 0, "high_water": out["high_water"]}
+        assert aa.count_unfilled(db, after_id=aa.get_backfill_high_water()) == 0
+        assert aa.backfill_action_attributes(db, from_start=True)["scanned"] >= 1
+    finally:
+        db.close()
+
+
+def test_game_stats_endpoint_uses_typed_summary():
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    aa.install_action_attribute_listeners()
+    db = SessionLocal()
+    try:
+        uid = _user(db)
+        UA = models.UserAction
+        db.add_all([
+            UA(user_id=uid, action_type="SLOT_SPIN",
+               action_data=_envelope("SLOT_SPIN", game_type="slot", bet_amount=10, win_amount=50, is_jackpot=True)),
+            UA(user_id=uid, action_type="SLOT_SPIN",
+               action_data=_envelope("SLOT_SPIN", game_type="slot", bet_amount=10, win_amount=0)),
+            UA(user_id=uid, action_type="RPS_PLAY",
+               action_data=_envelope("RPS_PLAY", bet_amount=20, win_amount=0, result="lose")),
+        ])
+        db.commit()
+    finally:
+        db.close()
+
+    body = TestClient(app).get(f"/api/games/stats/{uid}").json()
+    assert (body["total_gold_won"], body["total_bet"], body["win_rate"]) == (50, 40, round(1 / 3, 4))
+    assert body["jackpots_won"] == 1 and body["total_spins"] == 2
@@ -0,0 +1,103 @@
+import time
+import uuid
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.database import SessionLocal
+from app import models
+from app.models.auth_models import InviteCode
+from app.routers import admin as admin_router
+from app.services.job_service import (
+    JobService,
+    JobStore,
+    register_job,
+    CANCELLED,
+    SUCCEEDED,
+    TERMINAL_STATES,
+)
+
+client = TestClient(app)
+
+
+def _wait(job_id: str, timeout: float = 10.0) -> dict:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        r = client.get(f"/api/admin/jobs/{job_id}")
+        assert r.status_code == 200
+        if r.json()["status"] in TERMINAL_STATES:
+            return r.json()
+        time.sleep(0.05)
+    raise AssertionError("job did not finish")
+
+
+def test_bulk_invites_endpoint_enqueues_and_reports_progress():
+    app.dependency_overrides[admin_router.require_admin_access] = lambda: None
+    try:
+        r = client.post("/api/admin/invites/bulk", json={"count": 250, "length": 8})
+        assert r.status_code == 202
+        job = _wait(r.json()["job_id"])
+        assert job["status"] == SUCCEEDED
+        assert job["done"] == job["total"] == 250
+        codes = job["result"]["codes"]
+        assert len(set(codes)) == 250
+        db = SessionLocal()
+        try:
+            assert db.query(InviteCode).filter(InviteCode.code.in_(codes)).count() == 250
+        finally:
+            db.close()
+    finally:
+        app.dependency_overrides.pop(admin_router.require_admin_access, None)
+
+
+def test_cancel_stops_job_at_chunk_boundary():
+    calls = []
+
+    @register_job("test.loop")
+    def _loop(ctx, n: int = 5):
+        ctx.set_total(n)
+        for i in range(n):
+            calls.append(i)
+            if i == 1:
+                svc.cancel(ctx.job_id)
+            ctx.advance()
+        return "done"
+
+    svc = JobService(store=JobStore())
+    job = {"id": "j-cancel", "name": "test.loop", "params": {"n": 5}, "status": "queued", "cancel_requested": False}
+    svc.store.create(job)
+    out = svc.run("j-cancel")
+    assert out["status"] == CANCELLED
+    assert out["done"] == 2
+    assert calls == [0, 1]
+
+
+def test_calculate_rfm_job_upserts_in_chunks():
+    db = SessionLocal()
+    try:
+        tag = uuid.uuid4().hex[:8]
+        users = [models.User(site_id=f"rfmjob_{tag}_{i}", nickname=f"rfmjob_{tag}_{i}", phone_number=f"010{tag}{i}",
+                             password_hash="x", invite_code="5858") for i in range(7)]
+        db.add_all(users)
+        db.commit()
+        ids = [u.id for u in users]
+        db.add_all([models.UserAction(user_id=uid, action_type="SLOT_SPIN", action_data="{}") for uid in ids])
+        db.add(models.UserSegment(user_id=ids[0], rfm_group="OLD"))
+        db.commit()
+    finally:
+        db.close()
+
+    svc = JobService(store=JobStore())
+    svc.store.create({"id": "j-rfm", "name": "segments.calculate_rfm", "params": {"days": 30, "chunk_size": 3},
+                      "status": "queued", "cancel_requested": False})
+    out = svc.run("j-rfm")
+    assert out["status"] == SUCCEEDED, out.get("error")
+    assert out["done"] == out["total"] >= 7
+
+    db = SessionLocal()
+    try:
+        segs = db.query(models.UserSegment).filter(models.UserSegment.user_id.in_(ids)).all()
+        assert len(segs) == 7
+        assert {s.rfm_group for s in segs} == {"AT_RISK"}
+    finally:
+        db.close()
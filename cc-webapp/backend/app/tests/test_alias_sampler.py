@@ -0,0 +1,81 @@
+import random
+from collections import Counter
+
+import pytest
+
+from app.core import game_math
+from app.core.logging import request_id_ctx
+from app.utils.probability import weighted_random_choice
+from app.utils.sampling import AliasTable, SamplerRegistry, request_rng
+
+# 자유도별 카이제곱 임계값 (p = 0.001)
+_CHI2_CRIT = {1: 10.83, 2: 13.82, 3: 16.27, 4: 18.47, 5: 20.52, 6: 22.46}
+
+
+def _chi_square(table: AliasTable, n: int, rng) -> float:
+    observed = Counter(table.sample(n, rng))
+    chi2 = 0.0
+    for outcome, p in table.probabilities().items():
+        expected = n * p
+        if expected > 0:
+            chi2 += (observed[outcome] - expected) ** 2 / expected
+    return chi2
+
+
+def test_slot_reel_table_matches_configured_weights():
+    weights = game_math.slot_symbol_weights(None)
+    table = AliasTable(game_math.SLOT_SYMBOLS, weights)
+    assert _chi_square(table, 200_000, random.Random(3)) < _CHI2_CRIT[len(weights) - 1]
+
+
+def test_gacha_variant_tables_match_cdf_semantics():
+    # 부스트가 커서 누적합 > 1 인 상태와 < 1 인 상태 모두 검증 (잘린 구간 / Common 잔여 구간)
+    table = game_math.GACHA_DEFAULT_RARITY_TABLE
+    for present, boost in ((frozenset(), 0.173), (frozenset({"Common", "Rare"}), 0.273)):
+        masses = game_math.gacha_rarity_masses(table, present, boost)
+        assert sum(p for _, p in masses) == pytest.approx(1.0)
+        sampler = AliasTable.from_items(masses)
+        nonzero = sum(1 for p in sampler.probabilities().values() if p > 0)
+        assert _chi_square(sampler, 100_000, random.Random(5)) < _CHI2_CRIT[nonzero - 1]
+
+
+def test_registry_compiles_once_per_version_and_variant():
+    registry = SamplerRegistry(maxsize=4)
+    a = registry.get("reels", {"x": 1, "y": 3})
+    assert registry.get("reels", {"x": 1, "y": 3}) is a
+    assert registry.get("reels", {"x": 2, "y": 3}) is not a  # 설정 변경 → 새 버전
+    builds = []
+    v1 = registry.variant("gacha", "v1", (frozenset(), 0.2), lambda: builds.append(1) or [("a", 1.0)])
+    assert registry.variant("gacha", "v1", (frozenset(), 0.2), lambda: builds.append(1) or [("a", 1.0)]) is v1
+    assert builds == [1] and registry.misses == 3 and registry.hits == 2
+    with pytest.raises(ValueError):
+        AliasTable(["a", "b"], [0, 0])
+
+
+def test_registry_evicts_least_recently_used():
+    registry = SamplerRegistry(maxsize=2)
+    a = registry.get("a", {"x": 1})
+    registry.get("b", {"x": 1})
+    assert registry.get("a", {"x": 1}) is a  # hit → 최근 사용으로 갱신
+    registry.get("c", {"x": 1})  # b 가 축출됨
+    assert registry.get("a", {"x": 1}) is a
+    misses = registry.misses
+    registry.get("b", {"x": 1})
+    assert registry.misses == misses + 1
+
+
+def test_request_rng_stream_and_weighted_choice():
+    token = request_id_ctx.set("rng-req-1")
+    try:
+        rng = request_rng()
+        assert request_rng() is rng  # 요청 내 동일 스트림
+        replay = request_rng(seed=rng.seed_value)
+        reference = random.Random(rng.seed_value)
+        assert [replay.random() for _ in range(3)] == [reference.random() for _ in range(3)]
+    finally:
+        request_id_ctx.reset(token)
+
+    items = [{"id": "a", "weight": 0}, {"id": "b", "weight": 5}]
+    random.seed(11)
+    assert {weighted_random_choice(items)["id"] for _ in range(200)} == {"b"}
+    assert weighted_random_choice([]) is None
@@ -0,0 +1,159 @@
+import uuid
+from datetime import date, datetime, timedelta
+
+from app import models
+from app.core import redis_keys
+from app.database import SessionLocal
+from app.services import attendance_service as att
+
+
+class _BitRedis:
+    """Redis 비트맵 명령(SETBIT/GETBIT/BITFIELD GET/BITCOUNT BIT/BITPOS) 의미를 bytearray 로 재현하는 fake."""
+
+    def __init__(self):
+        self.b = {}
+        self.round_trips = 0
+
+    def _buf(self, key, nbits=0):
+        buf = self.b.setdefault(key, bytearray())
+        need = (nbits + 7) // 8
+        if len(buf) < need:
+            buf.extend(b"\x00" * (need - len(buf)))
+        return buf
+
+    def _get(self, key, off):
+        buf = self.b.get(key, bytearray())
+        return (buf[off // 8] >> (7 - off % 8)) & 1 if off // 8 < len(buf) else 0
+
+    def setbit(self, key, off, val):
+        buf = self._buf(key, off + 1)
+        old = self._get(key, off)
+        if val:
+            buf[off // 8] |= 1 << (7 - off % 8)
+        self.round_trips += 1
+        return old
+
+    def getbit(self, key, off):
+        return self._get(key, off)
+
+    def execute_command(self, cmd, key, *args):
+        if cmd == "BITFIELD":
+            out = []
+            for i in range(0, len(args), 3):
+                assert args[i] == "GET" and args[i + 1].startswith("u")
+                width, off = int(args[i + 1][1:]), args[i + 2]
+                assert width <= 63 and off >= 0
+                v = 0
+                for j in range(width):
+                    v = (v << 1) | self._get(key, off + j)
+                out.append(v)
+            return out
+        if cmd == "BITCOUNT":
+            start, end, mode = args
+            assert mode == "BIT"
+            return sum(self._get(key, o) for o in range(start, end + 1))
+        if cmd == "BITPOS":
+            buf = self.b.get(key, bytearray())
+            return next((o for o in range(len(buf) * 8) if self._get(key, o)), -1)
+        raise AssertionError(cmd)
+
+    def pipeline(self, transaction=True):
+        return _Pipe(self)
+
+
+class _Pipe:
+    def __init__(self, r):
+        self.r = r
+        self.calls = []
+
+    def __getattr__(self, name):
+        def _queue(*a):
+            self.calls.append((name, a))
+            return self
+        return _queue
+
+    def execute(self):
+        self.r.round_trips += 1
+        return [getattr(self.r, name)(*a) for name, a in self.calls]
+
+
+def _fake(monkeypatch):
+    fake = _BitRedis()
+    monkeypatch.setattr(att, "_redis", lambda: fake)
+    return fake
+
+
+def test_summary_single_round_trip_streak_calendar_windows(monkeypatch):
+    fake = _fake(monkeypatch)
+    today = date(2026, 3, 2)
+    # 2/20 ~ 3/2 연속 11일 + 2/10 단발 (월 경계를 넘는 스트릭)
+    days = [today - timedelta(days=i) for i in range(11)] + [date(2026, 2, 10)]
+    assert att.record_many([(7, "DAILY_LOGIN", d) for d in days]) == len(days)
+    assert att.record(7, "DAILY_LOGIN", today) is False and att.record(7, "DAILY_LOGIN", "2026-03-05") is True
+
+    fake.round_trips = 0
+    s = att.summary(7, "DAILY_LOGIN", today)
+    assert fake.round_trips == 1 and s.backend == "redis"
+    assert s.streak == 11 and s.attended_today
+    assert s.calendar == [date(2026, 3, 1), date(2026, 3, 2), date(2026, 3, 5)]  # 이번 달 전체
+    assert s.active_days == {7: 7, 30: 12}
+    assert s.first_day == date(2026, 2, 10)
+    assert att.month(7, "DAILY_LOGIN", 2026, 2)[0] == date(2026, 2, 10)
+    assert att.days_between(7, "DAILY_LOGIN", date(2026, 3, 1), date(2026, 3, 7))[-1] == date(2026, 3, 5)
+    # 오늘 미기록: 기본은 0, grace_today 면 어제까지의 연속
+    assert att.streak(7, "DAILY_LOGIN", date(2026, 3, 3)) == 0
+    assert att.streak(7, "DAILY_LOGIN", date(2026, 3, 3), grace_today=True) == 11
+
+
+def test_streak_longer_than_one_bitfield_window(monkeypatch):
+    _fake(monkeypatch)
+    today = date(2026, 10, 19)
+    n = att.CHUNK_BITS * att.STREAK_CHUNKS + 40
+    att.record_many([(9, att.ACTIVE, today - timedelta(days=i)) for i in range(n)])
+    assert att.streak(9, att.ACTIVE, today) == n  # 378일 초과분은 추가 BITFIELD 로 이어서 계산
+    assert att.active_days_many([9, 10], att.ACTIVE, 30, today) == {9: 30, 10: 0}
+    assert att.attended_on_many([9, 10], att.ACTIVE, today - timedelta(days=n)) == {9: False, 10: False}
+
+
+def test_memory_fallback_matches_redis_semantics(monkeypatch):
+    monkeypatch.setattr(att, "_redis", lambda: None)
+    att.clear_memory()
+    today = date(2026, 1, 3)
+    for d in (date(2025, 12, 31), date(2026, 1, 1), date(2026, 1, 2), date(2026, 1, 3)):
+        att.record(5, "DAILY_LOGIN", d)
+    s = att.summary(5, "DAILY_LOGIN", today, windows=(2,))
+    assert (s.streak, s.active_days, s.first_day) == (4, {2: 2}, date(2025, 12, 31))
+    assert [d.day for d in s.calendar] == [1, 2, 3]
+    assert att.record(5, "DAILY_LOGIN", date(2019, 12, 31)) is False  # EPOCH 이전은 무시
+
+
+def test_user_action_commit_sets_active_bit_and_backfill(monkeypatch):
+    fake = _fake(monkeypatch)
+    att.install_attendance_listeners()
+    db = SessionLocal()
+    try:
+        tag = uuid.uuid4().hex[:8]
+        u = models.User(site_id=f"att_{tag}", nickname=f"att_{tag}", phone_number=f"015{tag}",
+                        password_hash="x", invite_code="5858")
+        db.add(u)
+        db.commit()
+        past = datetime(2024, 5, 1, 12)
+        db.add(models.UserAction(user_id=u.id, action_type="SLOT_SPIN", created_at=past))
+        db.commit()
+        key = redis_keys.attendance(att.ACTIVE, u.id)
+        assert fake.getbit(key, att.day_offset(past.date())) == 1
+
+        db.add(models.UserAction(user_id=u.id, action_type="SLOT_SPIN", created_at=past + timedelta(days=1)))
+        db.flush()
+        db.rollback()
+        assert fake.getbit(key, att.day_offset(past.date()) + 1) == 0
+
+        db.add(models.UserAction(user_id=u.id, action_type="DAILY_LOGIN", created_at=past - timedelta(days=1)))
+        db.commit()
+        fake.b.clear()
+        att.backfill_from_user_actions(db, since=date(2024, 4, 1), until=date(2024, 5, 31),
+                                       action_types=["DAILY_LOGIN"])
+        assert att.streak(u.id, att.ACTIVE, past.date()) == 2
+        assert att.month(u.id, "DAILY_LOGIN", 2024, 4) == [date(2024, 4, 30)]
+    finally:
+        db.close()
@@ -0,0 +1,207 @@
+import asyncio
+import json
+import uuid
+
+from app.database import SessionLocal
+from app import models
+from app.core import redis_keys
+from app.realtime import hub
+from app.schemas.chat_schemas import ChatMessageCreate
+from app.services.chat_service import ChatService
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.sets = {}
+        self.values = {}
+        self.published = []
+
+    def exists(self, key):
+        return int(key in self.sets)
+
+    def sismember(self, key, member):
+        return member in self.sets.get(key, set())
+
+    def sadd(self, key, *members):
+        self.sets.setdefault(key, set()).update(members)
+        return len(members)
+
+    def expire(self, key, seconds):
+        return True
+
+    def delete(self, *keys):
+        for key in keys:
+            self.sets.pop(key, None)
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def incr(self, key):
+        self.values[key] = str(int(self.values.get(key) or 0) + 1)
+        return int(self.values[key])
+
+    def eval(self, script, numkeys, key, epoch_key, epoch, ttl, *members):
+        # _FILL_MEMBERS_LUA 와 동일: epoch 가 조회 시점 그대로일 때만 SET 교체
+        if (self.values.get(epoch_key) or "") != epoch:
+            return 0
+        self.sets[key] = set(members)
+        return 1
+
+    def publish(self, channel, message):
+        self.published.append((channel, message))
+        return 1
+
+
+class _WS:
+    def __init__(self):
+        self.sent = []
+
+    async def send_text(self, text):
+        self.sent.append(text)
+
+
+def test_room_message_publishes_once_and_member_cache_invalidates():
+    tag = uuid.uuid4().hex[:8]
+    db = SessionLocal()
+    redis = _FakeRedis()
+    svc = ChatService(db, redis)
+    try:
+        users = [models.User(site_id=f"chat_{tag}_{i}", nickname=f"chat_{tag}_{i}", phone_number=f"011{tag}{i}",
+                             password_hash="x", invite_code="5858") for i in range(30)]
+        db.add_all(users)
+        db.commit()
+        room = models.ChatRoom(name=f"room_{tag}", created_by=users[0].id)
+        db.add(room)
+        db.commit()
+        sockets = [_WS() for _ in range(30)]
+        channel = redis_keys.chat_room_channel(room.id)
+
+        async def _run():
+            for u in users:
+                assert await svc.join_chat_room(u.id, room.id)
+            for ws in sockets:
+                await hub.subscribe(channel, ws)
+            try:
+                msg = await svc.send_message(users[0].id, room.id, ChatMessageCreate(room_id=room.id, content="최고 좋아요!"))
+            finally:
+                for ws in sockets:
+                    await hub.unsubscribe(channel, ws)
+            cached = set(redis.sets[redis_keys.chat_room_members(room.id)])
+            assert await svc.leave_chat_room(users[1].id, room.id)
+            member_after_leave = await svc.is_room_member(room.id, users[1].id)
+            return msg, cached, member_after_leave
+
+        msg, cached, member_after_leave = asyncio.run(_run())
+
+        # 참가자 수와 무관하게 방 채널 publish 1회
+        assert len(redis.published) == 1
+        assert redis.published[0][0] == channel
+        assert json.loads(redis.published[0][1])["message_id"] == msg.id
+        assert all(len(ws.sent) == 1 for ws in sockets)
+        # 메시지와 감정 메타데이터가 함께 기록됨
+        db.expire_all()
+        stored = db.get(models.ChatMessage, msg.id)
+        assert stored.emotion_detected is not None and stored.sentiment_score is not None
+        # 참가자 SET 캐시 적재 → 퇴장 시 무효화 후 재적재
+        assert cached == {"0", *(str(u.id) for u in users)}
+        assert member_after_leave is False
+    finally:
+        db.close()
+
+
+def test_participant_commit_outside_service_invalidates_member_cache():
+    from app.services import chat_service
+    from app.utils.redis import get_redis_manager, init_redis_manager
+
+    tag = uuid.uuid4().hex[:8]
+    redis = _FakeRedis()
+    previous = get_redis_manager().redis_client
+    init_redis_manager(redis)
+    chat_service.install_chat_member_listeners()
+    db = SessionLocal()
+    try:
+        users = [models.User(site_id=f"chatl_{tag}_{i}", nickname=f"chatl_{tag}_{i}", phone_number=f"018{tag}{i}",
+                             password_hash="x", invite_code="5858") for i in range(2)]
+        db.add_all(users)
+        db.commit()
+        room = models.ChatRoom(name=f"room_{tag}", created_by=users[0].id)
+        db.add(room)
+        db.commit()
+        svc = ChatService(db, redis)
+        assert asyncio.run(svc.join_chat_room(users[0].id, room.id))
+        assert asyncio.run(svc.is_room_member(room.id, users[1].id)) is False  # 캐시 적재
+        # 서비스를 거치지 않는 참가 (chat_router 경로) → commit 시 캐시 삭제
+        db.add(models.ChatParticipant(room_id=room.id, user_id=users[1].id, is_active=True))
+        db.commit()
+        assert redis_keys.chat_room_members(room.id) not in redis.sets
+        assert asyncio.run(svc.is_room_member(room.id, users[1].id)) is True
+    finally:
+        db.close()
+        init_redis_manager(previous)
+
+
+def test_member_cache_fill_skipped_when_invalidated_during_load():
+    from app.services.chat_service import invalidate_room_members
+    from app.utils.redis import get_redis_manager, init_redis_manager
+
+    tag = uuid.uuid4().hex[:8]
+    redis = _FakeRedis()
+    previous = get_redis_manager().redis_client
+    init_redis_manager(redis)
+    db = SessionLocal()
+    svc = ChatService(db, redis)
+    try:
+        users = [models.User(site_id=f"chatr_{tag}_{i}", nickname=f"chatr_{tag}_{i}", phone_number=f"017{tag}{i}",
+                             password_hash="x", invite_code="5858") for i in range(2)]
+        db.add_all(users)
+        db.commit()
+        room = models.ChatRoom(name=f"room_{tag}", created_by=users[0].id)
+        db.add(room)
+        db.commit()
+        assert asyncio.run(svc.join_chat_room(users[0].id, room.id))
+        key = redis_keys.chat_room_members(room.id)
+
+        load = svc._load_room_members
+
+        def _stale_load(room_id):
+            members = load(room_id)  # 참가 commit 이전 스냅샷
+            db.add(models.ChatParticipant(room_id=room.id, user_id=users[1].id, is_active=True))
+            db.commit()
+            invalidate_room_members([room.id])  # 다른 요청의 commit 리스너
+            return members
+
+        svc._load_room_members = _stale_load
+        # 조회 중 무효화 → 오래된 집합으로 채우지 않음, 다음 조회가 DB 재적재
+        assert asyncio.run(svc.is_room_member(room.id, users[1].id)) is False
+        assert key not in redis.sets
+        svc._load_room_members = load
+        assert asyncio.run(svc.is_room_member(room.id, users[1].id)) is True
+        assert str(users[1].id) in redis.sets[key]
+    finally:
+        db.close()
+        init_redis_manager(previous)
+
+
+def test_relay_delivers_other_worker_messages_once():
+    from app.realtime.hub import RealtimeHub
+    from app.realtime.relay import INSTANCE_ID, TopicRelay
+
+    local_hub = RealtimeHub()
+    relay = TopicRelay(redis_keys.chat_room_channel_pattern(), hub=local_hub)
+    channel = redis_keys.chat_room_channel(7)
+    ws = _WS()
+
+    async def _run():
+        relay._loop = asyncio.get_running_loop()
+        await local_hub.subscribe(channel, ws)
+        results = [
+            relay.dispatch(channel, json.dumps({"message_id": 1, "origin": "other-worker"}).encode()),
+            relay.dispatch(channel, json.dumps({"message_id": 2, "origin": INSTANCE_ID})),  # 자기 발행분
+            relay.dispatch(redis_keys.chat_room_channel(8), json.dumps({"message_id": 3})),  # 로컬 구독자 없음
+            relay.dispatch(channel, b"not json"),
+        ]
+        await asyncio.sleep(0.01)
+        return results
+
+    assert asyncio.run(_run()) == [True, False, False, False]
+    assert [json.loads(t) for t in ws.sent] == [{"message_id": 1}]
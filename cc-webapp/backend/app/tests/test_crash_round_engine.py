@@ -0,0 +1,173 @@
+import asyncio
+import uuid
+
+import pytest
+
+from app.database import SessionLocal
+from app import models
+from app.models.game_stats_models import UserGameStats
+from app.realtime.hub import RealtimeHub
+from app.services.crash_round_engine import (
+    CrashInsufficientFunds,
+    CrashRoundEngine,
+    CrashRoundError,
+    crash_point_from_uniform,
+    CRASHED,
+    VOIDED,
+)
+
+
+class _WS:
+    def __init__(self):
+        self.sent = []
+
+    async def send_text(self, text):
+        self.sent.append(text)
+
+
+def _users(n):
+    tag = uuid.uuid4().hex[:8]
+    db = SessionLocal()
+    try:
+        users = [models.User(site_id=f"crash_{tag}_{i}", nickname=f"crash_{tag}_{i}", phone_number=f"010{tag}{i}",
+                             password_hash="x", invite_code="5858", gold_balance=10_000) for i in range(n)]
+        db.add_all(users)
+        db.commit()
+        return [u.id for u in users]
+    finally:
+        db.close()
+
+
+def test_crash_point_distribution_bounds():
+    assert crash_point_from_uniform(0.0) == 1.01
+    assert crash_point_from_uniform(0.9999) == 47.42
+
+
+def test_round_streams_ticks_once_and_settles_in_bulk():
+    hub = RealtimeHub()
+    # crash_point_from_uniform(0.5) == 1.99
+    engine = CrashRoundEngine(0, betting_seconds=0, tick_ms=1, growth_per_sec=50.0, cooldown_seconds=0,
+                              publisher=hub, rng=lambda: 0.5)
+    subscribers = [_WS() for _ in range(50)]
+
+    ids = _users(4)
+
+    async def _run():
+        for ws in subscribers:
+            await hub.subscribe(engine.topic, ws)
+        rnd = engine.new_round()
+        engine.place_bet(ids[0], 1000, 1.5)   # 자동 캐시아웃 성공
+        engine.place_bet(ids[1], 1000, 1.99)  # 크래시 배수와 동일 → 성공
+        engine.place_bet(ids[2], 1000, 3.0)   # 실패
+        engine.place_bet(ids[3], 1000)        # 캐시아웃 없음 → 실패
+        with pytest.raises(CrashRoundError):
+            engine.place_bet(ids[0], 10)
+        return await engine.run_round(rnd)
+
+    summary = asyncio.run(_run())
+    assert engine.current.phase == CRASHED and engine.current.crash_point == 1.99
+    assert summary == {"round_id": engine.current.round_id, "bets": 4, "winners": 2,
+                       "total_bet": 4000, "total_payout": 1500 + 1990}
+    # 모든 구독자가 동일한 스트림 수신 (라운드 시작 + 틱 + 결과)
+    counts = {len(ws.sent) for ws in subscribers}
+    assert len(counts) == 1 and counts.pop() >= 3
+
+    db = SessionLocal()
+    try:
+        balances = {u.id: u.gold_balance for u in db.query(models.User).filter(models.User.id.in_(ids))}
+        assert balances == {ids[0]: 10_500, ids[1]: 10_990, ids[2]: 9_000, ids[3]: 9_000}
+        actions = db.query(models.UserAction).filter(models.UserAction.user_id.in_(ids),
+                                                     models.UserAction.action_type == "CRASH_BET").count()
+        assert actions == 4
+        stats = {s.user_id: s for s in db.query(UserGameStats).filter(UserGameStats.user_id.in_(ids))}
+        assert stats[ids[0]].total_wins == 1 and stats[ids[2]].total_losses == 1
+        assert int(stats[ids[1]].total_profit) == 990
+    finally:
+        db.close()
+
+
+def test_bet_debits_stake_up_front_and_rejects_overdraw():
+    engine = CrashRoundEngine(0, betting_seconds=0, publisher=RealtimeHub(), rng=lambda: 0.0)
+    other = CrashRoundEngine(1, betting_seconds=0, publisher=RealtimeHub(), rng=lambda: 0.0)
+    (uid,) = _users(1)
+    engine.new_round()
+    other.new_round()
+    engine.place_bet(uid, 6_000)
+    # 잔액 4,000: 다른 샤드 라운드에 잔액 초과 베팅 불가 (무료 베팅 방지)
+    with pytest.raises(CrashInsufficientFunds):
+        other.place_bet(uid, 6_000)
+    assert uid not in other.current.book
+
+    # 크래시 1.01 → 캐시아웃 없는 베팅은 지급 없음, clamp 없이 차감분 그대로 유지
+    engine.advance(engine.current, 10.0)
+    assert engine.settle(engine.current)["total_payout"] == 0
+    db = SessionLocal()
+    try:
+        assert db.get(models.User, uid).gold_balance == 4_000
+    finally:
+        db.close()
+
+
+def test_bulk_balance_changes_patch_realtime_snapshot(monkeypatch):
+    from app.realtime import snapshot as snap
+
+    monkeypatch.setattr(snap.SyncSnapshotCache, "_redis", property(lambda self: None))
+    snap.sync_snapshots.clear_memory()
+    engine = CrashRoundEngine(0, betting_seconds=0, publisher=RealtimeHub(), rng=lambda: 0.5)
+    (uid,) = _users(1)
+    db = SessionLocal()
+    try:
+        assert snap.sync_snapshots.get(uid, db).sections["profile"]["gold_balance"] == 10_000
+        engine.new_round()
+        engine.place_bet(uid, 1000, 1.5)
+        state = snap.sync_snapshots.get(uid, db)
+        assert state.sections["profile"]["gold_balance"] == 9_000
+        engine.advance(engine.current, 10.0)
+        engine.settle(engine.current)
+        after = snap.sync_snapshots.get(uid, db)
+        assert after.sections["profile"]["gold_balance"] == 10_500
+        assert after.delta(state.version) == {"profile": {"gold_balance": 10_500}}
+    finally:
+        db.close()
+        snap.sync_snapshots.clear_memory()
+
+
+def test_stop_refunds_open_round_stakes():
+    engine = CrashRoundEngine(0, betting_seconds=60, publisher=RealtimeHub(), rng=lambda: 0.5)
+    (uid,) = _users(1)
+
+    async def _run():
+        engine.start()
+        await asyncio.sleep(0)  # run_forever → new_round → betting 대기
+        engine.place_bet(uid, 2_500, 1.5)
+        await engine.stop()
+
+    asyncio.run(_run())
+    assert engine.current.phase == VOIDED
+    with pytest.raises(CrashRoundError):
+        engine.place_bet(uid, 10)
+    db = SessionLocal()
+    try:
+        assert db.get(models.User, uid).gold_balance == 10_000
+    finally:
+        db.close()
+
+
+def test_slow_subscriber_is_dropped_without_stalling_publish():
+    class _SlowWS(_WS):
+        async def send_text(self, text):
+            await asyncio.sleep(10)
+
+    hub = RealtimeHub()
+    hub._send_timeout = 0.05
+    fast, slow = _WS(), _SlowWS()
+
+    async def _run():
+        await hub.subscribe("crash:0", fast)
+        await hub.subscribe("crash:0", slow)
+        started = asyncio.get_running_loop().time()
+        await hub.publish("crash:0", {"type": "crash_tick", "m": 1.01})
+        return asyncio.get_running_loop().time() - started
+
+    assert asyncio.run(_run()) < 1.0
+    assert fast.sent and hub.topic_size("crash:0") == 1
@@ -0,0 +1,90 @@
+from datetime import datetime
+
+import pytest
+
+from app.services import daily_quota_service as dq
+from app.services.daily_quota_service import DailyQuotaService, QuotaExceeded
+
+
+class _ScriptRedis:
+    """consume 스크립트 계약(GET → seed SET NX → 한도 비교 → INCRBY)만 흉내내는 최소 fake."""
+
+    def __init__(self):
+        self.store = {}
+        self.expire_at = {}
+        self.evals = 0
+
+    def script_load(self, script):
+        return "sha"
+
+    def evalsha(self, sha, numkeys, key, limit, amount, seed, expire_at):
+        self.evals += 1
+        cur = self.store.get(key)
+        if cur is None:
+            if int(seed) < 0:
+                return [-1, 0]
+            self.store[key] = int(seed)
+            self.expire_at[key] = int(expire_at)
+            cur = self.store[key]
+        if cur + int(amount) > int(limit):
+            return [0, cur]
+        self.store[key] = cur + int(amount)
+        return [1, self.store[key]]
+
+    def get(self, key):
+        v = self.store.get(key)
+        return None if v is None else str(v).encode()
+
+    def exists(self, key):
+        return key in self.store
+
+    def decrby(self, key, amount):
+        self.store[key] -= int(amount)
+        return self.store[key]
+
+
+@pytest.fixture
+def svc(monkeypatch):
+    fake = _ScriptRedis()
+    s = DailyQuotaService()
+    monkeypatch.setattr(DailyQuotaService, "_redis", property(lambda self: fake))
+    return s, fake
+
+
+def test_cold_key_seeds_from_db_once_then_single_op(svc):
+    s, fake = svc
+    seeds = []
+    now = datetime(2025, 1, 1, 15, 0)
+
+    def seed():
+        seeds.append(1)
+        return 1
+
+    s.consume(7, "gacha", 3, seed, now=now)
+    assert seeds == [1] and fake.evals == 2  # 콜드 키: probe + seed
+    st = s.consume(7, "gacha", 3, seed, now=now)
+    assert seeds == [1] and fake.evals == 3  # 이후 1회
+    assert st.used == 3 and st.remaining == 0
+    with pytest.raises(QuotaExceeded):
+        s.consume(7, "gacha", 3, seed, now=now)
+    key = "quota:daily:gacha:20250101:7"
+    assert fake.expire_at[key] == int((datetime(2025, 1, 2) - datetime(1970, 1, 1)).total_seconds())
+
+
+def test_refund_and_status(svc):
+    s, _ = svc
+    now = datetime(2025, 1, 1, 1, 0)
+    s.consume(8, "gacha", 5, lambda: 0, now=now)
+    s.consume(8, "gacha", 5, lambda: 0, now=now)
+    s.refund(8, "gacha", now=now)
+    st = s.status(8, "gacha", 5, lambda: 99, now=now)
+    assert st.used == 1 and st.remaining == 4
+    assert st.to_dict()["resets_at"] == "2025-01-02T00:00:00Z"
+
+
+def test_without_redis_falls_back_to_db_count(monkeypatch):
+    monkeypatch.setattr(DailyQuotaService, "_redis", property(lambda self: None))
+    s = dq.DailyQuotaService()
+    assert s.consume(1, "gacha", 3, lambda: 2).used == 3
+    with pytest.raises(QuotaExceeded):
+        s.consume(1, "gacha", 3, lambda: 3)
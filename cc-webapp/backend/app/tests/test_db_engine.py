@@ -0,0 +1,93 @@
+import threading
+import time
+
+import pytest
+from sqlalchemy import exc, text
+from sqlalchemy.pool import NullPool
+
+from app.core import db_engine
+
+
+def test_pgbouncer_mode_uses_null_pool_without_statement_cache():
+    pool = db_engine.PoolSettings(mode="pgbouncer")
+    kw = db_engine.engine_kwargs("postgresql+asyncpg://u:p@bouncer:6432/db", pool)
+    assert issubclass(kw["poolclass"], NullPool) and "pool_size" not in kw
+    assert kw["connect_args"] == {"statement_cache_size": 0, "prepared_statement_cache_size": 0}
+    assert db_engine.engine_kwargs("postgresql+psycopg://u:p@b/db", pool)["connect_args"] == {"prepare_threshold": None}
+
+    queue = db_engine.engine_kwargs("postgresql://u:p@db/db", db_engine.PoolSettings(pool_size=7, pool_timeout=2))
+    assert (queue["pool_size"], queue["pool_timeout"], queue["pool_pre_ping"]) == (7, 2, True)
+
+
+def test_pool_settings_from_env(monkeypatch):
+    monkeypatch.setenv("DB_POOL_MODE", "PgBouncer")
+    monkeypatch.setenv("DB_POOL_SIZE", "20")
+    monkeypatch.setenv("DB_POOL_PRE_PING", "false")
+    s = db_engine.PoolSettings.from_env()
+    assert (s.mode, s.pool_size, s.pool_pre_ping) == ("pgbouncer", 20, False)
+    monkeypatch.setenv("DB_POOL_MODE", "bogus")
+    assert db_engine.PoolSettings.from_env().mode == "queue"
+
+
+def test_saturated_pool_times_out_fast_and_records_metrics(tmp_path):
+    """pool_size 2 + overflow 1 에 6개 동시 체크아웃: 3개 성공, 나머지는 pool_timeout 후 TimeoutError."""
+    eng = db_engine.create_db_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}", name="stress",
+        pool=db_engine.PoolSettings(pool_size=2, max_overflow=1, pool_timeout=0.2),
+    )
+    hold = threading.Event()
+    acquired, timed_out = [], []
+    lock = threading.Lock()
+
+    def worker():
+        try:
+            with eng.connect() as conn:
+                conn.execute(text("SELECT 1"))
+                with lock:
+                    acquired.append(1)
+                hold.wait(5)
+        except exc.TimeoutError:
+            with lock:
+                timed_out.append(1)
+
+    threads = [threading.Thread(target=worker) for _ in range(6)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    deadline = time.perf_counter() + 5
+    while len(acquired) + len(timed_out) < 6 and time.perf_counter() < deadline:
+        time.sleep(0.01)
+    assert (len(acquired), len(timed_out)) == (3, 3)
+    assert time.perf_counter() - start < 2  # 무한 대기(행) 대신 빠른 실패
+
+    status = db_engine.pool_status(eng)
+    assert status["checkedout"] == 3 and status["overflow"] == 1 and status["peak_checked_out"] == 3
+    hold.set()
+    for t in threads:
+        t.join()
+
+    status = db_engine.pool_status(eng)
+    assert status["checkedout"] == 0 and status["timeouts"] == 3 and status["checkouts"] == 3
+    assert status["wait_max_ms"] >= 200  # 타임아웃 대기 시간 반영
+    with eng.connect():
+        pass  # 포화 해소 후 정상 체크아웃
+    eng.dispose()
+
+
+def test_connect_with_retry_backs_off_then_raises(monkeypatch):
+    class _Eng:
+        calls = 0
+        disposed = 0
+
+        def connect(self):
+            _Eng.calls += 1
+            raise exc.OperationalError("SELECT 1", {}, Exception("down"))
+
+        def dispose(self):
+            _Eng.disposed += 1
+
+    sleeps = []
+    monkeypatch.setattr(db_engine.time, "sleep", sleeps.append)
+    with pytest.raises(exc.OperationalError):
+        db_engine.connect_with_retry(_Eng(), attempts=5, delay=1.0, max_delay=3.0)
+    assert _Eng.calls == 5 and _Eng.disposed == 4 and sleeps == [1.0, 2.0, 3.0, 3.0]
@@ -0,0 +1,150 @@
+import pytest
+
+from app.core import redis_keys
+from app.services.fraud.fraud_service import Decision, FraudService
+from app.services.fraud.velocity import CompiledRuleSet, MemoryWindowStore, VelocityEngine, VelocityRule
+
+RULES = [
+    {"name": "user_5m", "kind": "count", "scope": "user", "window": 300, "threshold": 3},
+    {"name": "user_1m", "kind": "count", "scope": "user", "window": 60, "threshold": 2},
+    {"name": "amount_user_1h", "kind": "sum", "scope": "user", "window": 3600, "threshold": 1000},
+    {"name": "cards_device", "kind": "distinct", "scope": "device", "field": "card", "window": 600,
+     "threshold": 2, "decision": "HARD_BLOCK"},
+]
+
+
+class _ScriptRedis:
+    """EVALSHA 인자 계약만 검증하고 평가는 같은 의미의 MemoryWindowStore 에 위임하는 fake."""
+
+    def __init__(self, compiled: CompiledRuleSet):
+        self.compiled = compiled
+        self.store = MemoryWindowStore()
+        self.loads = 0
+        self.evals = []
+        self.flush_scripts = False
+
+    def script_load(self, script):
+        assert script == self.compiled.script
+        self.loads += 1
+        return f"sha{self.loads}"
+
+    def evalsha(self, sha, numkeys, *args):
+        if self.flush_scripts:
+            self.flush_scripts = False
+            raise Exception("NOSCRIPT No matching script")
+        keys, argv = list(args[:numkeys]), list(args[numkeys:])
+        self.evals.append((sha, keys, argv))
+        now_ms, member, values = int(argv[0]), argv[1], argv[2:]
+        out = []
+        for v, us in self.store.apply(self.compiled, keys, values, now_ms, member):
+            out += [str(int(v)) if v == int(v) else str(v), str(int(us))]
+        return out
+
+
+def _engine(**kw):
+    return VelocityEngine("test", RULES, **kw)
+
+
+def test_compiled_layout_shares_event_store_across_windows():
+    compiled = _engine().compiled
+    # user count(5m/1m) + sum 은 이벤트 ZSET 1개를 공유, distinct 는 별도 저장소
+    assert compiled.stores == (("user", None), ("device", "card"))
+    assert compiled.max_window_ms == (3_600_000, 600_000)
+    assert compiled.script.count("ZADD") == 2 and compiled.script.count("PEXPIRE") == 2
+    keys, values = compiled.keys_and_values({"user": 7, "device": "D1", "card": "tok"})
+    assert keys == [redis_keys.fraud_req_ts(7), redis_keys.fraud_distinct("device", "card", "D1")]
+    assert values == ["1", "tok"]
+    with pytest.raises(ValueError):
+        VelocityRule("bad", "distinct", "user", 60, 1)
+
+
+def test_memory_sliding_window_expires_old_events():
+    eng = _engine(memory_fallback=True)
+    t0 = 1_700_000_000.0
+    for i in range(3):
+        res = eng.check({"user": 1}, 10, now=t0 + i)
+    assert res.backend == "memory"
+    assert res.values()["user_1m"] == 3 and res.decision == Decision.SOFT_BLOCK
+    assert [o.rule.name for o in res.hits] == ["user_1m"]
+    # 1분 경과 → 1분 윈도 해소, 5분 윈도는 누적
+    res = eng.check({"user": 1}, 10, now=t0 + 61)
+    assert res.values()["user_1m"] == 2
+    assert res.values()["user_5m"] == 4 and res.values()["amount_user_1h"] == 40
+    assert [o.rule.name for o in res.hits] == ["user_5m"]
+    stats = eng.stats()
+    assert stats["user_1m"]["evaluations"] == 4 and stats["user_1m"]["hits"] == 1
+
+
+def test_distinct_cards_per_device_hard_block_and_missing_scope_skipped():
+    eng = _engine(memory_fallback=True)
+    now = 1_700_000_000.0
+    for uid, tok in ((2, "a"), (3, "b"), (4, "a")):
+        res = eng.check({"user": uid, "device": "dev", "card": tok}, now=now)
+    assert res.values()["cards_device"] == 2 and res.decision == Decision.ALLOW
+    res = eng.check({"user": 5, "device": "dev", "card": "c"}, now=now)
+    assert res.decision == Decision.HARD_BLOCK
+    # device 식별자 없음 → 해당 룰 미평가
+    res = eng.check({"user": 6, "card": "z"}, now=now)
+    assert "cards_device" not in res.values()
+
+
+def test_redis_path_single_evalsha_per_check_and_noscript_reload(monkeypatch):
+    eng = _engine()
+    fake = _ScriptRedis(eng.compiled)
+    monkeypatch.setattr(VelocityEngine, "_redis", property(lambda self: fake))
+    for _ in range(2):
+        res = eng.check({"user": 9, "device": "d", "card": "t"}, 600)
+    assert res.backend == "redis" and len(fake.evals) == 2 and fake.loads == 1
+    assert res.values()["amount_user_1h"] == 1200 and res.decision == Decision.SOFT_BLOCK
+    fake.flush_scripts = True
+    eng.check({"user": 9}, 0)
+    assert fake.loads == 2 and len(fake.evals) == 3
+
+
+def test_no_backend_allows_without_evaluation():
+    res = _engine(memory_fallback=False).check({"user": 1}, 10)
+    assert res.backend == "none" and res.outcomes == [] and res.decision == Decision.ALLOW
+
+
+def test_fraud_service_check_purchase_and_record_attempt():
+    svc = FraudService(RULES, memory_fallback=True)
+    for _ in range(3):
+        r = svc.check_purchase(11, amount=100, ip="10.0.0.1", card_token="tok")
+    assert r.decision == Decision.SOFT_BLOCK and r.reason == "user_1m"
+    assert r.scores["user_5m"] == 3 and r.meta["velocity_backend"] == "memory"
+    a = svc.record_attempt(11, "spin")
+    assert a.decision == Decision.ALLOW and a.scores == {"rate_1m": 1.0}
+
+
+def test_idempotent_limited_buy_retry_does_not_record_velocity(monkeypatch):
+    import uuid
+    from types import SimpleNamespace
+
+    from fastapi.testclient import TestClient
+
+    from app import models
+    from app.database import SessionLocal
+    from app.main import app
+    from app.routers import shop as shop_router
+
+    db = SessionLocal()
+    try:
+        tag = uuid.uuid4().hex[:8]
+        user = models.User(site_id=f"fv_{tag}", nickname=f"fv_{tag}", phone_number=f"017{tag}",
+                           password_hash="x", invite_code="5858")
+        db.add(user)
+        db.commit()
+        uid = user.id
+    finally:
+        db.close()
+
+    done = {f"shop:limited:idemp:{uid}:WEEKEND_STARTER:retry-1"}
+    fake = SimpleNamespace(exists=lambda key: key in done)
+    monkeypatch.setattr(shop_router, "get_redis_manager", lambda: SimpleNamespace(redis_client=fake))
+    checks = []
+    monkeypatch.setattr(shop_router, "get_fraud_service",
+                        lambda: SimpleNamespace(check_purchase=lambda *a, **kw: checks.append(a)))
+    resp = TestClient(app).post("/api/shop/limited/buy", json={
+        "user_id": uid, "code": "WEEKEND_STARTER", "quantity": 1, "idempotency_key": "retry-1"})
+    assert resp.status_code == 200 and resp.json()["message"] == "중복 요청 처리됨"
+    assert checks == []  # 이미 처리된 구매의 재시도는 속도 윈도에 기록되지 않음
@@ -0,0 +1,131 @@
+import asyncio
+import json
+import random
+import uuid
+from collections import Counter
+from unittest.mock import MagicMock
+
+from app.database import SessionLocal
+from app import models
+from app.repositories.game_repository import GameRepository
+from app.services.gacha_service import GachaService
+
+
+def _reference_draws(svc: GachaService, pulls: int, current_count: int, history: list):
+    """기존 per-draw 루프(테이블 재구성) 참조 구현 — 엔진 결과 동일성 비교용."""
+    results = []
+    for _ in range(pulls):
+        current_count += 1
+        pity = current_count >= 90
+        rnd = random.random()
+        cumulative, rarity = 0.0, "Common"
+        boost = svc._calculate_near_miss_probability(0, current_count)
+        for name, prob in svc.rarity_table:
+            adj = prob * 0.8 if history and name in history else prob
+            if "Near_Miss" in name:
+                adj = boost / 2
+            cumulative += adj
+            if rnd <= cumulative:
+                rarity = name
+                break
+        if pity and rarity not in {"Epic", "Legendary"}:
+            rarity, current_count = "Epic", 0
+        if rarity == "Near_Miss_Epic":
+            results.append("Rare_near_miss_epic")
+            rarity = "Rare"
+        elif rarity == "Near_Miss_Legendary":
+            results.append("Epic_near_miss_legendary")
+            rarity = "Epic"
+        else:
+            results.append(rarity)
+        history = ([rarity] + history)[:10]
+    return results, current_count, history
+
+
+def test_resolve_draws_matches_per_draw_loop():
+    """alias 추첨은 u → 등급 매핑이 달라 시퀀스 대신 결과 분포 동질성(카이제곱)으로 비교."""
+    svc = GachaService(repository=MagicMock(spec=GameRepository), token_service=MagicMock(), db=MagicMock())
+    svc.reward_pool = {}
+    random.seed(7)
+    expected = Counter(_reference_draws(svc, 20000, 40, ["Rare", "Common"])[0])
+    random.seed(7)
+    draw = svc._resolve_draws(0, 20000, 40, ["Rare", "Common"])
+    actual = Counter(draw.results)
+    assert set(actual) <= set(expected) | {"Legendary"}
+    chi2 = 0.0
+    for key in set(expected) | set(actual):
+        total = expected[key] + actual[key]
+        chi2 += (expected[key] - total / 2) ** 2 / (total / 2) + (actual[key] - total / 2) ** 2 / (total / 2)
+    assert chi2 < 20.5  # df=5, p=0.001
+    assert len(draw.history) == 10
+
+
+def test_pull_batch_single_charge_and_single_action_row():
+    db = SessionLocal()
+    try:
+        tag = uuid.uuid4().hex[:8]
+        user = models.User(site_id=f"gacha_batch_{tag}", nickname=f"gacha_batch_{tag}", phone_number=f"017{tag}",
+                           password_hash="x", invite_code="5858", gold_balance=200_000)
+        db.add(user)
+        db.commit()
+        uid = user.id
+
+        repo = MagicMock(spec=GameRepository)
+        repo.get_gacha_count.return_value = 89  # 다음 draw 에서 피티 발동
+        repo.get_gacha_history.return_value = []
+        repo.count_daily_actions.return_value = 0
+        svc = GachaService(repository=repo, token_service=MagicMock(), db=db, legacy_cost_mode=False)
+
+        res = svc.pull_batch(uid, 20, db)
+        assert len(res.results) == 20
+        assert res.results[0].split("_")[0] in {"Epic", "Legendary"}
+        assert res.tokens_change == -2 * GachaService.NEW_COST_TEN
+        db.expire_all()
+        assert db.get(models.User, uid).gold_balance == 200_000 - 2 * GachaService.NEW_COST_TEN
+        rows = db.query(models.UserAction).filter_by(user_id=uid, action_type="GACHA_PULL").all()
+        assert len(rows) == 1
+        assert json.loads(rows[0].action_data)["quota_units"] == 2
+        repo.set_gacha_count.assert_called_once()
+        repo.set_gacha_history.assert_called_once()
+    finally:
+        db.close()
+
+
+def test_daily_seed_counts_quota_units_and_batch_broadcasts_balance(monkeypatch):
+    from app.realtime import hub
+
+    sent = []
+
+    async def _capture(event):
+        sent.append(event)
+
+    monkeypatch.setattr(hub, "broadcast", _capture)
+    db = SessionLocal()
+    try:
+        tag = uuid.uuid4().hex[:8]
+        user = models.User(site_id=f"gacha_seed_{tag}", nickname=f"gacha_seed_{tag}", phone_number=f"016{tag}",
+                           password_hash="x", invite_code="5858", gold_balance=200_000)
+        db.add(user)
+        db.commit()
+        uid = user.id
+        # 단일 pull 경로(quota_units 없음 = 1단위) 1행
+        db.add(models.UserAction(user_id=uid, action_type="GACHA_PULL", action_data=json.dumps({"pulls": 1})))
+        db.commit()
+
+        repo = GameRepository()
+        repo.get_gacha_count = lambda _uid: 0
+        repo.get_gacha_history = lambda _uid: []
+        repo.set_gacha_count = repo.set_gacha_history = lambda *_: None
+        svc = GachaService(repository=repo, token_service=MagicMock(), db=db, legacy_cost_mode=False)
+
+        async def _pull():
+            res = svc.pull_batch(uid, 11, db)
+            await asyncio.sleep(0)
+            return res
+
+        res = asyncio.run(_pull())
+        assert repo.count_daily_actions(db, uid, "GACHA_PULL") == 2  # 행 수
+        assert svc._count_daily_pulls(db, uid) == 3  # 1 + quota_units(10연 1 + 단일 1)
+        assert sent and sent[-1]["type"] == "balance_update" and sent[-1]["balance"] == res.balance
+    finally:
+        db.close()
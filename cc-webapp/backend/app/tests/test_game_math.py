@@ -0,0 +1,42 @@
+import random
+
+from app.core import game_math
+from app.services.crash_round_engine import crash_point_from_uniform
+from app.services.gacha_service import GachaService
+
+
+def test_slot_rules():
+    bet = 100
+    assert game_math.slot_base_win(['7️⃣', '7️⃣', '7️⃣'], bet) == 5000
+    assert game_math.slot_base_win(['🍒', '🍒', '🍋'], bet) == 150
+    assert game_math.slot_base_win(['🍒', '🍋', '🍒'], bet) == 0
+    assert game_math.slot_final_win(0, 30, 1.05) == 0
+    assert game_math.slot_final_win(150, 30, 1.0) == 180  # 스트릭 보너스 최대 +20%
+    assert game_math.slot_symbol_weights({'🍒': 9}) == [9, 1, 1, 1, 1, 1]
+    assert game_math.slot_is_jackpot(['7️⃣'] * 3) and not game_math.slot_is_jackpot(['💎'] * 3)
+
+
+def test_crash_rules_shared_with_round_engine():
+    assert crash_point_from_uniform is game_math.crash_point_from_uniform
+    u = game_math.crash_uniform_from_seed("1:1700000000000:abc")
+    assert 0.0 <= u < 1.0 and u * game_math.CRASH_UNIFORM_GRID == int(u * game_math.CRASH_UNIFORM_GRID)
+    assert game_math.crash_auto_cashout_win(100, 2.0, 2.5) == (100, "auto_cashed")
+    assert game_math.crash_auto_cashout_win(100, 2.0, 1.5) == (0, "crashed")
+    assert game_math.crash_auto_cashout_win(100, None, 50.0) == (0, "crashed")
+
+
+def test_gacha_service_uses_shared_rules():
+    svc = GachaService()
+    svc.rarity_table = list(game_math.GACHA_DEFAULT_RARITY_TABLE)
+    svc.reward_pool = {}
+    assert svc._calculate_near_miss_probability(0, 60) == game_math.gacha_near_miss_probability(60) == 0.273
+
+    random.seed(7)
+    draws = svc._resolve_draws(0, 200, 0, [])
+    # 근접 실패 표시 결과는 실제 획득 등급으로 히스토리에 기록, 피티(90회)는 카운터 초기화
+    assert all(r in {"Common", "Rare", "Epic", "Legendary", "Rare_near_miss_epic", "Epic_near_miss_legendary"}
+               for r in draws.results)
+    assert len(draws.history) == game_math.GACHA_HISTORY_SIZE
+    assert draws.pity_count < 200
+    assert game_math.gacha_resolve_rarity("Common", True) == ("Epic", "Epic", False, True)
+    assert game_math.gacha_resolve_rarity("Near_Miss_Legendary", False) == ("Epic_near_miss_legendary", "Epic", True, False)
@@ -0,0 +1,111 @@
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from starlette.testclient import TestClient
+
+from app.database import SessionLocal
+from app import models
+from app.main import app
+from app.models.history_models import GameHistory
+from app.utils.pagination import InvalidCursor, decode_cursor, encode_cursor, keyset_page
+
+client = TestClient(app)
+
+
+def test_cursor_roundtrip_and_invalid():
+    ts = datetime(2026, 1, 2, 3, 4, 5, 678)
+    assert decode_cursor(encode_cursor(ts, 42)) == (ts, 42)
+    with pytest.raises(InvalidCursor):
+        decode_cursor("not-a-cursor")
+
+
+def test_history_keyset_pages_cover_all_rows_without_overlap():
+    site_id = f"keyset_{uuid.uuid4().hex[:8]}"
+    r = client.post("/api/auth/signup", json={"site_id": site_id, "nickname": site_id, "password": "pass1234",
+                                              "invite_code": "5858", "phone_number": f"012{uuid.uuid4().int % 10**8:08d}"})
+    assert r.status_code == 200
+    token = r.json()["access_token"]
+    uid = r.json()["user"]["id"]
+
+    db = SessionLocal()
+    try:
+        base = datetime.utcnow()
+        # 동일 created_at 묶음 포함 (id 로 순서 결정)
+        db.add_all([GameHistory(user_id=uid, game_type="slot", action_type="BET",
+                                created_at=base - timedelta(seconds=i // 3)) for i in range(11)])
+        db.commit()
+        expected = [h.id for h in keyset_page(db.query(GameHistory).filter(GameHistory.user_id == uid),
+                                              GameHistory.created_at, GameHistory.id, limit=100)[0]]
+    finally:
+        db.close()
+
+    headers = {"Authorization": f"Bearer {token}"}
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 4, **({"cursor": cursor} if cursor else {})}
+        body = client.get("/api/games/history", headers=headers, params=params).json()
+        # 첫 페이지만 total 포함, 이후 cursor 페이지는 COUNT 생략
+        assert (body["total"] == 11) if cursor is None else (body["total"] is None)
+        seen.extend(item["id"] for item in body["items"])
+        cursor = body["next_cursor"]
+        if not cursor:
+            break
+    assert seen == expected and len(seen) == 11
+
+    # offset 호환 모드 유지
+    page2 = client.get("/api/games/history", headers=headers, params={"limit": 4, "offset": 4}).json()
+    assert [i["id"] for i in page2["items"]] == expected[4:8] and page2["next_cursor"] is None
+
+    bad = client.get("/api/games/history", headers=headers, params={"cursor": "@@"})
+    assert bad.status_code == 400
+
+
+def test_chat_room_keyset_endpoint_pages_and_rejects_bad_cursor():
+    from fastapi import FastAPI
+    from app.auth.simple_auth import get_current_user_id
+    from app.routers import chat as chat_router
+
+    tag = uuid.uuid4().hex[:8]
+    db = SessionLocal()
+    try:
+        member, outsider = (models.User(site_id=f"chatks_{tag}_{i}", nickname=f"chatks_{tag}_{i}",
+                                        phone_number=f"013{tag}{i}", password_hash="x", invite_code="5858")
+                            for i in range(2))
+        db.add_all([member, outsider])
+        db.flush()
+        room = models.ChatRoom(name=f"keyset-{tag}", created_by=member.id)
+        db.add(room)
+        db.flush()
+        base = datetime.utcnow()
+        db.add(models.ChatParticipant(room_id=room.id, user_id=member.id, joined_at=base - timedelta(hours=1)))
+        db.add_all([models.ChatMessage(room_id=room.id, sender_id=member.id, content=f"m{i}",
+                                       created_at=base - timedelta(seconds=i // 2)) for i in range(7)])
+        db.commit()
+        room_id, member_id, outsider_id = room.id, member.id, outsider.id
+    finally:
+        db.close()
+
+    api = FastAPI()
+    api.include_router(chat_router.router)
+    current = {"id": member_id}
+    api.dependency_overrides[get_current_user_id] = lambda: current["id"]
+    chat_client = TestClient(api)
+    url = f"/api/chat/rooms/{room_id}/messages"
+
+    pages, cursor = [], None
+    while True:
+        body = chat_client.get(url, params={"limit": 3, **({"cursor": cursor} if cursor else {})}).json()
+        pages.append([m["content"] for m in body["items"]])
+        cursor = body["next_cursor"]
+        if not cursor:
+            break
+    # 페이지 내부는 시간순, 페이지는 최신 → 과거
+    assert [len(p) for p in pages] == [3, 3, 1]
+    assert sorted(c for p in pages for c in p) == [f"m{i}" for i in range(7)]
+    assert pages[-1] == ["m6"]
+
+    assert chat_client.get(url, params={"cursor": "@@"}).status_code == 400
+    assert chat_client.get(url, params={"cursor": encode_cursor(None, 2 ** 64)}).status_code == 400
+    current["id"] = outsider_id
+    assert chat_client.get(url).status_code == 403
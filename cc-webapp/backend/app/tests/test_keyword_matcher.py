@@ -0,0 +1,37 @@
+import random
+
+from app.utils import sentiment_analyzer as sa
+from app.utils.emotion_engine import EMOTION_KEYWORDS, EmotionEngine
+from app.utils.keyword_matcher import KeywordMatcher
+
+
+def _naive(groups, text):
+    out = {}
+    for label, kws in groups.items():
+        found = [k for k in kws if k in text]
+        if found:
+            out[label] = found
+    return out
+
+
+def test_matcher_equals_substring_loop_including_overlaps():
+    groups = {"x": ["ab", "bc", "와"], "y": ["b", "abc", "cd", "와우"], "z": ["dab"]}
+    matcher = KeywordMatcher(groups)
+    rnd = random.Random(3)
+    alphabet = "abcd와우 "
+    for _ in range(2000):
+        text = "".join(rnd.choice(alphabet) for _ in range(rnd.randint(0, 12)))
+        assert matcher.hits(text) == _naive(groups, text), text
+
+
+def test_emotion_engine_and_shared_analyzer():
+    groups = {e: d["keywords"] for e, d in EMOTION_KEYWORDS.items()}
+    result = EmotionEngine().analyze_text("대박 최고! 근데 좀 짜증")
+    assert result["emotion"] == "joy"
+    assert {e: d["keywords"] for e, d in result["details"].items()} == _naive(groups, "대박 최고! 근데 좀 짜증")
+    assert result["details"]["joy"]["score"] == 2.0
+
+    assert sa.get_sentiment_analyzer() is sa.get_sentiment_analyzer()
+    many = sa.analyze_many(["so angry and mad", "", "궁금해요 어떻게 해요"])
+    assert [r.emotion for r in many] == [sa.SupportedEmotion.ANGER, sa.SupportedEmotion.NEUTRAL, sa.SupportedEmotion.JOY]
+    assert many[0].scores == {sa.SupportedEmotion.ANGER: 2 / 5}
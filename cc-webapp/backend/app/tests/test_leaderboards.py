@@ -0,0 +1,240 @@
+import random
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import models
+from app.database import SessionLocal
+from app.services import leaderboard_service as lb
+
+
+class _ZRedis:
+    """리더보드가 쓰는 ZSET/키 명령만 흉내내는 최소 fake (파이프라인은 순차 실행)."""
+
+    def __init__(self):
+        self.z = {}
+        self.kv = {}
+        self.ttl = {}
+
+    def pipeline(self, transaction=True):
+        return _Pipe(self)
+
+    def zincrby(self, key, amount, member):
+        z = self.z.setdefault(key, {})
+        z[member] = z.get(member, 0) + amount
+        return z[member]
+
+    def zadd(self, key, mapping):
+        self.z.setdefault(key, {}).update(mapping)
+        return len(mapping)
+
+    def _order(self, key):
+        return sorted(self.z.get(key, {}).items(), key=lambda x: (x[1], x[0]), reverse=True)
+
+    def zrevrange(self, key, start, end, withscores=False):
+        return [(m.encode(), float(s)) for m, s in self._order(key)[start:end + 1]]
+
+    def zrevrank(self, key, member):
+        members = [m for m, _ in self._order(key)]
+        return members.index(member) if member in members else None
+
+    def exists(self, key):
+        return int(key in self.z or key in self.kv)
+
+    def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.kv:
+            return None
+        self.kv[key] = value
+        return True
+
+    def expire(self, key, ttl):
+        self.ttl[key] = ttl
+        return True
+
+    def delete(self, *keys):
+        for k in keys:
+            self.z.pop(k, None)
+            self.kv.pop(k, None)
+
+    def zunionstore(self, dest, keys):
+        union = {}
+        for k in keys:
+            for m, s in self.z.get(k, {}).items():
+                union[m] = union.get(m, 0) + s
+        self.delete(dest)
+        if union:
+            self.z[dest] = union
+        return len(union)
+
+    def eval(self, script, numkeys, live, staging, base, built, ttl):
+        # _SWAP_LUA 와 동일: 스냅샷 이후 증분 재적용 → staging 을 live 로 교체
+        assert script == lb._SWAP_LUA
+        for m, s in list(self.z.get(live, {}).items()):
+            delta = s - self.z.get(base, {}).get(m, 0)
+            if delta:
+                self.zincrby(staging, delta, m)
+        self.z.pop(base, None)
+        if staging in self.z:
+            self.z[live] = self.z.pop(staging)
+        else:
+            self.z.pop(live, None)
+        self.kv[built] = "1"
+        if int(ttl) > 0:
+            self.ttl[live] = self.ttl[built] = int(ttl)
+        else:
+            self.ttl.pop(live, None)
+        return len(self.z.get(live, {}))
+
+
+class _Pipe:
+    def __init__(self, r):
+        self.r = r
+        self.calls = []
+
+    def __getattr__(self, name):
+        def _queue(*a, **kw):
+            self.calls.append((name, a, kw))
+            return self
+        return _queue
+
+    def execute(self):
+        return [getattr(self.r, name)(*a, **kw) for name, a, kw in self.calls]
+
+
+def _users(db, n):
+    ids = []
+    for _ in range(n):
+        tag = uuid.uuid4().hex[:8]
+        u = models.User(site_id=f"lb_{tag}", nickname=f"lb_{tag}", phone_number=f"014{tag}",
+                        password_hash="x", invite_code="5858")
+        db.add(u)
+        db.commit()
+        ids.append(u.id)
+    return ids
+
+
+def _history(db, day, rows):
+    for uid, game, action, delta, meta in rows:
+        db.add(models.GameHistory(user_id=uid, game_type=game, action_type=action, delta_coin=delta,
+                                  result_meta=meta, created_at=day + timedelta(hours=1)))
+    db.commit()
+
+
+@pytest.fixture
+def past_day():
+    # 게임 이력이 없는 과거 일자 → 테스트 DB 에 남은 이전 실행의 행과 버킷이 겹치지 않음
+    db = SessionLocal()
+    try:
+        while True:
+            day = datetime(1990, 1, 1) + timedelta(days=random.randint(0, 15000))
+            used = db.query(models.GameHistory.id).filter(
+                models.GameHistory.created_at >= day - timedelta(days=7),
+                models.GameHistory.created_at < day + timedelta(days=8),
+            ).first()
+            if used is None:
+                return day
+    finally:
+        db.close()
+
+
+def test_scoring_and_period_buckets():
+    assert lb.score_for("slot", "WIN", 150) == 150
+    assert lb.score_for("crash", "BET", -100) == 0
+    assert lb.score_for("slot", "SESSION_END", 500) == 0
+    assert lb.score_for("gacha", "PULL", -500, {"pulls": 10}) == 10
+    assert lb.boards_for("rps") == ("rps", "all") and lb.boards_for("roulette") == ()
+    at = datetime(2026, 10, 19, 13, 0)
+    assert lb.period_bucket("daily", at) == "20261019"
+    assert lb.period_bucket("weekly", at) == "2026-W43"
+    assert lb.period_range("weekly", "2026-W43") == (datetime(2026, 10, 19), datetime(2026, 10, 26))
+    assert lb.previous_bucket("daily", at) == "20261018"
+
+
+def test_db_fallback_ranks_around_and_snapshot(monkeypatch, past_day):
+    monkeypatch.setattr(lb, "_redis", lambda: None)
+    lb.clear_memory_cache()
+    db = SessionLocal()
+    try:
+        a, b, c = _users(db, 3)
+        _history(db, past_day, [
+            (a, "slot", "WIN", 300, None), (a, "slot", "BET", -100, None),
+            (b, "slot", "WIN", 500, None), (c, "crash", "WIN", 200, None),
+            (c, "gacha", "PULL", -50, {"pulls": 10}),
+        ])
+        bucket = lb.period_bucket("daily", past_day)
+        view = lb.view(db, "slot", "daily", limit=5, user_id=a, k=1, bucket=bucket)
+        assert [(r, u, s) for r, u, s in view.top] == [(1, b, 500), (2, a, 300)]
+        assert view.user_rank == 2 and view.user_score == 300
+        assert [u for _, u, _ in view.around] == [b, a]
+        overall = lb.view(db, "all", "daily", limit=5, bucket=bucket)
+        assert [u for _, u, _ in overall.top] == [b, a, c]
+        assert lb.view(db, "gacha", "daily", bucket=bucket).top == [(1, c, 10)]
+
+        assert lb.snapshot(db, "all", "daily", bucket) == 3
+        assert lb.snapshot(db, "all", "daily", bucket) == 0  # 버킷당 1회
+        rows = (db.query(models.LeaderboardSnapshot)
+                .filter_by(game_type="all", period="daily", bucket=bucket)
+                .order_by(models.LeaderboardSnapshot.rank).all())
+        assert [(r.rank, r.user_id, r.score) for r in rows] == [(1, b, 500), (2, a, 300), (3, c, 200)]
+    finally:
+        db.close()
+
+
+def test_redis_cold_rebuild_then_incremental_updates(monkeypatch, past_day):
+    fake = _ZRedis()
+    monkeypatch.setattr(lb, "_redis", lambda: fake)
+    db = SessionLocal()
+    try:
+        a, b = _users(db, 2)
+        _history(db, past_day, [(a, "slot", "WIN", 40, None), (b, "slot", "WIN", 90, None)])
+        bucket = lb.period_bucket("daily", past_day)
+        key = f"lb:slot:daily:{bucket}"
+        fake.zincrby(key, 5, str(a))  # 재구성 전 부분 증분은 DB 집계로 덮어씀
+
+        view = lb.view(db, "slot", "daily", limit=10, user_id=a, bucket=bucket)
+        assert view.top == [(1, b, 90), (2, a, 40)] and view.user_rank == 2
+        assert fake.exists(f"{key}:built") and not fake.exists(f"{key}:lock")
+
+        lb.record_many([(a, "slot", 100), (b, "rps", 10), (a, "crash", 0)], at=past_day + timedelta(hours=2))
+        view = lb.view(db, "slot", "daily", limit=10, user_id=a, k=0, bucket=bucket)
+        assert view.top == [(1, a, 140), (2, b, 90)] and view.around == [(1, a, 140)]
+        assert fake.z[f"lb:all:daily:{bucket}"] == {str(a): 100, str(b): 10}
+        assert fake.ttl[key] == lb.PERIOD_TTL_SECONDS["daily"]
+        assert "lb:slot:alltime:all" in fake.z and "lb:slot:alltime:all" not in fake.ttl
+    finally:
+        db.close()
+
+
+def test_rebuild_keeps_increments_recorded_during_aggregate(monkeypatch, past_day):
+    fake = _ZRedis()
+    monkeypatch.setattr(lb, "_redis", lambda: fake)
+    db = SessionLocal()
+    try:
+        a, b = _users(db, 2)
+        _history(db, past_day, [(a, "slot", "WIN", 40, None)])
+        bucket = lb.period_bucket("daily", past_day)
+        key = f"lb:slot:daily:{bucket}"
+        aggregate = lb.aggregate
+
+        def _racing_aggregate(*args):
+            totals = aggregate(*args)
+            # 집계 쿼리 이후 commit 된 라운드 → ZINCRBY 가 교체 전 라이브 보드에 도착
+            lb.record(b, "slot", 70, at=past_day + timedelta(hours=3))
+            return totals
+
+        monkeypatch.setattr(lb, "aggregate", _racing_aggregate)
+        assert lb.rebuild(db, "slot", "daily", bucket) == 2
+        assert fake.z[key] == {str(a): 40, str(b): 70}
+        assert f"{key}:staging" not in fake.z and f"{key}:base" not in fake.z
+    finally:
+        db.close()
+
+
+def test_leaderboard_endpoint_shape(client):
+    res = client.get("/api/games/leaderboard", params={"game_type": "slot", "period": "weekly", "limit": 3})
+    assert res.status_code == 200
+    data = res.json()
+    assert data["game_type"] == "slot" and data["period"] == "weekly"
+    assert isinstance(data["entries"], list) and len(data["entries"]) <= 3
+    assert client.get("/api/games/leaderboard", params={"game_type": "roulette"}).json()["entries"] == []
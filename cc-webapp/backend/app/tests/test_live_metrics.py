@@ -0,0 +1,62 @@
+import time
+
+from app.database import SessionLocal
+from app import models
+from app.services.live_metrics_service import (
+    LiveMetricsService,
+    get_live_metrics,
+    install_live_metrics_listeners,
+    SLOT_SPINS,
+    REVENUE_TOTAL,
+    PENDING_TX,
+)
+
+
+def test_window_total_slides_per_minute_bucket():
+    svc = LiveMetricsService()
+    now = time.time()
+    svc.incr(SLOT_SPINS, ts=now - 61 * 60)  # 윈도우 밖
+    svc.incr(SLOT_SPINS, ts=now - 30 * 60)
+    svc.incr(SLOT_SPINS, 2, ts=now)
+    assert svc.window_total(SLOT_SPINS, 60, ts=now) == 3
+    assert svc.window_total(SLOT_SPINS, 1, ts=now) == 2
+
+
+def test_online_users_distinct_within_window():
+    svc = LiveMetricsService()
+    now = time.time()
+    svc.mark_online(1, ts=now)
+    svc.mark_online(1, ts=now - 60)
+    svc.mark_online(2, ts=now - 120)
+    svc.mark_online(3, ts=now - 10 * 60)  # 5분 윈도우 밖
+    assert svc.online_users(5, ts=now) == 2
+
+
+def test_transaction_transitions_update_gauges():
+    svc = LiveMetricsService()
+    svc.record_transaction_change(amount=500, old_status=None, new_status="pending")
+    assert svc.gauge(PENDING_TX) == 1
+    svc.record_transaction_change(amount=500, old_status="pending", new_status="success")
+    assert svc.gauge(PENDING_TX) == 0
+    assert svc.gauge(REVENUE_TOTAL) == 500
+    assert svc.today_revenue() == 500
+    svc.record_transaction_change(amount=500, old_status="success", new_status="refunded")
+    assert svc.gauge(REVENUE_TOTAL) == 0
+
+
+def test_committed_slot_spin_feeds_counter_without_scan():
+    install_live_metrics_listeners()
+    live = get_live_metrics()
+    before = live.window_total(SLOT_SPINS, 60)
+    db = SessionLocal()
+    try:
+        # flush 로 after_flush 수집까지 진행된 변경도 롤백되면 반영되지 않아야 함
+        db.add(models.UserAction(user_id=1, action_type="SLOT_SPIN", action_data="{}"))
+        db.flush()
+        db.rollback()
+        assert live.window_total(SLOT_SPINS, 60) == before
+        db.add(models.UserAction(user_id=1, action_type="SLOT_SPIN", action_data="{}"))
+        db.commit()
+    finally:
+        db.close()
+    assert live.window_total(SLOT_SPINS, 60) == before + 1
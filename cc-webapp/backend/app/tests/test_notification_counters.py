@@ -0,0 +1,205 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import func
+
+from app.database import SessionLocal
+from app import models
+from app.core import redis_keys
+from app.services import notification_counters
+from app.services.campaign_dispatcher import (
+    CLAIM_LEASE_SECONDS,
+    CampaignAlreadyClaimed,
+    claim_campaign,
+    dispatch_due_campaigns,
+    send_campaign,
+)
+from app.services.notification_service import NotificationService
+
+
+def _user(db):
+    tag = uuid.uuid4().hex[:8]
+    u = models.User(site_id=f"notif_{tag}", nickname=f"notif_{tag}", phone_number=f"013{tag}",
+                    password_hash="x", invite_code="5858")
+    db.add(u)
+    db.commit()
+    return u.id
+
+
+def test_counters_follow_create_read_and_campaign():
+    db = SessionLocal()
+    try:
+        uid = _user(db)
+        svc = NotificationService(db)
+        created = [svc.create_notification(uid, f"m{i}") for i in range(3)]
+        assert svc.unread_count(uid) == 3
+
+        svc.mark_as_read(uid, created[0].id)
+        svc.mark_as_read(uid, created[0].id)  # 상태 변화 없음 → 카운터 불변
+        assert svc.unread_count(uid) == 2
+        svc.mark_as_read(uid, created[0].id, read=False)
+        assert svc.unread_count(uid) == 3
+
+        camp = models.NotificationCampaign(title="t", message="camp", targeting_type="user_ids",
+                                           user_ids=str(uid), status="scheduled")
+        db.add(camp)
+        db.commit()
+        assert send_campaign(db, camp) == 1
+        assert notification_counters.get_counts(db, uid) == (4, 4)
+
+        items, total = svc.list_notifications(uid, only_unread=True)
+        assert total == 4 and len(items) == 4
+        assert [i["message"] for i in svc.latest(uid, 2)] == ["camp", "m2"]
+
+        assert svc.mark_all_as_read(uid) == 4
+        assert svc.unread_count(uid) == 0
+    finally:
+        db.close()
+
+
+def test_reconcile_repairs_drift():
+    db = SessionLocal()
+    try:
+        uid = _user(db)
+        NotificationService(db).create_notification(uid, "hello")
+        row = db.get(models.NotificationCounter, uid)
+        row.unread_count, row.total_count = 99, 0
+        db.commit()
+        assert notification_counters.reconcile_counters(db) >= 1
+        assert notification_counters.get_counts(db, uid) == (1, 1)
+    finally:
+        db.close()
+
+
+class _CounterRedis:
+    """HASH + 조건부 Lua(EXISTS 후 HINCRBY / HSET) 만 흉내내는 fake."""
+
+    def __init__(self):
+        self.h = {}
+
+    def hmget(self, key, *fields):
+        return [self.h.get(key, {}).get(f) for f in fields]
+
+    def hset(self, key, mapping):
+        self.h.setdefault(key, {}).update({k: str(v) for k, v in mapping.items()})
+
+    def expire(self, key, ttl):
+        return True
+
+    def delete(self, *keys):
+        for k in keys:
+            self.h.pop(k, None)
+
+    def eval(self, script, numkeys, key, a, b):
+        if key not in self.h:
+            return 0
+        cur = self.h[key]
+        if script == notification_counters._HINCR_IF_EXISTS_LUA:
+            cur["unread"], cur["total"] = str(int(cur["unread"]) + int(a)), str(int(cur["total"]) + int(b))
+            return 1
+        if (cur.get("unread"), cur.get("total")) == (str(a), str(b)):
+            return 0
+        cur.update(unread=str(a), total=str(b))
+        return 1
+
+    def pipeline(self, transaction=False):
+        return _Pipe(self)
+
+
+class _Pipe:
+    def __init__(self, r):
+        self.r, self.ops = r, []
+
+    def __getattr__(self, name):
+        return lambda *a, **k: self.ops.append((name, a, k))
+
+    def execute(self):
+        return [getattr(self.r, name)(*a, **k) for name, a, k in self.ops]
+
+
+def test_reconcile_overwrites_drifted_redis_counters(monkeypatch):
+    fake = _CounterRedis()
+    monkeypatch.setattr(notification_counters, "_redis", lambda: fake)
+    db = SessionLocal()
+    try:
+        uid = _user(db)
+        NotificationService(db).create_notification(uid, "hello")
+        assert notification_counters.get_counts(db, uid) == (1, 1)  # Redis 키 적재
+        # DB 행은 맞고 캐시만 어긋남 (HINCRBY 유실 등)
+        fake.h[redis_keys.notif_counters(uid)].update(unread="7", total="9")
+        assert notification_counters.reconcile_counters(db) >= 1
+        assert notification_counters.get_counts(db, uid) == (1, 1)
+    finally:
+        db.close()
+
+
+def test_campaign_resumes_after_interrupted_chunk():
+    db = SessionLocal()
+    try:
+        uids = [_user(db) for _ in range(3)]
+        camp = models.NotificationCampaign(title="t", message="resume", targeting_type="user_ids",
+                                           user_ids=",".join(map(str, uids)), status="scheduled")
+        db.add(camp)
+        db.commit()
+
+        def _crash(sent, total):
+            raise RuntimeError("worker died")
+
+        try:
+            send_campaign(db, camp, chunk_size=2, on_chunk=_crash)
+        except RuntimeError:
+            pass
+        assert camp.status == "sending" and camp.sent_cursor == uids[1]
+        # 리스가 살아 있는 동안은 다른 발송자가 가져갈 수 없음
+        with pytest.raises(CampaignAlreadyClaimed):
+            send_campaign(db, camp, chunk_size=2)
+        camp.claimed_at = datetime.now(timezone.utc) - timedelta(seconds=CLAIM_LEASE_SECONDS + 1)
+        db.commit()
+        # 리스 만료 후 재시도: 커밋된 첫 청크(2명)는 건너뛰고 남은 1명만 발송
+        assert send_campaign(db, camp, chunk_size=2) == 1
+        counts = dict(db.query(models.Notification.user_id, func.count())
+                      .filter(models.Notification.message == "resume", models.Notification.user_id.in_(uids))
+                      .group_by(models.Notification.user_id))
+        assert counts == {uid: 1 for uid in uids} and camp.status == "sent"
+    finally:
+        db.close()
+
+
+def test_achievement_unlock_notifications_bump_counters_and_stream(monkeypatch):
+    from types import SimpleNamespace
+
+    from app.services import notification_stream as ns
+    from app.services.achievement_service import AchievementService
+
+    monkeypatch.setattr(ns, "_redis", lambda: None)
+    db = SessionLocal()
+    try:
+        uid = _user(db)
+        ach = SimpleNamespace(code=f"ACH_{uid}", title="First Win", description="win once", reward_coins=10)
+        AchievementService(db)._notify_unlocks(uid, [(ach, 1)])
+        assert notification_counters.get_counts(db, uid) == (1, 1)
+        events = ns.replay(uid, 0).events
+        assert [e["data"]["notification_type"] for e in events] == ["achievement_unlock"]
+    finally:
+        db.close()
+
+
+def test_only_one_sender_claims_a_campaign():
+    db = SessionLocal()
+    other = SessionLocal()
+    try:
+        uid = _user(db)
+        camp = models.NotificationCampaign(title="t", message="claim-once", targeting_type="user_ids",
+                                           user_ids=str(uid), status="scheduled")
+        db.add(camp)
+        db.commit()
+        # 다른 워커(세션)가 먼저 점유 → 스케줄러는 건너뛰고, 즉시 발송 경로는 거부
+        assert claim_campaign(other, other.get(models.NotificationCampaign, camp.id))
+        dispatch_due_campaigns(db)
+        with pytest.raises(CampaignAlreadyClaimed):
+            send_campaign(db, camp)
+        assert db.query(models.Notification).filter_by(user_id=uid, message="claim-once").count() == 0
+    finally:
+        other.close()
+        db.close()
@@ -0,0 +1,173 @@
+import asyncio
+import threading
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core import redis_keys
+from app.core.config import settings
+from app.routers import notifications as notif_router
+from app.services import notification_stream as ns
+
+
+class _StreamRedis:
+    """EVAL(발행 Lua) / XRANGE / GET 파이프라인만 흉내내는 fake (MAXLEN 은 정확 절단)."""
+
+    def __init__(self):
+        self.seq = {}
+        self.streams = {}
+        self.broken = set()
+
+    def pipeline(self, transaction=True):
+        return _Pipe(self)
+
+    def _publish(self, script, numkeys, seq_key, stream_key, maxlen, ttl, payload, floor):
+        assert script == ns._PUBLISH_LUA
+        if seq_key in self.broken:
+            raise RuntimeError("WRONGTYPE")
+        self.seq[seq_key] = max(self.seq.get(seq_key, 0), int(floor)) + 1
+        entries = self.streams.setdefault(stream_key, [])
+        entries.append((f"{self.seq[seq_key]}-0".encode(), {b"e": payload.encode()}))
+        del entries[:-int(maxlen)]
+        return self.seq[seq_key]
+
+    def _xrange(self, key, min, max, count):
+        lo = int(min.split("-")[0])
+        return [e for e in self.streams.get(key, []) if int(e[0].split(b"-")[0]) >= lo][:count]
+
+
+class _Pipe:
+    def __init__(self, r):
+        self.r = r
+        self.ops = []
+
+    def eval(self, *args):
+        self.ops.append(lambda: self.r._publish(*args))
+
+    def xrange(self, key, min, max, count):
+        self.ops.append(lambda: self.r._xrange(key, min, max, count))
+
+    def get(self, key):
+        self.ops.append(lambda: self.r.seq.get(key))
+
+    def execute(self, raise_on_error=True):
+        out = []
+        for op in self.ops:
+            try:
+                out.append(op())
+            except Exception as e:
+                if raise_on_error:
+                    raise
+                out.append(e)
+        return out
+
+
+@pytest.fixture
+def memory_stream(monkeypatch):
+    monkeypatch.setattr(ns, "_redis", lambda: None)
+    monkeypatch.setattr(settings, "NOTIFICATION_STREAM_MAXLEN", 3)
+    ns.clear_memory()
+    yield
+    ns.clear_memory()
+
+
+def test_memory_ring_replay_and_truncation(memory_stream):
+    for i in range(5):
+        ns.publish(7, {"m": i}, topic="alpha" if i % 2 else "beta")
+    assert [e["id"] for e in ns.replay(7, 3).events] == [4, 5]
+    assert not ns.replay(7, 3).truncated and not ns.replay(7, 5).truncated
+    # 1 이후분(2)은 ring 에서 밀려남 → 재조회 필요
+    rep = ns.replay(7, 1)
+    assert rep.truncated and rep.latest == 5 and [e["id"] for e in rep.events] == [3, 4, 5]
+    assert ns.replay(7, 99).truncated
+    assert ns.replay(8, 0) == ns.Replay([], 0, False)
+
+
+def test_redis_stream_ids_are_per_user_and_replayable(monkeypatch):
+    fake = _StreamRedis()
+    monkeypatch.setattr(ns, "_redis", lambda: fake)
+    monkeypatch.setattr(settings, "NOTIFICATION_STREAM_MAXLEN", 2)
+    out = ns.publish_many([1, 2], {"m": "hi"}, topic="campaign")
+    assert [(e["id"], e["topic"]) for e in out] == [(1, "campaign"), (1, "campaign")]
+    ns.publish(1, {"m": "a"})
+    ns.publish(1, {"m": "b"})
+    assert redis_keys.notif_stream(1) in fake.streams
+    rep = ns.replay(1, 2)
+    assert [(e["id"], e["data"]["m"]) for e in rep.events] == [(3, "b")]
+    assert not rep.truncated and rep.latest == 3
+    assert ns.replay(1, 0).truncated  # id 1 은 MAXLEN 으로 절단됨
+    assert [e["data"]["m"] for e in ns.replay(2, 0).events] == ["hi"]
+
+
+def test_follow_replays_then_streams_live_from_other_thread(memory_stream):
+    ns.publish(9, {"m": 1})
+    ns.publish(9, {"m": 2})
+
+    async def run():
+        got = []
+        stream = ns.follow(9, since=1, idle_timeout=0.05)
+        got.append(await stream.__anext__())
+        threading.Thread(target=ns.publish, args=(9, {"m": 3})).start()
+        got.append(await stream.__anext__())
+        assert await stream.__anext__() is None  # 유휴 keepalive
+        await stream.aclose()
+        return got
+
+    assert [(e["id"], e["data"]["m"]) for e in asyncio.run(run())] == [(2, 2), (3, 3)]
+    assert not ns._subscribers
+
+
+def test_ws_since_cursor_and_rest_send(memory_stream):
+    app = FastAPI()
+    app.include_router(notif_router.router)
+    app.include_router(notif_router.api_router)
+    client = TestClient(app)
+    for m in ("a", "b", "c", "d"):
+        assert client.post("/api/notifications/41/send", json={"message": {"m": m}, "topic": "t"}).status_code == 200
+    with client.websocket_connect("/ws/notifications/41?since=2") as ws:
+        assert [ws.receive_json()["data"]["m"] for _ in range(2)] == ["c", "d"]
+    # id 1 은 ring(3건)에서 밀려남 → 재조회 지시
+    with client.websocket_connect("/ws/notifications/41?since=0") as ws:
+        assert ws.receive_json() == ns.resync_event(0, 4)
+    r = client.get("/api/notifications/41/backfill", params={"since": 3})
+    assert r.json()["count"] == 1 and r.json()["latest"] == 4 and not r.json()["truncated"]
+
+
+def test_partial_pipeline_failure_falls_back_only_for_failed_users(monkeypatch, memory_stream):
+    fake = _StreamRedis()
+    fake.broken.add(redis_keys.notif_seq(2))
+    monkeypatch.setattr(ns, "_redis", lambda: fake)
+    ns.publish(2, {"m": "earlier"})  # 메모리 ring seq 1
+    out = ns.publish_many([1, 2, 3], {"m": "x"})
+    assert [e["id"] for e in out] == [1, 2, 1]
+    assert set(fake.streams) == {redis_keys.notif_stream(1), redis_keys.notif_stream(3)}
+    assert set(ns._memory) == {2}  # 실패한 사용자만 메모리 ring
+
+
+def test_ids_stay_monotonic_across_redis_outage(monkeypatch, memory_stream):
+    fake = _StreamRedis()
+    monkeypatch.setattr(ns, "_redis", lambda: fake)
+    for i in range(3):
+        ns.publish(5, {"m": i})
+
+    async def run():
+        got = []
+        stream = ns.follow(5, since=3, idle_timeout=1.0)
+        pending = asyncio.ensure_future(stream.__anext__())
+        await asyncio.sleep(0.01)  # 구독 등록 후 발행
+        fake.broken.add(redis_keys.notif_seq(5))  # Redis 장애 → 메모리 ring
+        ns.publish(5, {"m": "outage"})
+        got.append(await pending)
+        fake.broken.clear()  # 복구 → Redis 가 ring id 다음부터 이어서 부여
+        ns.publish(5, {"m": "recovered"})
+        got.append(await stream.__anext__())
+        await stream.aclose()
+        return got
+
+    assert [(e["id"], e["data"]["m"]) for e in asyncio.run(run())] == [(4, "outage"), (5, "recovered")]
+
+
+def test_sse_resync_frame_advances_last_event_id(memory_stream):
+    frame = notif_router._format_sse(ns.resync_event(0, 4))
+    assert frame.startswith("id: 4\nevent: resync\n")
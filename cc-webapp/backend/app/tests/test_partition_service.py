@@ -0,0 +1,98 @@
+import gzip
+import json
+import uuid
+from datetime import datetime
+
+from app import models
+from app.database import SessionLocal
+from app.services import partition_service as ps
+
+
+def test_month_math_and_bound_parsing():
+    assert ps.add_months(datetime(2026, 11, 1), 3) == datetime(2027, 2, 1)
+    assert ps.add_months(datetime(2026, 1, 1), -13) == datetime(2024, 12, 1)
+    assert ps.partition_name("game_history", datetime(2026, 10, 1)) == "game_history_p202610"
+    p = ps.parse_bound("game_history", "game_history_p202610",
+                       "FOR VALUES FROM ('2026-10-01 00:00:00') TO ('2026-11-01 00:00:00')")
+    assert (p.start, p.end) == (datetime(2026, 10, 1), datetime(2026, 11, 1))
+    legacy = ps.parse_bound("game_history", "game_history_legacy", "FOR VALUES FROM (MINVALUE) TO ('2026-11-01')")
+    assert legacy.start is None and legacy.overlaps(datetime(2026, 10, 1), datetime(2026, 11, 1))
+    assert not legacy.overlaps(datetime(2026, 11, 1), datetime(2026, 12, 1))
+    assert ps.parse_bound("game_history", "game_history_default", "DEFAULT").is_default
+
+
+def test_sqlite_fallback_archives_expired_months_to_gzip(tmp_path):
+    db = SessionLocal()
+    try:
+        tag = uuid.uuid4().hex[:8]
+        u = models.User(site_id=f"pt_{tag}", nickname=f"pt_{tag}", phone_number=f"017{tag}",
+                        password_hash="x", invite_code="5858")
+        db.add(u)
+        db.commit()
+        # 다른 테스트 데이터와 겹치지 않는 먼 과거 (1901년) + 보존 기간 내 1행
+        for day in (datetime(1901, 1, 5), datetime(1901, 1, 20), datetime(1901, 3, 2), datetime(1902, 6, 1)):
+            db.add(models.GameHistory(user_id=u.id, game_type="slot", action_type="BET", delta_coin=-10,
+                                      result_meta={"t": day.isoformat()}, created_at=day))
+        db.commit()
+
+        assert ps.ensure_future_partitions(db) == []  # 파티션 미지원 DB → no-op
+        results = ps.archive_expired(db, now=datetime(1903, 1, 15), retention={"game_history": 12},
+                                     sink="file", archive_dir=str(tmp_path))
+        by_month = {r.start: r for r in results}
+        assert by_month[datetime(1901, 1, 1)].rows == 2 and by_month[datetime(1901, 3, 1)].rows == 1
+        assert all(r.mode == "delete" for r in results)
+        with gzip.open(by_month[datetime(1901, 1, 1)].location, "rt", encoding="utf-8") as fh:
+            rows = [json.loads(line) for line in fh]
+        assert [r["result_meta"]["t"][:10] for r in rows] == ["1901-01-05", "1901-01-20"]
+
+        GH = models.GameHistory
+        left = db.query(GH.created_at).filter(GH.user_id == u.id).all()
+        assert [c for (c,) in left] == [datetime(1902, 6, 1)]
+        # 재실행: 더 이상 대상 없음
+        assert ps.archive_expired(db, now=datetime(1903, 1, 15), retention={"game_history": 12},
+                                  sink="file", archive_dir=str(tmp_path)) == []
+    finally:
+        db.close()
+
+
+def test_failed_range_delete_keeps_month_for_full_reexport(tmp_path, monkeypatch):
+    db = SessionLocal()
+    try:
+        tag = uuid.uuid4().hex[:8]
+        u = models.User(site_id=f"pt_{tag}", nickname=f"pt_{tag}", phone_number=f"019{tag}",
+                        password_hash="x", invite_code="5858")
+        db.add(u)
+        db.commit()
+        for day in (1, 2, 3):
+            db.add(models.GameHistory(user_id=u.id, game_type="slot", action_type="BET", delta_coin=-1,
+                                      created_at=datetime(1899, 5, day)))
+        db.commit()
+
+        real_delete, calls = ps.delete, []
+
+        def _flaky_delete(table):
+            calls.append(table)
+            if len(calls) == 2:
+                raise RuntimeError("connection lost")
+            return real_delete(table)
+
+        args = dict(now=datetime(1900, 12, 1), retention={"game_history": 1}, sink="file", archive_dir=str(tmp_path))
+        monkeypatch.setattr(ps, "delete", _flaky_delete)
+        assert [r for r in ps.archive_expired(db, batch=1, **args) if r.start == datetime(1899, 5, 1)] == []
+        GH = models.GameHistory
+        assert db.query(GH).filter(GH.user_id == u.id).count() == 3  # 첫 배치 삭제도 롤백
+
+        monkeypatch.setattr(ps, "delete", real_delete)
+        (may,) = [r for r in ps.archive_expired(db, **args) if r.start == datetime(1899, 5, 1)]
+        with gzip.open(may.location, "rt", encoding="utf-8") as fh:
+            assert sum(1 for row in map(json.loads, fh) if row["user_id"] == u.id) == 3
+    finally:
+        db.close()
+
+
+def test_run_maintenance_skips_archive_when_disabled():
+    db = SessionLocal()
+    try:
+        assert ps.run_maintenance(db, archive=False) == {"created": [], "archived": []}
+    finally:
+        db.close()
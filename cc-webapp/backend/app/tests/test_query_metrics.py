@@ -0,0 +1,51 @@
+import logging
+
+import pytest
+from sqlalchemy import text
+
+from app.core import query_metrics
+from app.core.config import settings
+from app.core.logging import request_id_ctx
+from app.database import SessionLocal
+
+
+def test_fingerprint_ignores_literals_and_in_list_length():
+    a = query_metrics.fingerprint("SELECT * FROM users WHERE id IN (?, ?, ?) AND name = 'x'")
+    b = query_metrics.fingerprint("SELECT *  FROM users\nWHERE id IN (?, ?) AND name = 'yy'")
+    assert a == b == "SELECT * FROM users WHERE id IN (?+) AND name = ?"
+    assert query_metrics.fingerprint("SELECT 1 WHERE a = %(a_1)s") == "SELECT ? WHERE a = ?"
+
+
+def test_request_attribution_and_n_plus_one_warning(caplog, monkeypatch):
+    # alembic fileConfig(disable_existing_loggers) 가 기존 로거를 비활성화하므로 복구
+    monkeypatch.setattr(query_metrics.logger, "disabled", False)
+    query_metrics.install_query_metrics_listeners()
+    token = request_id_ctx.set("qm-test-1")
+    db = SessionLocal()
+    try:
+        query_metrics.begin_request("qm-test-1")
+        for i in range(6):
+            db.execute(text("SELECT :v"), {"v": i}).scalar()
+        with caplog.at_level(logging.WARNING, logger="app.core.query_metrics"):
+            stats = query_metrics.end_request("qm-test-1", "GET", "/api/things/{id}", 5)
+    finally:
+        db.close()
+        request_id_ctx.reset(token)
+    assert stats.count == 6 and stats.seconds >= 0
+    assert stats.repeated(5) == [("SELECT ?", 6)]
+    assert any("possible N+1" in r.getMessage() for r in caplog.records)
+    assert query_metrics.end_request("qm-test-1", "GET", "/x") is None  # 이미 종료된 요청
+
+
+def test_server_timing_header_and_query_budget(client, auth_token, assert_max_queries, monkeypatch):
+    token = auth_token()
+    monkeypatch.setattr(settings, "QUERY_METRICS_SERVER_TIMING", True)
+    with assert_max_queries(50) as captured:
+        resp = client.get("/api/auth/me", headers={"Authorization": f"Bearer {token}"})
+    assert resp.status_code == 200
+    assert resp.headers["server-timing"].startswith("db;dur=")
+    assert int(resp.headers["x-db-query-count"]) == captured.count > 0
+
+    with pytest.raises(AssertionError, match="expected at most 0 queries"):
+        with assert_max_queries(0):
+            client.get("/api/auth/me", headers={"Authorization": f"Bearer {token}"})
@@ -0,0 +1,103 @@
+import uuid
+
+import pytest
+from sqlalchemy import event
+
+from app import models
+from app.database import SessionLocal, engine
+from app.services import quiz_service
+from app.services.quiz_service import QuizService, install_quiz_cache_listeners
+
+
+def _user(db):
+    tag = uuid.uuid4().hex[:8]
+    u = models.User(site_id=f"quiz_{tag}", nickname=f"quiz_{tag}", phone_number=f"014{tag}",
+                    password_hash="x", invite_code="5858")
+    db.add(u)
+    db.commit()
+    return u.id
+
+
+def _quiz(db, n_questions):
+    quiz = models.Quiz(title=f"risk_{uuid.uuid4().hex[:8]}", max_attempts=5)
+    for i in range(n_questions):
+        q = models.QuizQuestion(text=f"q{i}", order=i)
+        q.answers = [models.QuizAnswer(text="low", score=0), models.QuizAnswer(text="high", score=2, is_correct=True)]
+        quiz.questions.append(q)
+    db.add(quiz)
+    db.commit()
+    return quiz.id
+
+
+def _count_statements(fn):
+    seen = []
+
+    def _on_exec(*_args):
+        seen.append(1)
+
+    event.listen(engine, "before_cursor_execute", _on_exec)
+    try:
+        result = fn()
+    finally:
+        event.remove(engine, "before_cursor_execute", _on_exec)
+    return result, len(seen)
+
+
+def test_submit_all_scores_in_memory_with_constant_queries():
+    install_quiz_cache_listeners()
+    db = SessionLocal()
+    try:
+        uid = _user(db)
+        svc = QuizService(db)
+        costs = []
+        for n in (3, 30):
+            quiz_id = _quiz(db, n)
+            definition = svc.get_definition(quiz_id)
+            sheet = {q.id: q.answers[1].id for q in definition.questions}
+            attempt, cost = _count_statements(lambda: svc.submit_all(uid, quiz_id, sheet))
+            costs.append(cost)
+            assert attempt.final_score == 2 * n and attempt.correct_answers == n
+            assert attempt.risk_profile_result == ("Calculated-Risk" if n == 3 else "High-Risk")
+        assert costs[0] == costs[1]
+
+        with pytest.raises(ValueError):
+            svc.submit_all(uid, quiz_id, {definition.questions[0].id: -1})
+        seg = db.query(models.UserSegment).filter_by(user_id=uid).one()
+        assert seg.risk_profile == "High-Risk"
+    finally:
+        db.close()
+
+
+def test_definition_invalidated_on_commit():
+    install_quiz_cache_listeners()
+    db = SessionLocal()
+    try:
+        quiz_id = _quiz(db, 2)
+        first = quiz_service.get_compiled_quiz(db, quiz_id)
+        assert quiz_service.get_compiled_quiz(db, quiz_id) is first
+
+        answer = db.query(models.QuizAnswer).filter_by(id=first.questions[0].answers[0].id).one()
+        answer.score = 7
+        db.commit()
+        updated = quiz_service.get_compiled_quiz(db, quiz_id)
+        assert updated is not first and updated.questions[0].answers[0].score == 7
+    finally:
+        db.close()
+
+
+def test_submit_router_keeps_lenient_contract():
+    from app.routers.quiz import AnswerRequest, submit_quiz_answers
+
+    db = SessionLocal()
+    try:
+        uid = _user(db)
+        quiz = db.get(models.Quiz, _quiz(db, 2))
+        quiz.max_attempts = 1
+        db.commit()
+        definition = QuizService(db).get_definition(quiz.id)
+        sheet = {definition.questions[0].id: -1, 99999999: 1}  # 잘못된 문항/보기 → 무시
+        for _ in range(2):  # 라우터 경계에서는 시도 횟수 제한 없음
+            body = submit_quiz_answers(quiz.id, AnswerRequest(answers=sheet), QuizService(db), user_id=uid)
+            assert body["final_score"] == 0 and body["risk_profile"] == "Low-Risk"
+    finally:
+        db.close()
@@ -0,0 +1,158 @@
+import asyncio
+import uuid
+
+import pytest
+
+from app import models
+from app.core import redis_keys
+from app.database import SessionLocal
+from app.realtime import snapshot as snap
+from app.realtime.hub import RealtimeHub
+
+
+class _HashRedis:
+    """HGETALL/HSET 파이프라인 + EVALSHA(패치 Lua → 같은 의미의 patch_hash) 만 흉내내는 fake."""
+
+    def __init__(self):
+        self.h = {}
+        self.loads = 0
+        self.hgetalls = 0
+
+    def hgetall(self, key):
+        self.hgetalls += 1
+        return {k.encode(): v.encode() for k, v in self.h.get(key, {}).items()}
+
+    def script_load(self, script):
+        assert script == snap._PATCH_LUA
+        self.loads += 1
+        return "sha"
+
+    def evalsha(self, sha, numkeys, key, unlock, *pairs):
+        if key not in self.h:
+            return -1
+        return snap.patch_hash(self.h[key], dict(zip(pairs[::2], pairs[1::2])), unlock)
+
+    def pipeline(self, transaction=True):
+        return _Pipe(self)
+
+    def delete(self, key):
+        self.h.pop(key, None)
+
+
+class _Pipe:
+    def __init__(self, r):
+        self.r = r
+        self.ops = []
+
+    def delete(self, key):
+        self.ops.append(lambda: self.r.h.pop(key, None))
+
+    def hset(self, key, mapping):
+        self.ops.append(lambda: self.r.h.setdefault(key, {}).update(mapping))
+
+    def expire(self, key, ttl):
+        self.ops.append(lambda: None)
+
+    def execute(self):
+        return [op() for op in self.ops]
+
+
+@pytest.fixture
+def user_id():
+    db = SessionLocal()
+    try:
+        tag = uuid.uuid4().hex[:8]
+        u = models.User(site_id=f"rt_{tag}", nickname=f"rt_{tag}", phone_number=f"016{tag}",
+                        password_hash="x", invite_code="5858", gold_balance=500)
+        db.add(u)
+        db.commit()
+        return u.id
+    finally:
+        db.close()
+
+
+def test_memory_snapshot_patch_and_delta(monkeypatch, user_id):
+    monkeypatch.setattr(snap.SyncSnapshotCache, "_redis", property(lambda self: None))
+    cache = snap.SyncSnapshotCache()
+    db = SessionLocal()
+    try:
+        assert cache.apply_event({"type": "profile_update", "user_id": user_id, "changes": {"gold_balance": 1}}) == -1
+        state = cache.get(user_id, db)
+        v0 = state.version
+        assert state.sections["profile"]["gold_balance"] == 500 and state.base == v0
+        assert state.delta(v0) == {}
+
+        assert cache.apply_event({"type": "profile_update", "user_id": user_id, "changes": {"gold_balance": 700}}) == 1
+        assert cache.apply_event({"type": "reward_granted", "user_id": user_id, "balance_after": 700}) == 0
+        assert cache.apply_event({"type": "streak_update", "user_id": user_id, "action_type": "OTHER",
+                                  "streak_count": 9}) == 0
+        cache.apply_event({"type": "achievement_progress", "user_id": user_id, "achievement_code": "X", "unlocked": True})
+        cache.apply_event({"type": "achievement_progress", "user_id": user_id, "achievement_code": "X", "unlocked": True})
+
+        state = cache.get(user_id, db)
+        assert state.version == v0 + 2
+        assert state.delta(v0) == {"profile": {"gold_balance": 700}, "achievements": {"unlocked_count": 1}}
+        assert state.delta(v0 + 1) == {"achievements": {"unlocked_count": 1}}
+        # 스냅샷 생성 이전/미래 버전 → 전체 재전송
+        assert state.delta(v0 - 1) is None and state.delta(v0 + 5) is None and state.delta(None) is None
+    finally:
+        db.close()
+
+
+def test_redis_snapshot_single_read_and_lua_patch(monkeypatch, user_id):
+    fake = _HashRedis()
+    monkeypatch.setattr(snap.SyncSnapshotCache, "_redis", property(lambda self: fake))
+    cache = snap.SyncSnapshotCache()
+    db = SessionLocal()
+    try:
+        v0 = cache.get(user_id, db).version
+        assert redis_keys.realtime_snapshot(user_id) in fake.h
+        fake.hgetalls = 0
+        state = cache.get(user_id, db)
+        assert fake.hgetalls == 1 and state.version == v0
+        assert cache.apply_event({"type": "balance_update", "user_id": user_id, "gold_balance": 42}) == 1
+        assert fake.loads == 1
+        state = cache.get(user_id, db)
+        assert state.delta(v0) == {"profile": {"gold_balance": 42}}
+    finally:
+        db.close()
+
+
+def test_hub_broadcast_and_user_commit_patch_snapshot(monkeypatch, user_id):
+    monkeypatch.setattr(snap.SyncSnapshotCache, "_redis", property(lambda self: None))
+    monkeypatch.setattr(snap, "sync_snapshots", snap.SyncSnapshotCache())
+    snap.install_snapshot_listeners()
+    db = SessionLocal()
+    try:
+        v0 = snap.sync_snapshots.get(user_id, db).version
+        asyncio.run(RealtimeHub().broadcast({"type": "profile_update", "user_id": user_id,
+                                             "changes": {"vip_points": 3}}))
+        u = db.get(models.User, user_id)
+        u.gold_balance = 1234
+        db.commit()
+        state = snap.sync_snapshots.get(user_id, db)
+        assert state.delta(v0) == {"profile": {"vip_points": 3, "gold_balance": 1234}}
+    finally:
+        db.close()
+
+
+def test_hub_broadcast_applies_snapshot_off_event_loop(monkeypatch):
+    import threading
+
+    seen = []
+
+    class _Cache:
+        def apply_event(self, event):
+            seen.append(threading.get_ident())
+            return 1
+
+    monkeypatch.setattr(snap, "sync_snapshots", _Cache())
+
+    async def run():
+        hub = RealtimeHub()
+        await hub.broadcast({"type": "balance_update", "user_id": 1, "gold_balance": 5})
+        await hub.broadcast({"type": "monitor_only"})  # user_id 없음 → 패치 생략
+        return threading.get_ident()
+
+    loop_thread = asyncio.run(run())
+    assert len(seen) == 1 and seen[0] != loop_thread
@@ -0,0 +1,155 @@
+import time
+import uuid
+
+import pytest
+
+from app import models
+from app.core import redis_keys
+from app.core.config import settings
+from app.database import SessionLocal
+from app.services import segment_resolver as sr
+
+
+class _HashRedis:
+    def __init__(self):
+        self.h = {}
+        self.hmgets = 0
+
+    def hmget(self, key, fields):
+        self.hmgets += 1
+        return [self.h.get(key, {}).get(f, None) for f in fields]
+
+    def hset(self, key, mapping):
+        self.h.setdefault(key, {}).update({k: v.encode() for k, v in mapping.items()})
+
+    def expire(self, key, ttl):
+        return True
+
+    def pipeline(self, transaction=False):
+        return _Pipe(self)
+
+    def eval(self, script, numkeys, key, now, ttl, *pairs):
+        # _FILL_LUA 와 동일: 없거나 만료된 필드만 기록
+        h = self.h.setdefault(key, {})
+        for field_, value in zip(pairs[::2], pairs[1::2]):
+            cur = h.get(field_)
+            ts = cur.decode().rpartition("|")[2] if cur else ""
+            if not ts.isdigit() or int(ts) + int(ttl) <= int(now):
+                h[field_] = value.encode()
+
+
+class _Pipe:
+    def __init__(self, r):
+        self.r, self.ops = r, []
+
+    def __getattr__(self, name):
+        return lambda *a, **k: self.ops.append((name, a, k))
+
+    def execute(self):
+        return [getattr(self.r, name)(*a, **k) for name, a, k in self.ops]
+
+
+def _label(raw):
+    return raw.decode().rpartition("|")[0]
+
+
+@pytest.fixture
+def users():
+    db = SessionLocal()
+    try:
+        ids = []
+        for group in ("Whale", "Medium", None):
+            tag = uuid.uuid4().hex[:8]
+            u = models.User(site_id=f"sg_{tag}", nickname=f"sg_{tag}", phone_number=f"019{tag}",
+                            password_hash="x", invite_code="5858")
+            db.add(u)
+            db.flush()
+            if group:
+                db.add(models.UserSegment(user_id=u.id, rfm_group=group))
+            ids.append(u.id)
+        db.commit()
+        return ids
+    finally:
+        db.close()
+
+
+def test_config_parsed_once_per_version(monkeypatch):
+    monkeypatch.delenv("HOUSE_EDGE_JSON", raising=False)
+    monkeypatch.delenv("SEGMENT_PROB_ADJUST_JSON", raising=False)
+    base = sr.segment_config()
+    assert sr.segment_config() is base and base.edge_for("Whale") == 0.05 and base.edge_for(None) == 0.15
+    monkeypatch.setenv("HOUSE_EDGE_JSON", '{"Whale": 0.2}')
+    cfg = sr.segment_config()
+    assert cfg is not base and cfg.edge_for("Whale") == 0.2 and cfg.edge_for("Other") == 0.10
+    assert sr.segment_config() is cfg
+    monkeypatch.setenv("HOUSE_EDGE_JSON", "not json")
+    assert sr.segment_config().house_edge == sr.DEFAULT_HOUSE_EDGE
+
+
+def test_labels_cached_in_lru_and_redis(monkeypatch, users):
+    whale, medium, none = users
+    fake = _HashRedis()
+    monkeypatch.setattr(sr.SegmentResolver, "_redis", property(lambda self: fake))
+    resolver = sr.SegmentResolver(max_size=10, ttl_seconds=60)
+    db = SessionLocal()
+    try:
+        assert resolver.labels_for(db, [whale, medium, none, whale]) == {whale: "Whale", medium: "Medium", none: None}
+        assert _label(fake.h[redis_keys.segment_labels()][str(none)]) == "-"
+    finally:
+        db.close()
+
+    # 같은 프로세스: LRU 적중 → Redis/DB 미사용
+    fake.hmgets = 0
+    assert resolver.label(None, whale) == "Whale" and fake.hmgets == 0
+    # 다른 워커(빈 LRU): Redis HMGET 1회, DB 미사용 (db=None)
+    other = sr.SegmentResolver(max_size=10, ttl_seconds=60)
+    assert other.labels_for(None, [whale, none]) == {whale: "Whale", none: None} and fake.hmgets == 1
+    assert other.house_edge(None, whale) == sr.segment_config().edge_for("Whale")
+
+
+def test_segment_commit_refreshes_cache(monkeypatch, users):
+    whale, medium, none = users
+    fake = _HashRedis()
+    monkeypatch.setattr(sr.SegmentResolver, "_redis", property(lambda self: fake))
+    monkeypatch.setattr(sr, "segment_resolver", sr.SegmentResolver(max_size=10, ttl_seconds=60))
+    sr.install_segment_listeners()
+    db = SessionLocal()
+    try:
+        assert sr.segment_resolver.label(db, medium) == "Medium"
+        seg = db.query(models.UserSegment).filter(models.UserSegment.user_id == medium).one()
+        seg.rfm_group = "Whale"
+        db.add(models.UserSegment(user_id=none, rfm_group="Low"))
+        db.commit()
+        assert sr.segment_resolver.labels_for(None, [medium, none]) == {medium: "Whale", none: "Low"}
+        assert _label(fake.h[redis_keys.segment_labels()][str(medium)]) == "Whale"
+
+        seg.rfm_group = "Medium"
+        db.flush()
+        db.rollback()  # 롤백된 변경은 반영하지 않음
+        assert sr.segment_resolver.label(None, medium) == "Whale"
+    finally:
+        db.close()
+
+
+def test_stale_fill_does_not_overwrite_listener_write_and_old_entries_expire(monkeypatch, users):
+    whale, medium, none = users
+    fake = _HashRedis()
+    monkeypatch.setattr(sr.SegmentResolver, "_redis", property(lambda self: fake))
+    resolver = sr.SegmentResolver(max_size=10, ttl_seconds=60)
+    key = redis_keys.segment_labels()
+
+    # 조회가 DB 에서 옛 라벨을 읽는 사이 commit 리스너가 새 라벨 기록 → 늦은 채우기는 무시
+    resolver.store_many({medium: "Whale"})
+    resolver._redis_fill({medium: "Medium"})
+    assert _label(fake.h[key][str(medium)]) == "Whale"
+
+    # 만료(또는 구형식) 항목은 miss → DB 재조회 후 채우기가 덮어씀
+    fake.h[key][str(whale)] = f"Low|{int(time.time()) - settings.SEGMENT_LABEL_REDIS_TTL_SECONDS - 1}".encode()
+    fake.h[key][str(none)] = b"Low"
+    other = sr.SegmentResolver(max_size=10, ttl_seconds=60)
+    db = SessionLocal()
+    try:
+        assert other.labels_for(db, [whale, none]) == {whale: "Whale", none: None}
+    finally:
+        db.close()
+    assert _label(fake.h[key][str(whale)]) == "Whale" and _label(fake.h[key][str(none)]) == "-"
@@ -0,0 +1,37 @@
+import uuid
+
+from app import models
+from app.database import SessionLocal
+from app.utils import session_hooks
+
+
+def _user(tag):
+    return models.User(site_id=f"hook_{tag}", nickname=f"hook_{tag}", phone_number=f"016{tag}",
+                       password_hash="x", invite_code="5858")
+
+
+def test_commit_hook_applies_on_commit_and_discards_on_rollback(monkeypatch):
+    monkeypatch.setattr(session_hooks, "_hooks", dict(session_hooks._hooks))
+    applied = []
+
+    def collect(session, pending):
+        pending.update(o.site_id for o in session.new if isinstance(o, models.User))
+
+    def broken(pending):
+        raise RuntimeError("boom")
+
+    key = f"test_hook_{uuid.uuid4().hex[:8]}"
+    session_hooks.register_commit_hook(f"{key}_a", lambda s, p: p.add(1), broken)
+    session_hooks.register_commit_hook(key, collect, applied.append)
+    db = SessionLocal()
+    try:
+        kept, dropped = _user(uuid.uuid4().hex[:8]), _user(uuid.uuid4().hex[:8])
+        db.add(dropped)
+        db.flush()
+        db.rollback()  # 롤백된 flush 수집분은 폐기
+        assert key not in db.info
+        db.add(kept)
+        db.commit()  # 앞선 훅의 반영 실패는 다른 훅 / commit 에 전파되지 않음
+        assert applied == [{kept.site_id}] and key not in db.info
+    finally:
+        db.close()
@@ -52,4 +52,6 @@ __all__ = [
     'detect_language',
     'analyze_emotion_basic',
     'get_emotion_analysis',
+    'get_sentiment_analyzer',
+    'analyze_many',
 ]
@@ -0,0 +1,97 @@
+"""Streaming CSV export helpers (admin exports).
+
+기존 export 는 ``.all()`` → StringIO → ``iter([buffer.getvalue()])`` 구조라 전체 파일이
+메모리에 상주하고 1000행에서 잘렸다. 여기서는
+
+- ``iter_keyset``: PK 기반 keyset 커서(``WHERE id < :last ORDER BY id DESC LIMIT n``)로
+  배치 조회 → OFFSET 비용/메모리 증가 없이 전 범위 순회
+- ``stream_csv``: 행 단위 CSV 인코딩 후 일정 크기 청크로 yield (선택적 gzip 온더플라이)
+- ``csv_streaming_response``: 위 둘을 StreamingResponse 로 포장
+
+메모리 사용량은 batch_size/청크 크기에만 비례하며 export 전체 행 수와 무관하다.
+"""
+from __future__ import annotations
+
+import csv
+import io
+import zlib
+from typing import Any, Iterable, Iterator, Optional, Sequence
+
+from fastapi.responses import StreamingResponse
+
+DEFAULT_BATCH_SIZE = 1000
+CHUNK_BYTES = 64 * 1024
+
+
+def iter_keyset(query: Any, key_column: Any, *, batch_size: int = DEFAULT_BATCH_SIZE,
+                max_rows: Optional[int] = None) -> Iterator[Any]:
+    """``query`` 결과를 key_column 내림차순 keyset 페이지로 순회.
+
+    query 는 key_column 을 포함한 column 엔티티 쿼리(``db.query(M.id, M.x, ...)``)를 권장
+    (ORM 엔티티 로드 시 identity map 누적 방지).
+    """
+    attr = key_column.key
+    last = None
+    emitted = 0
+    while True:
+        page = query
+        if last is not None:
+            page = page.filter(key_column < last)
+        limit = batch_size if max_rows is None else min(batch_size, max_rows - emitted)
+        if limit <= 0:
+            return
+        rows = page.order_by(key_column.desc()).limit(limit).all()
+        if not rows:
+            return
+        for row in rows:
+            yield row
+        emitted += len(rows)
+        last = getattr(rows[-1], attr)
+        if len(rows) < limit:
+            return
+
+
+def _cell(value: Any) -> Any:
+    if value is None:
+        return ""
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return value
+
+
+def stream_csv(header: Sequence[str], rows: Iterable[Sequence[Any]], *, gzip_output: bool = False) -> Iterator[bytes]:
+    """헤더 + 행을 CSV 바이트 청크로 변환 (gzip_output 시 gzip 스트림)."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    compressor = zlib.compressobj(wbits=31) if gzip_output else None  # 31 → gzip 헤더/트레일러
+
+    def _drain() -> bytes:
+        data = buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate(0)
+        return compressor.compress(data) if compressor else data
+
+    writer.writerow(header)
+    for row in rows:
+        writer.writerow([_cell(v) for v in row])
+        if buffer.tell() >= CHUNK_BYTES:
+            chunk = _drain()
+            if chunk:
+                yield chunk
+    tail = _drain()
+    if compressor:
+        tail += compressor.flush()
+    if tail:
+        yield tail
+
+
+def csv_streaming_response(filename: str, header: Sequence[str], rows: Iterable[Sequence[Any]], *,
+                           gzip_output: bool = False) -> StreamingResponse:
+    headers = {"Content-Disposition": f"attachment; filename={filename}{'.gz' if gzip_output else ''}"}
+    media_type = "text/csv"
+    if gzip_output:
+        media_type = "application/gzip"
+    return StreamingResponse(stream_csv(header, rows, gzip_output=gzip_output), media_type=media_type, headers=headers)
+
+
+__all__ = ["iter_keyset", "stream_csv", "csv_streaming_response", "DEFAULT_BATCH_SIZE"]
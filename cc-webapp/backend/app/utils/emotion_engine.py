@@ -6,12 +6,67 @@
 
 import json
 import logging
-from typing import Dict, Any, Optional, List
+from functools import lru_cache
+from typing import Dict, Any, Optional, List, Tuple
 from datetime import datetime, timedelta
 import asyncio
 
+from .keyword_matcher import CACHE_MAX_TEXT_LEN, CACHE_SIZE, KeywordMatcher
+
 logger = logging.getLogger(__name__)
 
+# 감정별 키워드와 가중치
+EMOTION_KEYWORDS: Dict[str, Dict[str, Any]] = {
+    "joy": {
+        "keywords": ["좋아", "기뻐", "행복", "최고", "완벽", "대박", "성공", "승리"],
+        "weight": 1.0
+    },
+    "sad": {
+        "keywords": ["슬퍼", "실망", "안타까", "아쉬워", "실패", "패배", "힘들어"],
+        "weight": 1.0
+    },
+    "angry": {
+        "keywords": ["화나", "짜증", "분노", "열받", "억울", "불공평"],
+        "weight": 1.2
+    },
+    "neutral": {
+        "keywords": ["보통", "그냥", "괜찮", "무난", "평범"],
+        "weight": 0.5
+    },
+    "excited": {
+        "keywords": ["신나", "흥미", "재미", "즐거", "놀라", "와우"],
+        "weight": 1.1
+    },
+    "calm": {
+        "keywords": ["차분", "평온", "안정", "조용", "평화"],
+        "weight": 0.8
+    }
+}
+
+# 감정별 감정 점수
+SENTIMENT_MAPPING: Dict[str, float] = {
+    "joy": 0.8, "excited": 0.7, "calm": 0.3,
+    "neutral": 0.0, "sad": -0.5, "angry": -0.8
+}
+
+# 전체 키워드를 시작 시 1회 컴파일 (단일 패스 매칭)
+_KEYWORD_MATCHER = KeywordMatcher({e: d["keywords"] for e, d in EMOTION_KEYWORDS.items()})
+
+
+def _score(text_lower: str) -> Tuple[str, float, float, Tuple[Tuple[str, float, Tuple[str, ...]], ...]]:
+    """(최고 감정, 신뢰도, 감정 점수, ((감정, 점수, 키워드들), ...)) — 불변 결과 (캐시 가능)"""
+    details = []
+    for emotion, keywords_found in _KEYWORD_MATCHER.hits(text_lower).items():
+        weight = EMOTION_KEYWORDS[emotion]["weight"]
+        details.append((emotion, sum([weight] * len(keywords_found), 0.0), tuple(keywords_found)))
+    if not details:
+        return "neutral", 0.5, 0.0, ()
+    best = max(details, key=lambda d: d[1])
+    return best[0], min(best[1] / 3.0, 1.0), SENTIMENT_MAPPING.get(best[0], 0.0), tuple(details)
+
+
+_score_cached = lru_cache(maxsize=CACHE_SIZE)(_score)
+
 
 class EmotionEngine:
     """감정 분석 및 피드백 엔진"""
@@ -19,33 +74,7 @@ class EmotionEngine:
     def __init__(self, redis_client=None):
         self.redis = redis_client
         
-        # 감정별 키워드와 가중치
-        self.emotion_keywords = {
-            "joy": {
-                "keywords": ["좋아", "기뻐", "행복", "최고", "완벽", "대박", "성공", "승리"],
-                "weight": 1.0
-            },
-            "sad": {
-                "keywords": ["슬퍼", "실망", "안타까", "아쉬워", "실패", "패배", "힘들어"],
-                "weight": 1.0
-            },
-            "angry": {
-                "keywords": ["화나", "짜증", "분노", "열받", "억울", "불공평"],
-                "weight": 1.2
-            },
-            "neutral": {
-                "keywords": ["보통", "그냥", "괜찮", "무난", "평범"],
-                "weight": 0.5
-            },
-            "excited": {
-                "keywords": ["신나", "흥미", "재미", "즐거", "놀라", "와우"],
-                "weight": 1.1
-            },
-            "calm": {
-                "keywords": ["차분", "평온", "안정", "조용", "평화"],
-                "weight": 0.8
-            }
-        }
+        self.emotion_keywords = EMOTION_KEYWORDS
         
         # 감정별 피드백 템플릿
         self.feedback_templates = {
@@ -83,57 +112,36 @@ class EmotionEngine:
     
     async def detect_emotion_from_text(self, text: str) -> Dict[str, Any]:
         """텍스트에서 감정 감지"""
+        return self.analyze_text(text)
+
+    def analyze_text(self, text: str) -> Dict[str, Any]:
+        """텍스트 감정 감지 (동기, 컴파일된 키워드 매처 단일 패스)"""
         try:
             if not text:
                 return {"emotion": "neutral", "confidence": 0.0, "sentiment_score": 0.0}
             
-            text_lower = text.lower()
-            emotion_scores = {}
-            
-            # 각 감정별 키워드 매칭
-            for emotion, data in self.emotion_keywords.items():
-                score = 0.0
-                keywords_found = []
-                
-                for keyword in data["keywords"]:
-                    if keyword in text_lower:
-                        score += data["weight"]
-                        keywords_found.append(keyword)
-                
-                if score > 0:
-                    emotion_scores[emotion] = {
-                        "score": score,
-                        "keywords": keywords_found
-                    }
-            
-            # 최고 점수 감정 결정
-            if emotion_scores:
-                best_emotion = max(emotion_scores.keys(), key=lambda k: emotion_scores[k]["score"])
-                confidence = min(emotion_scores[best_emotion]["score"] / 3.0, 1.0)
-                
-                # 감정별 감정 점수 계산
-                sentiment_mapping = {
-                    "joy": 0.8, "excited": 0.7, "calm": 0.3,
-                    "neutral": 0.0, "sad": -0.5, "angry": -0.8
-                }
-                sentiment_score = sentiment_mapping.get(best_emotion, 0.0)
-            else:
-                best_emotion = "neutral"
-                confidence = 0.5
-                sentiment_score = 0.0
+            lowered = text.lower()
+            scored = _score_cached(lowered) if len(lowered) <= CACHE_MAX_TEXT_LEN else _score(lowered)
+            best_emotion, confidence, sentiment_score, details = scored
+            emotion_scores = {
+                emotion: {"score": score, "keywords": list(keywords)}
+                for emotion, score, keywords in details
+            }
             
-            result = {
+            return {
                 "emotion": best_emotion,
                 "confidence": confidence,
                 "sentiment_score": sentiment_score,
                 "details": emotion_scores
             }
             
-            return result
-            
         except Exception as e:
             logger.error(f"Failed to detect emotion: {str(e)}")
             return {"emotion": "neutral", "confidence": 0.0, "sentiment_score": 0.0}
+
+    def analyze_many(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """여러 텍스트 일괄 감정 감지 (채팅 백필 등)"""
+        return [self.analyze_text(t) for t in texts]
     
     async def detect_emotion_from_actions(self, user_actions: List[Dict[str, Any]]) -> Dict[str, Any]:
         """사용자 행동에서 감정 감지"""
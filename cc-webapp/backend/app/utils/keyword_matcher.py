@@ -0,0 +1,81 @@
+"""Compiled multi-keyword matcher (감정/감성 키워드 단일 패스 매칭).
+
+감정 분석기들은 감정 × 키워드마다 ``keyword in text`` 부분문자열 검사를 반복했다.
+``KeywordMatcher`` 는 전체 키워드를 길이 내림차순 대안(alternation) 정규식 1개로 컴파일해
+텍스트를 한 번만 훑는다.
+
+- 매칭 1건마다 그 키워드에 포함된(부분문자열) 다른 키워드들을 미리 계산해 함께 포함
+- 비중첩 스캔이 놓칠 수 있는 "매칭 안쪽에서 시작해 경계를 넘는" 키워드는 컴파일 시
+  (오프셋, 키워드) 후보로 미리 계산해 ``startswith`` 로만 확인
+  → 결과는 ``{k for k in keywords if k in text}`` 와 정확히 동일
+- 라벨별 "등장한 서로 다른 키워드 수" 를 반환 (기존 ``score += 1`` 루프와 동일 의미)
+- 짧은 메시지는 라벨별 결과를 LRU 캐시 (채팅의 반복 문구 "ㅋㅋ", "대박" 등)
+"""
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from typing import Dict, FrozenSet, Hashable, Iterable, List, Mapping, Tuple
+
+CACHE_MAX_TEXT_LEN = 64
+CACHE_SIZE = 4096
+
+
+class KeywordMatcher:
+    def __init__(self, groups: Mapping[Hashable, Iterable[str]]) -> None:
+        # 라벨 순서/키워드 순서 보존 (동점 처리·keywords_found 순서가 기존 루프와 같도록)
+        self.groups: Dict[Hashable, Tuple[str, ...]] = {label: tuple(kws) for label, kws in groups.items()}
+        vocab = sorted({k for kws in self.groups.values() for k in kws if k}, key=lambda k: (-len(k), k))
+        self._owners: Dict[str, List[Tuple[Hashable, int]]] = {}
+        for label, kws in self.groups.items():
+            for idx, kw in enumerate(kws):
+                self._owners.setdefault(kw, []).append((label, idx))
+        # 키워드 → 그 키워드에 포함된 키워드 집합 (자기 자신 포함)
+        self._closure: Dict[str, FrozenSet[str]] = {
+            kw: frozenset(p for p in vocab if p in kw) for kw in vocab
+        }
+        # 키워드 a 안쪽 오프셋 i 에서 시작해 a 끝을 넘어가는 키워드 b 후보 (a[i:] 가 b 의 접두사)
+        self._straddle: Dict[str, Tuple[Tuple[int, str], ...]] = {
+            a: tuple((i, b) for i in range(1, len(a)) for b in vocab if len(b) > len(a) - i and b.startswith(a[i:]))
+            for a in vocab
+        }
+        self._pattern = re.compile("|".join(re.escape(k) for k in vocab)) if vocab else None
+        self._cached_hits = lru_cache(maxsize=CACHE_SIZE)(self._hits)
+
+    def found(self, text: str) -> FrozenSet[str]:
+        """text 에 부분문자열로 등장하는 키워드 집합."""
+        if self._pattern is None or not text:
+            return frozenset()
+        closure, straddle = self._closure, self._straddle
+        found: set = set()
+        for m in self._pattern.finditer(text):
+            kw = m.group()
+            found |= closure[kw]
+            for offset, other in straddle[kw]:
+                if text.startswith(other, m.start() + offset):
+                    found |= closure[other]
+        return frozenset(found)
+
+    def _hits(self, text: str) -> Tuple[Tuple[Hashable, Tuple[str, ...]], ...]:
+        found = self.found(text)
+        if not found:
+            return ()
+        per_label: Dict[Hashable, List[Tuple[int, str]]] = {}
+        for kw in found:
+            for label, idx in self._owners[kw]:
+                per_label.setdefault(label, []).append((idx, kw))
+        return tuple(
+            (label, tuple(kw for _, kw in sorted(per_label[label])))
+            for label in self.groups
+            if label in per_label
+        )
+
+    def hits(self, text: str) -> Dict[Hashable, List[str]]:
+        """라벨 → 등장한 키워드 목록 (라벨 내 정의 순서). 매칭 없는 라벨은 제외."""
+        raw = self._cached_hits(text) if len(text) <= CACHE_MAX_TEXT_LEN else self._hits(text)
+        return {label: list(kws) for label, kws in raw}
+
+    def counts(self, text: str) -> Dict[Hashable, int]:
+        """라벨 → 등장한 서로 다른 키워드 수."""
+        raw = self._cached_hits(text) if len(text) <= CACHE_MAX_TEXT_LEN else self._hits(text)
+        return {label: len(kws) for label, kws in raw}
@@ -0,0 +1,72 @@
+"""Keyset (cursor) pagination helpers.
+
+OFFSET 페이지네이션은 깊은 페이지일수록 건너뛸 행을 모두 스캔하고, 매 페이지마다
+별도 ``COUNT(*)`` 를 수행한다. 여기서는 ``(created_at, id)`` 복합 키 기준 내림차순
+keyset 조회를 제공한다.
+
+    WHERE created_at < :c OR (created_at = :c AND id < :i)
+    ORDER BY created_at DESC, id DESC LIMIT :n + 1
+
+- 커서는 불투명 문자열(urlsafe base64 JSON) — 클라이언트는 ``next_cursor`` 를 그대로 되돌려 보낸다
+- ``limit + 1`` 행을 읽어 다음 페이지 존재 여부를 판단 (COUNT 불필요)
+- (scope 컬럼, created_at, id) 복합 인덱스와 함께 쓰면 N 번째 페이지 비용 == 첫 페이지 비용
+"""
+from __future__ import annotations
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+
+from sqlalchemy import and_, or_
+
+
+class InvalidCursor(ValueError):
+    """디코딩할 수 없는 커서."""
+
+
+def encode_cursor(created_at: Optional[datetime], row_id: int) -> str:
+    payload = {"c": created_at.isoformat() if created_at else None, "i": int(row_id)}
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Optional[datetime], int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        created = payload.get("c")
+        row_id = int(payload["i"])
+        if not 0 <= row_id < 2 ** 63:
+            raise ValueError("cursor id out of range")
+        return (datetime.fromisoformat(created) if created else None), row_id
+    except Exception as e:  # noqa: BLE001
+        raise InvalidCursor("invalid cursor") from e
+
+
+def keyset_page(query: Any, created_col: Any, id_col: Any, *, limit: int,
+                cursor: Optional[str] = None) -> Tuple[List[Any], Optional[str]]:
+    """``(created_at DESC, id DESC)`` keyset 페이지 1개 조회.
+
+    반환: (items, next_cursor) — 마지막 페이지면 next_cursor 는 None.
+    대상 테이블의 created_at 은 기본값으로 채워진다는 전제 (NULL 커서는 id 만 비교).
+    """
+    if cursor:
+        created, last_id = decode_cursor(cursor)
+        if created is None:
+            query = query.filter(id_col < last_id)
+        else:
+            query = query.filter(or_(
+                created_col < created,
+                and_(created_col == created, id_col < last_id),
+            ))
+    rows = (
+        query.order_by(created_col.desc(), id_col.desc())
+        .limit(limit + 1)
+        .all()
+    )
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(getattr(last, created_col.key), getattr(last, id_col.key))
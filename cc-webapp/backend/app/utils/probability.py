@@ -12,6 +12,8 @@ from typing import List, Dict, Any, Tuple, Optional
 from datetime import datetime, timedelta
 import logging
 
+from .sampling import get_sampler_registry
+
 logger = logging.getLogger(__name__)
 
 def calculate_gacha_probability(base_probability: float, streak_count: int = 0, 
@@ -76,13 +78,15 @@ def calculate_streak_bonus(streak_count: int, multiplier: float = 1.1,
         logger.error(f"Failed to calculate streak bonus: {str(e)}")
         return 1.0
 
-def weighted_random_choice(items: List[Dict[str, Any]], weight_key: str = "weight") -> Optional[Dict[str, Any]]:
+def weighted_random_choice(items: List[Dict[str, Any]], weight_key: str = "weight",
+                           default_weight: float = 0) -> Optional[Dict[str, Any]]:
     """
     가중치 기반 랜덤 선택
     
     Args:
         items: 선택할 아이템 리스트 (각 아이템은 weight_key를 가져야 함)
         weight_key: 가중치 키 이름
+        default_weight: weight_key 가 없는 아이템의 가중치
     
     Returns:
         선택된 아이템 또는 None
@@ -91,23 +95,13 @@ def weighted_random_choice(items: List[Dict[str, Any]], weight_key: str = "weigh
         if not items:
             return None
         
-        # 총 가중치 계산
-        total_weight = sum(item.get(weight_key, 0) for item in items)
-        if total_weight <= 0:
+        weights = tuple(item.get(weight_key, default_weight) for item in items)
+        if sum(weights) <= 0:
             return random.choice(items)  # 가중치가 없으면 균등 선택
         
-        # 랜덤 값 생성
-        random_value = random.uniform(0, total_weight)
-        
-        # 가중치에 따라 선택
-        current_weight = 0
-        for item in items:
-            current_weight += item.get(weight_key, 0)
-            if random_value <= current_weight:
-                return item
-        
-        # 예외 상황 (부동소수점 오차 등)
-        return items[-1]
+        # 동일 가중치 구성은 alias 테이블 1회 컴파일 후 O(1) 추첨 (인덱스 → 아이템)
+        sampler = get_sampler_registry().get("weighted_random_choice", tuple(enumerate(weights)))
+        return items[sampler.draw()]
         
     except Exception as e:
         logger.error(f"Failed to make weighted random choice: {str(e)}")
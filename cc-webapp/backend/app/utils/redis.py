@@ -243,49 +243,23 @@ class RedisManager:
             day_iso: 'YYYY-MM-DD' 형식의 날짜 문자열
 
         Note:
-            월 단위 키에 SADD로 보관. 키 만료는 120일로 설정.
+            사용자×액션 비트맵에 SETBIT (app/services/attendance_service.py, 만료 없음).
         """
         try:
-            month_key = day_iso[:7].replace('-', '')  # YYYYMM
-            key = f"user:{user_id}:attendance:{action_type}:{month_key}"
-            if self.is_connected():
-                # SADD 로 날짜 문자열 저장
-                self.redis_client.sadd(key, day_iso)
-                # 120일 만료 (보수적으로 길게)
-                self.redis_client.expire(key, 60 * 60 * 24 * 120)
-                return True
-            else:
-                # Fallback set in memory
-                s = self._fallback_cache.get(key)
-                if not isinstance(s, set):
-                    s = set()
-                s.add(day_iso)
-                self._fallback_cache[key] = s
-                return True
+            from app.services import attendance_service
+            attendance_service.record(int(user_id), action_type, day_iso)
+            return True
         except Exception as e:
             logger.error(f"Failed to record attendance: {str(e)}")
             return False
 
     def get_attendance_month(self, user_id: str, action_type: str, year: int, month: int) -> List[str]:
         """
-        해당 연/월의 출석 날짜 목록 반환 (YYYY-MM-DD 문자열 리스트)
+        해당 연/월의 출석 날짜 목록 반환 (YYYY-MM-DD 문자열 리스트, BITFIELD 1회)
         """
         try:
-            month_key = f"{year:04d}{month:02d}"
-            key = f"user:{user_id}:attendance:{action_type}:{month_key}"
-            if self.is_connected():
-                members = self.redis_client.smembers(key)
-                # redis-py returns set[bytes|str]; decode if bytes
-                result = []
-                for m in members or []:
-                    if isinstance(m, bytes):
-                        result.append(m.decode('utf-8'))
-                    else:
-                        result.append(str(m))
-                return sorted(result)
-            else:
-                s = self._fallback_cache.get(key, set())
-                return sorted(list(s)) if isinstance(s, set) else []
+            from app.services import attendance_service
+            return [d.isoformat() for d in attendance_service.month(int(user_id), action_type, year, month)]
         except Exception as e:
             logger.error(f"Failed to get attendance month: {str(e)}")
             return []
@@ -0,0 +1,189 @@
+"""Precompiled weighted samplers (Walker/Vose alias method).
+
+가중치 테이블을 설정 버전마다 한 번만 alias 테이블로 컴파일해 draw 당 O(1) 로 뽑는다.
+
+- ``AliasTable``: 컴파일된 테이블. ``draw`` 는 rng.random() 1회 (인덱스 + 비교값 동시 사용),
+  ``sample(k)`` 는 일괄 추첨
+- ``SamplerRegistry``: (이름, 설정 버전[, 변형 키]) → AliasTable LRU 캐시.
+  피티/세그먼트 등 조정 테이블은 ``variant`` 로 변형 키별 1회만 생성
+- ``request_rng``: 요청(request_id_ctx) 단위 시드 고정 ``random.Random`` 스트림
+  (시드는 로그/이력에 남겨 결과 재현 가능)
+
+rng 인자를 생략하면 ``random`` 모듈 전역 상태를 사용한다 (random.seed / patch 호환).
+"""
+from __future__ import annotations
+
+import random
+import secrets
+import threading
+from collections import OrderedDict
+from contextvars import ContextVar
+from typing import Any, Callable, Generic, Hashable, List, Mapping, Optional, Sequence, Tuple, TypeVar, Union
+
+from ..core.logging import request_id_ctx
+
+T = TypeVar("T")
+
+WeightedItems = Union[Mapping[Any, float], Sequence[Tuple[Any, float]]]
+
+
+def _items(weights: WeightedItems) -> List[Tuple[Any, float]]:
+    if isinstance(weights, Mapping):
+        return list(weights.items())
+    return [(outcome, weight) for outcome, weight in weights]
+
+
+class AliasTable(Generic[T]):
+    """Vose alias 테이블 (음수 가중치 금지, 0 가중치 항목은 추첨되지 않음)."""
+
+    __slots__ = ("outcomes", "weights", "_prob", "_alias", "_n")
+
+    def __init__(self, outcomes: Sequence[T], weights: Sequence[float]) -> None:
+        if len(outcomes) != len(weights) or not outcomes:
+            raise ValueError("outcomes and weights must be non-empty and the same length")
+        if any(w < 0 for w in weights):
+            raise ValueError("weights must be non-negative")
+        total = float(sum(weights))
+        if total <= 0:
+            raise ValueError("weights must sum to a positive value")
+        n = len(weights)
+        self.outcomes: Tuple[T, ...] = tuple(outcomes)
+        self.weights: Tuple[float, ...] = tuple(float(w) for w in weights)
+        self._n = n
+        prob = [0.0] * n
+        alias = list(range(n))
+        scaled = [w * n / total for w in weights]
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s, lg = small.pop(), large.pop()
+            prob[s] = scaled[s]
+            alias[s] = lg
+            scaled[lg] = (scaled[lg] + scaled[s]) - 1.0
+            (small if scaled[lg] < 1.0 else large).append(lg)
+        for i in large + small:  # 부동소수점 잔여분 → 확정 1.0
+            prob[i] = 1.0
+        self._prob = tuple(prob)
+        self._alias = tuple(alias)
+
+    @classmethod
+    def from_items(cls, weights: WeightedItems) -> "AliasTable":
+        items = _items(weights)
+        return cls([o for o, _ in items], [w for _, w in items])
+
+    def __len__(self) -> int:
+        return self._n
+
+    def draw_index(self, rng: Any = random) -> int:
+        u = rng.random() * self._n
+        i = int(u)
+        if i >= self._n:  # rng.random() 패치 값 1.0 방어
+            i = self._n - 1
+        return i if u - i < self._prob[i] else self._alias[i]
+
+    def draw(self, rng: Any = random) -> T:
+        return self.outcomes[self.draw_index(rng)]
+
+    def sample(self, k: int, rng: Any = random) -> List[T]:
+        """k 회 독립 추첨 (복원 추출)."""
+        n, prob, alias, outcomes = self._n, self._prob, self._alias, self.outcomes
+        rand = rng.random
+        out: List[T] = []
+        append = out.append
+        for _ in range(k):
+            u = rand() * n
+            i = int(u)
+            if i >= n:
+                i = n - 1
+            append(outcomes[i] if u - i < prob[i] else outcomes[alias[i]])
+        return out
+
+    def probabilities(self) -> dict:
+        total = sum(self.weights)
+        out: dict = {}
+        for outcome, w in zip(self.outcomes, self.weights):
+            out[outcome] = out.get(outcome, 0.0) + w / total
+        return out
+
+
+class SamplerRegistry:
+    """(이름, 설정 버전, 변형 키) → AliasTable LRU 캐시 (스레드 안전)."""
+
+    def __init__(self, maxsize: int = 1024) -> None:
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._tables: "OrderedDict[Tuple[Hashable, ...], AliasTable]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def _get_or_build(self, key: Tuple[Hashable, ...], build: Callable[[], WeightedItems]) -> AliasTable:
+        with self._lock:
+            table = self._tables.get(key)
+            if table is not None:
+                self._tables.move_to_end(key)
+                self.hits += 1
+                return table
+        table = AliasTable.from_items(build())  # 락 밖에서 컴파일 (동시 miss 시 중복 생성 허용)
+        with self._lock:
+            self.misses += 1
+            self._tables[key] = table
+            if len(self._tables) > self.maxsize:
+                self._tables.popitem(last=False)
+        return table
+
+    def get(self, name: str, weights: WeightedItems, version: Optional[Hashable] = None) -> AliasTable:
+        """설정 테이블 sampler. version 생략 시 항목 튜플 자체를 버전으로 사용."""
+        items = _items(weights)
+        key = (name, version if version is not None else tuple(items), None)
+        return self._get_or_build(key, lambda: items)
+
+    def variant(self, name: str, version: Hashable, variant_key: Hashable, build: Callable[[], WeightedItems]) -> AliasTable:
+        """조정 테이블 sampler (예: 가챠 히스토리/근접 실패 부스트 상태). build 는 캐시 miss 시에만 호출."""
+        return self._get_or_build((name, version, variant_key), build)
+
+    def clear(self, name: Optional[str] = None) -> None:
+        with self._lock:
+            if name is None:
+                self._tables.clear()
+            else:
+                for key in [k for k in self._tables if k[0] == name]:
+                    del self._tables[key]
+
+    def __len__(self) -> int:
+        return len(self._tables)
+
+
+_registry = SamplerRegistry()
+
+
+def get_sampler_registry() -> SamplerRegistry:
+    return _registry
+
+
+class SeededRandom(random.Random):
+    """시드 값을 보존하는 Random (감사/재현용)."""
+
+    def __init__(self, seed: int) -> None:
+        super().__init__(seed)
+        self.seed_value = seed
+
+
+_request_rng: ContextVar[Optional[Tuple[str, SeededRandom]]] = ContextVar("request_rng", default=None)
+
+
+def request_rng(seed: Optional[int] = None) -> SeededRandom:
+    """현재 요청의 RNG 스트림 (요청 내 재사용, 요청 밖에서는 호출마다 새 스트림).
+
+    seed 를 주면 해당 시드로 새 스트림을 시작한다 (재현/테스트)."""
+    rid = request_id_ctx.get()
+    if seed is None:
+        current = _request_rng.get()
+        if current is not None and current[0] == rid and rid != "-":
+            return current[1]
+        seed = secrets.randbits(63)  # 부호 있는 64bit 정수 범위 (이력 JSON/DB 저장)
+    rng = SeededRandom(seed)
+    _request_rng.set((rid, rng))
+    return rng
+
+
+__all__ = ["AliasTable", "SamplerRegistry", "get_sampler_registry", "SeededRandom", "request_rng"]
@@ -9,6 +9,8 @@ from enum import Enum
 from pathlib import Path
 from dataclasses import dataclass
 
+from .keyword_matcher import KeywordMatcher
+
 logger = logging.getLogger(__name__)
 
 class SupportedLanguage(str, Enum):
@@ -36,73 +38,72 @@ class EmotionResult:
     language: SupportedLanguage
     text_length: int = 0
 
+_STRIP_RE = re.compile(r'[^\w\s\'-]')
+_SPACE_RE = re.compile(r'\s+')
+_HANGUL_RE = re.compile(r'[가-힣]')
+
 def preprocess_text(text: str) -> str:
     """텍스트 전처리"""
     if not text:
         return ""
     
     # 특수문자 제거 (한글, 영문, 숫자, 공백, 하이픈, 어포스트로피 제외)
-    text = re.sub(r'[^\w\s\'-]', '', text)
+    text = _STRIP_RE.sub('', text)
     
     # 연속된 공백을 하나로 줄임
-    text = re.sub(r'\s+', ' ', text)
+    text = _SPACE_RE.sub(' ', text)
     
     return text.strip()
 
 def detect_language(text: str) -> SupportedLanguage:
     """언어 감지"""
     # 한글이 포함되어 있으면 한국어로 판단
-    if re.search(r'[가-힣]', text):
+    if _HANGUL_RE.search(text):
         return SupportedLanguage.KOREAN
     else:
         return SupportedLanguage.ENGLISH
 
+# 감정별 키워드 정의 (언어별)
+# ANGER 는 과거 중복 정의(이전 FRUSTRATED + 분노) 중 뒤의 목록이 적용되던 동작을 그대로 유지
+_BASIC_EMOTION_KEYWORDS = {
+    SupportedEmotion.EXCITED: {
+        'korean': ['기뻐', '좋아', '최고', '대박', '환상', '완전', '진짜', '와'],
+        'english': ['great', 'awesome', 'amazing', 'fantastic', 'wonderful', 'excellent', 'love', 'best']
+    },
+    SupportedEmotion.ANGER: {
+        'korean': ['화나', '빡쳐', '열받', '미쳐', '죽이고싶'],
+        'english': ['angry', 'mad', 'furious', 'pissed', 'rage']
+    },
+    SupportedEmotion.JOY: {  # 이전 CURIOUS에 해당
+        'korean': ['궁금', '어떻게', '왜', '뭐야', '신기', '재밌'],
+        'english': ['curious', 'interesting', 'wonder', 'how', 'why', 'what']
+    },
+    SupportedEmotion.NEUTRAL: {  # 이전 TIRED에 해당
+        'korean': ['피곤', '졸려', '지쳐', '힘들', '못하겠'],
+        'english': ['tired', 'exhausted', 'sleepy', 'worn out', 'cant anymore']
+    },
+    SupportedEmotion.SADNESS: {
+        'korean': ['슬퍼', '우울', '눈물', '속상', '마음아파'],
+        'english': ['sad', 'depressed', 'cry', 'tears', 'heartbroken']
+    }
+}
+
+# 언어별 키워드를 모듈 로드 시 1회 컴파일
+_BASIC_MATCHERS = {
+    lang: KeywordMatcher({emotion: kws[key] for emotion, kws in _BASIC_EMOTION_KEYWORDS.items()})
+    for lang, key in ((SupportedLanguage.KOREAN, 'korean'), (SupportedLanguage.ENGLISH, 'english'))
+}
+
 def analyze_emotion_basic(text: str) -> EmotionResult:
-    """기본 감정 분석 (키워드 기반)"""
+    """기본 감정 분석 (키워드 기반, 단일 패스 매칭)"""
     language = detect_language(text)
-    text_lower = text.lower()
-      # 감정별 키워드 정의
-    emotion_keywords = {
-        SupportedEmotion.EXCITED: {
-            'korean': ['기뻐', '좋아', '최고', '대박', '환상', '완전', '진짜', '와'],
-            'english': ['great', 'awesome', 'amazing', 'fantastic', 'wonderful', 'excellent', 'love', 'best']
-        },
-        SupportedEmotion.ANGER: {  # 이전 FRUSTRATED에 해당
-            'korean': ['짜증', '답답', '화나', '빡쳐', '열받', '싫어', '최악'],
-            'english': ['annoying', 'frustrated', 'angry', 'hate', 'worst', 'terrible', 'awful']
-        },
-        SupportedEmotion.JOY: {  # 이전 CURIOUS에 해당
-            'korean': ['궁금', '어떻게', '왜', '뭐야', '신기', '재밌'],
-            'english': ['curious', 'interesting', 'wonder', 'how', 'why', 'what']
-        },
-        SupportedEmotion.NEUTRAL: {  # 이전 TIRED에 해당
-            'korean': ['피곤', '졸려', '지쳐', '힘들', '못하겠'],
-            'english': ['tired', 'exhausted', 'sleepy', 'worn out', 'cant anymore']
-        },
-        SupportedEmotion.ANGER: {  # 중복 제거
-            'korean': ['화나', '빡쳐', '열받', '미쳐', '죽이고싶'],
-            'english': ['angry', 'mad', 'furious', 'pissed', 'rage']
-        },
-        SupportedEmotion.SADNESS: {
-            'korean': ['슬퍼', '우울', '눈물', '속상', '마음아파'],
-            'english': ['sad', 'depressed', 'cry', 'tears', 'heartbroken']
-        }
-    }
+    matcher = _BASIC_MATCHERS[language]
     
     # 키워드 매칭으로 감정 점수 계산
-    emotion_scores = {}
-    
-    for emotion, keywords in emotion_keywords.items():
-        score = 0
-        lang_key = 'korean' if language == SupportedLanguage.KOREAN else 'english'
-        lang_keywords = keywords.get(lang_key, [])
-        
-        for keyword in lang_keywords:
-            if keyword in text_lower:
-                score += 1
-        
-        if score > 0 and len(lang_keywords) > 0:
-            emotion_scores[emotion] = score / len(lang_keywords)
+    emotion_scores = {
+        emotion: count / len(matcher.groups[emotion])
+        for emotion, count in matcher.counts(text.lower()).items()
+    }
     
     # 가장 높은 점수의 감정 선택
     if emotion_scores:
@@ -189,13 +190,29 @@ class SentimentAnalyzer:
                         language=SupportedLanguage.KOREAN
                     )
         
-        logger.debug(f"Emotion analysis result: {result}")
+        logger.debug("Emotion analysis result: %s", result)
         return result
 
+    def analyze_many(self, texts: List[str]) -> List[EmotionResult]:
+        """여러 텍스트 일괄 분석 (채팅 백필 등)"""
+        return [self.analyze(t) for t in texts]
+
+_shared_analyzer: Optional[SentimentAnalyzer] = None
+
+def get_sentiment_analyzer() -> SentimentAnalyzer:
+    """공유 분석기 (모델 로드/환경변수 조회는 최초 1회)"""
+    global _shared_analyzer
+    if _shared_analyzer is None:
+        _shared_analyzer = SentimentAnalyzer()
+    return _shared_analyzer
+
 def get_emotion_analysis(text: str, context: Optional[Dict] = None) -> EmotionResult:
     """감정 분석 함수 (편의용)"""
-    analyzer = SentimentAnalyzer()
-    return analyzer.analyze(text)
+    return get_sentiment_analyzer().analyze(text)
+
+def analyze_many(texts: List[str]) -> List[EmotionResult]:
+    """여러 텍스트 일괄 감정 분석 (공유 분석기)"""
+    return get_sentiment_analyzer().analyze_many(texts)
 
 def load_local_model():
     """로컬 모델 로드 (향후 구현)"""
@@ -0,0 +1,76 @@
+"""Session commit hooks (flush 수집 → commit 확정 시 반영 → 롤백 시 폐기).
+
+캐시 무효화 / 실시간 지표처럼 "commit 된 변경에만 반응"해야 하는 서비스가 공유하는 리스너 한 벌.
+서비스는 ``register_commit_hook(key, collect, apply)`` 로 수집/반영 함수만 등록한다.
+
+- after_flush: ``collect(session, pending)`` — 이번 flush 의 변경을 ``pending`` (factory 로 만든
+  누적 컨테이너) 에 추가. 비어 있으면 ``session.info`` 에 남기지 않는다
+- after_commit: ``session.info`` 에서 꺼낸 ``pending`` 으로 ``apply(pending)`` (best-effort —
+  실패는 로그만 남기고 다른 훅 / commit 호출자에게 전파하지 않음)
+- after_soft_rollback: 등록된 모든 key 의 ``pending`` 폐기 (롤백된 변경은 반영하지 않음)
+
+Session 전역 리스너는 첫 등록 시 1회만 설치되며, 같은 key 재등록은 교체 (멱등).
+"""
+from __future__ import annotations
+
+import logging
+import threading
+from typing import Any, Callable, Dict, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+CollectFn = Callable[[Session, Any], None]
+ApplyFn = Callable[[Any], None]
+
+_lock = threading.Lock()
+_hooks: Dict[str, Tuple[CollectFn, ApplyFn, Callable[[], Any]]] = {}
+_installed = False
+
+
+def register_commit_hook(key: str, collect: CollectFn, apply: ApplyFn, *,
+                         factory: Callable[[], Any] = set) -> None:
+    """``session.info[key]`` 에 누적할 수집/반영 함수 등록 (멱등)."""
+    global _hooks, _installed
+    with _lock:
+        updated = dict(_hooks)
+        updated[key] = (collect, apply, factory)
+        _hooks = updated  # 리스너는 락 없이 스냅샷 dict 를 순회
+        if not _installed:
+            event.listen(Session, "after_flush", _collect)
+            event.listen(Session, "after_commit", _apply)
+            event.listen(Session, "after_soft_rollback", _discard)
+            _installed = True
+
+
+def _collect(session: Session, flush_context: Any) -> None:
+    for key, (collect, _, factory) in _hooks.items():
+        pending = session.info.get(key)
+        if pending is not None:
+            collect(session, pending)
+            continue
+        pending = factory()
+        collect(session, pending)
+        if pending:
+            session.info[key] = pending
+
+
+def _apply(session: Session) -> None:
+    for key, (_, apply, _) in _hooks.items():
+        pending = session.info.pop(key, None)
+        if not pending:
+            continue
+        try:
+            apply(pending)
+        except Exception:
+            logger.warning("session commit hook failed key=%s", key, exc_info=True)
+
+
+def _discard(session: Session, previous_transaction: Any) -> None:
+    for key in _hooks:
+        session.info.pop(key, None)
+
+
+__all__ = ["register_commit_hook"]
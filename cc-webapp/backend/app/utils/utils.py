@@ -92,22 +92,9 @@ class ProbabilityUtils:
         Returns:
             선택된 아이템
         """
-        if not items:
-            return None
-        
-        total_weight = sum(item.get(weight_key, 1) for item in items)
-        if total_weight <= 0:
-            return random.choice(items)
-        
-        pick = random.uniform(0, total_weight)
-        current = 0
-        
-        for item in items:
-            current += item.get(weight_key, 1)
-            if current >= pick:
-                return item
-        
-        return items[-1]  # fallback
+        # probability.weighted_random_choice 와 동일 구현 (alias 테이블 캐시), 가중치 누락 시 1
+        from .probability import weighted_random_choice
+        return weighted_random_choice(items, weight_key, default_weight=1)
     
     @staticmethod
     def variable_ratio_reward(action_count: int, avg_ratio: int = 5, variance: float = 0.3) -> bool:
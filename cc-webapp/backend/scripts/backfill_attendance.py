@@ -0,0 +1,77 @@
+"""Backfill attendance bitmaps from user_actions (and legacy monthly SADD sets)
+
+용도:
+  - 비트맵 출석 엔진(app/services/attendance_service.py) 도입 시 기존 활동 이력 이관
+  - user_actions 의 DISTINCT (user_id, 일자) → attendance:active:<user_id> SETBIT
+  - --actions 지정 시 해당 action_type 비트맵도 함께 기록 (예: DAILY_LOGIN)
+  - --legacy-sets: 이전 구조의 user:<id>:attendance:<action>:<YYYYMM> SADD 세트를 비트맵으로 복사
+  - SETBIT 은 멱등 → 재실행/구간 중복 실행 안전
+
+실행:
+  python scripts/backfill_attendance.py --since 2025-01-01
+  python scripts/backfill_attendance.py --actions DAILY_LOGIN SLOT_SPIN --legacy-sets
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from datetime import date
+from typing import Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import SessionLocal  # noqa: E402
+from app.services import attendance_service  # noqa: E402
+from app.utils.redis import get_redis_manager  # noqa: E402
+
+
+def _day(value: Optional[str]) -> Optional[date]:
+    return date.fromisoformat(value) if value else None
+
+
+def copy_legacy_sets(batch: int) -> int:
+    r = get_redis_manager().redis_client
+    if r is None:
+        print("Redis 미연결 — legacy 세트 이관 생략")
+        return 0
+    marks = []
+    written = 0
+    for raw in r.scan_iter(match="user:*:attendance:*", count=batch):
+        key = raw.decode() if isinstance(raw, bytes) else raw
+        parts = key.split(":")  # user:<id>:attendance:<action>:<YYYYMM>
+        if len(parts) != 5 or not parts[1].isdigit():
+            continue
+        for member in r.smembers(key) or ():
+            day = member.decode() if isinstance(member, bytes) else str(member)
+            marks.append((int(parts[1]), parts[3], day))
+        if len(marks) >= batch:
+            written += attendance_service.record_many(marks)
+            marks = []
+    return written + attendance_service.record_many(marks)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--since", help="YYYY-MM-DD (포함)")
+    ap.add_argument("--until", help="YYYY-MM-DD (포함)")
+    ap.add_argument("--actions", nargs="*", default=[], help="ACTIVE 외에 개별 비트맵을 채울 action_type")
+    ap.add_argument("--legacy-sets", action="store_true", help="월별 SADD 출석 세트도 이관")
+    ap.add_argument("--batch", type=int, default=5000)
+    args = ap.parse_args()
+
+    started = time.perf_counter()
+    db = SessionLocal()
+    try:
+        bits = attendance_service.backfill_from_user_actions(
+            db, since=_day(args.since), until=_day(args.until), action_types=args.actions, batch=args.batch)
+    finally:
+        db.close()
+    print(f"user_actions → bitmap: {bits} bits ({time.perf_counter() - started:.1f}s)")
+    if args.legacy_sets:
+        print(f"legacy SADD sets → bitmap: {copy_legacy_sets(args.batch)} bits")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,428 @@
+"""Hot API path load / latency benchmark (in-process ASGI, concurrent async clients)
+
+용도:
+  - 핫 패스 처리량/지연 측정: /api/auth/login, /api/games/slot/spin, /api/games/gacha/pull,
+    /api/games/crash/bet, /api/shop/buy-limited + 실시간 허브 토픽 팬아웃(RealtimeHub.publish)
+  - 시나리오별 p50/p95/p99 (ms), requests/sec, 요청당 DB 쿼리 수, 상태 코드 분포,
+    이벤트 루프 지연(lag p50/p99/max) 을 JSON 으로 출력
+  - 저장된 기준선(--baseline) 과 비교해 회귀가 있으면 exit code 1
+
+환경:
+  - 기본 DB 는 임시 SQLite 파일 (--database-url 로 로컬 Postgres 지정 가능)
+    스키마는 alembic upgrade head + 미반영 모델 create_all (테스트 conftest 와 동일, 실패 시 create_all)
+  - Redis 는 --redis-url 지정 시 사용, 미지정/연결 실패 시 앱의 메모리/DB fallback 경로
+  - Kafka 프로듀서는 기본 비활성 (send_kafka_message 를 호출 횟수만 세는 no-op 으로 교체;
+    미기동 브로커 재시도/백오프가 p95 를 지배하지 않도록). --kafka 지정 시 실제 프로듀서 사용
+  - httpx.AsyncClient + ASGITransport (lifespan/스케줄러 미기동, 네트워크 미사용)
+  - 결제 게이트웨이는 TESTING=1 결정적 모드, 가챠 일일 한도는 벤치마크 중 비활성화
+  - 요청당 쿼리 수는 요청 태스크 contextvar 로 귀속 (threadpool 실행 엔드포인트 포함)
+  - 팬아웃은 가짜 소켓(send_text 기록) N개를 토픽에 구독시켜 서버측 전송 비용만 측정
+
+실행:
+  python scripts/bench_api.py --users 50 --requests 400 --concurrency 12
+  python scripts/bench_api.py --save-baseline scripts/bench_api_baseline.json
+  python scripts/bench_api.py --baseline scripts/bench_api_baseline.json --tolerance 0.3
+
+기준선의 지연/처리량 수치는 측정 머신에 종속적이므로 CI 머신에서 --save-baseline 으로 갱신할 것.
+요청당 쿼리 수 비교는 머신과 무관 (N+1 회귀 감지용).
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import contextvars
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+SCENARIOS = ("login", "slot_spin", "gacha_pull", "crash_bet", "buy_limited", "ws_fanout")
+PASSWORD = "bench-passw0rd!"
+BENCH_PACKAGE = "BENCH_PACK"
+TOKEN_CONCURRENCY = 4  # 측정 외 토큰 발급 동시성 (풀 고갈로 셋업이 실패하지 않도록)
+
+_query_counter: contextvars.ContextVar[Optional[List[int]]] = contextvars.ContextVar("bench_query_counter", default=None)
+
+
+def _configure_env(args: argparse.Namespace) -> None:
+    # app 모듈 import 이전에 설정되어야 함 (database.py 가 import 시점에 엔진 생성)
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+    else:
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench_api.db')}"
+    if args.redis_url:
+        os.environ["REDIS_URL"] = args.redis_url
+    else:
+        os.environ.setdefault("REDIS_HOST", "127.0.0.1")
+    os.environ.setdefault("KAFKA_ENABLED", "0")
+    os.environ.setdefault("CLICKHOUSE_ENABLED", "0")
+    os.environ.setdefault("DISABLE_SCHEMA_DRIFT_GUARD", "1")
+    os.environ.setdefault("TESTING", "1")
+
+
+def _stub_kafka() -> None:
+    """send_kafka_message 를 no-op 으로 교체 (이름으로 import 한 라우터 모듈 포함)."""
+    from app import kafka_client
+    from app.routers import kafka_api, shop
+
+    def _send(topic: str, value: Dict[str, Any]) -> None:
+        return None
+
+    for mod in (kafka_client, kafka_api, shop):
+        mod.send_kafka_message = _send  # type: ignore[assignment]
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    k = (len(sorted_values) - 1) * pct / 100
+    lo, hi = int(k), min(int(k) + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+
+def _summary(latencies_ms: List[float], elapsed: float, extra: Dict[str, Any]) -> Dict[str, Any]:
+    ordered = sorted(latencies_ms)
+    out = {
+        "requests": len(ordered),
+        "rps": round(len(ordered) / elapsed, 1) if elapsed > 0 else 0.0,
+        "p50_ms": round(_percentile(ordered, 50), 2),
+        "p95_ms": round(_percentile(ordered, 95), 2),
+        "p99_ms": round(_percentile(ordered, 99), 2),
+        "mean_ms": round(statistics.fmean(ordered), 2) if ordered else 0.0,
+    }
+    out.update(extra)
+    return out
+
+
+class LoopLagMonitor:
+    """주기적으로 sleep 후 초과 지연(= 이벤트 루프 블로킹)을 기록."""
+
+    def __init__(self, interval: float = 0.01) -> None:
+        self.interval = interval
+        self.samples: List[float] = []
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            t0 = loop.time()
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(0.0, (loop.time() - t0 - self.interval) * 1000))
+
+    def __enter__(self) -> "LoopLagMonitor":
+        self.samples = []
+        self._task = asyncio.get_running_loop().create_task(self._run())
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        if self._task:
+            self._task.cancel()
+
+    def report(self) -> Dict[str, float]:
+        ordered = sorted(self.samples)
+        return {
+            "loop_lag_p50_ms": round(_percentile(ordered, 50), 2),
+            "loop_lag_p99_ms": round(_percentile(ordered, 99), 2),
+            "loop_lag_max_ms": round(ordered[-1], 2) if ordered else 0.0,
+        }
+
+
+def _install_query_counter(engine) -> None:
+    from sqlalchemy import event
+
+    def _on_execute(*_args: Any) -> None:
+        counter = _query_counter.get()
+        if counter is not None:
+            counter[0] += 1
+
+    event.listen(engine, "before_cursor_execute", _on_execute)
+
+
+def _ensure_schema(engine) -> None:
+    from app.database import Base
+
+    backend_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    try:
+        from alembic import command
+        from alembic.config import Config
+
+        cfg = Config(os.path.join(backend_root, "alembic.ini"))
+        cfg.set_main_option("script_location", os.path.join(backend_root, "alembic"))
+        command.upgrade(cfg, "head")
+    except Exception as e:
+        print(f"alembic upgrade failed, falling back to create_all: {e}", file=sys.stderr)
+    Base.metadata.create_all(bind=engine)
+    if engine.url.get_backend_name() == "sqlite":
+        # crash_sessions / crash_bets 는 ORM 모델 없이 raw SQL 로만 사용 (Postgres 배포 스키마) → SQLite 보강
+        from sqlalchemy import text
+        with engine.begin() as conn:
+            conn.execute(text(
+                "CREATE TABLE IF NOT EXISTS crash_sessions (id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                "external_session_id VARCHAR(64) UNIQUE, user_id INTEGER, bet_amount INTEGER, status VARCHAR(20), "
+                "auto_cashout_multiplier FLOAT, actual_multiplier FLOAT, win_amount INTEGER, "
+                "created_at DATETIME DEFAULT CURRENT_TIMESTAMP)"
+            ))
+            conn.execute(text(
+                "CREATE TABLE IF NOT EXISTS crash_bets (id INTEGER PRIMARY KEY AUTOINCREMENT, session_id INTEGER, "
+                "user_id INTEGER, bet_amount INTEGER, payout_amount INTEGER, cashout_multiplier FLOAT, "
+                "status VARCHAR(20), created_at DATETIME DEFAULT CURRENT_TIMESTAMP)"
+            ))
+
+
+def _seed(n_users: int) -> List[Tuple[int, str]]:
+    from datetime import datetime, timedelta, timezone
+
+    from app import models
+    from app.database import SessionLocal
+    from app.services.auth_service import AuthService
+    from app.services.limited_package_service import LimitedPackage, LimitedPackageService
+
+    password_hash = AuthService.get_password_hash(PASSWORD)  # bcrypt 1회 후 재사용
+    tag = uuid.uuid4().hex[:6]
+    db = SessionLocal()
+    try:
+        users = [
+            models.User(site_id=f"bench_{tag}_{i}", nickname=f"bench_{tag}_{i}", phone_number=f"019{tag}{i:04d}",
+                        password_hash=password_hash, invite_code="5858", gold_balance=10 ** 9)
+            for i in range(n_users)
+        ]
+        db.add_all(users)
+        db.commit()
+        seeded = [(u.id, u.site_id) for u in users]
+    finally:
+        db.close()
+
+    LimitedPackageService._seed_catalog()  # noqa: SLF001
+    now = datetime.now(timezone.utc)
+    LimitedPackageService._catalog[BENCH_PACKAGE] = LimitedPackage(  # noqa: SLF001
+        code=BENCH_PACKAGE, name="Bench Pack", description="benchmark", price_cents=100, gold=10,
+        start_at=now - timedelta(minutes=1), end_at=now + timedelta(days=1),
+        per_user_limit=10 ** 9, initial_stock=None, is_active=True,
+    )
+    return seeded
+
+
+async def _login_all(client, users: List[Tuple[int, str]], concurrency: int) -> List[str]:
+    sem = asyncio.Semaphore(concurrency)
+
+    async def _one(site_id: str) -> str:
+        async with sem:
+            r = await client.post("/api/auth/login", json={"site_id": site_id, "password": PASSWORD})
+            if r.status_code != 200:
+                raise RuntimeError(f"login failed for {site_id}: {r.status_code} {r.text[:300]}")
+            return r.json()["access_token"]
+
+    return list(await asyncio.gather(*(_one(site_id) for _, site_id in users)))
+
+
+RequestFactory = Callable[[int], Tuple[str, str, Optional[dict], Dict[str, str]]]
+
+
+def _factories(users: List[Tuple[int, str]], tokens: List[str]) -> Dict[str, RequestFactory]:
+    def _auth(i: int) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {tokens[i % len(tokens)]}"}
+
+    return {
+        "login": lambda i: ("POST", "/api/auth/login", {"site_id": users[i % len(users)][1], "password": PASSWORD}, {}),
+        "slot_spin": lambda i: ("POST", "/api/games/slot/spin", {"bet_amount": 10}, _auth(i)),
+        "gacha_pull": lambda i: ("POST", "/api/games/gacha/pull", {"pull_count": 1}, _auth(i)),
+        "crash_bet": lambda i: ("POST", "/api/games/crash/bet", {"bet_amount": 10, "auto_cashout_multiplier": 1.5}, _auth(i)),
+        "buy_limited": lambda i: ("POST", "/api/shop/buy-limited",
+                                  {"package_id": BENCH_PACKAGE, "idempotency_key": uuid.uuid4().hex}, _auth(i)),
+    }
+
+
+async def _run_http(client, factory: RequestFactory, total: int, concurrency: int) -> Dict[str, Any]:
+    latencies: List[float] = []
+    queries: List[int] = []
+    statuses: Dict[str, int] = {}
+    next_index = 0
+
+    async def _worker() -> None:
+        nonlocal next_index
+        while next_index < total:
+            i = next_index
+            next_index += 1
+            method, path, body, headers = factory(i)
+            counter = [0]
+            _query_counter.set(counter)  # 워커 태스크 컨텍스트 → ASGI 앱/threadpool 로 전파
+            t0 = time.perf_counter()
+            try:
+                r = await client.request(method, path, json=body, headers=headers)
+                code = str(r.status_code)
+            except Exception as e:  # 앱 예외도 결과에 포함
+                code = type(e).__name__
+            latencies.append((time.perf_counter() - t0) * 1000)
+            queries.append(counter[0])
+            statuses[code] = statuses.get(code, 0) + 1
+
+    with LoopLagMonitor() as lag:
+        t0 = time.perf_counter()
+        await asyncio.gather(*(_worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - t0
+    ok = sum(n for code, n in statuses.items() if code.startswith("2"))
+    return _summary(latencies, elapsed, {
+        "queries_per_request": round(statistics.fmean(queries), 2) if queries else 0.0,
+        "error_rate": round(1 - ok / max(1, len(latencies)), 4),
+        "status_codes": statuses,
+        **lag.report(),
+    })
+
+
+class _FakeSocket:
+    __slots__ = ("received_at",)
+
+    def __init__(self) -> None:
+        self.received_at = 0.0
+
+    async def send_text(self, text: str) -> None:
+        self.received_at = time.perf_counter()
+
+
+async def _run_fanout(subscribers: int, publishes: int) -> Dict[str, Any]:
+    from app.realtime.hub import hub
+
+    topic = f"bench:{uuid.uuid4().hex[:6]}"
+    sockets = [_FakeSocket() for _ in range(subscribers)]
+    for ws in sockets:
+        await hub.subscribe(topic, ws)
+    latencies: List[float] = []
+    try:
+        with LoopLagMonitor() as lag:
+            t0 = time.perf_counter()
+            for seq in range(publishes):
+                start = time.perf_counter()
+                await hub.publish(topic, {"type": "bench_tick", "seq": seq, "data": {"m": 1.23}})
+                latencies.append((max(ws.received_at for ws in sockets) - start) * 1000)
+            elapsed = time.perf_counter() - t0
+    finally:
+        for ws in sockets:
+            await hub.unsubscribe(topic, ws)
+    return _summary(latencies, elapsed, {
+        "subscribers": subscribers,
+        "deliveries_per_sec": round(subscribers * publishes / elapsed, 1) if elapsed > 0 else 0.0,
+        "queries_per_request": 0.0,
+        "error_rate": 0.0,
+        **lag.report(),
+    })
+
+
+def compare(result: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """기준선 대비 회귀 목록 (비어 있으면 통과)."""
+    regressions: List[str] = []
+    for key in ("database", "kafka", "users", "requests", "concurrency"):
+        if baseline.get("meta", {}).get(key) != result.get("meta", {}).get(key):
+            print(f"WARNING baseline meta.{key}={baseline.get('meta', {}).get(key)} differs from run "
+                  f"({result.get('meta', {}).get(key)})", file=sys.stderr)
+    for name, base in baseline.get("scenarios", {}).items():
+        cur = result.get("scenarios", {}).get(name)
+        if cur is None:
+            continue
+        if base.get("p95_ms") and cur["p95_ms"] > base["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {cur['p95_ms']}ms > baseline {base['p95_ms']}ms")
+        if base.get("rps") and cur["rps"] < base["rps"] * (1 - tolerance):
+            regressions.append(f"{name}: rps {cur['rps']} < baseline {base['rps']}")
+        if cur["queries_per_request"] > base.get("queries_per_request", 0) + 0.5:
+            regressions.append(f"{name}: queries/request {cur['queries_per_request']} > baseline {base['queries_per_request']}")
+        if cur["error_rate"] > base.get("error_rate", 0) + 0.01:
+            regressions.append(f"{name}: error_rate {cur['error_rate']} > baseline {base['error_rate']}")
+    return regressions
+
+
+async def _main_async(args: argparse.Namespace) -> Dict[str, Any]:
+    import httpx
+
+    from app.database import engine
+    import app.models  # noqa: F401 - register all models on Base
+    from app.main import app
+    from app.services.gacha_service import GachaService
+
+    _ensure_schema(engine)
+    _install_query_counter(engine)
+    # 벤치마크 중 일일 가챠 한도 비활성화
+    GachaService.daily_limit_for = staticmethod(lambda rank: 10 ** 9)  # type: ignore[assignment]
+    if not args.kafka:
+        _stub_kafka()
+
+    users = _seed(args.users)
+    scenarios: Dict[str, Any] = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        tokens = await _login_all(client, users, TOKEN_CONCURRENCY)
+        factories = _factories(users, tokens)
+        for name in args.scenarios:
+            if name == "ws_fanout":
+                scenarios[name] = await _run_fanout(args.ws_subscribers, args.ws_publishes)
+                continue
+            # 워밍업 (임포트/캐시 채움) 후 측정
+            await _run_http(client, factories[name], min(args.concurrency, args.requests), args.concurrency)
+            scenarios[name] = await _run_http(client, factories[name], args.requests, args.concurrency)
+            if name == "login":
+                # 재로그인으로 기존 세션 토큰이 무효화되므로 이후 시나리오용 토큰 재발급
+                tokens[:] = await _login_all(client, users, TOKEN_CONCURRENCY)
+    return {
+        "meta": {
+            "database": engine.url.get_backend_name(),
+            "users": args.users,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "kafka": "real" if args.kafka else "stub",
+            "python": sys.version.split()[0],
+            "timestamp": int(time.time()),
+        },
+        "scenarios": scenarios,
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--users", type=int, default=50)
+    ap.add_argument("--requests", type=int, default=400, help="scenario 당 요청 수")
+    ap.add_argument("--concurrency", type=int, default=12,
+                    help="동시 클라이언트 수 (기본 엔진 풀 5+10 초과 시 풀 대기/타임아웃이 결과에 반영됨)")
+    ap.add_argument("--scenarios", nargs="*", default=list(SCENARIOS), choices=SCENARIOS)
+    ap.add_argument("--ws-subscribers", type=int, default=1000)
+    ap.add_argument("--ws-publishes", type=int, default=200)
+    ap.add_argument("--database-url", default=None, help="기본: 임시 SQLite 파일")
+    ap.add_argument("--redis-url", default=None, help="기본: REDIS_* 환경변수 (실패 시 fallback)")
+    ap.add_argument("--kafka", action="store_true", help="실제 Kafka 프로듀서 사용 (기본: no-op 스텁)")
+    ap.add_argument("--out", default=None, help="결과 JSON 파일 경로 (기본 stdout)")
+    ap.add_argument("--baseline", default=None, help="비교할 기준선 JSON")
+    ap.add_argument("--save-baseline", default=None, help="결과를 기준선으로 저장")
+    ap.add_argument("--tolerance", type=float, default=0.25, help="p95/rps 허용 변동 비율")
+    args = ap.parse_args()
+
+    _configure_env(args)
+    import logging
+    logging.disable(logging.WARNING)
+
+    # 앱 디버그 print 가 결과 JSON 과 섞이지 않도록 실행 중 stdout → stderr
+    with contextlib.redirect_stdout(sys.stderr):
+        result = asyncio.run(_main_async(args))
+    text = json.dumps(result, indent=2, sort_keys=True)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(result, json.load(f), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
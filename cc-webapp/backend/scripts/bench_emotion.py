@@ -0,0 +1,152 @@
+"""Emotion / sentiment keyword matching throughput benchmark (legacy loop vs compiled matcher)
+
+용도:
+  - ``EmotionEngine.detect_emotion_from_text`` / ``sentiment_analyzer.get_emotion_analysis`` 의
+    기존 구현(감정 × 키워드 부분문자열 루프, 호출마다 분석기 생성)과
+    컴파일된 ``KeywordMatcher`` + 공유 분석기 경로의 messages/sec 비교
+  - 채팅 메시지 형태의 합성 코퍼스 (한/영 혼합, 반복 문구 비율 --repeat-ratio)
+  - 두 경로의 결과가 동일한지 함께 검증
+  - 키워드 사전 확장(--vocab-scale 배수, 합성 3음절 키워드) 시 라벨별 매칭 비용 비교
+
+실행:
+  python scripts/bench_emotion.py --messages 20000
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.utils import sentiment_analyzer as sa  # noqa: E402
+from app.utils.keyword_matcher import KeywordMatcher  # noqa: E402
+from app.utils.emotion_engine import EMOTION_KEYWORDS, SENTIMENT_MAPPING, EmotionEngine  # noqa: E402
+
+logging.disable(logging.INFO)
+
+_FRAGMENTS = [
+    "오늘 슬롯 대박 났어요", "진짜 짜증나네 또 졌어", "그냥 보통이에요", "와우 잭팟 신나", "너무 슬퍼 실패했어",
+    "차분하게 다시 해볼게요", "이거 어떻게 하는 거야 궁금", "피곤해서 못하겠어", "최고 완벽 승리!",
+    "this is awesome", "so frustrated and angry", "how does the gacha work", "feeling tired today",
+    "sad, lost again", "great win, love it", "ok", "ㅋㅋㅋㅋ", "gg", "다음 판 가자", "lol what",
+]
+
+
+def _corpus(n: int, repeat_ratio: float, seed: int = 7) -> list[str]:
+    rnd = random.Random(seed)
+    out = []
+    for _ in range(n):
+        if rnd.random() < repeat_ratio:
+            out.append(rnd.choice(_FRAGMENTS))
+        else:
+            out.append(" ".join(rnd.sample(_FRAGMENTS, rnd.randint(2, 4))) + f" #{rnd.randint(0, 10 ** 6)}")
+    return out
+
+
+def _legacy_engine(text: str) -> dict:
+    text_lower = text.lower()
+    emotion_scores = {}
+    for emotion, data in EMOTION_KEYWORDS.items():
+        score = 0.0
+        keywords_found = []
+        for keyword in data["keywords"]:
+            if keyword in text_lower:
+                score += data["weight"]
+                keywords_found.append(keyword)
+        if score > 0:
+            emotion_scores[emotion] = {"score": score, "keywords": keywords_found}
+    if emotion_scores:
+        best = max(emotion_scores.keys(), key=lambda k: emotion_scores[k]["score"])
+        return {"emotion": best, "confidence": min(emotion_scores[best]["score"] / 3.0, 1.0),
+                "sentiment_score": SENTIMENT_MAPPING.get(best, 0.0), "details": emotion_scores}
+    return {"emotion": "neutral", "confidence": 0.5, "sentiment_score": 0.0, "details": emotion_scores}
+
+
+def _legacy_basic(text: str) -> sa.EmotionResult:
+    language = sa.detect_language(text)
+    text_lower = text.lower()
+    lang_key = 'korean' if language == sa.SupportedLanguage.KOREAN else 'english'
+    emotion_scores = {}
+    for emotion, keywords in sa._BASIC_EMOTION_KEYWORDS.items():
+        lang_keywords = keywords.get(lang_key, [])
+        score = sum(1 for k in lang_keywords if k in text_lower)
+        if score > 0:
+            emotion_scores[emotion] = score / len(lang_keywords)
+    if emotion_scores:
+        best = max(emotion_scores, key=lambda k: emotion_scores[k])
+        return sa.EmotionResult(best, min(emotion_scores[best] * 2, 1.0), emotion_scores, language)
+    return sa.EmotionResult(sa.SupportedEmotion.NEUTRAL, 0.6, {}, language)
+
+
+def _legacy_analysis(text: str) -> sa.EmotionResult:
+    # 호출마다 분석기 생성 (모델 로드 + 환경변수 조회) + 키워드 루프
+    return sa.SentimentAnalyzer().analyze(text)
+
+
+def _rate(fn, corpus) -> float:
+    t0 = time.perf_counter()
+    for text in corpus:
+        fn(text)
+    return len(corpus) / (time.perf_counter() - t0)
+
+
+def _scaling(corpus: list[str], scales: list[int]) -> None:
+    rnd = random.Random(1)
+    syllables = "가나다라마바사아자차카타파하거너더러머버서어저처"
+    lowered = [t.lower() for t in corpus]
+    print(f"{'keywords':>8} {'loop msg/s':>12} {'compiled msg/s':>15} {'speedup':>8}")
+    for scale in scales:
+        groups = {e: list(d["keywords"]) for e, d in EMOTION_KEYWORDS.items()}
+        for e in groups:
+            groups[e] += ["".join(rnd.choice(syllables) for _ in range(3)) for _ in range(len(groups[e]) * (scale - 1))]
+        matcher = KeywordMatcher(groups)
+
+        def _loop(text: str) -> dict:
+            return {e: f for e, kws in groups.items() if (f := [k for k in kws if k in text])}
+
+        loop, compiled = _rate(_loop, lowered), _rate(matcher._hits, lowered)  # 캐시 미사용 경로
+        print(f"{sum(map(len, groups.values())):>8} {loop:>12,.0f} {compiled:>15,.0f} {compiled / loop:>7.1f}x")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--messages", type=int, default=20000)
+    ap.add_argument("--repeat-ratio", type=float, default=0.5)
+    ap.add_argument("--vocab-scale", type=int, nargs="*", default=[1, 5, 20])
+    args = ap.parse_args()
+    corpus = _corpus(args.messages, args.repeat_ratio)
+
+    engine = EmotionEngine()
+    mismatches = sum(_legacy_engine(t) != engine.analyze_text(t) for t in corpus)
+    mismatches += sum(_legacy_basic(sa.preprocess_text(t)) != sa.analyze_emotion_basic(sa.preprocess_text(t))
+                      for t in corpus)
+
+    compiled_basic = sa.analyze_emotion_basic
+    sa.analyze_emotion_basic = _legacy_basic
+    try:
+        legacy_analysis = _rate(_legacy_analysis, corpus)
+    finally:
+        sa.analyze_emotion_basic = compiled_basic
+    rows = [
+        ("EmotionEngine.detect", _rate(_legacy_engine, corpus), _rate(engine.analyze_text, corpus)),
+        ("get_emotion_analysis", legacy_analysis, _rate(sa.get_emotion_analysis, corpus)),
+    ]
+    t0 = time.perf_counter()
+    sa.analyze_many(corpus)
+    batch_rate = len(corpus) / (time.perf_counter() - t0)
+
+    print(f"corpus={len(corpus)} repeat_ratio={args.repeat_ratio} mismatches={mismatches}")
+    print(f"{'path':<22} {'legacy msg/s':>14} {'compiled msg/s':>15} {'speedup':>8}")
+    for name, legacy, compiled in rows:
+        print(f"{name:<22} {legacy:>14,.0f} {compiled:>15,.0f} {compiled / legacy:>7.1f}x")
+    print(f"{'analyze_many':<22} {'':>14} {batch_rate:>15,.0f}")
+    print()
+    _scaling(corpus, args.vocab_scale)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Gacha multi-pull latency benchmark (looped vs batched)
+
+용도:
+  - 라우터의 기존 방식(10연/단일 ``GachaService.pull`` 반복 호출)과
+    ``GachaService.pull_batch`` (1회 처리)의 1 / 10 / 100 연차 지연시간 비교
+  - 임시 SQLite 파일 DB + Redis 미연결(피티/히스토리 no-op, 쿼터는 DB 집계 fallback) 기준
+
+실행:
+  python scripts/bench_gacha.py --repeat 20
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.database import Base  # noqa: E402
+from app import models  # noqa: E402
+from app.repositories.game_repository import GameRepository  # noqa: E402
+from app.services.gacha_service import GachaService  # noqa: E402
+from app.services.token_service import TokenService  # noqa: E402
+
+
+def _looped(svc: GachaService, user_id: int, n: int, db) -> None:
+    tens, singles = divmod(n, 10)
+    for _ in range(tens):
+        svc.pull(user_id, 10, db)
+    for _ in range(singles):
+        svc.pull(user_id, 1, db)
+
+
+def _batched(svc: GachaService, user_id: int, n: int, db) -> None:
+    svc.pull_batch(user_id, n, db)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--repeat", type=int, default=20)
+    args = ap.parse_args()
+
+    # 벤치마크 중 일일 한도 비활성화
+    GachaService.daily_limit_for = staticmethod(lambda rank: 10 ** 9)  # type: ignore[assignment]
+
+    path = os.path.join(tempfile.mkdtemp(), "bench_gacha.db")
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    user = models.User(site_id="bench", nickname="bench", phone_number="0100000000",
+                       password_hash="x", invite_code="5858", gold_balance=10 ** 12)
+    db.add(user)
+    db.commit()
+
+    repo = GameRepository()
+    svc = GachaService(repository=repo, token_service=TokenService(db, repo), db=db)
+
+    print(f"{'pulls':>6} {'looped p50 ms':>14} {'batched p50 ms':>15} {'speedup':>8}")
+    for n in (1, 10, 100):
+        timings = {}
+        for label, fn in (("looped", _looped), ("batched", _batched)):
+            samples = []
+            for _ in range(args.repeat):
+                t0 = time.perf_counter()
+                fn(svc, user.id, n, db)
+                samples.append((time.perf_counter() - t0) * 1000)
+            timings[label] = statistics.median(samples)
+        print(f"{n:>6} {timings['looped']:>14.2f} {timings['batched']:>15.2f} {timings['looped'] / timings['batched']:>7.1f}x")
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Weighted sampler throughput benchmark (draws/sec)
+
+용도:
+  - 기존 방식(random.choices 가중치 목록 / 선형 누적 탐색 / 가챠 상태별 누적분포 이진 탐색)과
+    ``app.utils.sampling.AliasTable`` (draw / sample(n)) 의 초당 추첨 수 비교
+  - 슬롯 릴(6 심볼), 가챠 등급 테이블(근접 실패 포함), 64 항목 보상 테이블 기준
+
+실행:
+  python scripts/bench_sampler.py --draws 300000
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import time
+from bisect import bisect_left
+from itertools import accumulate
+from typing import Callable, List, Sequence
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core import game_math  # noqa: E402
+from app.utils.sampling import AliasTable  # noqa: E402
+
+
+def _rate(fn: Callable[[int], None], draws: int) -> float:
+    started = time.perf_counter()
+    fn(draws)
+    return draws / (time.perf_counter() - started)
+
+
+def _linear_walk(outcomes: Sequence, weights: Sequence[float], rng: random.Random):
+    # 기존 utils/probability.weighted_random_choice 방식 (호출마다 합계 + 선형 탐색)
+    total = sum(weights)
+    pick = rng.uniform(0, total)
+    current = 0.0
+    for outcome, w in zip(outcomes, weights):
+        current += w
+        if pick <= current:
+            return outcome
+    return outcomes[-1]
+
+
+def _bench_table(label: str, outcomes: Sequence, weights: Sequence[float], draws: int) -> None:
+    rng = random.Random(1)
+    table = AliasTable(outcomes, weights)
+    cum: List[float] = list(accumulate(weights))
+    rows = [
+        ("random.choices", lambda n: [rng.choices(outcomes, weights=weights)[0] for _ in range(n)]),
+        ("linear walk", lambda n: [_linear_walk(outcomes, weights, rng) for _ in range(n)]),
+        ("bisect (cached cdf)", lambda n: [outcomes[min(bisect_left(cum, rng.random() * cum[-1]), len(cum) - 1)] for _ in range(n)]),
+        ("alias draw", lambda n: [table.draw(rng) for _ in range(n)]),
+        ("alias sample(n)", lambda n: table.sample(n, rng)),
+    ]
+    print(f"\n== {label} ({len(outcomes)} outcomes)")
+    for name, fn in rows:
+        print(f"  {name:<22} {_rate(fn, draws):>14,.0f} draws/s")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--draws", type=int, default=300_000)
+    args = ap.parse_args()
+
+    _bench_table("slot reels", game_math.SLOT_SYMBOLS, game_math.slot_symbol_weights(None), args.draws)
+    masses = game_math.gacha_rarity_masses(game_math.GACHA_DEFAULT_RARITY_TABLE, frozenset({"Common"}), 0.223)
+    _bench_table("gacha rarity", [n for n, _ in masses], [p for _, p in masses], args.draws)
+    reward_weights = [random.Random(i).randint(1, 100) for i in range(64)]
+    _bench_table("reward table", list(range(64)), reward_weights, args.draws)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
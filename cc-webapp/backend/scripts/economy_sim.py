@@ -5,18 +5,38 @@
   - 구현 값이 목표(Target)에서 허용 편차 이내인지 검증
   - 결과 JSON + 콘솔 요약 출력, CI에서 --fail-on-deviation 사용 가능
 
-주의:
-  - 서비스 레이어/DB 의존 최소화를 위해 확률/코스트는 경량화된 샘플 로직 사용
-  - 추후 실제 GameService / GachaService 함수 직접 호출 모드(--mode service) 추가 가능
+모드 (--mode):
+  - sample     : 경량화된 샘플 분포 (기존 동작, 기본값)
+  - service    : 운영 코드 경로 그대로 스칼라 실행 — 슬롯/크래시는 app.core.game_math 순수 함수,
+                 가챠는 GachaService._resolve_draws 직접 호출 (DB 불필요)
+  - vectorized : 같은 순수 함수로 룩업 테이블을 만든 뒤 NumPy 배치 + 프로세스 풀로 평가
+                 (1억 라운드 RTP 검증용, numpy 필요)
+
+  예) python scripts/economy_sim.py --mode vectorized --slot-n 100000000 --crash-n 100000000 --workers 8
+
+모델링 가정 (service / vectorized 공통):
+  - 슬롯: 스트릭은 스핀마다 +1 (승패 무관), 세션 길이(--slot-session) 단위로 초기화 (24h TTL 근사)
+  - 크래시: 단일 요청 모드(/crash/bet) 정산 — 베팅액 선차감, 자동 캐시아웃 성공 시 순이익만 가산.
+            md5 시드 해시 % 10000 은 10000 격자 균등값으로 근사 (vectorized)
+  - 가챠: 신규 사용자(피티 0, 히스토리 없음)가 --gacha-pulls 회 연속 뽑기, 보상 풀은 무한
+  - RPS 는 아직 순수 함수로 분리되지 않아 모든 모드에서 샘플 분포 사용
 """
 from __future__ import annotations
 import os
+import sys
 import math
 import json
+import time
 import random
 import argparse
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from dataclasses import dataclass
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core import game_math  # noqa: E402  (순수 함수 모듈: 설정/DB import 없음)
 
 # Target constants (문서와 동기화)
 TARGET_SLOT_RTP = 0.92
@@ -193,6 +213,402 @@ def simulate_crash(n: int, rng: random.Random) -> Dict[str, Any]:
         "pass": abs(house_edge_est - TARGET_CRASH_HOUSE_EDGE) <= 0.01
     }
 
+# ---------------------------------------------------------------------------
+# 운영 규칙 기반 시뮬레이션 (service / vectorized)
+# ---------------------------------------------------------------------------
+# 가챠 EV 계산용 등급 가치 (GACHA_RARITIES 와 동일 배수, 비용 대비)
+GACHA_VALUE_BY_RARITY = {name: val for name, _, val in GACHA_RARITIES}
+DEFAULT_CHUNK = 1_000_000
+SLOT_SESSION_DEFAULT = 50
+GACHA_PULLS_DEFAULT = 100
+CRASH_AUTO_DEFAULT = 2.0
+GACHA_MAX_TABLE = 12  # 히스토리 보유 조합(2^K) 테이블 상한
+GACHA_COUNT_CAP = 1000  # 근접 실패 확률 테이블 범위 (이후 값은 포화 가정)
+SLOT_COMBO_TABLE_MAX = 1 << 22  # 정수 가중치 총합^3 이 이 이하이면 단일 정수 추첨 → 조합 직접 룩업
+
+
+@dataclass(frozen=True)
+class SimParams:
+    slot_weights: Tuple[int, ...]
+    slot_session: int = SLOT_SESSION_DEFAULT
+    crash_auto: float = CRASH_AUTO_DEFAULT
+    gacha_table: Tuple[Tuple[str, float], ...] = game_math.GACHA_DEFAULT_RARITY_TABLE
+    gacha_pulls: int = GACHA_PULLS_DEFAULT
+
+
+def load_sim_params(args: argparse.Namespace) -> SimParams:
+    """운영 설정(SLOT_SYMBOL_WEIGHTS, GACHA_RARITY_TABLE)을 읽어 시뮬레이션 파라미터 구성."""
+    cfg_weights = None
+    try:
+        from app.core.config import settings
+        cfg_weights = getattr(settings, "SLOT_SYMBOL_WEIGHTS", None)
+    except Exception:  # 설정 로드 실패 시 기본 가중치
+        cfg_weights = None
+    table: Sequence[Tuple[str, float]] = game_math.GACHA_DEFAULT_RARITY_TABLE
+    table_json = os.getenv("GACHA_RARITY_TABLE")
+    if table_json:
+        table = [(str(name), float(prob)) for name, prob in json.loads(table_json)]
+    return SimParams(
+        slot_weights=tuple(game_math.slot_symbol_weights(cfg_weights)),
+        slot_session=max(1, args.slot_session),
+        crash_auto=args.crash_auto,
+        gacha_table=tuple(table),
+        gacha_pulls=max(1, args.gacha_pulls),
+    )
+
+
+class SumStat:
+    """병합 가능한 합계 통계 (청크/프로세스 결과 합산용)."""
+
+    def __init__(self, n: int = 0, total: float = 0.0, total_sq: float = 0.0) -> None:
+        self.n = n
+        self.total = total
+        self.total_sq = total_sq
+
+    def merge(self, other: "SumStat") -> None:
+        self.n += other.n
+        self.total += other.total
+        self.total_sq += other.total_sq
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.n if self.n else 0.0
+
+    def ci95(self) -> Tuple[float, float]:
+        if self.n < 2:
+            return (self.mean, self.mean)
+        var = max(0.0, (self.total_sq - self.total * self.total / self.n) / (self.n - 1))
+        se = math.sqrt(var / self.n)
+        return (self.mean - 1.96 * se, self.mean + 1.96 * se)
+
+
+def _merge_counts(dst: Dict[str, int], src: Dict[str, int]) -> None:
+    for k, v in src.items():
+        dst[k] = dst.get(k, 0) + v
+
+
+def _slot_report(stat: SumStat, counts: Dict[str, int], params: SimParams) -> Dict[str, Any]:
+    low, high = stat.ci95()
+    n = max(stat.n, 1)
+    return {
+        "rounds": stat.n,
+        "rtp_mean": stat.mean,
+        "rtp_ci95": [low, high],
+        "target_rtp": TARGET_SLOT_RTP,
+        "diff": stat.mean - TARGET_SLOT_RTP,
+        "pass": abs(stat.mean - TARGET_SLOT_RTP) <= 0.01,
+        "hit_rate": counts.get("hit", 0) / n,
+        "jackpot_rate": counts.get("jackpot", 0) / n,
+        "session_length": params.slot_session,
+    }
+
+
+def _crash_report(stat: SumStat, counts: Dict[str, int], params: SimParams) -> Dict[str, Any]:
+    low, high = stat.ci95()
+    mean = stat.mean
+    house_edge_est = 1 - mean
+    return {
+        "rounds": stat.n,
+        "player_return_mean": mean,
+        "player_return_ci95": [low, high],
+        "house_edge_est": house_edge_est,
+        "target_house_edge": TARGET_CRASH_HOUSE_EDGE,
+        "diff": house_edge_est - TARGET_CRASH_HOUSE_EDGE,
+        "pass": abs(house_edge_est - TARGET_CRASH_HOUSE_EDGE) <= 0.01,
+        "auto_cashout": params.crash_auto,
+        "cashout_rate": counts.get("auto_cashed", 0) / max(stat.n, 1),
+    }
+
+
+def _gacha_report(stat: SumStat, counts: Dict[str, int], params: SimParams) -> Dict[str, Any]:
+    low, high = stat.ci95()
+    n = max(stat.n, 1)
+    target_low, target_high = TARGET_GACHA_EV_RANGE
+    rarity = {k[len("rarity:"):]: v / n for k, v in sorted(counts.items()) if k.startswith("rarity:")}
+    return {
+        "pulls": stat.n,
+        "ev_mean": stat.mean,
+        "ev_ci95": [low, high],
+        "target_range": [target_low, target_high],
+        "within_range": target_low <= stat.mean <= target_high,
+        "rarity_distribution": rarity,
+        "near_miss_rate": counts.get("near_miss", 0) / n,
+        "pity_rate": counts.get("pity", 0) / n,
+        "pulls_per_player": params.gacha_pulls,
+    }
+
+
+# ---- service mode: 운영 코드 경로 스칼라 실행 ------------------------------
+
+def service_slot(n: int, params: SimParams, rng: random.Random) -> Tuple[SumStat, Dict[str, int]]:
+    """spin_slot 과 동일한 추첨 경로 (릴 alias sampler 3회, 승리 시 uniform 1회)."""
+    from app.utils.sampling import get_sampler_registry
+
+    stat, counts = SumStat(), {"hit": 0, "jackpot": 0}
+    reel_sampler = get_sampler_registry().get("slot_reels", list(zip(game_math.SLOT_SYMBOLS, params.slot_weights)))
+    for i in range(n):
+        reels = reel_sampler.sample(3, rng)
+        win = game_math.slot_base_win(reels, SLOT_BET)
+        if win > 0:
+            streak = i % params.slot_session + 1
+            win = game_math.slot_final_win(win, streak, rng.uniform(*game_math.SLOT_VARIATION_RANGE))
+            counts["hit"] += 1
+            counts["jackpot"] += game_math.slot_is_jackpot(reels)
+        ratio = win / SLOT_BET
+        stat.merge(SumStat(1, ratio, ratio * ratio))
+    return stat, counts
+
+
+def service_crash(n: int, params: SimParams, rng: random.Random) -> Tuple[SumStat, Dict[str, int]]:
+    """place_crash_bet 과 동일한 md5 시드 해시 → 배수 → 자동 캐시아웃 정산."""
+    stat, counts = SumStat(), {"auto_cashed": 0}
+    for i in range(n):
+        seed = f"sim:{rng.getrandbits(64)}:{i}"
+        point = game_math.crash_point_from_uniform(game_math.crash_uniform_from_seed(seed))
+        credit, status = game_math.crash_auto_cashout_win(CRASH_BET, params.crash_auto, point)
+        counts["auto_cashed"] += status == "auto_cashed"
+        ratio = credit / CRASH_BET
+        stat.merge(SumStat(1, ratio, ratio * ratio))
+    return stat, counts
+
+
+def service_gacha(n: int, params: SimParams, rng: random.Random) -> Tuple[SumStat, Dict[str, int]]:
+    """GachaService._resolve_draws 직접 호출 (전역 random 사용 → rng 로 시드)."""
+    from app.services.gacha_service import GachaService
+
+    svc = GachaService()
+    svc.rarity_table = list(params.gacha_table)
+    svc.reward_pool = {}
+    random.seed(rng.getrandbits(64))
+    stat, counts = SumStat(), {}
+    remaining = n
+    while remaining > 0:
+        pulls = min(params.gacha_pulls, remaining)
+        remaining -= pulls
+        count, history = 0, []
+        for _ in range(pulls):
+            # 단일 뽑기 단위로 호출해 근접 실패/피티 여부를 draw 별로 집계
+            draw = svc._resolve_draws(0, 1, count, history)
+            pity_hit = draw.pity_count == 0  # 카운터는 피티 발동 시에만 0 으로 초기화
+            count, history = draw.pity_count, draw.history
+            actual = history[0]
+            value = GACHA_VALUE_BY_RARITY.get(actual.lower(), 0.0)
+            stat.merge(SumStat(1, value, value * value))
+            key = f"rarity:{actual}"
+            counts[key] = counts.get(key, 0) + 1
+            counts["near_miss"] = counts.get("near_miss", 0) + draw.near_miss_occurred
+            counts["pity"] = counts.get("pity", 0) + pity_hit
+    return stat, counts
+
+
+# ---- vectorized mode: 순수 함수 → 룩업 테이블 → NumPy 배치 ------------------
+
+def _require_numpy():
+    try:
+        import numpy as np
+    except ImportError as e:  # pragma: no cover - 선택 의존성
+        raise SystemExit("--mode vectorized requires numpy (pip install numpy)") from e
+    return np
+
+
+@lru_cache(maxsize=8)
+def _slot_tables(params: SimParams):
+    """(216 릴 조합 기본 당첨액, 잭팟 조합, 스트릭별 보너스 배수, 추첨값 → 조합) 테이블.
+
+    정수 가중치면 릴 추첨은 [0, 총가중치) 균등 정수와 동일 분포이므로
+    릴 3개를 [0, 총가중치^3) 정수 1개로 뽑아 조합 인덱스를 직접 찾는다 (없으면 None).
+    """
+    np = _require_numpy()
+    k = len(game_math.SLOT_SYMBOLS)
+    base = np.zeros((k, k, k), dtype=np.float64)
+    jackpot = np.zeros((k, k, k), dtype=bool)
+    for a in range(k):
+        for b in range(k):
+            for c in range(k):
+                reels = (game_math.SLOT_SYMBOLS[a], game_math.SLOT_SYMBOLS[b], game_math.SLOT_SYMBOLS[c])
+                base[a, b, c] = game_math.slot_base_win(reels, SLOT_BET)
+                jackpot[a, b, c] = game_math.slot_is_jackpot(reels)
+    bonus = np.array([game_math.slot_streak_bonus(s) for s in range(params.slot_session + 1)])
+    combo_by_draw = None
+    total = sum(params.slot_weights)
+    if all(float(w).is_integer() and w >= 0 for w in params.slot_weights) and 0 < total ** 3 <= SLOT_COMBO_TABLE_MAX:
+        reel = np.repeat(np.arange(k, dtype=np.int16), [int(w) for w in params.slot_weights])
+        combo_by_draw = ((reel[:, None, None] * k + reel[None, :, None]) * k + reel[None, None, :]).ravel()
+    return base.ravel(), jackpot.ravel(), bonus, combo_by_draw
+
+
+@lru_cache(maxsize=8)
+def _crash_table(params: SimParams):
+    """격자 인덱스(0..9999) → 잔액 가산액 (crash_auto_cashout_win)."""
+    np = _require_numpy()
+    grid = game_math.CRASH_UNIFORM_GRID
+    credit = np.empty(grid, dtype=np.float64)
+    for i in range(grid):
+        point = game_math.crash_point_from_uniform(i / float(grid))
+        credit[i] = game_math.crash_auto_cashout_win(CRASH_BET, params.crash_auto, point)[0]
+    return credit
+
+
+@lru_cache(maxsize=8)
+def _gacha_tables(params: SimParams):
+    """(보유 마스크, 부스트 레벨) 별 누적분포 + (추첨 인덱스, 피티) 별 결과 테이블."""
+    np = _require_numpy()
+    table = list(params.gacha_table)
+    names = [name for name, _ in table]
+    k = len(names)
+    if k > GACHA_MAX_TABLE:
+        raise SystemExit(f"gacha table too large for vectorized mode ({k} > {GACHA_MAX_TABLE})")
+    boosts = [game_math.gacha_near_miss_probability(c) for c in range(GACHA_COUNT_CAP + 1)]
+    levels, level_by_count = np.unique(np.array(boosts), return_inverse=True)
+    cdf = np.empty((1 << k, len(levels), k), dtype=np.float64)
+    for mask in range(1 << k):
+        present = frozenset(names[i] for i in range(k) if mask >> i & 1)
+        for li, boost in enumerate(levels):
+            cdf[mask, li] = game_math.gacha_rarity_cdf(table, present, float(boost))[0]
+    # 결과 등급 이름 목록 (통계 키) / 히스토리 코드 (테이블 인덱스, 없으면 -1)
+    outcome_names: List[str] = []
+    outcome_id = np.empty((k + 1, 2), dtype=np.int16)
+    hist_code = np.empty((k + 1, 2), dtype=np.int16)
+    near_miss = np.zeros((k + 1, 2), dtype=bool)
+    pity_hit = np.zeros((k + 1, 2), dtype=bool)
+    for idx in range(k + 1):
+        drawn = names[idx] if idx < k else "Common"  # 누적분포 초과 구간 → Common
+        for pity in (0, 1):
+            _, actual, nm, ph = game_math.gacha_resolve_rarity(drawn, bool(pity))
+            if actual not in outcome_names:
+                outcome_names.append(actual)
+            outcome_id[idx, pity] = outcome_names.index(actual)
+            hist_code[idx, pity] = names.index(actual) if actual in names else -1
+            near_miss[idx, pity] = nm
+            pity_hit[idx, pity] = ph
+    values = np.array([GACHA_VALUE_BY_RARITY.get(n.lower(), 0.0) for n in outcome_names])
+    return {
+        "cdf": cdf, "level_by_count": level_by_count.astype(np.int16), "outcome_id": outcome_id,
+        "hist_code": hist_code, "near_miss": near_miss, "pity_hit": pity_hit,
+        "values": values, "outcome_names": outcome_names,
+    }
+
+
+def _vector_slot(n: int, offset: int, params: SimParams, seed) -> Tuple[SumStat, Dict[str, int]]:
+    np = _require_numpy()
+    rng = np.random.default_rng(seed)
+    base, jackpot, bonus, combo_by_draw = _slot_tables(params)
+    if combo_by_draw is not None:
+        combo = combo_by_draw[rng.integers(0, combo_by_draw.size, size=n)]
+    else:
+        # 실수 가중치: 균등값 → 누적가중치 이진 탐색 (릴 alias sampler 와 같은 분포)
+        k = len(game_math.SLOT_SYMBOLS)
+        cum = np.cumsum(np.array(params.slot_weights, dtype=np.float64))
+        cum /= cum[-1]
+        idx = np.searchsorted(cum, rng.random((n, 3)), side="right")
+        np.minimum(idx, k - 1, out=idx)
+        combo = (idx[:, 0] * k + idx[:, 1]) * k + idx[:, 2]
+    win = base[combo]
+    streak = (np.arange(offset, offset + n) % params.slot_session) + 1
+    variation = rng.uniform(*game_math.SLOT_VARIATION_RANGE, size=n)
+    hit = win > 0
+    # slot_final_win: int(base × bonus × variation) — 양수이므로 floor 와 동일
+    win = np.where(hit, np.floor(win * bonus[streak] * variation), 0.0)
+    ratio = win / SLOT_BET
+    counts = {"hit": int(hit.sum()), "jackpot": int(jackpot[combo].sum())}
+    return SumStat(n, float(ratio.sum()), float(np.dot(ratio, ratio))), counts
+
+
+def _vector_crash(n: int, offset: int, params: SimParams, seed) -> Tuple[SumStat, Dict[str, int]]:
+    np = _require_numpy()
+    rng = np.random.default_rng(seed)
+    credit = _crash_table(params)[rng.integers(0, game_math.CRASH_UNIFORM_GRID, size=n)]
+    ratio = credit / CRASH_BET
+    counts = {"auto_cashed": int((credit > 0).sum())}
+    return SumStat(n, float(ratio.sum()), float(np.dot(ratio, ratio))), counts
+
+
+def _vector_gacha(n: int, offset: int, params: SimParams, seed) -> Tuple[SumStat, Dict[str, int]]:
+    """플레이어 축으로 벡터화, 뽑기 순서(피티/히스토리 상태)는 pulls 단계 루프."""
+    np = _require_numpy()
+    rng = np.random.default_rng(seed)
+    t = _gacha_tables(params)
+    pulls = params.gacha_pulls
+    players = -(-n // pulls)
+    count = np.zeros(players, dtype=np.int64)
+    history = np.full((players, game_math.GACHA_HISTORY_SIZE), -1, dtype=np.int16)
+    bit = np.zeros(history.shape, dtype=np.int64)
+    k = t["cdf"].shape[2]
+    totals = np.zeros(len(t["outcome_names"]), dtype=np.int64)
+    near_miss = pity_total = 0
+    total = total_sq = 0.0
+    drawn_total = 0
+    rows = np.arange(players)
+    for step in range(pulls):
+        active = min(players, n - drawn_total) if step == pulls - 1 else players
+        count += 1
+        pity = (count >= game_math.GACHA_PITY_THRESHOLD).astype(np.int8)
+        np.left_shift(1, history, out=bit, where=history >= 0)
+        bit[history < 0] = 0
+        mask = np.bitwise_or.reduce(bit, axis=1)
+        level = t["level_by_count"][np.minimum(count, GACHA_COUNT_CAP)]
+        rnd = rng.random(players)
+        drawn = (t["cdf"][mask, level] < rnd[:, None]).sum(axis=1)  # bisect_left
+        oid = t["outcome_id"][drawn, pity]
+        count = np.where(t["pity_hit"][drawn, pity], 0, count)
+        history[:, step % game_math.GACHA_HISTORY_SIZE] = t["hist_code"][drawn, pity]
+        # 마지막 단계는 n 을 넘지 않도록 앞쪽 플레이어만 집계
+        sel = rows < active if active < players else slice(None)
+        vals = t["values"][oid[sel]]
+        total += float(vals.sum())
+        total_sq += float(np.dot(vals, vals))
+        totals += np.bincount(oid[sel], minlength=len(totals))
+        near_miss += int(t["near_miss"][drawn, pity][sel].sum())
+        pity_total += int(t["pity_hit"][drawn, pity][sel].sum())
+        drawn_total += int(vals.size)
+    counts = {f"rarity:{name}": int(c) for name, c in zip(t["outcome_names"], totals)}
+    counts["near_miss"] = near_miss
+    counts["pity"] = pity_total
+    return SumStat(drawn_total, total, total_sq), counts
+
+
+_VECTOR_KERNELS = {"slot": _vector_slot, "crash": _vector_crash, "gacha": _vector_gacha}
+_SERVICE_KERNELS = {"slot": service_slot, "crash": service_crash, "gacha": service_gacha}
+_REPORTS = {"slot": _slot_report, "crash": _crash_report, "gacha": _gacha_report}
+
+
+def _run_chunk(task: Tuple[str, int, int, SimParams, Any]) -> Tuple[SumStat, Dict[str, int]]:
+    game, n, offset, params, seed = task
+    return _VECTOR_KERNELS[game](n, offset, params, seed)
+
+
+def run_vectorized(game: str, n: int, params: SimParams, seed: int, workers: int, chunk: int,
+                   executor: Optional[ProcessPoolExecutor] = None) -> Dict[str, Any]:
+    """n 라운드를 청크로 나눠 (프로세스 풀) 평가. 청크별 독립 SeedSequence → 워커 수와 무관하게 재현 가능."""
+    np = _require_numpy()
+    if n <= 0:
+        return _REPORTS[game](SumStat(), {}, params)
+    if game == "gacha":
+        chunk = max(params.gacha_pulls, chunk - chunk % params.gacha_pulls)  # 플레이어 단위 분할
+    sizes = [min(chunk, n - start) for start in range(0, n, chunk)]
+    seeds = np.random.SeedSequence([seed, sum(map(ord, game))]).spawn(len(sizes))
+    tasks = [(game, size, i * chunk, params, s) for i, (size, s) in enumerate(zip(sizes, seeds))]
+    started = time.perf_counter()
+    if executor is not None and workers > 1 and len(tasks) > 1:
+        parts = list(executor.map(_run_chunk, tasks))
+    else:
+        parts = [_run_chunk(t) for t in tasks]
+    stat, counts = SumStat(), {}
+    for part_stat, part_counts in parts:
+        stat.merge(part_stat)
+        _merge_counts(counts, part_counts)
+    report = _REPORTS[game](stat, counts, params)
+    report["elapsed_seconds"] = round(time.perf_counter() - started, 3)
+    return report
+
+
+def run_service(game: str, n: int, params: SimParams, rng: random.Random) -> Dict[str, Any]:
+    started = time.perf_counter()
+    stat, counts = _SERVICE_KERNELS[game](n, params, rng)
+    report = _REPORTS[game](stat, counts, params)
+    report["elapsed_seconds"] = round(time.perf_counter() - started, 3)
+    return report
+
 
 def main():
     parser = argparse.ArgumentParser()
@@ -201,18 +617,46 @@ def main():
     parser.add_argument("--gacha-n", type=int, default=int(os.getenv("SIM_GACHA_N", 50000)))
     parser.add_argument("--crash-n", type=int, default=int(os.getenv("SIM_CRASH_N", 50000)))
     parser.add_argument("--seed", type=int, default=12345)
+    parser.add_argument("--mode", choices=("sample", "service", "vectorized"), default=os.getenv("SIM_MODE", "sample"))
+    parser.add_argument("--workers", type=int, default=int(os.getenv("SIM_WORKERS", os.cpu_count() or 1)))
+    parser.add_argument("--chunk", type=int, default=DEFAULT_CHUNK, help="vectorized 청크 크기 (라운드)")
+    parser.add_argument("--slot-session", type=int, default=SLOT_SESSION_DEFAULT, help="슬롯 스트릭 초기화 주기 (스핀)")
+    parser.add_argument("--crash-auto", type=float, default=CRASH_AUTO_DEFAULT, help="크래시 자동 캐시아웃 배수")
+    parser.add_argument("--gacha-pulls", type=int, default=GACHA_PULLS_DEFAULT, help="가챠 플레이어당 연속 뽑기 수")
     parser.add_argument("--fail-on-deviation", action="store_true")
     parser.add_argument("--output", help="JSON 결과 저장 경로")
     args = parser.parse_args()
 
     rng = random.Random(args.seed)
-    slot_res = simulate_slot(args.slot_n, rng)
-    rps_res = simulate_rps(args.rps_n, rng)
-    gacha_res = simulate_gacha(args.gacha_n, rng)
-    crash_res = simulate_crash(args.crash_n, rng)
+    if args.mode == "sample":
+        slot_res = simulate_slot(args.slot_n, rng)
+        rps_res = simulate_rps(args.rps_n, rng)
+        gacha_res = simulate_gacha(args.gacha_n, rng)
+        crash_res = simulate_crash(args.crash_n, rng)
+    elif args.mode == "service":
+        params = load_sim_params(args)
+        slot_res = run_service("slot", args.slot_n, params, rng)
+        rps_res = simulate_rps(args.rps_n, rng)
+        gacha_res = run_service("gacha", args.gacha_n, params, rng)
+        crash_res = run_service("crash", args.crash_n, params, rng)
+    else:
+        _require_numpy()
+        params = load_sim_params(args)
+        workers = max(1, args.workers)
+        chunk = max(1, args.chunk)
+        executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+        try:
+            slot_res = run_vectorized("slot", args.slot_n, params, args.seed, workers, chunk, executor)
+            gacha_res = run_vectorized("gacha", args.gacha_n, params, args.seed, workers, chunk, executor)
+            crash_res = run_vectorized("crash", args.crash_n, params, args.seed, workers, chunk, executor)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+        rps_res = simulate_rps(args.rps_n, rng)
 
     result = {
         "seed": args.seed,
+        "mode": args.mode,
         "simulations": {
             "slot": slot_res,
             "rps": rps_res,
@@ -3,12 +3,14 @@ from unittest.mock import MagicMock
 import os
 
 from app.services.user_segment_service import UserSegmentService
+from app.services.segment_resolver import segment_resolver
 from app.models import UserSegment
 
 class TestUserSegmentService(unittest.TestCase):
     def setUp(self):
         self.mock_db = MagicMock()
         self.service = UserSegmentService(db=self.mock_db)
+        segment_resolver.clear()  # 라벨 LRU 는 프로세스 공유
 
     def test_get_segment_label_default(self):
         self.mock_db.query.return_value.filter.return_value.first.return_value = None